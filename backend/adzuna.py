@@ -3,6 +3,10 @@ import os
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from utils.http_client import get_http_pool
+from utils.job_ids import stable_job_id
+from utils.hedging import fetch_pages, hedged_call, get_latency_tracker
+from managers.budget_manager import get_budget_manager, PRIORITY_INTERACTIVE
 
 logger = logging.getLogger(__name__)
 
@@ -11,56 +15,74 @@ class AdzunaClient:
         self.app_id = os.getenv("ADZUNA_APP_ID")
         self.app_key = os.getenv("ADZUNA_APP_KEY")
         self.base_url = "https://api.adzuna.com/v1/api/jobs/in/search"
+        # Max Adzuna pages in flight per search
+        self.page_concurrency = int(os.getenv("ADZUNA_PAGE_CONCURRENCY", "3"))
         
-    async def search_jobs(self, query: str, location: str = None, page: int = 1) -> List[Dict[str, Any]]:
+    async def search_jobs(self, query: str, location: str = None, page: int = 1, num_pages: int = 1,
+                          priority: str = PRIORITY_INTERACTIVE, deadline: float = 15.0) -> List[Dict[str, Any]]:
         """
         Search for jobs using Adzuna API for India.
         Returns normalized job data.
+        With num_pages > 1, pages are fetched in parallel with hedging and a shared
+        deadline; pages that finished in time are returned even if others did not.
         """
         if not self.app_id or not self.app_key:
             logger.warning("ADZUNA_APP_ID or ADZUNA_APP_KEY not set. Returning empty results.")
             return []
         
+        budget = get_budget_manager()
+        latency = get_latency_tracker("adzuna")
+
+        async def fetch(page_num: int) -> List[Dict[str, Any]]:
+            if not await budget.acquire("adzuna", priority=priority):
+                return []
+            return await hedged_call(
+                lambda: self._fetch_page(query, location, page_num),
+                hedge_after=latency.p95,
+                can_hedge=lambda: budget.try_acquire_nowait("adzuna"),
+                tracker=latency,
+            )
+
         jobs = []
-        async with httpx.AsyncClient() as client:
-            try:
-                params = {
-                    "app_id": self.app_id,
-                    "app_key": self.app_key,
-                    "results_per_page": 50,
-                    "what": query,
-                    "content-type": "application/json"
-                }
-                
-                if location:
-                    params["where"] = location
-                
-                response = await client.get(
-                    f"{self.base_url}/{page}",
-                    params=params,
-                    timeout=15.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                raw_jobs = data.get("results", [])
-                jobs = [self._normalize_job(job) for job in raw_jobs]
-                
-            except httpx.HTTPError as e:
-                logger.error(f"Adzuna API error: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error fetching jobs from Adzuna: {e}")
+        try:
+            pages = range(page, page + max(1, num_pages))
+            for raw_jobs in await fetch_pages(fetch, pages, concurrency=self.page_concurrency, deadline=deadline, name="Adzuna"):
+                jobs.extend(self._normalize_job(job) for job in raw_jobs)
+        except Exception as e:
+            logger.error(f"Unexpected error fetching jobs from Adzuna: {e}")
         
         return jobs
+
+    async def _fetch_page(self, query: str, location: str, page: int) -> List[Dict[str, Any]]:
+        """
+        Fetch a single Adzuna results page. Raises on HTTP errors so hedging can retry.
+        """
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": 50,
+            "what": query,
+            "content-type": "application/json"
+        }
+        
+        if location:
+            params["where"] = location
+        
+        # Shared pooled client (keep-alive, per-host limits, retry/backoff)
+        response = await get_http_pool().get(
+            f"{self.base_url}/{page}",
+            params=params,
+            timeout=15.0
+        )
+        response.raise_for_status()
+        return response.json().get("results", [])
     
     def _normalize_job(self, raw_job: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize Adzuna job data to our internal schema.
         """
-        import hashlib
-        
         # Generate unique ID from redirect_url
-        job_id = abs(hash(raw_job.get("redirect_url", "") + raw_job.get("title", ""))) % (10 ** 8)
+        job_id = stable_job_id((raw_job.get("redirect_url") or "") + (raw_job.get("title") or ""))
         
         # Parse salary
         salary_min = raw_job.get("salary_min")
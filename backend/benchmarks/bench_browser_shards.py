@@ -0,0 +1,115 @@
+"""
+Benchmark: scrape throughput with browser scrapes in-process vs spread over N
+browser worker processes (BrowserShards).
+
+Every scrape leases a page from the worker's BrowserPool, is served the recorded
+search results page (benchmarks/fixtures/) through page.route, extracts the cards
+with the Naukri selectors and normalizes them, so no network is used and the work
+per scrape is what a real Playwright scrape costs us in CPU and browser IPC.
+
+Usage (from backend/):
+    python -m benchmarks.bench_browser_shards [--scrapes 64] [--concurrency 8] [--workers 1,2,4] [--no-browser]
+
+Requires Chromium (`playwright install chromium`). Throughput only scales up to
+the number of cores (os.cpu_count()). With --no-browser the cards are extracted
+from the same page server-side (the HTTP fast path), which measures the worker
+IPC and normalization overhead where Chromium isn't available.
+
+Either way, the jobs a worker returns must carry the ids the in-process scrape
+gave them (ids are stable across processes), or the run fails.
+"""
+import argparse
+import asyncio
+import os
+import time
+from scrapers.browser_pool import get_browser_pool
+from scrapers.browser_shards import BrowserShards
+from scrapers.html_extract import extract_cards_from_html
+from scrapers.naukri_scraper import NaukriScraper
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "naukri_search.html")
+
+
+class FixtureNaukriScraper(NaukriScraper):
+    """Naukri card extraction against the recorded fixture page."""
+    async def search_jobs(self, query, location="India", page=1):
+        with open(FIXTURE, encoding="utf-8") as f:
+            html = f.read()
+
+        async def serve(route):
+            if route.request.resource_type == "document":
+                await route.fulfill(status=200, content_type="text/html", body=html)
+            else:
+                await route.abort()
+
+        page_obj, _ = await self._get_page()
+        try:
+            await page_obj.route("**/*", serve)
+            await page_obj.goto(f"https://www.naukri.com/{query}-jobs-in-{location}?pageNo={page}",
+                                wait_until="domcontentloaded")
+            cards = await self._extract_cards(page_obj, limit=20)
+            await page_obj.unroute("**/*", serve)
+            return [self.normalize_job_data(card, "Naukri.com") for card in cards]
+        finally:
+            await self._safe_close()
+
+
+class FixtureNaukriHtmlScraper(NaukriScraper):
+    """The same cards extracted from the fixture without a browser."""
+    async def search_jobs(self, query, location="India", page=1):
+        with open(FIXTURE, encoding="utf-8") as f:
+            html = f.read()
+        cards = extract_cards_from_html(html, self.CARD_SELECTORS, self.CARD_FIELDS, limit=20)
+        return [self.normalize_job_data(card, "Naukri.com") for card in cards]
+
+
+async def run(call, scrapes: int, concurrency: int, browsers: int = 1) -> float:
+    """Scrapes per second for `scrapes` calls with at most `concurrency` in flight."""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with slots:
+            jobs = await call(i)
+            assert jobs, "fixture page produced no jobs"
+
+    # Warm up: browser launches and first contexts aren't throughput
+    await asyncio.gather(*(call(0) for _ in range(browsers)))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(scrapes)))
+    return scrapes / (time.perf_counter() - t0)
+
+
+async def main(scrapes: int, concurrency: int, workers, browser: bool = True):
+    scraper_cls = FixtureNaukriScraper if browser else FixtureNaukriHtmlScraper
+    print(f"{scrapes} fixture scrapes per run ({'browser' if browser else 'no browser'}), {os.cpu_count()} cores\n")
+    print(f"{'mode':<14}{'in flight':>10}{'scrapes/s':>12}{'speedup':>10}")
+
+    scraper = scraper_cls()
+    expected_ids = [job["id"] for job in await scraper.search_jobs("python", "Pune", 1)]
+    baseline = await run(lambda i: scraper.search_jobs("python", "Pune", i), scrapes, concurrency)
+    if browser:
+        await (await get_browser_pool()).shutdown()
+    print(f"{'in-process':<14}{concurrency:>10}{baseline:>12.1f}{1.0:>9.2f}x")
+
+    for n in workers:
+        # Source affinity would pin one source to one worker: spread calls instead
+        shards = BrowserShards(workers=n, policy="least_loaded")
+        try:
+            ids = [job["id"] for job in await shards.run("Naukri", scraper_cls, ("python", "Pune", 1))]
+            assert ids == expected_ids, "worker processes gave the same jobs different ids"
+            rate = await run(lambda i: shards.run("Naukri", scraper_cls, ("python", "Pune", i)),
+                             scrapes, concurrency * n, browsers=n)
+        finally:
+            shards.shutdown()
+        print(f"{f'{n} worker(s)':<14}{concurrency * n:>10}{rate:>12.1f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scrapes", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8, help="scrapes in flight per browser")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--no-browser", action="store_true", help="extract the fixture without Chromium")
+    args = parser.parse_args()
+    asyncio.run(main(args.scrapes, args.concurrency, [int(n) for n in args.workers.split(",")],
+                     browser=not args.no_browser))
@@ -0,0 +1,101 @@
+"""
+Benchmark: cache hit rate with raw vs canonical query keys.
+
+Replays the searches logged in search_history_tracker.csv in time order and counts
+how many would have been served from cache, for both cache layers:
+
+- search: the SearchQuery entry (JobService.get_jobs cache_params, 2h freshness)
+- scrape: the per-source result cache, keyed by scraper inputs (query, location)
+
+--variants also replays, a minute after each logged search, the spellings users
+type for the same search (title case, trailing space, plural, location typed into
+the query), since the tracker only holds a few days of history.
+
+Usage (from backend/):
+    python -m benchmarks.bench_query_canonicalization [--csv search_history_tracker.csv] [--ttl 7200] [--variants]
+"""
+import argparse
+import csv
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.query_canonical import canonicalize_query
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "search_history_tracker.csv")
+
+
+def load_searches(path: str) -> List[Tuple[datetime, str, List[str]]]:
+    """(timestamp, query, locations) per logged search, oldest first."""
+    searches = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            when = datetime.strptime(f"{row['Date']} {row['Time']}", "%Y-%m-%d %H:%M:%S")
+            location = (row.get("Location") or "").strip()
+            locations = [] if location in ("", "None") else [loc.strip() for loc in location.split(",")]
+            searches.append((when, row["Query"], locations))
+    return sorted(searches, key=lambda s: s[0])
+
+
+def with_variants(searches):
+    """Each search followed by typed variants of itself, one minute apart."""
+    replayed = []
+    for when, query, locations in searches:
+        variants = [(query, locations), (query.title(), locations), (query + " ", locations), (query + "s", locations)]
+        if locations:
+            variants.append((f"{query} in {locations[0]}", []))
+        replayed.extend((when + timedelta(minutes=i), q, locs) for i, (q, locs) in enumerate(variants))
+    return sorted(replayed, key=lambda s: s[0])
+
+
+def raw_keys(query: str, locations: List[str]) -> Tuple[str, tuple]:
+    """Keys as built before canonicalization (raw query string)."""
+    search_term = query.strip() or "Job"
+    primary = locations[0] if locations else None
+    full_term = f"{search_term} in {primary}" if primary else search_term
+    search_key = json.dumps({"q": full_term, "orig_q": query, "country": "India"}, sort_keys=True)
+    return search_key, (" ".join(query.lower().split()), (primary or "").lower())
+
+
+def canonical_keys(query: str, locations: List[str]) -> Tuple[str, tuple]:
+    """Keys as JobService.get_jobs builds them now."""
+    canonical = canonicalize_query(query, locations[0] if locations else None)
+    search_term = canonical.query or "Job"
+    full_term = f"{search_term} in {canonical.location}" if canonical.location else search_term
+    search_key = json.dumps({"q": full_term, "orig_q": search_term, "country": "India"}, sort_keys=True)
+    return search_key, (search_term, (canonical.location or "").lower())
+
+
+def replay(searches, make_keys: Callable, ttl: float) -> Dict[str, int]:
+    fetched: Dict[str, Dict[object, datetime]] = {"search": {}, "scrape": {}}
+    hits = {"search": 0, "scrape": 0}
+    for when, query, locations in searches:
+        for layer, key in zip(("search", "scrape"), make_keys(query, locations)):
+            last: Optional[datetime] = fetched[layer].get(key)
+            if last is not None and (when - last).total_seconds() <= ttl:
+                hits[layer] += 1
+            else:
+                fetched[layer][key] = when
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--ttl", type=float, default=7200, help="cache freshness in seconds")
+    parser.add_argument("--variants", action="store_true", help="also replay typed variants of each search")
+    args = parser.parse_args()
+
+    searches = load_searches(args.csv)
+    if args.variants:
+        searches = with_variants(searches)
+    total = len(searches)
+    print(f"{total} searches replayed from {args.csv} (ttl {args.ttl:.0f}s)\n")
+    print(f"{'keys':<10}{'search hits':>14}{'scrape hits':>14}")
+    for label, make_keys in (("raw", raw_keys), ("canonical", canonical_keys)):
+        hits = replay(searches, make_keys, args.ttl)
+        print(f"{label:<10}{hits['search']:>8} ({hits['search'] / total:4.0%}){hits['scrape']:>8} ({hits['scrape'] / total:4.0%})")
+
+
+if __name__ == "__main__":
+    main()
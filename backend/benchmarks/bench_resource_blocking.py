@@ -0,0 +1,212 @@
+"""
+Benchmark: bytes transferred and time-to-cards with and without request blocking.
+
+Replays a HAR recording of a search results page and every subresource it loaded
+(stylesheets, scripts, images, fonts, tracker calls) through utils.replay.HarReplay,
+so no network is used: each response is the recorded body, served after its
+recorded time. The baseline run loads everything; the blocking run aborts what
+RoutingPolicy() blocks in production.
+
+Record the fixture once, with blocking off (needs network and Chromium):
+    python -m benchmarks.bench_resource_blocking --record "https://www.naukri.com/python-jobs-in-pune"
+
+Replay it (from backend/):
+    python -m benchmarks.bench_resource_blocking [--runs 5] [--har PATH]
+
+--no-browser skips Chromium and counts, per resource type, the requests and bytes
+of the recording that the policy would block (no timings).
+
+fixtures/resource_blocking/synthetic_naukri_search.har is not a recording: it is the
+hand-written Naukri results page (fixtures/naukri_search.html) plus hand-written
+subresources of each type, with made-up sizes and timings. The unit tests replay it through BrowserPool's route
+handler; benchmark numbers need the real recording above.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+from scrapers.routing_policy import RoutingPolicy
+from utils.replay import HarReplay, ReplayStats, load_har, request_key
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+DEFAULT_HAR = os.path.join(FIXTURE_DIR, "resource_blocking", "naukri_search.har")
+CARD_SELECTOR = ".cust-job-tuple"
+
+# Resource type by response MIME prefix, for recordings without Chromium's _resourceType
+MIME_TYPES = [
+    ("text/html", "document"),
+    ("text/css", "stylesheet"),
+    ("application/javascript", "script"),
+    ("text/javascript", "script"),
+    ("application/x-javascript", "script"),
+    ("image/", "image"),
+    ("font/", "font"),
+    ("application/font", "font"),
+    ("application/x-font", "font"),
+    ("video/", "media"),
+    ("audio/", "media"),
+]
+FONT_EXTENSIONS = (".woff", ".woff2", ".ttf", ".otf", ".eot")
+
+
+def resource_type(entry: Dict[str, Any]) -> str:
+    if entry.get("_resourceType"):
+        return entry["_resourceType"]
+    mime = entry["response"].get("content", {}).get("mimeType", "").lower()
+    for prefix, kind in MIME_TYPES:
+        if mime.startswith(prefix):
+            return kind
+    if entry["request"]["url"].split("?")[0].lower().endswith(FONT_EXTENSIONS):
+        return "font"
+    return "fetch"
+
+
+def body_size(entry: Dict[str, Any]) -> int:
+    return max(entry["response"].get("content", {}).get("size", 0), 0)
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        sys.exit(f"No recording at {path}; record one with --record URL")
+    # Requests that never got a response (aborted, redirected away) can't be replayed
+    return [entry for entry in load_har(path) if entry["response"].get("status", 0) > 0]
+
+
+def count_blocked(entries: List[Dict[str, Any]], policy: RoutingPolicy) -> Dict[str, Counter]:
+    """Requests and bytes of the recording by resource type, split into loaded and blocked."""
+    totals = {"requests": Counter(), "bytes": Counter(), "blocked": Counter(), "blocked_bytes": Counter()}
+    for entry in entries:
+        kind = resource_type(entry)
+        totals["requests"][kind] += 1
+        totals["bytes"][kind] += body_size(entry)
+        if policy.should_block(kind, entry["request"]["url"]):
+            totals["blocked"][kind] += 1
+            totals["blocked_bytes"][kind] += body_size(entry)
+    return totals
+
+
+def print_counts(entries: List[Dict[str, Any]]):
+    totals = count_blocked(entries, RoutingPolicy())
+    print(f"{'type':<12}{'requests':>9}{'KiB':>10}{'blocked':>9}{'blocked KiB':>13}")
+    for kind in sorted(totals["requests"], key=lambda k: -totals["bytes"][k]):
+        print(f"{kind:<12}{totals['requests'][kind]:>9}{totals['bytes'][kind] / 1024:>10.1f}"
+              f"{totals['blocked'][kind]:>9}{totals['blocked_bytes'][kind] / 1024:>13.1f}")
+    requests, size = sum(totals["requests"].values()), sum(totals["bytes"].values())
+    blocked, blocked_size = sum(totals["blocked"].values()), sum(totals["blocked_bytes"].values())
+    print(f"{'total':<12}{requests:>9}{size / 1024:>10.1f}{blocked:>9}{blocked_size / 1024:>13.1f}")
+    if size:
+        print(f"blocking saves {blocked}/{requests} requests and {blocked_size / size:.0%} of the bytes")
+
+
+async def run_once(browser, url: str, replay: HarReplay, delays: Dict[str, float], policy: RoutingPolicy):
+    replay.rewind()
+    replay.stats = ReplayStats()
+    stats = {"blocked": 0}
+
+    async def handle(route):
+        request = route.request
+        if policy.should_block(request.resource_type, request.url):
+            stats["blocked"] += 1
+            await route.abort()
+            return
+        await asyncio.sleep(delays.get(request_key(request.method, request.url), 0))
+        await replay.fulfill(route)
+
+    context = await browser.new_context()
+    await context.route("**/*", handle)
+    page = await context.new_page()
+    try:
+        t0 = time.perf_counter()
+        await page.goto(url, wait_until="domcontentloaded")
+        await page.wait_for_selector(CARD_SELECTOR)
+        stats["time_to_cards"] = time.perf_counter() - t0
+        await page.wait_for_load_state("load")
+        stats["time_to_load"] = time.perf_counter() - t0
+        stats["cards"] = await page.locator(CARD_SELECTOR).count()
+    finally:
+        await context.close()
+    traffic = replay.stats.snapshot()
+    return {**stats, "requests": traffic["round_trips"], "bytes": traffic["bytes"], "unmatched": traffic["unmatched"]}
+
+
+def summarize(label: str, runs):
+    median = lambda key: statistics.median(r[key] for r in runs)
+    print(
+        f"{label:<10} cards={runs[0]['cards']:<3} requests={median('requests'):<5.0f} "
+        f"blocked={median('blocked'):<4.0f} unmatched={median('unmatched'):<4.0f} "
+        f"bytes={median('bytes') / 1024:8.1f} KiB  "
+        f"time_to_cards={median('time_to_cards') * 1000:7.1f} ms  "
+        f"time_to_load={median('time_to_load') * 1000:7.1f} ms"
+    )
+
+
+async def replay_in_browser(entries: List[Dict[str, Any]], runs: int):
+    from playwright.async_api import async_playwright
+
+    replay = HarReplay()
+    for entry in entries:
+        replay.add(entry)
+    # Recorded time of each request's first response (Playwright/Chromium HARs store it in ms)
+    delays: Dict[str, float] = {}
+    for entry in entries:
+        delays.setdefault(request_key(entry["request"]["method"], entry["request"]["url"]),
+                          max(entry.get("time", 0), 0) / 1000)
+    url = entries[0]["request"]["url"]
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for label, policy in (
+                ("baseline", RoutingPolicy(blocked_types=[], blocked_domains=[])),
+                ("blocking", RoutingPolicy()),
+            ):
+                results = [await run_once(browser, url, replay, delays, policy) for _ in range(runs)]
+                summarize(label, results)
+        finally:
+            await browser.close()
+
+
+async def record(url: str, path: str):
+    """Load `url` in Chromium with nothing blocked and save all its traffic to `path`."""
+    from playwright.async_api import async_playwright
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(record_har_path=path, record_har_content="embed")
+            page = await context.new_page()
+            await page.goto(url, wait_until="load")
+            try:
+                await page.wait_for_load_state("networkidle", timeout=15000)
+            except Exception:
+                pass  # pages that poll never go idle; what loaded so far is enough
+            await context.close()  # writes the HAR
+        finally:
+            await browser.close()
+    print(f"Recorded {len(load_har(path))} exchanges to {path}")
+
+
+async def main(args):
+    if args.record:
+        await record(args.record, args.har)
+        return
+    entries = load_recording(args.har)
+    print(f"{args.har}: {len(entries)} recorded responses")
+    print_counts(entries)
+    if not args.no_browser:
+        await replay_in_browser(entries, args.runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--har", default=DEFAULT_HAR)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", metavar="URL", help="record a new fixture from URL to --har")
+    parser.add_argument("--no-browser", action="store_true", help="only count what the policy blocks")
+    args = parser.parse_args()
+    asyncio.run(main(args))
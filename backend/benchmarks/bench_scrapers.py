@@ -0,0 +1,301 @@
+"""
+Benchmark: per-source scrape cost against recorded fixtures, fully offline.
+
+Each directory under benchmarks/fixtures/sources/ holds one recorded search for a
+source: http.har (API clients and HTTP fast paths, replayed through the httpx
+pool), browser.har (replayed through BrowserPool's request routing) and meta.json
+(the search inputs and how many jobs were extracted when it was recorded).
+
+Per source it reports wall and CPU time (parsing and normalization in this
+process), round trips, bytes served and jobs extracted. --check exits non-zero
+when a source extracts fewer jobs than recorded, or its CPU time grew past
+--max-slowdown times the --baseline.
+
+Browser fixtures need Chromium. Without it (or with --no-browser) they are
+replayed in "html" mode: the recorded document goes through the HTTP fast path's
+card extractor (scrapers.html_extract) and normalize_job_data, which checks
+selectors and parsing but not rendering, scripts or API capture. Sources with an
+HTTP fast path (Iimjobs, Freshersworld, GulfTalent) record and replay over plain
+HTTP and never need a browser unless the site challenges the fast path.
+
+Fixtures whose meta.json has "synthetic": true were written by hand in the
+provider's format, not recorded, so they only show that the code agrees with
+itself; --record replaces them with a recording (and drops the flag). The JSearch,
+Adzuna and Naukri fixtures are synthetic, and the HTTP fast-path sources have none
+yet. Synthetic results are marked with * in the report.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scrapers [--sources Naukri,JSearch] [--runs 3] [--check]
+                                        [--baseline FILE] [--save-baseline FILE]
+    python -m benchmarks.bench_scrapers --record Naukri --query python --location Pune   (live network)
+"""
+import argparse
+import asyncio
+import glob
+import inspect
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+from unittest.mock import patch
+from adzuna import AdzunaClient
+from jsearch import JSearchClient
+from scrapers.base_scraper import BaseScraper
+from scrapers.browser_pool import BrowserPool
+from scrapers.fetch_tiers import FetchTierMemory
+from scrapers.html_extract import extract_cards_from_html
+from scrapers.apna_scraper import ApnaScraper
+from scrapers.bayt_scraper import BaytScraper
+from scrapers.cutshort_scraper import CutshortScraper
+from scrapers.foundit_scraper import FounditScraper
+from scrapers.freshersworld_scraper import FreshersworldScraper
+from scrapers.glassdoor_scraper import GlassdoorScraper
+from scrapers.gulftalent_scraper import GulfTalentScraper
+from scrapers.herkey_scraper import HerKeyScraper
+from scrapers.hirist_scraper import HiristScraper
+from scrapers.iimjobs_scraper import IimjobsScraper
+from scrapers.indeed_scraper import IndeedScraper
+from scrapers.instahyre_scraper import InstahyreScraper
+from scrapers.linkedin_scraper import LinkedInScraper
+from scrapers.naukri_scraper import NaukriScraper
+from scrapers.naukrigulf_scraper import NaukriGulfScraper
+from scrapers.ziprecruiter_scraper import ZipRecruiterScraper
+from utils.http_client import use_http_transport
+from utils.replay import HarReplay, RecordingTransport, ReplayTransport, load_har, save_har
+
+SOURCES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "sources")
+
+API_SOURCES = {
+    "JSearch": lambda meta: JSearchClient().search_jobs(meta["query"], page=meta["page"], num_pages=1,
+                                                       country=meta["country"]),
+    "Adzuna": lambda meta: AdzunaClient().search_jobs(meta["query"], meta["location"], meta["page"], num_pages=1),
+}
+BROWSER_SCRAPERS = {
+    cls.__name__.replace("Scraper", ""): cls
+    for cls in (NaukriScraper, LinkedInScraper, InstahyreScraper, IimjobsScraper, HiristScraper, HerKeyScraper,
+                CutshortScraper, FreshersworldScraper, ApnaScraper, IndeedScraper, FounditScraper,
+                ZipRecruiterScraper, GlassdoorScraper, NaukriGulfScraper, BaytScraper, GulfTalentScraper)
+}
+
+
+@contextmanager
+def offline_state():
+    """
+    Keep benchmark runs away from production state: state files in a temp dir,
+    fresh budgets and fetch tiers, placeholder API keys, no API rate limits,
+    politeness spacing or random delays.
+    """
+    async def no_delay(self, *args, **kwargs):
+        pass
+
+    env = {
+        "SCRAPER_POLITENESS": "false",
+        "RAPIDAPI_KEY": os.getenv("RAPIDAPI_KEY", "replay"),
+        "ADZUNA_APP_ID": os.getenv("ADZUNA_APP_ID", "replay"),
+        "ADZUNA_APP_KEY": os.getenv("ADZUNA_APP_KEY", "replay"),
+        # Replayed calls cost nothing: don't let the provider rate limits skip runs
+        "JSEARCH_RATE_PER_SEC": "1000",
+        "ADZUNA_RATE_PER_SEC": "1000",
+    }
+    with tempfile.TemporaryDirectory() as state_dir, \
+         patch("utils.state_store.STATE_DIR", state_dir), \
+         patch("managers.budget_manager._budget_manager", None), \
+         patch("scrapers.fetch_tiers._fetch_tiers", None), \
+         patch.dict(os.environ, env), \
+         patch.object(BaseScraper, "_random_delay", no_delay):
+        yield
+
+
+def load_meta(source: str) -> Dict[str, Any]:
+    with open(os.path.join(SOURCES_DIR, source, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def chromium_available() -> bool:
+    try:
+        from playwright.async_api import async_playwright
+        async with async_playwright() as p:
+            return os.path.exists(p.chromium.executable_path)
+    except Exception:
+        return False
+
+
+async def scrape_recorded_html(source: str, meta: Dict[str, Any], replay: HarReplay,
+                               document_url: str) -> List[Dict[str, Any]]:
+    """Browser source without a browser: its cards extracted from the recorded document."""
+    scraper = BROWSER_SCRAPERS[source]()
+    recorded = replay.match("GET", document_url)
+    if recorded is None:
+        return []
+    cards = extract_cards_from_html(recorded[2].decode("utf-8", errors="replace"), scraper.CARD_SELECTORS,
+                                    scraper.CARD_FIELDS)
+    return [scraper.normalize_job_data(card, scraper.source_name, meta["country"]) for card in cards]
+
+
+def recorded_document(fixture_dir: str):
+    """URL of the first HTML response in the source's browser.har, if it has one."""
+    path = os.path.join(fixture_dir, "browser.har")
+    if not os.path.exists(path):
+        return None
+    for entry in load_har(path):
+        if entry["response"].get("content", {}).get("mimeType", "").startswith("text/html"):
+            return entry["request"]["url"]
+    return None
+
+
+async def scrape(source: str, meta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if source in API_SOURCES:
+        return await API_SOURCES[source](meta)
+    scraper = BROWSER_SCRAPERS[source]()
+    kwargs = {"country": meta["country"]} if "country" in inspect.signature(scraper.search_jobs).parameters else {}
+    return await scraper.search_jobs(meta["query"], meta["location"], meta["page"], **kwargs)
+
+
+async def run_source(source: str, runs: int = 3, browser: bool = True) -> Dict[str, Any]:
+    """
+    Replay `source`'s fixture `runs` times; medians of wall/CPU time plus per-run traffic and jobs.
+    With `browser` off, browser fixtures are replayed in html mode (see the module docstring).
+    """
+    meta = load_meta(source)
+    fixture_dir = os.path.join(SOURCES_DIR, source)
+    replay = HarReplay(os.path.join(fixture_dir, "http.har"), os.path.join(fixture_dir, "browser.har"))
+    await use_http_transport(ReplayTransport(replay))
+    document_url = recorded_document(fixture_dir) if source in BROWSER_SCRAPERS else None
+    mode = "http" if source in API_SOURCES or document_url is None else "browser" if browser else "html"
+    pool = None
+    if mode != "html" and source in BROWSER_SCRAPERS:
+        pool = BrowserPool()
+        pool.replay = replay
+
+    walls, cpus, jobs = [], [], []
+    try:
+        for _ in range(runs):
+            replay.rewind()
+            wall, cpu = time.perf_counter(), time.process_time()
+            if mode == "html":
+                jobs.append(len(await scrape_recorded_html(source, meta, replay, document_url)))
+            else:
+                jobs.append(len(await scrape(source, meta)))
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+    finally:
+        await use_http_transport(None)
+        if pool is not None:
+            await pool.shutdown()
+            pool.replay = None
+    traffic = replay.stats.snapshot()
+    return {
+        "mode": mode,
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "cpu_ms": round(statistics.median(cpus) * 1000, 1),
+        "round_trips": traffic["round_trips"] // runs,
+        "bytes": traffic["bytes"] // runs,
+        "unmatched": traffic["unmatched"] // runs,
+        "jobs": min(jobs),
+        "expected_jobs": meta.get("jobs"),
+        "synthetic": bool(meta.get("synthetic")),
+    }
+
+
+async def record_source(source: str, meta: Dict[str, Any]):
+    """Run one live search for `source` and store its traffic and meta.json as the fixture."""
+    fixture_dir = os.path.join(SOURCES_DIR, source)
+    os.makedirs(fixture_dir, exist_ok=True)
+    recorder = RecordingTransport()
+    await use_http_transport(recorder)
+    pool = None
+    # Fresh fetch-tier memory: fast-path sources record over HTTP even if production escalated them
+    with tempfile.TemporaryDirectory() as har_dir, \
+         patch("scrapers.fetch_tiers._fetch_tiers", FetchTierMemory(os.path.join(har_dir, "fetch_tiers.json"))):
+        if source in BROWSER_SCRAPERS:
+            pool = BrowserPool()
+            pool.record_har_dir = har_dir
+            pool.prewarm_count = 0
+        try:
+            jobs = await scrape(source, meta)
+        finally:
+            await use_http_transport(None)
+            if pool is not None:
+                # Contexts write their HAR files when they close
+                await pool.shutdown()
+                pool.record_har_dir = None
+        entries = [entry for path in sorted(glob.glob(os.path.join(har_dir, "*.har"))) for entry in load_har(path)]
+    if entries:
+        save_har(os.path.join(fixture_dir, "browser.har"), entries)
+    if recorder.entries:
+        recorder.save(os.path.join(fixture_dir, "http.har"))
+    with open(os.path.join(fixture_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({**meta, "jobs": len(jobs)}, f, indent=2)
+    print(f"{source}: recorded {len(recorder.entries)} HTTP and {len(entries)} browser exchanges, {len(jobs)} jobs")
+
+
+def check(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], max_slowdown: float) -> List[str]:
+    """Regressions: fewer jobs than recorded, or CPU time past `max_slowdown` x baseline."""
+    failures = []
+    for source, result in results.items():
+        if result["expected_jobs"] is not None and result["jobs"] < result["expected_jobs"]:
+            failures.append(f"{source}: {result['jobs']} jobs extracted, {result['expected_jobs']} recorded")
+        before = baseline.get(source, {}).get("cpu_ms")
+        if baseline.get(source, {}).get("mode") != result.get("mode"):
+            before = None  # html mode does a fraction of a browser replay's work
+        if before and result["cpu_ms"] > before * max_slowdown:
+            failures.append(f"{source}: {result['cpu_ms']} ms CPU vs {before} ms baseline")
+    return failures
+
+
+async def main(args) -> int:
+    if args.record:
+        meta = {"query": args.query, "location": args.location, "page": 1, "country": args.country}
+        for source in args.record.split(","):
+            await record_source(source, meta)
+        return 0
+
+    sources = args.sources.split(",") if args.sources else sorted(
+        d for d in os.listdir(SOURCES_DIR) if os.path.isfile(os.path.join(SOURCES_DIR, d, "meta.json")))
+    results = {}
+    browser = not args.no_browser and await chromium_available()
+    if not browser and not args.no_browser:
+        print("Chromium is not installed: browser fixtures replay in html mode")
+    print(f"{'source':<14}{'mode':>8}{'wall ms':>10}{'cpu ms':>10}{'trips':>7}{'KiB':>9}{'jobs':>6}{'recorded':>10}")
+    with offline_state():
+        for source in sources:
+            result = results[source] = await run_source(source, args.runs, browser=browser)
+            print(f"{source + ('*' if result['synthetic'] else ''):<14}{result['mode']:>8}{result['wall_ms']:>10.1f}{result['cpu_ms']:>10.1f}{result['round_trips']:>7}"
+                  f"{result['bytes'] / 1024:>9.1f}{result['jobs']:>6}{result['expected_jobs'] or '-':>10}"
+                  + (f"  ({result['unmatched']} unrecorded requests)" if result["unmatched"] else ""))
+    if any(result["synthetic"] for result in results.values()):
+        print("* synthetic fixture (hand-written, not recorded)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.check:
+        baseline = {}
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        failures = check(results, baseline, args.max_slowdown)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", help="comma-separated sources (default: every fixture)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="exit 1 on extraction or speed regressions")
+    parser.add_argument("--baseline", help="results JSON from --save-baseline to compare CPU time against")
+    parser.add_argument("--save-baseline", help="write this run's results as JSON")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--no-browser", action="store_true", help="replay browser fixtures in html mode")
+    parser.add_argument("--record", help="comma-separated sources to record from the live sites")
+    parser.add_argument("--query", default="python")
+    parser.add_argument("--location", default="Pune")
+    parser.add_argument("--country", default="India")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,110 +1,220 @@
+import asyncio
 import logging
-import pandas as pd
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Any, Optional
-from datetime import datetime
-from jobspy import scrape_jobs
+import pandas as pd
+from utils.job_ids import stable_job_id
 
 logger = logging.getLogger(__name__)
 
-class JobSpyClient:
-    def __init__(self):
-        # sites to scrape: linkedin, indeed, glassdoor, zip_recruiter
-        self.sites = ["linkedin", "indeed", "glassdoor"]
-        
-    async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
+DESCRIPTION_LIMIT = 3000
+
+
+def _text(frame: pd.DataFrame, column: str, default: str) -> pd.Series:
+    """`column` as strings, with missing/empty values (or a missing column) set to `default`."""
+    if column not in frame.columns:
+        return pd.Series(default, index=frame.index, dtype=object)
+    values = frame[column].astype(object)
+    values = values.where(values.notna(), "").astype(str)
+    return values.mask(values == "", default)
+
+
+def _amounts(frame: pd.DataFrame, column: str) -> list:
+    if column not in frame.columns:
+        return [None] * len(frame)
+    values = pd.to_numeric(frame[column], errors="coerce")
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _dates(frame: pd.DataFrame, column: str) -> list:
+    if column not in frame.columns:
+        return [None] * len(frame)
+    values = pd.to_datetime(frame[column], errors="coerce")
+    return [None if pd.isna(value) else value.to_pydatetime() for value in values]
+
+
+def frame_to_jobs(frame: Optional[pd.DataFrame]) -> List[Dict[str, Any]]:
+    """
+    Normalize a JobSpy DataFrame to our internal job schema. Columns are converted
+    once each (numbers, dates, defaults) and zipped into the job dicts, rather than
+    building a dict of every JobSpy column per row and normalizing it field by field.
+    """
+    if frame is None or frame.empty:
+        return []
+    urls = _text(frame, "job_url", "")
+    titles = _text(frame, "title", "")
+    logos = _text(frame, "company_logo", "")
+    logos = logos.mask(logos == "", _text(frame, "company_url", "")).replace("", None)
+    columns = {
+        "id": [stable_job_id(key) for key in (urls + titles)],
+        "title": titles.tolist(),
+        "company": _text(frame, "company", "Unknown Company").tolist(),
+        "location": _text(frame, "location", "Remote").tolist(),
+        "ctc_min": _amounts(frame, "min_amount"),
+        "ctc_max": _amounts(frame, "max_amount"),
+        "posted_at": _dates(frame, "date_posted"),
+        "apply_link": urls.tolist(),
+        "source": _text(frame, "site", "JobSpy").str.capitalize().tolist(),  # e.g. "Linkedin", "Indeed"
+        "logo_url": logos.tolist(),
+        "description": _text(frame, "description", "").str.slice(0, DESCRIPTION_LIMIT).tolist(),
+    }
+    names = list(columns)
+    return [{**dict(zip(names, row)), "experience_min": 0, "experience_max": 0, "skills": []}
+            for row in zip(*columns.values())]
+
+
+def _scrape(sites: List[str], query: str, location: str, results_wanted: int, country: str,
+            offset: int) -> List[Dict[str, Any]]:
+    """Runs in a JobSpy worker process: the blocking scrape plus DataFrame normalization."""
+    from jobspy import scrape_jobs
+
+    frame = scrape_jobs(
+        site_name=sites,
+        search_term=query,
+        location=location,
+        results_wanted=results_wanted,
+        country_indeed=country,
+        offset=offset,
+    )
+    return frame_to_jobs(frame)
+
+
+class JobSpyPool:
+    """
+    Dedicated worker processes for blocking JobSpy scrapes (JOBSPY_WORKERS, started
+    with the first call), so a multi-site scrape never holds up the event loop.
+
+    Each worker is a slot with its own single-process executor, and a call waits
+    for a free slot. A call that runs past its timeout or is cancelled can't be
+    interrupted inside its worker, so that slot's process is killed and its next
+    call starts a fresh one; scrapes running in the other slots carry on.
+    """
+    def __init__(self, workers: int = None, timeout: float = None):
+        self.workers = workers or int(os.getenv("JOBSPY_WORKERS", "1"))
+        # Below the ScraperManager's 60s JobSpy timeout, so the pool times out (and
+        # counts it) before the search is cancelled from outside
+        self.timeout = timeout or float(os.getenv("JOBSPY_TIMEOUT_SECONDS", "55"))
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self._idle: Optional[asyncio.Queue] = None
+        self.in_flight = 0
+        self.stats: Counter = Counter()
+
+    def _get_executor(self, slot: int) -> ProcessPoolExecutor:
+        if self._executors[slot] is None:
+            self._executors[slot] = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executors[slot]
+
+    async def run(self, fn, *args, timeout: float = None):
         """
-        Search for jobs using JobSpy (scrapes LinkedIn, Indeed, etc.).
-        Note: JobSpy is synchronous/blocking, so we should run it carefully, 
-        but for simplicity in this MVP we call it directly.
-        In a prod app, run this in a thread pool executor.
+        Result of `fn(*args)` from a worker; raises TimeoutError after `timeout`
+        (default JOBSPY_TIMEOUT_SECONDS), time spent waiting for a free slot included.
         """
-        jobs_list = []
+        deadline = time.monotonic() + (timeout or self.timeout)
+        if self.in_flight == 0:
+            # Every slot is free: (re)build the idle queue on the running loop
+            self._idle = asyncio.Queue()
+            for slot in range(self.workers):
+                self._idle.put_nowait(slot)
+        idle = self._idle
+        self.stats["calls"] += 1
+        self.in_flight += 1
+        slot = None
         try:
-            # JobSpy expects 'results_wanted' (count), not pages directly.
-            # We'll fetch 10 results per call.
-            # It also takes 'country_indeed' parameter.
-            
-            logger.info(f"JobSpy scraping for '{query}' in '{location}'...")
-            
-            # Scrape jobs
-            jobs_df = scrape_jobs(
-                site_name=self.sites,
-                search_term=query,
-                location=location,
-                results_wanted=10,
-                country_indeed='India',
-                offset=(page - 1) * 10 
-            )
-            
-            if jobs_df is not None and not jobs_df.empty:
-                logger.info(f"JobSpy found {len(jobs_df)} jobs")
-                # Convert DataFrame to list of dicts
-                raw_jobs = jobs_df.to_dict('records')
-                jobs_list = [self._normalize_job(job) for job in raw_jobs]
-            else:
-                logger.info("JobSpy returned no jobs")
-                
-        except Exception as e:
-            logger.error(f"JobSpy error: {e}")
-        
-        return jobs_list
-    
-    def _normalize_job(self, raw_job: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Normalize JobSpy job data to our internal schema.
-        """
-        import hashlib
-        
-        # JobSpy returns fields: id, site, job_url, title, company, location, date_posted, etc.
-        
-        # Generate unique ID
-        job_url = raw_job.get("job_url") or ""
-        job_title = raw_job.get("title") or ""
-        job_id = abs(hash(job_url + job_title)) % (10 ** 8)
-        
-        # Parse salary if available (JobSpy might return interval/min/max)
-        ctc_min = None
-        ctc_max = None
-        if raw_job.get("min_amount"):
-            try:
-                ctc_min = float(raw_job["min_amount"])
-            except:
-                pass
-        if raw_job.get("max_amount"):
+            slot = await asyncio.wait_for(idle.get(), max(deadline - time.monotonic(), 0))
+            future = self._get_executor(slot).submit(fn, *args)
             try:
-                ctc_max = float(raw_job["max_amount"])
-            except:
-                pass
-                
-        # Date
-        posted_at = None
-        if raw_job.get("date_posted"):
-            # jobspy often returns date object or string
-            d = raw_job["date_posted"]
-            if isinstance(d, datetime):
-                posted_at = d
-            else:
-                try:
-                    from dateutil import parser
-                    posted_at = parser.parse(str(d))
-                except:
-                    pass
-
-        description = raw_job.get("description") or ""
+                return await asyncio.wait_for(asyncio.wrap_future(future), max(deadline - time.monotonic(), 0))
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # A running call only stops with its worker
+                if not future.cancel() and not future.done():
+                    self._terminate(slot)
+                raise
+            except BrokenProcessPool:
+                self.stats["broken"] += 1
+                self._discard(slot)
+                raise
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            self.stats["timeouts" if isinstance(e, asyncio.TimeoutError) else "cancelled"] += 1
+            raise
+        finally:
+            if slot is not None:
+                idle.put_nowait(slot)
+            self.in_flight -= 1
+
+    def _terminate(self, slot: int):
+        logger.warning(f"JobSpy: killing worker {slot} to stop an abandoned scrape")
+        executor = self._executors[slot]
+        terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+        else:
+            for process in list((executor._processes or {}).values()):
+                process.kill()
+        self.stats["restarts"] += 1
+        self._discard(slot)
+
+    def _discard(self, slot: int):
+        executor, self._executors[slot] = self._executors[slot], None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        for slot in range(self.workers):
+            self._discard(slot)
 
+    def snapshot(self) -> Dict[str, Any]:
         return {
-            "id": job_id,
-            "title": job_title,
-            "company": raw_job.get("company") or "Unknown Company",
-            "location": raw_job.get("location") or "Remote",
-            "experience_min": 0,
-            "experience_max": 0,
-            "ctc_min": ctc_min,
-            "ctc_max": ctc_max,
-            "skills": [], 
-            "posted_at": posted_at,
-            "apply_link": job_url,
-            "source": raw_job.get("site", "JobSpy").capitalize(), # e.g. "Linkedin", "Indeed"
-            "logo_url": raw_job.get("company_url"), # JobSpy doesn't always give logo, sometime company url
-            "description": description[:3000] # Limit description
+            "workers": self.workers,
+            "running": sum(executor is not None for executor in self._executors),
+            "in_flight": self.in_flight,
+            **dict(self.stats),
         }
+
+
+# Global instance
+_jobspy_pool: Optional[JobSpyPool] = None
+
+def get_jobspy_pool() -> JobSpyPool:
+    """Get or create the global JobSpy worker pool."""
+    global _jobspy_pool
+    if _jobspy_pool is None:
+        _jobspy_pool = JobSpyPool()
+    return _jobspy_pool
+
+
+def jobspy_snapshot() -> Optional[Dict[str, Any]]:
+    return _jobspy_pool.snapshot() if _jobspy_pool is not None else None
+
+
+class JobSpyClient:
+    def __init__(self, pool: JobSpyPool = None):
+        # sites to scrape: linkedin, indeed, glassdoor, zip_recruiter
+        self.sites = os.getenv("JOBSPY_SITES", "linkedin,indeed,glassdoor").split(",")
+        # Results per site and call; pages are offsets in steps of this
+        self.results_wanted = int(os.getenv("JOBSPY_RESULTS_WANTED", "10"))
+        self.pool = pool or get_jobspy_pool()
+
+    async def search_jobs(self, query: str, location: str = "India", page: int = 1,
+                          country: str = "India") -> List[Dict[str, Any]]:
+        """
+        Search for jobs using JobSpy (scrapes LinkedIn, Indeed, etc.).
+        JobSpy is synchronous/blocking, so the scrape and the DataFrame conversion run
+        in the JobSpy worker pool; cancelling the search stops the scrape.
+        Timeouts (asyncio.TimeoutError) and worker errors propagate, so ScraperManager
+        counts them against JobSpy's circuit breaker instead of as an empty run.
+        """
+        logger.info(f"JobSpy scraping for '{query}' in '{location}'...")
+        try:
+            jobs = await self.pool.run(_scrape, self.sites, query, location, self.results_wanted, country,
+                                       (page - 1) * self.results_wanted)
+        except asyncio.TimeoutError:
+            logger.warning(f"JobSpy timed out after {self.pool.timeout:.0f}s")
+            raise
+
+        logger.info(f"JobSpy found {len(jobs)} jobs" if jobs else "JobSpy returned no jobs")
+        return jobs
@@ -3,6 +3,10 @@ import os
 import logging
 from typing import List, Dict, Any, Optional
 from dateutil import parser
+from utils.http_client import get_http_pool
+from utils.job_ids import stable_job_id
+from managers.budget_manager import get_budget_manager, PRIORITY_INTERACTIVE
+from utils.hedging import fetch_pages, hedged_call, get_latency_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +19,30 @@ class JSearchClient:
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": self.host,
         }
+        # Max JSearch pages in flight per search
+        self.page_concurrency = int(os.getenv("JSEARCH_PAGE_CONCURRENCY", "3"))
+        # One request per page (parallel, hedged and cut off per page at the deadline) instead
+        # of one num_pages=N request. Off by default: it spends N requests of the monthly
+        # quota per search instead of the 1-3 a single multi-page request is billed as
+        self.split_pages = os.getenv("JSEARCH_SPLIT_PAGES", "false").lower() == "true"
 
-    async def search_jobs(self, query: str, page: int = 1, num_pages: int = 3, country: str = "India") -> List[Dict[str, Any]]:
+    @staticmethod
+    def _billed(num_pages: int) -> int:
+        """Quota requests one call is billed as: 1 page = 1, up to 10 pages = 2, more = 3."""
+        return 1 if num_pages <= 1 else 2 if num_pages <= 10 else 3
+
+    def requests_for(self, num_pages: int) -> int:
+        """Quota requests a search of `num_pages` pages costs."""
+        return max(1, num_pages) if self.split_pages else self._billed(num_pages)
+
+    async def search_jobs(self, query: str, page: int = 1, num_pages: int = 3, country: str = "India",
+                          priority: str = PRIORITY_INTERACTIVE, deadline: float = 12.0) -> List[Dict[str, Any]]:
         """
         Search for jobs using JSearch API.
-        Fetches 3 pages by default (30 jobs total) for better pagination.
+        Fetches 3 pages by default (30 jobs total) for better pagination, in one
+        num_pages request that is hedged once it exceeds the observed p95 latency.
+        With JSEARCH_SPLIT_PAGES, pages are fetched in parallel (one request each, hedged
+        separately) and whatever finished by `deadline` is returned.
         """
         if not self.api_key:
             logger.warning("RAPIDAPI_KEY not set. Returning empty results.")
@@ -34,40 +57,62 @@ class JSearchClient:
         }
         country_code = country_map.get(country.lower(), "IN")
 
+        budget = get_budget_manager()
+        latency = get_latency_tracker("jsearch")
+
+        num_pages = num_pages or 4
+        per_request = 1 if self.split_pages else num_pages
+
+        async def fetch(page_num: int) -> List[Dict[str, Any]]:
+            if not await budget.acquire("jsearch", cost=self._billed(per_request), priority=priority):
+                return []
+            return await hedged_call(
+                lambda: self._fetch_page(query, page_num, country_code, per_request),
+                hedge_after=latency.p95,
+                can_hedge=lambda: budget.try_acquire_nowait("jsearch", cost=self._billed(per_request)),
+                tracker=latency,
+            )
+
         jobs = []
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.base_url,
-                    headers=self.headers,
-                    params={
-                        "query": query,
-                        "page": str(page),
-                        "num_pages": str(num_pages) if num_pages else "4",
-                        "country": country_code, 
-                    },
-                    timeout=15.0  # Increased timeout for multiple pages
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                raw_jobs = data.get("data", [])
-                jobs = [self._normalize_job(job, country) for job in raw_jobs]
-                
-            except httpx.HTTPError as e:
-                logger.error(f"JSearch API error: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error fetching jobs: {e}")
+        try:
+            pages = range(page, page + num_pages) if self.split_pages else [page]
+            for raw_jobs in await fetch_pages(fetch, pages, concurrency=self.page_concurrency, deadline=deadline, name="JSearch"):
+                jobs.extend(self._normalize_job(job, country) for job in raw_jobs)
+        except Exception as e:
+            logger.error(f"Unexpected error fetching jobs: {e}")
                 
         return jobs
 
+    async def _fetch_page(self, query: str, page: int, country_code: str, num_pages: int = 1) -> List[Dict[str, Any]]:
+        """
+        Fetch `num_pages` JSearch results pages from `page` in one request. Raises on
+        HTTP errors so hedging can retry.
+        """
+        # Shared pooled client (keep-alive, per-host limits, retry/backoff)
+        response = await get_http_pool().get(
+            self.base_url,
+            headers=self.headers,
+            params={
+                "query": query,
+                "page": str(page),
+                "num_pages": str(num_pages),
+                "country": country_code, 
+            },
+            timeout=15.0
+        )
+        # RapidAPI reports the remaining monthly quota; keep our budget in sync
+        remaining = response.headers.get("x-ratelimit-requests-remaining")
+        if remaining and remaining.isdigit():
+            get_budget_manager().sync_remaining("jsearch", int(remaining))
+        response.raise_for_status()
+        return response.json().get("data", [])
+
     def _normalize_job(self, raw_job: Dict[str, Any], country: str = "India") -> Dict[str, Any]:
         """
         Normalize JSearch job data to our internal schema.
         """
         # Generate a unique ID from the apply link
-        import hashlib
-        job_id = abs(hash(raw_job.get("job_apply_link", "") + raw_job.get("job_title", ""))) % (10 ** 8)
+        job_id = stable_job_id((raw_job.get("job_apply_link") or "") + (raw_job.get("job_title") or ""))
         
         return {
             "id": job_id,
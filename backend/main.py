@@ -11,11 +11,29 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import os
 
-from models import UserInteraction
+from models import Job, UserInteraction
 # Load environment variables from parent directory's .env file
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 from managers.vector_manager import VectorManager
+from utils.http_client import close_http_pool
+from remotive import get_remotive_feed
+from jobspy_client import get_jobspy_pool, jobspy_snapshot
+from managers.budget_manager import get_budget_manager
+from utils.hedging import latency_snapshot
+from managers.circuit_breaker import get_circuit_breakers
+from managers.scrape_scheduler import get_scrape_scheduler
+from managers.result_cache import get_result_cache
+from managers.watermarks import get_watermarks
+from managers.source_yield import get_source_yield
+from managers.scraper_manager import flush_scrape_state, run_state_flush_loop
+from managers.ingest_pipeline import ingest_snapshot
+from managers.job_enrichment import get_job_enricher
+from scrapers.browser_pool import browser_pool_snapshot
+from scrapers.browser_shards import browser_shards_snapshot, get_browser_shards
+from scrapers.fetch_tiers import get_fetch_tiers
+from scrapers.base_scraper import readiness_snapshot
+from scrapers.debug_artifacts import get_debug_artifacts
 
 # Global Vector Manager Instance
 vector_manager_instance = None
@@ -64,11 +82,30 @@ async def lifespan(app: FastAPI):
         print("Initializing Vector Manager (Loading AI Models)...")
         vector_manager_instance = VectorManager()
         print("Vector Manager Ready 🧠")
+        # Enriched jobs are re-embedded
+        get_job_enricher().vector_manager = vector_manager_instance
     except Exception as e:
         print(f"Failed to load Vector Manager: {e}")
 
+    # Keep the local Remotive feed copy fresh in the background
+    remotive_refresh_task = asyncio.create_task(get_remotive_feed().run_refresh_loop())
+    # Breaker, watermark and yield state is written off the loop, not after every search
+    state_flush_task = asyncio.create_task(run_state_flush_loop())
+
     yield
 
+    remotive_refresh_task.cancel()
+    state_flush_task.cancel()
+    await flush_scrape_state()
+    await get_job_enricher().close()
+    # Release pooled API connections on shutdown
+    await close_http_pool()
+    # Stop browser worker processes (their browsers close with them)
+    shards = get_browser_shards()
+    if shards is not None:
+        shards.shutdown()
+    get_jobspy_pool().shutdown()
+
 
 
 app = FastAPI(title="Job Portal API", version="1.0.0", lifespan=lifespan)
@@ -114,6 +151,29 @@ app.add_middleware(ProfilerMiddleware)
 async def root():
     return {"message": "Job Portal API is running"}
 
+@app.get("/api/metrics")
+async def metrics():
+    """
+    Operational metrics for the scraping/API layer.
+    """
+    return {
+        "api_budget": get_budget_manager().snapshot(),
+        "api_latency": latency_snapshot(),
+        "sources": get_circuit_breakers().snapshot(),
+        "scheduler": get_scrape_scheduler().snapshot(),
+        "result_cache": get_result_cache().snapshot(),
+        "watermarks": get_watermarks().snapshot(),
+        "source_yield": get_source_yield().snapshot(),
+        "ingest": ingest_snapshot(),
+        "browser": browser_pool_snapshot(),
+        "browser_shards": browser_shards_snapshot(),
+        "jobspy": jobspy_snapshot(),
+        "fetch_tiers": get_fetch_tiers().snapshot(),
+        "readiness": readiness_snapshot(),
+        "debug_artifacts": get_debug_artifacts().snapshot(),
+        "enrichment": get_job_enricher().snapshot(),
+    }
+
 from fastapi import Response, Request, File, UploadFile
 from utils.resume_parser import ResumeParser
 
@@ -157,11 +217,19 @@ async def log_feedback(feedback: FeedbackRequest, db: AsyncSession = Depends(get
         )
         db.add(interaction)
         await db.commit()
-        return {"status": "logged", "job_id": feedback.job_id}
     except Exception as e:
         # Don't fail the request, just log error
         print(f"Feedback logging failed: {e}")
         return {"status": "error", "message": str(e)}
+    if feedback.action_type in ("CLICK", "APPLY"):
+        # Clicked jobs get their full description fetched in the background
+        try:
+            job = await db.get(Job, feedback.job_id)
+            if job is not None:
+                get_job_enricher().submit([job])
+        except Exception as e:
+            print(f"Enrichment queueing failed: {e}")
+    return {"status": "logged", "job_id": feedback.job_id}
 
 @app.get("/api/jobs", response_model=List[JobResponse])
 async def get_jobs(
@@ -179,7 +247,8 @@ async def get_jobs(
     db: AsyncSession = Depends(get_db)
 ):
     profiler = getattr(request.state, "profiler", None)
-    service = JobService(db, vector_manager=vector_manager_instance, profiler=profiler)
+    service = JobService(db, vector_manager=vector_manager_instance, profiler=profiler,
+                         enricher=get_job_enricher())
     jobs, triggered = await service.get_jobs(
         query=query, 
         locations=locations, 
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+from utils.state_store import state_path, load_json_state, save_json_state
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_PREWARM = "prewarm"
+
+
+class ProviderBudget:
+    """
+    Token bucket (per-second rate) plus a monthly request budget for one API provider.
+    """
+    def __init__(self, name: str, monthly_quota: int, rate_per_sec: float, burst: int = None):
+        self.name = name
+        self.monthly_quota = monthly_quota
+        self.rate_per_sec = rate_per_sec
+        self.capacity = float(burst or max(1, int(rate_per_sec)))
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.month = datetime.utcnow().strftime("%Y-%m")
+        self.used = 0
+        self.denied = 0
+
+    def _roll_month(self):
+        current = datetime.utcnow().strftime("%Y-%m")
+        if current != self.month:
+            self.month = current
+            self.used = 0
+            self.denied = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_sec)
+        self.last_refill = now
+
+    @property
+    def remaining(self) -> int:
+        self._roll_month()
+        return max(0, self.monthly_quota - self.used)
+
+    def wait_time(self) -> float:
+        """Seconds until a request token is available (0 if available now)."""
+        self._refill()
+        missing = 1 - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate_per_sec
+
+
+class ApiBudgetManager:
+    """
+    Quota-aware gate for paid APIs (JSearch via RapidAPI, Adzuna).
+
+    - Token bucket per provider keeps us under the per-second limit (avoids 429s).
+    - Monthly budget per provider is persisted across restarts.
+    - Interactive searches may wait briefly for a token and can use the full budget;
+      prewarm requests never wait and stop once the budget falls into the reserve.
+    """
+    def __init__(self, state_file: str = None, reserve_fraction: float = None, max_wait: float = None):
+        self.state_file = state_file or state_path("api_budget.json")
+        self.reserve_fraction = reserve_fraction if reserve_fraction is not None else float(os.getenv("API_BUDGET_PREWARM_RESERVE", "0.2"))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("API_BUDGET_MAX_WAIT", "2.0"))
+        self.providers: Dict[str, ProviderBudget] = {
+            "jsearch": ProviderBudget(
+                "jsearch",
+                monthly_quota=int(os.getenv("JSEARCH_MONTHLY_QUOTA", "200")),
+                rate_per_sec=float(os.getenv("JSEARCH_RATE_PER_SEC", "1")),
+                burst=3,  # one per parallel page
+            ),
+            "adzuna": ProviderBudget(
+                "adzuna",
+                monthly_quota=int(os.getenv("ADZUNA_MONTHLY_QUOTA", "2500")),
+                rate_per_sec=float(os.getenv("ADZUNA_RATE_PER_SEC", "0.4")),  # 25 hits/minute
+                burst=3,
+            ),
+        }
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def _load(self):
+        state = load_json_state(self.state_file, default={})
+        for name, saved in state.items():
+            provider = self.providers.get(name)
+            if provider and saved.get("month") == provider.month:
+                provider.used = saved.get("used", 0)
+                provider.denied = saved.get("denied", 0)
+
+    def _save(self):
+        save_json_state(self.state_file, {
+            name: {"month": p.month, "used": p.used, "denied": p.denied}
+            for name, p in self.providers.items()
+        })
+
+    def has_budget(self, provider: str, cost: int = 1, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """Check the monthly budget without consuming anything."""
+        p = self.providers.get(provider)
+        if p is None:
+            return True
+        floor = 0
+        if priority == PRIORITY_PREWARM:
+            floor = int(p.monthly_quota * self.reserve_fraction)
+        return p.remaining - cost >= floor
+
+    async def acquire(self, provider: str, cost: int = 1, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """
+        Reserve one HTTP call billed as `cost` requests (e.g. JSearch num_pages) for `provider`.
+        Returns False if the provider should be skipped (budget near exhaustion or the
+        rate limit would require too long a wait).
+        """
+        p = self.providers.get(provider)
+        if p is None:
+            return True
+
+        async with self._lock:
+            if not self.has_budget(provider, cost, priority):
+                p.denied += 1
+                logger.warning(f"API budget: skipping {provider} ({priority}), {p.remaining}/{p.monthly_quota} left this month")
+                self._save()
+                return False
+
+            wait = p.wait_time()
+            max_wait = self.max_wait if priority == PRIORITY_INTERACTIVE else 0.0
+            if wait > max_wait:
+                p.denied += 1
+                logger.info(f"API budget: {provider} rate limited ({wait:.1f}s wait > {max_wait:.1f}s), skipping")
+                return False
+            if wait > 0:
+                # Holding the lock while waiting keeps callers in FIFO order
+                await asyncio.sleep(wait)
+                p._refill()
+
+            p.tokens -= 1
+            p.used += cost
+            self._save()
+            return True
+
+    def try_acquire_nowait(self, provider: str, cost: int = 1) -> bool:
+        """
+        Opportunistic spend (e.g. hedged duplicate requests): never waits and never
+        dips into the interactive reserve.
+        """
+        p = self.providers.get(provider)
+        if p is None:
+            return True
+        if not self.has_budget(provider, cost, PRIORITY_PREWARM) or p.wait_time() > 0:
+            return False
+        p.tokens -= 1
+        p.used += cost
+        self._save()
+        return True
+
+    def sync_remaining(self, provider: str, remaining: Optional[int]):
+        """Align local usage with the provider's own remaining-quota header, if sent."""
+        p = self.providers.get(provider)
+        if p is None or remaining is None:
+            return
+        p.used = max(p.used, p.monthly_quota - remaining)
+        self._save()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Remaining budget per provider, for the metrics endpoint."""
+        return {
+            name: {
+                "month": p.month,
+                "monthly_quota": p.monthly_quota,
+                "used": p.used,
+                "remaining": p.remaining,
+                "denied": p.denied,
+                "rate_per_sec": p.rate_per_sec,
+                "tokens": round(min(p.capacity, p.tokens), 2),
+            }
+            for name, p in self.providers.items()
+        }
+
+
+# Global instance
+_budget_manager: Optional[ApiBudgetManager] = None
+
+def get_budget_manager() -> ApiBudgetManager:
+    """Get or create the global API budget manager."""
+    global _budget_manager
+    if _budget_manager is None:
+        _budget_manager = ApiBudgetManager()
+    return _budget_manager
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+from utils.hedging import LatencyTracker
+from utils.state_store import state_path, load_json_state, save_json_state
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one scraping source.
+
+    - closed: requests flow; consecutive failures (errors, timeouts, bot blocks)
+      or a long run of empty results trip it open.
+    - open: requests are skipped until the cooldown expires.
+    - half_open: a single probe request is allowed; success closes the breaker,
+      failure re-opens it with a doubled cooldown (capped).
+    """
+    def __init__(self, name: str, failure_threshold: int = 3, empty_threshold: int = 5,
+                 base_cooldown: float = 300.0, max_cooldown: float = 3600.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.empty_threshold = empty_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = CLOSED
+        self.failures = 0
+        self.empty_runs = 0
+        self.cooldown = base_cooldown
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.latency = LatencyTracker(window=50, min_samples=5)
+
+    def allow(self) -> bool:
+        """Whether a request to this source should be attempted now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.time() - self.opened_at < self.cooldown:
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+            logger.info(f"Circuit {self.name}: half-open, allowing a probe")
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self, elapsed: float, count: int):
+        self.latency.record(elapsed)
+        if count > 0:
+            self.empty_runs = 0
+        else:
+            self.empty_runs += 1
+            if self.empty_runs >= self.empty_threshold:
+                self._trip(f"{self.empty_runs} empty runs in a row")
+                return
+        if self.state == HALF_OPEN:
+            logger.info(f"Circuit {self.name}: probe succeeded, closing")
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.probe_in_flight = False
+
+    def record_cancelled(self):
+        """The request was cancelled before reporting back: free the probe slot for the next one."""
+        self.probe_in_flight = False
+
+    def record_failure(self, reason: str, elapsed: Optional[float] = None):
+        if elapsed is not None:
+            # Timeouts still tell us the source is at least this slow
+            self.latency.record(elapsed)
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._trip(f"probe failed ({reason})")
+        elif self.failures >= self.failure_threshold:
+            self._trip(f"{self.failures} consecutive failures, last: {reason}")
+
+    def _trip(self, reason: str):
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.probe_in_flight = False
+        logger.warning(f"Circuit {self.name}: OPEN for {self.cooldown:.0f}s ({reason})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "empty_runs": self.empty_runs,
+            "cooldown": self.cooldown,
+            "opened_at": self.opened_at,
+            "latency_samples": list(self.latency.samples),
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        self.state = data.get("state", CLOSED)
+        if self.state == HALF_OPEN:
+            # A probe in flight when we shut down never reported back
+            self.state = OPEN
+        self.failures = data.get("failures", 0)
+        self.empty_runs = data.get("empty_runs", 0)
+        self.cooldown = data.get("cooldown", self.base_cooldown)
+        self.opened_at = data.get("opened_at", 0.0)
+        for sample in data.get("latency_samples", []):
+            self.latency.record(sample)
+
+
+class CircuitBreakerRegistry:
+    """
+    Per-source circuit breakers plus adaptive timeouts, persisted across restarts.
+
+    Timeouts adapt from each source's recent latency: p95 * multiplier, clamped
+    to [min_timeout, max_timeout]. Until enough samples exist, the caller's static
+    default is used.
+    """
+    def __init__(self, state_file: str = None, min_timeout: float = None, max_timeout: float = None,
+                 timeout_multiplier: float = 1.5):
+        self.state_file = state_file or state_path("circuit_breakers.json")
+        self.min_timeout = min_timeout or float(os.getenv("SCRAPER_MIN_TIMEOUT", "5"))
+        self.max_timeout = max_timeout or float(os.getenv("SCRAPER_MAX_TIMEOUT", "60"))
+        self.timeout_multiplier = timeout_multiplier
+        self.failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+        self.base_cooldown = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "300"))
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.dirty = False  # changed since the state file was last written
+        self._load()
+
+    def get(self, name: str) -> CircuitBreaker:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=self.failure_threshold,
+                base_cooldown=self.base_cooldown,
+            )
+        return self.breakers[name]
+
+    def allow(self, name: str) -> bool:
+        return self.get(name).allow()
+
+    def timeout_for(self, name: str, default: float) -> float:
+        p95 = self.get(name).latency.p95
+        if p95 is None:
+            return default
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_multiplier))
+
+    def record_success(self, name: str, elapsed: float, count: int):
+        self.get(name).record_success(elapsed, count)
+
+    def record_failure(self, name: str, reason: str, elapsed: Optional[float] = None):
+        self.get(name).record_failure(reason, elapsed)
+
+    def record_cancelled(self, name: str):
+        self.get(name).record_cancelled()
+
+    def _load(self):
+        state = load_json_state(self.state_file, default={})
+        for name, data in state.items():
+            self.get(name).load_dict(data)
+
+    def _state(self) -> Dict[str, Any]:
+        return {name: b.to_dict() for name, b in self.breakers.items()}
+
+    def save(self):
+        save_json_state(self.state_file, self._state())
+        self.dirty = False
+
+    async def flush(self):
+        """Write the state file off the event loop, if it changed since the last write."""
+        if self.dirty:
+            self.dirty = False
+            # Copied on the loop, so searches can keep updating it while the thread writes
+            await asyncio.to_thread(save_json_state, self.state_file, self._state())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state and adaptive timeout per source, for the metrics endpoint."""
+        return {
+            name: {
+                "state": b.state,
+                "failures": b.failures,
+                "empty_runs": b.empty_runs,
+                "cooldown": b.cooldown,
+                "p50": b.latency.percentile(0.5),
+                "p95": b.latency.p95,
+            }
+            for name, b in self.breakers.items()
+        }
+
+
+# Global instance
+_circuit_breakers: Optional[CircuitBreakerRegistry] = None
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get or create the global circuit breaker registry."""
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakerRegistry()
+    return _circuit_breakers
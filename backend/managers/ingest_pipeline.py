@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+import time
+import weakref
+from datetime import datetime
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional
+from dateutil import parser as date_parser
+from sqlalchemy import Text, case, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in order. Each one reads a bounded queue fed by the previous one,
+# so a slow stage (usually embedding) stalls the stages before it instead of letting
+# scraped jobs pile up in memory.
+STAGES = ("scrape", "normalize", "dedup", "db_write", "embed", "vector_upsert")
+
+# Columns written by the bulk upsert (created_at keeps its column default)
+JOB_COLUMNS = tuple(c.name for c in Job.__table__.columns if c.name != "created_at")
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+class StageStats:
+    """Process-wide counters for one stage, summed over every pipeline run."""
+    def __init__(self):
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy = 0.0        # seconds spent handling batches (including waiting on the next queue)
+        self.max_queue_depth = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy, 3),
+            "items_per_sec": round(self.items / self.busy, 1) if self.busy else None,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+_stage_stats: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+_running: "weakref.WeakSet[IngestPipeline]" = weakref.WeakSet()
+
+
+def ingest_snapshot() -> Dict[str, Any]:
+    """Per-stage throughput plus the current input queue depth of running pipelines, for the metrics endpoint."""
+    snapshot = {}
+    for name, stats in _stage_stats.items():
+        snapshot[name] = stats.snapshot()
+        snapshot[name]["queue_depth"] = sum(p.queues[name].qsize() for p in _running if name in p.queues)
+    return {"running": len(_running), "stages": snapshot}
+
+
+def _coerce_datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return date_parser.parse(str(value))
+    except (ValueError, OverflowError):
+        # Relative dates ("3 days ago") and other free text
+        return None
+
+
+def _clean(text) -> str:
+    return " ".join(str(text or "").split())
+
+
+def normalize_job(job: Dict[str, Any], query_hash: str, country: str) -> Optional[Dict[str, Any]]:
+    """
+    Row for the jobs table: every column present, whitespace folded, posted_at a
+    datetime (or None) and tagged with the search that fetched it. Returns None for
+    jobs without an id.
+    """
+    if job.get("id") is None:
+        return None
+    row = {column: job.get(column) for column in JOB_COLUMNS}
+    row["title"] = _clean(row["title"]) or "Unknown Role"
+    row["company"] = _clean(row["company"]) or "Unknown Company"
+    row["location"] = _clean(row["location"]) or country
+    row["apply_link"] = (row["apply_link"] or "").strip()
+    row["skills"] = row["skills"] if isinstance(row["skills"], list) else []
+    row["posted_at"] = _coerce_datetime(row["posted_at"])
+    row["query_hash"] = query_hash
+    row["country"] = country
+    return row
+
+
+async def bulk_upsert_jobs(session, rows: List[Dict[str, Any]]):
+    """
+    Insert or update `rows` (from `normalize_job`) with one INSERT ... ON CONFLICT
+    statement on SQLite/PostgreSQL; other databases fall back to a merge per row.
+    """
+    insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if insert is None:
+        for row in rows:
+            existing = await session.get(Job, row["id"])
+            if existing is not None:
+                row = {**row, **_kept_details(existing.description, existing.skills, row)}
+            await session.merge(Job(**row))
+        return
+    stmt = insert(Job)
+    excluded = stmt.excluded
+    set_ = {column: excluded[column] for column in JOB_COLUMNS if column != "id"}
+    # Re-scrapes carry card text again: keep a longer (enriched) description and non-empty skills
+    set_["description"] = case(
+        (func.length(func.coalesce(excluded.description, "")) >= func.length(func.coalesce(Job.description, "")),
+         excluded.description),
+        else_=Job.description,
+    )
+    skills = func.coalesce(cast(excluded.skills, Text), "[]")
+    set_["skills"] = case((or_(skills == "[]", skills == "null"), Job.skills), else_=excluded.skills)
+    stmt = stmt.on_conflict_do_update(index_elements=[Job.id], set_=set_)
+    await session.execute(stmt, rows)
+
+
+def _kept_details(description: Optional[str], skills, row: Dict[str, Any]) -> Dict[str, Any]:
+    """`bulk_upsert_jobs` rules for the merge fallback: longer description wins, empty skills don't overwrite."""
+    kept = {}
+    if len(description or "") > len(row.get("description") or ""):
+        kept["description"] = description
+    if skills and not row.get("skills"):
+        kept["skills"] = skills
+    return kept
+
+
+class IngestPipeline:
+    """
+    Staged ingestion of scraped batches:
+    scrape → normalize → dedup → bulk DB write → batched embedding → vector upsert.
+
+    Stages are worker pools connected by bounded asyncio queues; DB writes and
+    embeddings take up to a batch of items at a time. Embedding and vector upserts
+    are CPU/IO bound and run in worker threads, off the event loop.
+    """
+    def __init__(self, session_factory: Callable, vector_manager=None, queue_size: int = None,
+                 db_batch_size: int = None, embed_batch_size: int = None, normalize_workers: int = None,
+                 db_workers: int = None, embed_workers: int = None, linger: float = 0.05):
+        self.session_factory = session_factory
+        self.vector_manager = vector_manager
+        self.queue_size = queue_size or int(os.getenv("INGEST_QUEUE_SIZE", "500"))
+        self.db_batch_size = db_batch_size or int(os.getenv("INGEST_DB_BATCH_SIZE", "200"))
+        self.embed_batch_size = embed_batch_size or int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+        self.normalize_workers = normalize_workers or int(os.getenv("INGEST_NORMALIZE_WORKERS", "2"))
+        # SQLite has a single writer: more DB workers only help on PostgreSQL
+        self.db_workers = db_workers or int(os.getenv("INGEST_DB_WORKERS", "1"))
+        self.embed_workers = embed_workers or int(os.getenv("INGEST_EMBED_WORKERS", "1"))
+        # How long a batching stage waits for a batch to fill once it has its first item
+        self.linger = linger
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.written = 0
+
+    async def run(self, batches: AsyncIterable, query_hash: str, country: str) -> int:
+        """
+        Ingest every SourceBatch from `batches` and return the number of jobs written
+        to the DB. Returns once everything has been written and indexed.
+        """
+        self.written = 0
+        self._seen_links = set()
+        self._seen_jobs = set()  # (title, company) tuples
+        self.queues = {
+            "normalize": asyncio.Queue(self.queue_size),
+            "dedup": asyncio.Queue(self.queue_size),
+            "db_write": asyncio.Queue(self.queue_size),
+        }
+        stages = [
+            ("normalize", self.normalize_workers, 1, lambda jobs: self._normalize(jobs, query_hash, country)),
+            ("dedup", 1, self.db_batch_size, self._dedup),
+            ("db_write", self.db_workers, self.db_batch_size, self._write),
+        ]
+        if self.vector_manager:
+            self.queues["embed"] = asyncio.Queue(self.queue_size)
+            self.queues["vector_upsert"] = asyncio.Queue(max(2, self.queue_size // self.embed_batch_size))
+            stages += [
+                ("embed", self.embed_workers, self.embed_batch_size, self._embed),
+                ("vector_upsert", 1, 1, self._index),
+            ]
+
+        _running.add(self)
+        workers = {
+            name: [asyncio.create_task(self._worker(name, size, handle)) for _ in range(count)]
+            for name, count, size, handle in stages
+        }
+        try:
+            await self._scrape(batches)
+            # Drain stage by stage: once a stage's queue is empty nothing more can reach the next one
+            for name, _, _, _ in stages:
+                await self.queues[name].join()
+                for task in workers[name]:
+                    task.cancel()
+        finally:
+            tasks = [task for group in workers.values() for task in group]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            _running.discard(self)
+        return self.written
+
+    async def _scrape(self, batches: AsyncIterable):
+        stats = _stage_stats["scrape"]
+        async for batch in batches:
+            start = time.monotonic()
+            for job in batch.jobs:
+                await self._put("normalize", job)
+            stats.items += len(batch.jobs)
+            stats.batches += 1
+            stats.busy += time.monotonic() - start
+
+    async def _put(self, stage: str, item):
+        queue = self.queues[stage]
+        await queue.put(item)
+        stats = _stage_stats[stage]
+        stats.max_queue_depth = max(stats.max_queue_depth, queue.qsize())
+
+    async def _take(self, queue: asyncio.Queue, size: int) -> list:
+        """Wait for one item, then take up to `size` within the linger window."""
+        items = [await queue.get()]
+        deadline = time.monotonic() + self.linger
+        while len(items) < size:
+            try:
+                items.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _worker(self, name: str, size: int, handle: Callable[[list], Awaitable[None]]):
+        queue = self.queues[name]
+        stats = _stage_stats[name]
+        while True:
+            items = await self._take(queue, size)
+            start = time.monotonic()
+            try:
+                await handle(items)
+                stats.items += len(items)
+                stats.batches += 1
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"Ingest stage {name} failed on {len(items)} items: {str(e)}")
+            finally:
+                stats.busy += time.monotonic() - start
+                for _ in items:
+                    queue.task_done()
+
+    async def _normalize(self, jobs: list, query_hash: str, country: str):
+        for job in jobs:
+            row = normalize_job(job, query_hash, country)
+            if row is not None:
+                await self._put("dedup", row)
+
+    async def _dedup(self, rows: list):
+        """Drop jobs already ingested in this run: same apply link, or same title + company."""
+        unique = 0
+        for row in rows:
+            link = row["apply_link"]
+            signature = (row["title"].lower(), row["company"].lower())
+            if (link and link in self._seen_links) or signature in self._seen_jobs:
+                continue
+            if link:
+                self._seen_links.add(link)
+            self._seen_jobs.add(signature)
+            unique += 1
+            await self._put("db_write", row)
+        if unique != len(rows):
+            logger.info(f"Deduplication: {len(rows)} → {unique} unique jobs ({len(rows) - unique} duplicates removed)")
+
+    async def _write(self, rows: list):
+        try:
+            rows = await self._upsert(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                raise
+            # One bad row fails the whole statement: retry one by one so the rest still land
+            logger.warning(f"Ingest: bulk write of {len(rows)} jobs failed ({e}), retrying row by row")
+            rows = await self._upsert_rows(rows)
+        self.written += len(rows)
+        logger.info(f"Ingest: wrote {len(rows)} jobs")
+        if self.vector_manager:
+            for row in rows:
+                await self._put("embed", row)
+
+    async def _upsert(self, rows: list) -> list:
+        async with self.session_factory() as session:
+            await bulk_upsert_jobs(session, rows)
+            await session.commit()
+            if self.vector_manager:
+                rows = await self._stored_details(session, rows)
+        return rows
+
+    async def _upsert_rows(self, rows: list) -> list:
+        """Write `rows` one statement each; returns the rows that were written (bad ones are logged and counted)."""
+        written = []
+        for row in rows:
+            try:
+                written += await self._upsert([row])
+            except Exception as e:
+                _stage_stats["db_write"].errors += 1
+                logger.error(f"Ingest: dropped job {row.get('id')} ({row.get('source')}): {e}")
+        return written
+
+    async def _stored_details(self, session, rows: list) -> list:
+        """Rows with the description/skills the upsert kept, so enriched jobs aren't re-embedded from card text."""
+        result = await session.execute(
+            select(Job.id, Job.description, Job.skills).where(Job.id.in_([row["id"] for row in rows])))
+        stored = {job_id: (description, skills) for job_id, description, skills in result}
+        return [{**row, "description": stored[row["id"]][0], "skills": stored[row["id"]][1]}
+                if row["id"] in stored else row for row in rows]
+
+    async def _embed(self, rows: list):
+        embedded = await asyncio.to_thread(self.vector_manager.embed_jobs, rows)
+        await self._put("vector_upsert", embedded)
+
+    async def _index(self, items: list):
+        for embedded in items:
+            await asyncio.to_thread(self.vector_manager.index_embedded, embedded)
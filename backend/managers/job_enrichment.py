@@ -0,0 +1,296 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from fake_useragent import UserAgent
+from sqlalchemy import select, update
+from database import AsyncSessionLocal
+from models import Job
+from managers.budget_manager import PRIORITY_PREWARM
+from managers.ingest_pipeline import JOB_COLUMNS
+from managers.scrape_scheduler import get_scrape_scheduler
+from scrapers.base_scraper import BaseScraper
+from scrapers.html_extract import HTML_PARSER
+from scrapers.politeness import domain_of, get_politeness_policy
+from utils.http_client import get_http_pool
+
+logger = logging.getLogger(__name__)
+
+# Descriptions scrapers store when the card has no text, e.g. "View details on Indeed: <link>"
+PLACEHOLDER_RE = re.compile(r"^view (full description|details) on \w+", re.IGNORECASE)
+DESCRIPTION_LIMIT = 5000
+
+# Description containers on detail pages, by domain (after the JSON-LD JobPosting); generic ones last
+DESCRIPTION_SELECTORS = {
+    "linkedin.com": [".show-more-less-html__markup", ".description__text"],
+    "indeed.com": ["#jobDescriptionText"],
+    "glassdoor.com": ["[class*='JobDetails_jobDescription']", "#JobDescriptionContainer"],
+    "ziprecruiter.com": [".job_description", "[class*='job_description']"],
+    "naukrigulf.com": [".job-description", "[class*='jd-']"],
+    "bayt.com": ["[itemprop='description']", ".card-content.is-spaced"],
+}
+GENERIC_DESCRIPTION_SELECTORS = ["[itemprop='description']", "#job-description", ".job-description",
+                                 ".jobDescription", "[class*='description']"]
+
+
+def needs_enrichment(description: Optional[str], min_length: int) -> bool:
+    """True for empty, placeholder or too-short-to-embed descriptions."""
+    text = description.strip() if isinstance(description, str) else ""
+    return not text or bool(PLACEHOLDER_RE.match(text)) or len(text) < min_length
+
+
+def _html_text(html: str) -> str:
+    return BeautifulSoup(html, HTML_PARSER).get_text("\n", strip=True)
+
+
+def _split_skills(value) -> List[str]:
+    items = value if isinstance(value, list) else re.split(r"[,;\n|]", str(value or ""))
+    return [item.strip() for item in (str(i) for i in items) if 1 < len(item.strip()) <= 40]
+
+
+def _job_postings(data) -> Iterable[Dict[str, Any]]:
+    """JobPosting objects anywhere in a JSON-LD document (lists and @graph included)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _job_postings(item)
+    elif isinstance(data, dict):
+        types = data.get("@type")
+        if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+            yield data
+        yield from _job_postings(data.get("@graph"))
+
+
+def extract_job_details(html: str, url: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Description text and skills from a job detail page: the schema.org JobPosting
+    (JSON-LD) most job sites embed for search engines, else the site's description
+    container. Returns (None, []) when neither is found.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for script in soup.select("script[type='application/ld+json']"):
+        try:
+            data = json.loads(script.string or script.get_text(), strict=False)
+        except ValueError:
+            continue
+        for posting in _job_postings(data):
+            description = _html_text(str(posting.get("description") or ""))
+            if description:
+                return description[:DESCRIPTION_LIMIT], _split_skills(posting.get("skills"))
+
+    domain = domain_of(url)
+    selectors = [selector for suffix, items in DESCRIPTION_SELECTORS.items()
+                 if domain == suffix or domain.endswith("." + suffix) for selector in items]
+    for selector in selectors + GENERIC_DESCRIPTION_SELECTORS:
+        el = soup.select_one(selector)
+        text = el.get_text("\n", strip=True) if el is not None else ""
+        if len(text) >= 100:
+            return text[:DESCRIPTION_LIMIT], []
+    return None, []
+
+
+def _merge_skills(current, found: List[str]) -> List[str]:
+    skills = list(current) if isinstance(current, list) else []
+    seen = {skill.lower() for skill in skills}
+    for skill in found:
+        if skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills
+
+
+class JobEnricher:
+    """
+    Lazy detail-page enrichment for jobs stored with a placeholder description
+    ("View details on Indeed: ...") or one too short to embed, score or rerank.
+
+    Jobs are queued when they reach the top of a ranked result list or get clicked.
+    Fetches are low priority: each waits for a prewarm slot in the scrape scheduler
+    (the source's per-domain rate limit, behind interactive scrapes) and for the
+    domain's politeness delay, over plain HTTP. The queue is bounded; jobs that
+    don't fit, or that wait too long for a slot, are dropped and come back the next
+    time they rank. New descriptions
+    and skills are written in bulk, and only the rows that changed are re-embedded.
+    """
+    def __init__(self, session_factory=None, vector_manager=None, workers: int = None, queue_size: int = None,
+                 batch_size: int = None, linger: float = None, retry_after: float = None,
+                 min_description: int = None, top_n: int = None, scheduler=None):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.vector_manager = vector_manager
+        self.enabled = os.getenv("ENRICH_ENABLED", "true").lower() == "true"
+        self.workers = workers or int(os.getenv("ENRICH_WORKERS", "2"))
+        self.queue_size = queue_size or int(os.getenv("ENRICH_QUEUE_SIZE", "200"))
+        self.batch_size = batch_size or int(os.getenv("ENRICH_BATCH_SIZE", "20"))
+        # How long the writer waits for a batch to fill once it has its first update
+        self.linger = linger if linger is not None else float(os.getenv("ENRICH_LINGER_SECONDS", "2"))
+        # A job is fetched at most once per window, whether it worked or not
+        self.retry_after = retry_after if retry_after is not None else \
+            float(os.getenv("ENRICH_RETRY_HOURS", "24")) * 3600
+        self.min_description = min_description or int(os.getenv("ENRICH_MIN_DESCRIPTION_CHARS", "200"))
+        # How many of a ranked result list's top jobs are considered
+        self.top_n = top_n or int(os.getenv("ENRICH_TOP_N", "10"))
+        self.scheduler = scheduler or get_scrape_scheduler()
+        self.headers = {
+            "User-Agent": UserAgent().chrome,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        self._attempted: Dict[int, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._updates: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.stats: Counter = Counter()
+
+    def submit(self, jobs: Iterable) -> int:
+        """
+        Queue the jobs (Job rows) that need a detail fetch; returns how many were queued.
+        Never blocks: the fetches and writes happen in background workers.
+        """
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+        queued = 0
+        for job in jobs:
+            link = job.apply_link
+            if not isinstance(link, str) or not link.startswith("http") \
+                    or not needs_enrichment(job.description, self.min_description):
+                continue
+            last = self._attempted.get(job.id)
+            if last is not None and now - last < self.retry_after:
+                continue
+            self._start()
+            try:
+                self._queue.put_nowait((job.id, job.source or domain_of(link), link, job.description or ""))
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+                break
+            self._attempted[job.id] = now
+            queued += 1
+        self.stats["queued"] += queued
+        if len(self._attempted) > 20 * self.queue_size:
+            self._attempted = {job_id: at for job_id, at in self._attempted.items() if now - at < self.retry_after}
+        return queued
+
+    def _start(self):
+        if self._tasks and not any(task.done() for task in self._tasks):
+            return
+        self._queue = self._queue or asyncio.Queue(self.queue_size)
+        self._updates = self._updates or asyncio.Queue(self.queue_size)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = [asyncio.create_task(self._fetch_loop()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._write_loop()))
+
+    async def _fetch_loop(self):
+        while True:
+            job_id, source, url, description = await self._queue.get()
+            try:
+                found, skills = await self.scheduler.submit(source, lambda: self._fetch(url),
+                                                            priority=PRIORITY_PREWARM)
+                if found and len(found) > len(description.strip()):
+                    await self._updates.put((job_id, found, skills))
+                    self.stats["fetched"] += 1
+                else:
+                    self.stats["not_found"] += 1
+            except asyncio.TimeoutError:
+                # No prewarm slot within the scheduler's max wait: not fetched, so it may queue again
+                self.stats["expired"] += 1
+                self._attempted.pop(job_id, None)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"Enrichment of job {job_id} ({url}) failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _fetch(self, url: str) -> Tuple[Optional[str], List[str]]:
+        await get_politeness_policy().wait(url)
+        # No retries: detail pages are best effort and the site's rate limit is shared with scrapes
+        response = await get_http_pool().request("GET", url, max_retries=0, headers=self.headers)
+        html = response.text
+        head = html[:5000].lower()
+        if response.status_code != 200 or any(marker in head for marker in BaseScraper.BOT_CHALLENGE_MARKERS):
+            self.stats["blocked"] += 1
+            return None, []
+        return await asyncio.to_thread(extract_job_details, html, url)
+
+    async def _write_loop(self):
+        while True:
+            updates = [await self._updates.get()]
+            deadline = time.monotonic() + self.linger
+            while len(updates) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    updates.append(await asyncio.wait_for(self._updates.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(updates)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Enrichment write of {len(updates)} jobs failed: {e}")
+            finally:
+                for _ in updates:
+                    self._updates.task_done()
+
+    async def _write(self, updates: List[Tuple[int, str, List[str]]]):
+        """One bulk UPDATE for the rows whose description or skills changed, then re-embed just those."""
+        found = {job_id: (description, skills) for job_id, description, skills in updates}
+        async with self.session_factory() as session:
+            jobs = (await session.execute(select(Job).where(Job.id.in_(list(found))))).scalars().all()
+            changed = []
+            for job in jobs:
+                description, skills = found[job.id]
+                skills = _merge_skills(job.skills, skills)
+                if description != job.description or skills != (job.skills or []):
+                    row = {column: getattr(job, column) for column in JOB_COLUMNS}
+                    changed.append({**row, "description": description, "skills": skills})
+            if not changed:
+                return
+            await session.execute(update(Job), [{"id": row["id"], "description": row["description"],
+                                                 "skills": row["skills"]} for row in changed])
+            await session.commit()
+        self.stats["enriched"] += len(changed)
+        logger.info(f"Enrichment: updated descriptions of {len(changed)} jobs")
+
+        if self.vector_manager:
+            embedded = await asyncio.to_thread(self.vector_manager.embed_jobs, changed)
+            await asyncio.to_thread(self.vector_manager.index_embedded, embedded)
+            self.stats["reembedded"] += len(changed)
+
+    async def drain(self):
+        """Wait until every queued job has been fetched and written (tests, benchmarks)."""
+        if self._queue is not None:
+            await self._queue.join()
+            await self._updates.join()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = self._updates = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "pending_writes": self._updates.qsize() if self._updates is not None else 0,
+            **dict(self.stats),
+        }
+
+
+# Global instance
+_job_enricher: Optional[JobEnricher] = None
+
+def get_job_enricher() -> JobEnricher:
+    """Get or create the global job enricher."""
+    global _job_enricher
+    if _job_enricher is None:
+        _job_enricher = JobEnricher()
+    return _job_enricher
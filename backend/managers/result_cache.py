@@ -0,0 +1,112 @@
+import logging
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a source's results stay fresh. Paid APIs are cached longer to save quota;
+# high-churn boards shorter.
+DEFAULT_TTL = 7200
+SOURCE_TTLS: Dict[str, int] = {
+    "JSearch": 6 * 3600,
+    "Adzuna": 6 * 3600,
+    "LinkedIn": 3600,
+    "Naukri": 3600,
+    "Indeed": 3600,
+}
+
+CacheKey = Tuple[str, str, str, int, str]
+
+
+def _parse_ttls(spec: str) -> Dict[str, int]:
+    """Parse "Naukri=1800,JSearch=43200" into per-source TTLs."""
+    ttls = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        source, seconds = item.split("=", 1)
+        try:
+            ttls[source.strip()] = int(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid SOURCE_CACHE_TTLS entry: {item!r}")
+    return ttls
+
+
+def _fold(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class SourceResultCache:
+    """
+    Normalized results per (source, query, location, page, country), shared by every
+    search whose scraper inputs match, whatever its skills/experience/portal filters.
+
+    In-memory LRU with a TTL per source. Only non-empty results are stored, so a
+    soft block or a flaky empty page is retried on the next search.
+    """
+    def __init__(self, max_entries: int = None, default_ttl: int = None, ttls: Dict[str, int] = None):
+        self.max_entries = max_entries or int(os.getenv("SOURCE_CACHE_MAX_ENTRIES", "500"))
+        self.default_ttl = default_ttl or int(os.getenv("SOURCE_CACHE_TTL_SECONDS", str(DEFAULT_TTL)))
+        self.ttls = dict(SOURCE_TTLS)
+        self.ttls.update(ttls if ttls is not None else _parse_ttls(os.getenv("SOURCE_CACHE_TTLS", "")))
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def key(self, source: str, query: str, location: str, page: int, country: str) -> CacheKey:
+        return (source, _fold(query), _fold(location), int(page or 1), _fold(country))
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, source: str, query: str, location: str, page: int, country: str) -> Optional[List[Dict[str, Any]]]:
+        """Fresh cached jobs for these scraper inputs, or None on a miss."""
+        key = self.key(source, query, location, page, country)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl_for(source):
+            if entry is not None:
+                del self._entries[key]
+            self.misses[source] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits[source] += 1
+        # Callers tag and persist the dicts they get back: hand out copies
+        return [dict(job) for job in entry[1]]
+
+    def put(self, source: str, query: str, location: str, page: int, country: str, jobs: List[Dict[str, Any]]):
+        if not jobs:
+            return
+        key = self.key(source, query, location, page, country)
+        self._entries[key] = (time.time(), [dict(job) for job in jobs])
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counts per source, for the metrics endpoint."""
+        sources = set(self.hits) | set(self.misses)
+        return {
+            "entries": len(self._entries),
+            "sources": {
+                s: {
+                    "hits": self.hits[s],
+                    "misses": self.misses[s],
+                    "hit_rate": round(self.hits[s] / (self.hits[s] + self.misses[s]), 3),
+                    "ttl": self.ttl_for(s),
+                }
+                for s in sorted(sources)
+            },
+        }
+
+
+# Global instance
+_result_cache: Optional[SourceResultCache] = None
+
+def get_result_cache() -> SourceResultCache:
+    """Get or create the global source result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = SourceResultCache()
+    return _result_cache
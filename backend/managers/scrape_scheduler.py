@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+from managers.budget_manager import PRIORITY_INTERACTIVE, PRIORITY_PREWARM
+from utils.hedging import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Dispatch order: interactive searches always go before prewarm work
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_PREWARM)
+
+
+def _parse_limits(spec: str) -> Dict[str, Tuple[int, float]]:
+    """Parse "Naukri=1:0.2,Indeed=1:0.1" into domain -> (max_in_flight, rate_per_sec)."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        domain, value = item.split("=", 1)
+        try:
+            max_in_flight, _, rate = value.partition(":")
+            limits[domain.strip()] = (int(max_in_flight), float(rate) if rate else None)
+        except ValueError:
+            logger.warning(f"Ignoring invalid SCRAPE_DOMAIN_LIMITS entry: {item!r}")
+    return limits
+
+
+class DomainSlots:
+    """
+    Per-domain admission state: a token bucket for scrape starts, a cap on scrapes
+    in flight, one FIFO queue per priority class, and wait/utilization stats.
+    """
+    def __init__(self, name: str, max_in_flight: int, rate_per_sec: float, burst: int = None):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.rate_per_sec = rate_per_sec
+        self.capacity = float(burst or max_in_flight)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.in_flight = 0
+        self.queues: Dict[str, Deque[asyncio.Future]] = {p: deque() for p in PRIORITIES}
+        self.queue_wait = LatencyTracker(window=200, min_samples=1)
+        self.completed = 0
+        self.expired = 0
+        self.busy_seconds = 0.0
+        self.first_used: Optional[float] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_sec)
+        self.last_refill = now
+
+    def ready_in(self) -> Optional[float]:
+        """Seconds until this domain may start another scrape (None while all slots are busy)."""
+        if self.in_flight >= self.max_in_flight:
+            return None
+        self._refill()
+        missing = 1 - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate_per_sec
+
+    def take(self):
+        self.tokens -= 1
+        self.in_flight += 1
+        if self.first_used is None:
+            self.first_used = time.monotonic()
+
+    def release(self, busy: float):
+        self.in_flight -= 1
+        self.completed += 1
+        self.busy_seconds += busy
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+    def utilization(self) -> Optional[float]:
+        """Share of this domain's slot-time spent scraping since its first scrape."""
+        if self.first_used is None:
+            return None
+        elapsed = time.monotonic() - self.first_used
+        if elapsed <= 0:
+            return None
+        return round(min(1.0, self.busy_seconds / (elapsed * self.max_in_flight)), 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": {p: len(q) for p, q in self.queues.items()},
+            "completed": self.completed,
+            "expired": self.expired,
+            "queue_wait": self.queue_wait.snapshot(),
+            "utilization": self.utilization(),
+        }
+
+
+class ScrapeScheduler:
+    """
+    Global concurrency governor for browser scrapes.
+
+    - Each domain has a token bucket (scrape starts per second) and a max-in-flight
+      cap, so one search can't fire a dozen pages at the same site at once.
+    - A global cap bounds concurrent scrapes; slots are handed out round-robin
+      across domains, so a slow site can't hold every slot while others queue.
+    - Interactive work is dispatched before prewarm work, and prewarm may only
+      use `prewarm_share` of the global slots. Prewarm work that waits longer than
+      `prewarm_max_wait` for a slot gives up, so a busy period can't pile up stale
+      background scrapes that all start at once when it ends.
+    """
+    def __init__(self, max_concurrency: int = None, max_in_flight: int = None, rate_per_sec: float = None,
+                 prewarm_share: float = None, limits: Dict[str, Tuple[int, float]] = None,
+                 prewarm_max_wait: float = None):
+        self.max_concurrency = max_concurrency or int(os.getenv("SCRAPE_MAX_CONCURRENCY", "8"))
+        self.default_max_in_flight = max_in_flight or int(os.getenv("SCRAPE_DOMAIN_MAX_IN_FLIGHT", "2"))
+        self.default_rate = rate_per_sec or float(os.getenv("SCRAPE_DOMAIN_RATE_PER_SEC", "0.5"))
+        if prewarm_share is None:
+            prewarm_share = float(os.getenv("SCRAPE_PREWARM_MAX_SHARE", "0.5"))
+        self.max_prewarm = max(1, int(self.max_concurrency * prewarm_share))
+        self.prewarm_max_wait = prewarm_max_wait or float(os.getenv("SCRAPE_PREWARM_MAX_QUEUE_WAIT_SECONDS", "120"))
+        self.limits = limits if limits is not None else _parse_limits(os.getenv("SCRAPE_DOMAIN_LIMITS", ""))
+        self.domains: Dict[str, DomainSlots] = {}
+        self.in_flight: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._rotation: Deque[str] = deque()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def _domain(self, name: str) -> DomainSlots:
+        if name not in self.domains:
+            max_in_flight, rate = self.limits.get(name, (None, None))
+            self.domains[name] = DomainSlots(
+                name,
+                max_in_flight=max_in_flight or self.default_max_in_flight,
+                rate_per_sec=rate or self.default_rate,
+            )
+            self._rotation.append(name)
+        return self.domains[name]
+
+    @property
+    def total_in_flight(self) -> int:
+        return sum(self.in_flight.values())
+
+    def _has_capacity(self, priority: str) -> bool:
+        if self.total_in_flight >= self.max_concurrency:
+            return False
+        return priority != PRIORITY_PREWARM or self.in_flight[priority] < self.max_prewarm
+
+    def _dispatch(self):
+        """Grant free slots: priority classes in order, round-robin across domains within a class."""
+        next_token: Optional[float] = None
+        for priority in PRIORITIES:
+            granted = True
+            while granted and self._has_capacity(priority):
+                granted = False
+                for _ in range(len(self._rotation)):
+                    name = self._rotation[0]
+                    self._rotation.rotate(-1)
+                    domain = self.domains[name]
+                    queue = domain.queues[priority]
+                    while queue and queue[0].done():  # cancelled while queued
+                        queue.popleft()
+                    if not queue:
+                        continue
+                    wait = domain.ready_in()
+                    if wait is None:
+                        continue
+                    if wait > 0:
+                        next_token = wait if next_token is None else min(next_token, wait)
+                        continue
+                    domain.take()
+                    self.in_flight[priority] += 1
+                    queue.popleft().set_result(None)
+                    granted = True
+                    break
+        if next_token is not None and self._wakeup is None:
+            # Only empty token buckets hold work back: look again once one refills
+            self._wakeup = asyncio.get_running_loop().call_later(next_token, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+
+    def _release(self, domain: DomainSlots, priority: str, busy: float):
+        domain.release(busy)
+        self.in_flight[priority] -= 1
+        self._dispatch()
+
+    async def submit(self, domain: str, call: Callable[[], Awaitable[Any]],
+                     priority: str = PRIORITY_INTERACTIVE, max_wait: float = None) -> Any:
+        """
+        Run `call()` once `domain` and the global governor have a free slot.
+
+        Args:
+            domain: Site the scrape hits (ScraperManager uses the source name)
+            call: Zero-arg coroutine factory; not invoked until a slot is granted
+            priority: PRIORITY_INTERACTIVE or PRIORITY_PREWARM
+            max_wait: Seconds to wait for a slot before giving up with asyncio.TimeoutError
+                (default: prewarm_max_wait for prewarm work, no limit for interactive work)
+
+        Raises:
+            asyncio.TimeoutError: No slot within `max_wait`; `call` was never invoked
+        """
+        if priority not in PRIORITIES:
+            priority = PRIORITY_INTERACTIVE
+        if max_wait is None and priority == PRIORITY_PREWARM:
+            max_wait = self.prewarm_max_wait
+        slots = self._domain(domain)
+        granted = asyncio.get_running_loop().create_future()
+        slots.queues[priority].append(granted)
+        enqueued = time.monotonic()
+        self._dispatch()
+        try:
+            async with asyncio.timeout(max_wait):
+                await granted
+        except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+            if granted.done() and not granted.cancelled():
+                # Slot was granted just as we were cancelled or timed out: hand it back
+                self._release(slots, priority, 0.0)
+            if isinstance(e, asyncio.TimeoutError):
+                slots.expired += 1
+                logger.info(f"{domain}: {priority} scrape gave up after waiting {max_wait:.0f}s for a slot")
+            raise
+        slots.queue_wait.record(time.monotonic() - enqueued)
+
+        started = time.monotonic()
+        try:
+            return await call()
+        finally:
+            self._release(slots, priority, time.monotonic() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Global and per-domain slot usage, queue depth and queue wait, for the metrics endpoint."""
+        return {
+            "in_flight": dict(self.in_flight),
+            "max_concurrency": self.max_concurrency,
+            "max_prewarm": self.max_prewarm,
+            "domains": {name: d.snapshot() for name, d in self.domains.items()},
+        }
+
+
+# Global instance
+_scrape_scheduler: Optional[ScrapeScheduler] = None
+
+def get_scrape_scheduler() -> ScrapeScheduler:
+    """Get or create the global scrape scheduler."""
+    global _scrape_scheduler
+    if _scrape_scheduler is None:
+        _scrape_scheduler = ScrapeScheduler()
+    return _scrape_scheduler
@@ -1,9 +1,11 @@
 import asyncio
 import logging
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, AsyncIterator, NamedTuple, Optional
 from jsearch import JSearchClient
 from adzuna import AdzunaClient
 from remotive import RemotiveClient
+from jobspy_client import JobSpyClient
 from scrapers.naukri_scraper import NaukriScraper
 from scrapers.linkedin_scraper import LinkedInScraper
 from scrapers.instahyre_scraper import InstahyreScraper
@@ -22,15 +24,38 @@ from scrapers.glassdoor_scraper import GlassdoorScraper
 from scrapers.naukrigulf_scraper import NaukriGulfScraper
 from scrapers.bayt_scraper import BaytScraper
 from scrapers.gulftalent_scraper import GulfTalentScraper
+from managers.budget_manager import get_budget_manager, PRIORITY_INTERACTIVE
+from managers.circuit_breaker import get_circuit_breakers
+from managers.scrape_scheduler import get_scrape_scheduler
+from managers.result_cache import get_result_cache
+from managers.watermarks import get_watermarks
+from managers.source_yield import get_source_yield, GLOBAL_BUCKET
+from scrapers.base_scraper import ScraperBlockedError
+from scrapers.browser_shards import get_browser_shards
 
 logger = logging.getLogger(__name__)
 
+# How often breaker, watermark and yield state that searches changed is written to disk
+STATE_FLUSH_SECONDS = float(os.getenv("SCRAPE_STATE_FLUSH_SECONDS", "30"))
+
+
+class SourceBatch(NamedTuple):
+    """Jobs from one source (one page for paginated scrapers), yielded as soon as they arrive."""
+    source: str
+    jobs: List[Dict[str, Any]]
+    new: int = 0  # jobs not seen recently by this source for this query
+
+
 class ScraperManager:
     def __init__(self):
         # Initialize all clients
         self.jsearch_client = JSearchClient()
         self.adzuna_client = AdzunaClient()
         self.remotive_client = RemotiveClient()
+        # Blocking multi-site scrapes in a worker process pool; off unless JOBSPY_ENABLED
+        # (it covers LinkedIn/Indeed/Glassdoor, which the Playwright scrapers also hit)
+        self.jobspy_client = JobSpyClient()
+        self.jobspy_enabled = os.getenv("JOBSPY_ENABLED", "false").lower() == "true"
         self.scrapers = {
             "Naukri": NaukriScraper(),
             "LinkedIn": LinkedInScraper(),
@@ -49,11 +74,60 @@ class ScraperManager:
             "Bayt": BaytScraper(),
             "GulfTalent": GulfTalentScraper()
         }
+        # Shared across requests: monthly quotas and rate limits for paid APIs
+        self.budget = get_budget_manager()
+        # Per-source circuit breakers + adaptive timeouts (persisted across restarts)
+        self.breakers = get_circuit_breakers()
+        # Browser scrapes start through the per-domain/global concurrency governor
+        self.scheduler = get_scrape_scheduler()
+        # Per-source results shared by searches with the same scraper inputs
+        self.results = get_result_cache()
+        # Recently seen jobs per (source, query): decide how deep to paginate
+        self.watermarks = get_watermarks()
+        # Yield stats per source, query category and country: pick sources and pages,
+        # cheapest sources start first
+        self.yields = get_source_yield()
+        # Browser scrapes run in worker processes when BROWSER_WORKERS > 0 (else None: in-process)
+        self.shards = get_browser_shards()
+        # Interactive searches stop once this many new jobs are in, or after the budget
+        self.target_new = int(os.getenv("SCRAPE_TARGET_NEW_JOBS", "200"))
+        self.budget_seconds = float(os.getenv("SCRAPE_BUDGET_SECONDS", "90"))
 
-    async def execute_search(self, query: str, location: str = "India", page: int = 1, country: str = "India") -> List[Dict[str, Any]]:
+    async def execute_search(self, query: str, location: str = "India", page: int = 1, country: str = "India",
+                             priority: str = PRIORITY_INTERACTIVE, target_new: int = None,
+                             budget: float = None) -> List[Dict[str, Any]]:
         """
-        Execute all configured scrapers concurrently with timeouts.
+        Execute all configured scrapers concurrently with timeouts and return every job.
+        `priority` (interactive/prewarm) decides how much of the paid API budget may be used;
+        `target_new`/`budget` end the search early as in `stream_search`.
         """
+        all_jobs = []
+        async for batch in self.stream_search(query, location, page, country, priority=priority,
+                                              target_new=target_new, budget=budget):
+            all_jobs.extend(batch.jobs)
+        return all_jobs
+
+    async def stream_search(self, query: str, location: str = "India", page: int = 1, country: str = "India",
+                            priority: str = PRIORITY_INTERACTIVE, target_new: int = None,
+                            budget: float = None) -> AsyncIterator[SourceBatch]:
+        """
+        Run all configured sources concurrently and yield their non-empty batches in
+        completion order, so callers can persist fast sources while slow scrapers run.
+        Which scrapers run, how many pages they may fetch and the order sources start
+        in (cheapest per new job first) come from yield stats for the query's
+        category and country.
+
+        The search ends once `target_new` new jobs are in or `budget` seconds have
+        passed (for interactive searches both default to SCRAPE_TARGET_NEW_JOBS /
+        SCRAPE_BUDGET_SECONDS; 0 disables). Ending early, like closing the generator,
+        cancels the sources still running, which closes their pages.
+        Prewarm searches queue their browser scrapes behind interactive ones (giving
+        up after SCRAPE_PREWARM_MAX_QUEUE_WAIT_SECONDS) and leave the paid APIs'
+        interactive reserve alone.
+        """
+        if priority == PRIORITY_INTERACTIVE:
+            target_new = self.target_new if target_new is None else target_new
+            budget = self.budget_seconds if budget is None else budget
         search_term = query
         if location:
             search_term_with_loc = f"{query} in {location}"
@@ -67,37 +141,50 @@ class ScraperManager:
 
         logger.info(f"ScraperManager: Starting concurrent search for '{search_term}' in {country}")
         
-        tasks = []
+        streams = []
+        bucket = self.yields.bucket(query, country)
+        # Scraper inputs for the result cache; filters that don't reach the scrapers aren't part of it
+        inputs = (query, location, page, country)
 
-        # 1. API Clients (Fast)
-        tasks.append(self._run_wrapper(
-            self.jsearch_client.search_jobs(search_term_with_loc, page=page, num_pages=5, country=country), 
-            "JSearch", 15
-        ))
+        # 1. API Clients (Fast) - gated by the quota-aware budget manager.
+        # Clients fetch their pages in parallel with hedging and return partial results on deadline;
+        # how many pages follows the share of new jobs they returned last time.
+        self._schedule(streams, "JSearch", "JSearch", 15, lambda: self._adaptive_pages("JSearch", "jsearch", priority,
+            query, location, 5,
+            lambda n: self.jsearch_client.search_jobs(search_term_with_loc, page=page, num_pages=n, country=country, priority=priority),
+            requests_for=self.jsearch_client.requests_for),
+            cache_key=inputs, watermark=(query, location), max_depth=5, bucket=bucket)
         
-        # Remotive (Global/Remote) - Keep it for both but it's international
-        tasks.append(self._run_wrapper(
-            self.remotive_client.search_jobs(search_term, country=country), 
-            "Remotive", 10
-        ))
+        # Remotive (Global/Remote): the client returns nothing for UAE, so don't run it there -
+        # those empty runs would count against its breaker for India searches too
+        if country.lower() not in ["uae", "ae", "united arab emirates"]:
+            self._schedule(streams, "Remotive", "Remotive", 10,
+                lambda: self.remotive_client.search_jobs(search_term, country=country), watermark=(query, location),
+                bucket=bucket)
         
         # 2. Adzuna (Reliable but rate-limited)
         # Verify if country is supported by Adzuna (India only in current config)
         if country.lower() not in ["uae", "ae", "united arab emirates"]:
-            for i in range(3):  # Increased from 2 to 3 iterations
-                tasks.append(self._run_wrapper(
-                    self.adzuna_client.search_jobs(query, location, page + i), 
-                    f"Adzuna-{i+1}", 20
-                ))
+            self._schedule(streams, "Adzuna", "Adzuna", 20, lambda: self._adaptive_pages("Adzuna", "adzuna", priority,
+                query, location, 3,
+                lambda n: self.adzuna_client.search_jobs(query, location, page, num_pages=n, priority=priority)),
+                cache_key=inputs, watermark=(query, location), max_depth=3, bucket=bucket)
+
+        # JobSpy (LinkedIn/Indeed/Glassdoor in one call): runs in its worker pool, and a
+        # timeout or cancelled search kills the scrape there. Like the APIs it skips the
+        # scrape scheduler, whatever the priority: it holds no browser context, and
+        # JOBSPY_WORKERS already caps how many run at once
+        if self.jobspy_enabled:
+            self._schedule(streams, "JobSpy", "JobSpy", 60,
+                lambda: self.jobspy_client.search_jobs(query, location, page, country=country),
+                cache_key=inputs, watermark=(query, location), bucket=bucket)
 
         # 3. Scrapers (Playwright)
         # Priority Scrapers (Higher timeout)
         priority_scrapers = ["Hirist", "Foundit", "Iimjobs", "Naukri", "Indeed"]
-        
-        # Scrapers to fetch multiple pages from (to increase volume)
-        multi_page_targets = ["Apna", "Freshersworld", "Hirist", "Indeed", "Foundit", "Iimjobs"]
 
-        for name, scraper in self.scrapers.items():
+        eligible = []
+        for name in self.scrapers:
             # Country-Specific Logic
             is_uae = country.lower() in ["uae", "ae", "united arab emirates"]
             is_india = not is_uae # Default to India
@@ -109,55 +196,292 @@ class ScraperManager:
             # Skip UAE-specific sites if India
             if is_india and name in ["NaukriGulf", "Bayt", "GulfTalent"]:
                 continue
+            eligible.append(name)
 
+        # Bandit over past yields for this kind of query: drop sources that find nothing
+        # new for it (exploring them now and then) and cap pages for marginal ones
+        selected = self.yields.select(eligible, bucket, self.watermarks.max_pages)
+
+        for name, max_pages in selected.items():
+            scraper = self.scrapers[name]
+            # Static default; replaced by an adaptive timeout once latency history exists
             timeout = 45 if name in priority_scrapers else 25
             
-            # Determine how many pages to scrape
-            num_pages = 2 if name in multi_page_targets else 1
-            
-            for i in range(num_pages):
-                current_page = page + i
-                task_name = f"{name}-Page{current_page}"
-                
-                # Safe call handling for country argument
-                if name in ["Indeed", "NaukriGulf", "Bayt", "GulfTalent"]:
-                     tasks.append(self._run_wrapper(
-                        scraper.search_jobs(query, location, current_page, country=country),
-                        task_name, timeout
-                    ))
+            # Safe call handling for country argument
+            kwargs = {"country": country} if name in ["Indeed", "NaukriGulf", "Bayt", "GulfTalent"] else {}
+            if self.shards is not None:
+                page_call = lambda p, n=name, s=scraper, kw=kwargs: (
+                    lambda: self.shards.run(n, type(s), (query, location, p), kw))
+            else:
+                page_call = lambda p, s=scraper, kw=kwargs: (lambda: s.search_jobs(query, location, p, **kw))
+            # Pages are walked one at a time: deeper only while pages are mostly new jobs
+            streams.append((name, self._paginate(name, timeout, page_call, query, location, page, country, priority,
+                                                 max_pages=max_pages, bucket=bucket)))
+
+        # Run all, cheapest per new job first (scrapes wait for their slot in the scheduler;
+        # the APIs start right away)
+        rank = {source: i for i, source in enumerate(self.yields.order((source for source, _ in streams), bucket))}
+        streams.sort(key=lambda item: rank[item[0]])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget if budget else None
+        total = new_total = 0
+        merged = self._merge([stream for _, stream in streams], deadline=deadline)
+        try:
+            async for batch in merged:
+                total += len(batch.jobs)
+                new_total += batch.new
+                yield batch
+                if target_new and new_total >= target_new:
+                    logger.info(f"🎯 ScraperManager: {new_total} new jobs (target {target_new}), cancelling remaining sources")
+                    break
+        finally:
+            # Cancel whatever is still running now rather than when the generator is collected
+            await merged.aclose()
+            logger.info(f"ScraperManager: Total jobs collected: {total} ({new_total} new)")
+            # Written off the loop by run_state_flush_loop, not on every search
+            self.breakers.dirty = self.watermarks.dirty = self.yields.dirty = True
+
+    async def _merge(self, streams: list, deadline: float = None) -> AsyncIterator[SourceBatch]:
+        """
+        Interleave per-source batch streams in completion order, until `deadline` (loop time).
+        The queue is bounded, so a fast source waits for the consumer instead of
+        piling up pages nobody has read (or will, once the search stops early).
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=len(streams) * 2)
+        done = object()
+
+        async def pump(stream):
+            try:
+                async for batch in stream:
+                    await queue.put(batch)
+            except Exception as e:
+                logger.error(f"❌ Source stream failed: {str(e)}")
+            # Not in a finally: a cancelled pump must not block on a full queue
+            await queue.put(done)
+
+        pumps = [asyncio.create_task(pump(stream)) for stream in streams]
+        remaining = len(pumps)
+        try:
+            while remaining:
+                if deadline is None:
+                    item = await queue.get()
                 else:
-                     tasks.append(self._run_wrapper(
-                        scraper.search_jobs(query, location, current_page),
-                        task_name, timeout
-                    ))
+                    try:
+                        item = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        logger.info(f"⏱️ ScraperManager: time budget spent, cancelling {remaining} remaining sources")
+                        return
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in pumps:
+                task.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
 
-        # Execute all
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Flatten results
-        all_jobs = []
-        for res in results:
-            if isinstance(res, list):
-                all_jobs.extend(res)
-        
-        logger.info(f"ScraperManager: Total jobs collected: {len(all_jobs)}")
-        return all_jobs
+    async def _once(self, source: str, launched, watermark: tuple = None, max_depth: int = None,
+                    bucket: str = GLOBAL_BUCKET) -> AsyncIterator[SourceBatch]:
+        """
+        Stream for a single-shot source. With a `watermark` (query, location), fetched
+        jobs are checked against recently seen ones; with a `max_depth` too, the share
+        of new jobs sets the source's page count for the next run.
+        """
+        if isinstance(launched, list):
+            # Served from the result cache: counted when it was fetched
+            jobs, new = launched, 0
+        else:
+            jobs = await launched
+            new = self._observe(source, watermark, jobs, bucket) if watermark and jobs else 0
+            if max_depth and jobs:
+                query, location = watermark
+                num_pages = self.watermarks.plan_depth(source, query, location, default=max_depth)
+                self.watermarks.record_depth(source, query, location, num_pages, new / len(jobs), max_depth=max_depth)
+        if jobs:
+            yield SourceBatch(source, jobs, new)
 
-    async def _run_wrapper(self, coro, name: str, timeout: int) -> List[Dict[str, Any]]:
+    def _observe(self, source: str, watermark: tuple, jobs: List[Dict[str, Any]], bucket: str,
+                 first_page: bool = True) -> int:
+        """
+        Record fetched jobs in the source's watermark and yield stats; returns how many were new.
+        A first page with nothing new means the query was repeated, not that the source dried up.
+        """
+        query, location = watermark
+        new = round(self.watermarks.observe(source, query, location, jobs) * len(jobs))
+        self.yields.record_new(source, new, bucket, known=first_page and new == 0)
+        return new
+
+    def _schedule(self, streams: list, source: str, task_name: str, default_timeout: float, call,
+                  priority: str = None, cache_key: tuple = None, watermark: tuple = None, max_depth: int = None,
+                  bucket: str = GLOBAL_BUCKET):
+        """
+        Add a stream for `call()` unless the source's circuit breaker is open. Open sources cost
+        nothing (no coroutine, no browser context); the timeout adapts to recent latency.
+        With a `priority`, the call waits for a slot in the scrape scheduler first; the
+        timeout only starts once the scrape does, so queueing never trips the breaker.
+        With a `cache_key` (query, location, page, country), fresh cached results are
+        served instead and successful results are cached.
+        """
+        launched = self._launch(source, task_name, default_timeout, call, priority=priority, cache_key=cache_key,
+                                bucket=bucket)
+        if launched is not None:
+            streams.append((source, self._once(source, launched, watermark=watermark, max_depth=max_depth,
+                                               bucket=bucket)))
+
+    def _launch(self, source: str, task_name: str, default_timeout: float, call,
+                priority: str = None, cache_key: tuple = None, bucket: str = GLOBAL_BUCKET):
+        """
+        Awaitable for one `call()` as described in `_schedule`, the cached job list on
+        a result cache hit, or None if the circuit is open.
+        """
+        if cache_key is not None:
+            cached = self.results.get(source, *cache_key)
+            if cached is not None:
+                logger.info(f"♻️ {task_name} served from result cache: {len(cached)} jobs")
+                return cached
+        if not self.breakers.allow(source):
+            logger.info(f"⏭️ {task_name} skipped: circuit open")
+            return None
+        timeout = self.breakers.timeout_for(source, default_timeout)
+        run = lambda: self._run_wrapper(call(), task_name, timeout, source=source, cache_key=cache_key, bucket=bucket)
+        if priority is None:
+            return self._cancellable(source, run())
+        return self._cancellable(source, self.scheduler.submit(source, run, priority=priority))
+
+    async def _cancellable(self, source: str, awaitable):
+        """
+        Await a launched call; if the search is cancelled first, release the breaker's probe slot.
+        A call that never got a scheduler slot (prewarm queue wait exceeded) returns no jobs
+        and isn't counted against the source either.
+        """
+        try:
+            return await awaitable
+        except asyncio.CancelledError:
+            self.breakers.record_cancelled(source)
+            raise
+        except asyncio.TimeoutError:
+            # `_run_wrapper` handles scrape timeouts itself: this one is the scheduler's queue wait
+            logger.info(f"⏭️ {source} not queried: no scrape slot in time")
+            self.breakers.record_cancelled(source)
+            return []
+
+    async def _paginate(self, source: str, default_timeout: float, page_call, query: str, location: str,
+                        page: int, country: str, priority: str, max_pages: int = None,
+                        bucket: str = GLOBAL_BUCKET) -> AsyncIterator[SourceBatch]:
+        """
+        Scrape `source` page by page from `page`, yielding each non-empty page. Each
+        page goes through `_launch` (cache, breaker, scheduler); the next page is only
+        fetched while the last one was mostly jobs not seen recently for this query,
+        up to `max_pages` (default: the configured depth). `page_call(p)` returns the
+        zero-arg call for page `p`.
+        """
+        for current_page in range(page, page + (max_pages or self.watermarks.max_pages)):
+            launched = self._launch(source, f"{source}-Page{current_page}", default_timeout, page_call(current_page),
+                                    priority=priority, cache_key=(query, location, current_page, country),
+                                    bucket=bucket)
+            if launched is None:
+                break
+            if isinstance(launched, list):
+                # Cached page: its jobs were counted when fetched, so it doesn't earn another page
+                result, new = launched, 0
+            else:
+                result = await launched
+                new = self._observe(source, (query, location), result, bucket,
+                                    first_page=current_page == page) if result else 0
+            if result:
+                yield SourceBatch(source, result, new)
+            new_ratio = new / len(result) if result else 0.0
+            if not self.watermarks.should_deepen(source, new_ratio, current_page - page + 1):
+                if result and new_ratio < self.watermarks.deepen_ratio:
+                    logger.info(f"🛑 {source}: page {current_page} only {new_ratio:.0%} new, not paginating further")
+                break
+
+    async def _adaptive_pages(self, source: str, provider: str, priority: str, query: str, location: str,
+                              max_pages: int, call, requests_for=None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Paid API fetch whose page count adapts per query: `call(num_pages)` fetches
+        all pages at once, so instead of stopping early the depth for the next run
+        follows the share of new jobs this run returned (between 1 and `max_pages`,
+        recorded by `_once`). `requests_for(num_pages)` is the quota cost (default:
+        one request per page).
+        """
+        num_pages = self.watermarks.plan_depth(source, query, location, default=max_pages)
+        cost = requests_for(num_pages) if requests_for else num_pages
+        return await self._budgeted(provider, priority, lambda: call(num_pages), cost=cost)
+
+    async def _budgeted(self, provider: str, priority: str, call, cost: int = 1) -> Optional[List[Dict[str, Any]]]:
+        """
+        Skip a paid API source up front if its monthly budget can't cover `cost` requests.
+        Per-request budget/rate accounting happens inside the client.
+        `call` is a zero-arg factory so skipped calls never create a coroutine.
+        Returns None when skipped, which `_run_wrapper` doesn't count as an empty run.
+        """
+        if not self.budget.has_budget(provider, cost=cost, priority=priority):
+            logger.info(f"Skipping {provider}: monthly API budget near exhaustion ({priority})")
+            return None
+        return await call()
+
+    async def _run_wrapper(self, coro, name: str, timeout: float, source: str = None,
+                           cache_key: tuple = None, bucket: str = GLOBAL_BUCKET) -> List[Dict[str, Any]]:
         """
         Helper to run a scraper coroutine with timeout and error handling.
+        If `source` is given, the outcome feeds that source's circuit breaker
+        (and, with a `cache_key`, successful results go into the result cache) and the
+        time spent and the outcome feed its yield stats in `bucket`. A None result means
+        the source wasn't queried (e.g. no API budget left): it isn't evidence either way.
         """
+        start_time = asyncio.get_event_loop().time()
         try:
-            start_time = asyncio.get_event_loop().time()
             result = await asyncio.wait_for(coro, timeout=timeout)
             elapsed = asyncio.get_event_loop().time() - start_time
+            if result is None:
+                logger.info(f"⏭️ {name} not queried")
+                if source:
+                    self.breakers.record_cancelled(source)
+                return []
+            if source:
+                self.yields.record_time(source, elapsed, bucket)
             
             count = len(result) if isinstance(result, list) else 0
             logger.info(f"✅ {name} finished in {elapsed:.1f}s: {count} jobs")
+            if source:
+                self.breakers.record_success(source, elapsed, count)
+                if cache_key is not None and count:
+                    self.results.put(source, *cache_key, result)
             return result if isinstance(result, list) else []
         except asyncio.TimeoutError:
-            logger.warning(f"⚠️ {name} timed out after {timeout}s")
+            logger.warning(f"⚠️ {name} timed out after {timeout:.0f}s")
+            if source:
+                self.yields.record_time(source, timeout, bucket, failed=True)
+                self.breakers.record_failure(source, "timeout", elapsed=timeout)
+            return []
+        except ScraperBlockedError as e:
+            logger.warning(f"🚫 {name} blocked: {str(e)}")
+            if source:
+                self.yields.record_time(source, asyncio.get_event_loop().time() - start_time, bucket, failed=True)
+                self.breakers.record_failure(source, "blocked")
             return []
         except Exception as e:
             logger.error(f"❌ {name} failed: {str(e)}")
+            if source:
+                self.yields.record_time(source, asyncio.get_event_loop().time() - start_time, bucket, failed=True)
+                self.breakers.record_failure(source, e.__class__.__name__)
             return []
+
+
+async def flush_scrape_state():
+    """Write the breaker, watermark and yield state files that changed since the last flush."""
+    for store in (get_circuit_breakers(), get_watermarks(), get_source_yield()):
+        await store.flush()
+
+
+async def run_state_flush_loop(interval: float = None):
+    """Periodic flush of scrape state; started from the app lifespan, which flushes once more at shutdown."""
+    interval = interval or STATE_FLUSH_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_scrape_state()
+        except Exception as e:
+            logger.error(f"Scrape state flush failed: {e}")
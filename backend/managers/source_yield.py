@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Dict, Iterable, List, Optional
+from utils.state_store import state_path, load_json_state, save_json_state
+
+logger = logging.getLogger(__name__)
+
+# Older runs fade out: each new call to a source weighs its history by this factor
+DECAY = 0.9
+# Prior for sources without history: PRIOR_SECONDS spent per PRIOR_NEW_JOBS new jobs
+PRIOR_SECONDS = 10.0
+PRIOR_NEW_JOBS = 5.0
+
+GLOBAL_BUCKET = "*"
+
+# Query categories, checked in order (first match wins). Sites differ most by seniority
+# and by white- vs blue-collar work, so those are the buckets yield stats are kept in.
+QUERY_CATEGORIES = (
+    ("entry", {"fresher", "freshers", "intern", "internship", "trainee", "junior", "graduate", "entry", "apprentice"}),
+    ("senior", {"senior", "lead", "head", "manager", "director", "principal", "architect", "vp", "chief", "staff"}),
+    ("blue_collar", {"driver", "delivery", "electrician", "plumber", "technician", "helper", "guard", "warehouse",
+                     "cook", "chef", "telecaller", "mechanic", "welder", "housekeeping", "cleaner", "peon", "operator"}),
+)
+DEFAULT_CATEGORY = "general"
+
+
+def query_category(query: str) -> str:
+    """Coarse category of a (canonical) query: entry, senior, blue_collar or general."""
+    words = set((query or "").lower().split())
+    for category, keywords in QUERY_CATEGORIES:
+        if words & keywords:
+            return category
+    return DEFAULT_CATEGORY
+
+
+class SourceYieldStats:
+    """
+    Per-source yield statistics bucketed by query category and country, persisted
+    across restarts: decayed seconds spent, new jobs found, calls and failures.
+    Calls whose first page was entirely jobs already seen for the query (a repeated
+    search within the watermark TTL) are "known": they cost time but say nothing
+    about what the source would find for a new query, so `select` leaves them out.
+
+    - Cost per new job (smoothed with a prior) orders the fan-out so cheap,
+      high-yield sources start first.
+    - `select` is an epsilon-greedy bandit over those stats: it decides which
+      scrapers run for a search and how many pages they may fetch.
+    """
+    def __init__(self, state_file: str = None, min_trials: int = None, min_new_jobs: float = None,
+                 explore: float = None, rng: random.Random = None):
+        self.state_file = state_file or state_path("source_yield.json")
+        # Calls before a source's stats in a bucket are trusted
+        self.min_trials = min_trials or int(os.getenv("SOURCE_SELECTION_MIN_TRIALS", "3"))
+        # Average new jobs per call below which a source is skipped (except when exploring)
+        self.min_new_jobs = min_new_jobs if min_new_jobs is not None else float(os.getenv("SOURCE_SELECTION_MIN_NEW_JOBS", "1"))
+        # Chance of running a skipped source anyway, so a source that recovers gets noticed
+        self.explore = explore if explore is not None else float(os.getenv("SOURCE_SELECTION_EXPLORE", "0.1"))
+        self.rng = rng or random.Random()
+        state = load_json_state(self.state_file, default={})
+        # bucket -> source -> {"seconds", "new_jobs", "weight", "failures", "calls", "known", "known_calls"}
+        self.buckets: Dict[str, Dict[str, Dict[str, float]]] = state.get("buckets", {})
+        self.dirty = False  # changed since the state file was last written
+
+    @staticmethod
+    def bucket(query: str, country: str) -> str:
+        return f"{query_category(query)}|{(country or '').lower()}"
+
+    def _stats(self, source: str, bucket: str) -> Dict[str, float]:
+        sources = self.buckets.setdefault(bucket, {})
+        if source not in sources:
+            sources[source] = {"seconds": 0.0, "new_jobs": 0.0, "weight": 0.0, "failures": 0.0, "calls": 0}
+        stats = sources[source]
+        stats.setdefault("known", 0.0)  # state saved before known calls were tracked
+        stats.setdefault("known_calls", 0)
+        return stats
+
+    def record_time(self, source: str, seconds: float, bucket: str = GLOBAL_BUCKET, failed: bool = False):
+        """One call to `source` finished (successful or not) after `seconds`; ages its history."""
+        stats = self._stats(source, bucket)
+        stats["seconds"] = stats["seconds"] * DECAY + seconds
+        stats["new_jobs"] *= DECAY
+        stats["failures"] = stats["failures"] * DECAY + (1 if failed else 0)
+        stats["weight"] = stats["weight"] * DECAY + 1
+        stats["known"] *= DECAY
+        stats["calls"] += 1
+
+    def record_new(self, source: str, new_jobs: int, bucket: str = GLOBAL_BUCKET, known: bool = False):
+        """New jobs from the call just timed; `known` marks a call whose first page was all seen before."""
+        stats = self._stats(source, bucket)
+        stats["new_jobs"] += new_jobs
+        if known:
+            stats["known"] += 1
+            stats["known_calls"] += 1
+
+    def cost_per_new_job(self, source: str, bucket: str = GLOBAL_BUCKET) -> float:
+        stats = self.buckets.get(bucket, {}).get(source) or {"seconds": 0.0, "new_jobs": 0.0}
+        return (stats["seconds"] + PRIOR_SECONDS) / (stats["new_jobs"] + PRIOR_NEW_JOBS)
+
+    def order(self, sources: Iterable[str], bucket: str = GLOBAL_BUCKET) -> List[str]:
+        """`sources` cheapest first (stable for equal costs)."""
+        return sorted(sources, key=lambda source: self.cost_per_new_job(source, bucket))
+
+    def mean_new_jobs(self, source: str, bucket: str) -> Optional[float]:
+        """
+        Average new jobs per call, known calls left out, or None until the source has
+        `min_trials` other calls in the bucket.
+        """
+        stats = self.buckets.get(bucket, {}).get(source)
+        if not stats or stats["calls"] - stats.get("known_calls", 0) < self.min_trials:
+            return None
+        return stats["new_jobs"] / max(stats["weight"] - stats.get("known", 0.0), 1e-9)
+
+    def select(self, sources: Iterable[str], bucket: str, max_pages: int) -> Dict[str, int]:
+        """
+        Sources to run for a search in `bucket` and how many pages each may fetch.
+        Untried sources run with full depth; sources averaging fewer than
+        `min_new_jobs` new jobs per call are skipped unless picked for exploration
+        (then one page); sources whose pages are mostly productive keep full depth.
+        """
+        selected = {}
+        for source in sources:
+            mean = self.mean_new_jobs(source, bucket)
+            if mean is None:
+                selected[source] = max_pages
+            elif mean >= self.min_new_jobs:
+                # Deep pages only pay off for sources that keep finding new jobs
+                selected[source] = max_pages if mean >= 2 * self.min_new_jobs else 1
+            elif self.rng.random() < self.explore:
+                logger.info(f"🎲 Exploring {source} for {bucket} ({mean:.1f} new jobs per call)")
+                selected[source] = 1
+            else:
+                logger.info(f"⏭️ {source} skipped for {bucket}: {mean:.1f} new jobs per call")
+        return selected
+
+    def _state(self) -> Dict[str, Any]:
+        return {"buckets": {bucket: {source: dict(stats) for source, stats in sources.items()}
+                            for bucket, sources in self.buckets.items()}}
+
+    def save(self):
+        save_json_state(self.state_file, self._state())
+        self.dirty = False
+
+    async def flush(self):
+        """Write the state file off the event loop, if it changed since the last write."""
+        if self.dirty:
+            self.dirty = False
+            # Copied on the loop, so searches can keep updating it while the thread writes
+            await asyncio.to_thread(save_json_state, self.state_file, self._state())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per bucket and source: calls, failure rate, latency, new jobs per call and cost per new job."""
+        return {
+            bucket: {
+                source: {
+                    "calls": stats["calls"],
+                    "failure_rate": round(stats["failures"] / stats["weight"], 3) if stats["weight"] else None,
+                    "avg_seconds": round(stats["seconds"] / stats["weight"], 2) if stats["weight"] else None,
+                    "new_jobs_per_call": round(stats["new_jobs"] / stats["weight"], 2) if stats["weight"] else None,
+                    "cost_per_new_job": round(self.cost_per_new_job(source, bucket), 2),
+                }
+                for source, stats in sorted(sources.items(), key=lambda item: self.cost_per_new_job(item[0], bucket))
+            }
+            for bucket, sources in sorted(self.buckets.items())
+        }
+
+
+# Global instance
+_source_yield: Optional[SourceYieldStats] = None
+
+def get_source_yield() -> SourceYieldStats:
+    """Get or create the global source yield stats."""
+    global _source_yield
+    if _source_yield is None:
+        _source_yield = SourceYieldStats()
+    return _source_yield
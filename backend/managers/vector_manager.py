@@ -83,9 +83,15 @@ class VectorManager:
         """
         if not jobs:
             return
+        self.index_embedded(self.embed_jobs(jobs))
 
+    def embed_jobs(self, jobs: List[Dict[str, Any]], batch_size: int = 32) -> Dict[str, list]:
+        """
+        Embed a batch of jobs in one model call.
+        Returns the columns for `index_embedded` (ids, embeddings, metadatas, documents).
+        CPU-bound: the ingest pipeline runs it in a worker thread.
+        """
         ids = []
-        embeddings = []
         metadatas = []
         documents = []
 
@@ -96,7 +102,7 @@ class VectorManager:
             # Safe get
             title = job.get('title', '')
             company = job.get('company', '')
-            desc = job.get('description', '')
+            desc = job.get('description') or ''
             skills = job.get('skills', [])
             location = job.get('location', '')
             
@@ -107,7 +113,6 @@ class VectorManager:
             
             ids.append(job_id)
             documents.append(embed_text)
-            embeddings.append(self._generate_embedding(embed_text))
             
             # Store metadata for Filtering before vector search
             metadatas.append({
@@ -118,15 +123,17 @@ class VectorManager:
                 "experience_min": job.get('experience_min', 0),
                 "ctc_min": job.get('ctc_min', 0)
             })
-            
+
+        embeddings = self.model.encode(documents, batch_size=batch_size).tolist() if documents else []
+        return {"ids": ids, "embeddings": embeddings, "metadatas": metadatas, "documents": documents}
+
+    def index_embedded(self, embedded: Dict[str, list]):
+        """Upsert the output of `embed_jobs` into the job collection."""
+        if not embedded["ids"]:
+            return
         # Upsert to Chroma
-        self.collection.upsert(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            documents=documents
-        )
-        logger.info(f"Indexed {len(jobs)} jobs in ChromaDB")
+        self.collection.upsert(**embedded)
+        logger.info(f"Indexed {len(embedded['ids'])} jobs in ChromaDB")
 
     def get_embeddings_by_ids(self, job_ids: List[int]) -> List[List[float]]:
         """Fetch embeddings for specific job IDs."""
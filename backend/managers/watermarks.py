@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from utils.state_store import state_path, load_json_state, save_json_state
+
+logger = logging.getLogger(__name__)
+
+
+def job_key(job: Dict[str, Any]) -> str:
+    """Stable identity of a job across scrapes: its apply link, else title + company."""
+    link = (job.get("apply_link") or "").strip().lower().split("#")[0].rstrip("/")
+    for prefix in ("https://", "http://"):
+        if link.startswith(prefix):
+            link = link[len(prefix):]
+    if link.startswith("www."):
+        link = link[4:]
+    if link:
+        return link
+    title = " ".join((job.get("title") or "").lower().split())
+    company = " ".join((job.get("company") or "").lower().split())
+    return f"{title}|{company}"
+
+
+class WatermarkStore:
+    """
+    Recently seen job keys per (source, query, location), persisted across restarts.
+
+    Drives incremental scraping: a page whose jobs are mostly already known ends
+    pagination, a page that is mostly new earns the next page, and page depth for
+    sources that fetch pages in parallel (the APIs) follows the last run's share of
+    new jobs.
+    """
+    def __init__(self, state_file: str = None, max_keys: int = None, max_entries: int = None,
+                 ttl: float = None, max_pages: int = None, deepen_ratio: float = None):
+        self.state_file = state_file or state_path("watermarks.json")
+        self.max_keys = max_keys or int(os.getenv("SCRAPE_WATERMARK_MAX_KEYS", "500"))  # job keys per entry
+        self.max_entries = max_entries or 1000                                         # (source, query) entries
+        self.ttl = ttl or float(os.getenv("SCRAPE_WATERMARK_TTL_SECONDS", "86400"))
+        self.max_pages = max_pages or int(os.getenv("SCRAPE_MAX_PAGES", "2"))
+        # Share of new jobs on a page needed to go one page deeper
+        self.deepen_ratio = deepen_ratio if deepen_ratio is not None else float(os.getenv("SCRAPE_DEEPEN_RATIO", "0.5"))
+        # entry key -> {"seen": {job_key: timestamp}, "depth": int, "updated": timestamp}
+        self.entries: Dict[str, Dict[str, Any]] = load_json_state(self.state_file, default={})
+        self.pages: Counter = Counter()       # pages observed per source
+        self.early_stops: Counter = Counter() # paginations ended by a mostly-known page
+        self.dirty = False                    # changed since the state file was last written
+
+    @staticmethod
+    def _key(source: str, query: str, location: Optional[str]) -> str:
+        return "|".join([source, " ".join((query or "").lower().split()), " ".join((location or "").lower().split())])
+
+    def _entry(self, source: str, query: str, location: Optional[str]) -> Dict[str, Any]:
+        key = self._key(source, query, location)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {"seen": {}, "depth": None, "updated": time.time()}
+            if len(self.entries) > self.max_entries:
+                oldest = min(self.entries, key=lambda k: self.entries[k]["updated"])
+                del self.entries[oldest]
+        return entry
+
+    def observe(self, source: str, query: str, location: Optional[str], jobs: List[Dict[str, Any]]) -> float:
+        """
+        Record a page of results and return the share that was new (not seen within
+        the TTL, including earlier pages of this run). An empty page counts as 0.
+        """
+        if not jobs:
+            return 0.0
+        entry = self._entry(source, query, location)
+        now = time.time()
+        seen = entry["seen"]
+        keys = {job_key(job) for job in jobs}
+        new = sum(1 for k in keys if now - seen.get(k, 0) > self.ttl)
+        for k in keys:
+            seen[k] = now
+        if len(seen) > self.max_keys:
+            for k in sorted(seen, key=seen.get)[:len(seen) - self.max_keys]:
+                del seen[k]
+        entry["updated"] = now
+        self.pages[source] += 1
+        return new / len(keys)
+
+    def should_deepen(self, source: str, new_ratio: float, pages_fetched: int) -> bool:
+        """Whether a paginating scraper should fetch another page."""
+        if pages_fetched >= self.max_pages:
+            return False
+        if new_ratio < self.deepen_ratio:
+            self.early_stops[source] += 1
+            return False
+        return True
+
+    def plan_depth(self, source: str, query: str, location: Optional[str], default: int) -> int:
+        """Pages to fetch up front for sources that fetch pages in parallel."""
+        entry = self.entries.get(self._key(source, query, location))
+        depth = entry.get("depth") if entry else None
+        return depth or default
+
+    def record_depth(self, source: str, query: str, location: Optional[str], depth: int, new_ratio: float,
+                     max_depth: int):
+        """
+        Adapt a parallel source's depth from its last run: one page deeper when most
+        results were new, one page shallower when most were already known.
+        """
+        if new_ratio >= self.deepen_ratio:
+            depth += 1
+        elif new_ratio < self.deepen_ratio / 2:
+            depth -= 1
+        self._entry(source, query, location)["depth"] = max(1, min(max_depth, depth))
+
+    def _state(self) -> Dict[str, Any]:
+        return {key: {**entry, "seen": dict(entry["seen"])} for key, entry in self.entries.items()}
+
+    def save(self):
+        save_json_state(self.state_file, self._state())
+        self.dirty = False
+
+    async def flush(self):
+        """Write the state file off the event loop, if it changed since the last write."""
+        if self.dirty:
+            self.dirty = False
+            # Copied on the loop, so searches can keep updating it while the thread writes
+            await asyncio.to_thread(save_json_state, self.state_file, self._state())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "max_pages": self.max_pages,
+            "deepen_ratio": self.deepen_ratio,
+            "sources": {
+                s: {"pages": self.pages[s], "early_stops": self.early_stops[s]}
+                for s in sorted(self.pages)
+            },
+        }
+
+
+# Global instance
+_watermarks: Optional[WatermarkStore] = None
+
+def get_watermarks() -> WatermarkStore:
+    """Get or create the global watermark store."""
+    global _watermarks
+    if _watermarks is None:
+        _watermarks = WatermarkStore()
+    return _watermarks
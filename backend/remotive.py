@@ -1,23 +1,276 @@
 import httpx
 import os
+import re
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
+from utils.http_client import get_http_pool
+from utils.job_ids import stable_job_id
+from utils.query_canonical import stem
+from utils.state_store import state_path, load_json_state, save_json_state
 
 logger = logging.getLogger(__name__)
 
+REMOTIVE_API_URL = "https://remotive.com/api/remote-jobs"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def _tokenize(text: str) -> Set[str]:
+    """
+    Lowercase, plural-stemmed word tokens (HTML stripped). Keeps '+'/'#' for c++, c#.
+    Stemmed like canonicalize_query, so "Java Engineers" in the feed matches the
+    canonical query "java engineer" and the other way round.
+    """
+    if not text:
+        return set()
+    return {stem(token) for token in _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())}
+
+
+def _slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
+
+
+def _index_feed(raw_jobs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, Set[int]]]:
+    """Normalized jobs, category slug per job and the token -> positions index for a raw feed."""
+    jobs, categories, index = [], [], {}
+    for raw_job in raw_jobs:
+        pos = len(jobs)
+        jobs.append(_normalize_remotive_job(raw_job))
+        categories.append(_slugify(raw_job.get("category", "")))
+        tokens = _tokenize(raw_job.get("title", "")) | _tokenize(raw_job.get("company_name", "")) | _tokenize(raw_job.get("description", ""))
+        for token in tokens:
+            index.setdefault(token, set()).add(pos)
+    return jobs, categories, index
+
+
+def _normalize_remotive_job(raw_job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize Remotive job data to our internal schema.
+    """
+    # Generate unique ID from job URL
+    job_id = stable_job_id(raw_job.get("url", "") + str(raw_job.get("id", "")))
+
+    # Parse salary (Remotive provides salary as a string like "$80k - $120k")
+    salary_text = raw_job.get("salary", "")
+    ctc_min = None
+    ctc_max = None
+
+    # Parse publication date
+    posted_at = None
+    if raw_job.get("publication_date"):
+        try:
+            from dateutil import parser
+            posted_at = parser.parse(raw_job["publication_date"])
+        except:
+            pass
+
+    # Extract tags as skills
+    tags = raw_job.get("tags", [])
+
+    return {
+        "id": job_id,
+        "title": raw_job.get("title", "Unknown Role"),
+        "company": raw_job.get("company_name", "Unknown Company"),
+        "location": "Remote",  # All Remotive jobs are remote
+        "experience_min": 0,
+        "experience_max": 0,
+        "ctc_min": ctc_min,
+        "ctc_max": ctc_max,
+        "skills": tags[:5] if tags else [],  # Limit to 5 tags
+        "posted_at": posted_at,
+        "apply_link": raw_job.get("url"),
+        "source": "Remotive",
+        "logo_url": raw_job.get("company_logo"),
+        "description": raw_job.get("description", "")[:1000]  # Limit description length
+    }
+
+
+class RemotiveFeedCache:
+    """
+    Local copy of the Remotive remote-jobs feed with an in-memory token index.
+
+    The feed is refreshed on a schedule using conditional requests (ETag /
+    Last-Modified), persisted to disk so restarts don't re-download it, and
+    searched locally: a query becomes a posting-list intersection instead of a
+    multi-megabyte download plus an O(N) substring scan.
+
+    Parsing, indexing and writing the multi-megabyte feed run in a worker thread,
+    off the event loop. The validators and fetch time live in a small separate
+    meta file, so a 304 only rewrites that.
+    """
+    def __init__(self, api_key: str = None, cache_file: str = None, refresh_interval: int = None,
+                 meta_file: str = None):
+        self.api_key = api_key if api_key is not None else os.getenv("REMOTIVE_API_KEY", "")
+        self.cache_file = cache_file or state_path("remotive_feed.json")
+        self.meta_file = meta_file or os.path.splitext(self.cache_file)[0] + "_meta.json"
+        # Remotive asks clients not to poll more than a few times per day
+        self.refresh_interval = refresh_interval or int(os.getenv("REMOTIVE_REFRESH_SECONDS", "21600"))
+
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at: float = 0.0
+        self._loaded = False
+        self._jobs: List[Dict[str, Any]] = []        # normalized jobs
+        self._categories: List[str] = []             # category slug per job
+        self._index: Dict[str, Set[int]] = {}        # token -> job positions
+        self._refresh_lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > self.refresh_interval
+
+    async def _build_index(self, raw_jobs: List[Dict[str, Any]]):
+        """Normalize raw feed jobs and build the token -> positions index (in a worker thread)."""
+        jobs, categories, index = await asyncio.to_thread(_index_feed, raw_jobs)
+        # Swap in one go so concurrent searches never see a half-built index
+        self._jobs, self._categories, self._index = jobs, categories, index
+        logger.info(f"Remotive feed indexed: {len(jobs)} jobs, {len(index)} tokens")
+
+    def _read_state(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        state = load_json_state(self.cache_file, default={})
+        # Files written before the meta file existed keep the validators next to the jobs
+        meta = load_json_state(self.meta_file) or state
+        return meta, state.get("jobs", [])
+
+    async def load(self):
+        """Load the persisted feed from disk (once per process)."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            meta, raw_jobs = await asyncio.to_thread(self._read_state)
+            self._loaded = True
+            if not raw_jobs:
+                # Validators without the feed they describe would turn the first refresh into an empty 304
+                return
+            self.etag = meta.get("etag")
+            self.last_modified = meta.get("last_modified")
+            self.fetched_at = meta.get("fetched_at", 0.0)
+            await self._build_index(raw_jobs)
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Refresh the feed with a conditional GET. Returns True if new data was loaded.
+        Concurrent callers share a single in-flight refresh.
+        """
+        async with self._refresh_lock:
+            if not force and not self.is_stale and self._jobs:
+                return False
+
+            headers = {}
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+            params = {"api_key": self.api_key} if self.api_key else {}
+
+            try:
+                response = await get_http_pool().get(REMOTIVE_API_URL, params=params, headers=headers, timeout=30.0)
+                if response.status_code == 304:
+                    logger.info("Remotive feed not modified")
+                    self.fetched_at = time.time()
+                    await asyncio.to_thread(self._persist_meta)
+                    return False
+                response.raise_for_status()
+                raw_jobs = (await asyncio.to_thread(response.json)).get("jobs", [])
+            except httpx.HTTPError as e:
+                logger.error(f"Remotive API error: {e}")
+                return False
+            except Exception as e:
+                logger.error(f"Unexpected error refreshing Remotive feed: {e}")
+                return False
+
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            self.fetched_at = time.time()
+            await self._build_index(raw_jobs)
+            await asyncio.to_thread(self._persist, raw_jobs)
+            return True
+
+    def _persist(self, raw_jobs: List[Dict[str, Any]]):
+        # Feed first: a crash in between leaves old validators, which only cost a full download
+        save_json_state(self.cache_file, {"jobs": raw_jobs})
+        self._persist_meta()
+
+    def _persist_meta(self):
+        save_json_state(self.meta_file, {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+        })
+
+    async def ensure_fresh(self):
+        """
+        Make sure there is data to search. An empty cache is filled synchronously;
+        a stale one is served as-is while a refresh runs in the background.
+        """
+        await self.load()
+        if not self._jobs:
+            await self.refresh()
+        elif self.is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    def search(self, query: str = None, category: str = None) -> List[Dict[str, Any]]:
+        """
+        Local lookup: jobs whose title/company/description contain every query token.
+        Returns copies so callers can annotate results without touching the cache.
+        """
+        if query:
+            tokens = _tokenize(query)
+            if not tokens:
+                return []
+            postings = sorted((self._index.get(t, set()) for t in tokens), key=len)
+            positions = set.intersection(*postings) if postings else set()
+        else:
+            positions = set(range(len(self._jobs)))
+
+        if category:
+            category_slug = _slugify(category)
+            positions = {p for p in positions if self._categories[p] == category_slug}
+
+        return [dict(self._jobs[p]) for p in sorted(positions)]
+
+    async def run_refresh_loop(self):
+        """Periodic refresh; started from the app lifespan."""
+        while True:
+            try:
+                await self.load()
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Remotive refresh loop error: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+# Global instance
+_remotive_feed: Optional[RemotiveFeedCache] = None
+
+def get_remotive_feed() -> RemotiveFeedCache:
+    """Get or create the global Remotive feed cache."""
+    global _remotive_feed
+    if _remotive_feed is None:
+        _remotive_feed = RemotiveFeedCache()
+    return _remotive_feed
+
+
 class RemotiveClient:
     def __init__(self):
         # Remotive API doesn't require authentication for basic access
         # But you can optionally use an API key for higher limits
         self.api_key = os.getenv("REMOTIVE_API_KEY", "")
-        self.base_url = "https://remotive.com/api/remote-jobs"
-        
+        self.base_url = REMOTIVE_API_URL
+
     async def search_jobs(self, query: str = None, category: str = None, country: str = None) -> List[Dict[str, Any]]:
         """
-        Search for remote jobs using Remotive API.
+        Search for remote jobs in the locally cached Remotive feed.
         Note: Remotive doesn't support traditional pagination or location filtering.
-        It returns all active remote jobs, which we then filter.
+        The full feed is cached and indexed by RemotiveFeedCache; searches are local lookups.
         """
         # Remotive is primarily global/US. If searching for specific country like UAE,
         # it's better to skip to avoid pollution unless explicitly looking for Remote.
@@ -25,85 +278,17 @@ class RemotiveClient:
             return []
 
         jobs = []
-        async with httpx.AsyncClient() as client:
-            try:
-                params = {}
-                if category:
-                    params["category"] = category
-                
-                # Add API key if available
-                if self.api_key:
-                    params["api_key"] = self.api_key
-                
-                response = await client.get(
-                    self.base_url,
-                    params=params,
-                    timeout=15.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                raw_jobs = data.get("jobs", [])
-                
-                # Filter by query if provided
-                if query:
-                    query_lower = query.lower()
-                    raw_jobs = [
-                        job for job in raw_jobs
-                        if query_lower in job.get("title", "").lower() or
-                           query_lower in job.get("description", "").lower() or
-                           query_lower in job.get("company_name", "").lower()
-                    ]
-                
-                # No limit to match other high-volume APIs
-                # raw_jobs = raw_jobs[:20]
-                
-                jobs = [self._normalize_job(job) for job in raw_jobs]
-                
-            except httpx.HTTPError as e:
-                logger.error(f"Remotive API error: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error fetching jobs from Remotive: {e}")
-        
+        try:
+            feed = get_remotive_feed()
+            await feed.ensure_fresh()
+            jobs = feed.search(query, category)
+        except Exception as e:
+            logger.error(f"Unexpected error searching Remotive feed: {e}")
+
         return jobs
-    
+
     def _normalize_job(self, raw_job: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize Remotive job data to our internal schema.
         """
-        # Generate unique ID from job URL
-        job_id = abs(hash(raw_job.get("url", "") + str(raw_job.get("id", "")))) % (10 ** 8)
-        
-        # Parse salary (Remotive provides salary as a string like "$80k - $120k")
-        salary_text = raw_job.get("salary", "")
-        ctc_min = None
-        ctc_max = None
-        
-        # Parse publication date
-        posted_at = None
-        if raw_job.get("publication_date"):
-            try:
-                from dateutil import parser
-                posted_at = parser.parse(raw_job["publication_date"])
-            except:
-                pass
-        
-        # Extract tags as skills
-        tags = raw_job.get("tags", [])
-        
-        return {
-            "id": job_id,
-            "title": raw_job.get("title", "Unknown Role"),
-            "company": raw_job.get("company_name", "Unknown Company"),
-            "location": "Remote",  # All Remotive jobs are remote
-            "experience_min": 0,
-            "experience_max": 0,
-            "ctc_min": ctc_min,
-            "ctc_max": ctc_max,
-            "skills": tags[:5] if tags else [],  # Limit to 5 tags
-            "posted_at": posted_at,
-            "apply_link": raw_job.get("url"),
-            "source": "Remotive",
-            "logo_url": raw_job.get("company_logo"),
-            "description": raw_job.get("description", "")[:1000]  # Limit description length
-        }
+        return _normalize_remotive_job(raw_job)
@@ -1,12 +1,30 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
+from .response_capture import as_text
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class ApnaScraper(BaseScraper):
+    CARD_SELECTORS = ["a[href^='/job/']"]
+    CARD_FIELDS = {
+        "title": card_field("h2"),
+        "company": card_field("div[class*='JobCompany']"),
+        "location": card_field("p[class*='leading']"),
+        "link": card_field(":scope", attr="href"),
+    }
+    # Job feed is loaded from Apna's public jobs API
+    API_RESPONSE_PATTERNS = ["apna.co/api/", "production.apna.co/"]
+    API_FIELDS = {
+        "title": ["title", "job_title"],
+        "company": ["organization.name", "company_name", "org_name"],
+        "location": ["address.area.name", "address.city.name", "location_name", "city"],
+        "link": ["public_url", "share_url", "slug"],
+        "description": ["description"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on Apna.co.
@@ -21,25 +39,29 @@ class ApnaScraper(BaseScraper):
             logger.info(f"Scraping Apna: {url}")
             
             page_obj, context = await self._get_page()
-            await page_obj.goto(url, wait_until="networkidle", timeout=30000)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=30000)
+            
+            await self._wait_ready(page_obj, capture=capture)
+            
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "Apna") for r in records if r["title"]]
             
             # Wait for cards
             await page_obj.wait_for_selector("a[href^='/job/']", timeout=10000)
             
-            cards = await page_obj.query_selector_all("a[href^='/job/']")
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector("h2")
-                    company_el = await card.query_selector("div[class*='JobCompany']")
-                    location_el = await card.query_selector("p[class*='leading']")
+                    if not card["title"]: continue
                     
-                    if not title_el: continue
-                    
-                    title = await title_el.inner_text()
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await card.get_attribute("href")
+                    title = card["title"]
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"]
                     
                     if link and not link.startswith("http"):
                         link = f"https://apna.co{link}"
@@ -62,3 +84,20 @@ class ApnaScraper(BaseScraper):
             await self._safe_close()
             
         return jobs
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a jobs API item to our raw job format."""
+        link = as_text(record["link"]) or ""
+        if link.startswith("/"):
+            link = f"https://apna.co{link}"
+        elif link and not link.startswith("http"):
+            # Bare job slug
+            link = f"https://apna.co/job/{link}"
+        
+        return {
+            "title": as_text(record["title"]),
+            "company": as_text(record["company"]) or "Unknown Company",
+            "location": as_text(record["location"]) or location,
+            "apply_link": link,
+            "description": as_text(record["description"]) or f"View details on Apna: {link}"
+        }
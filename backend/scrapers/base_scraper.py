@@ -1,18 +1,146 @@
 import logging
 import asyncio
 import random
+from collections import Counter, defaultdict
 from typing import List, Dict, Any, Optional, Tuple
 from playwright.async_api import Page, BrowserContext
 from fake_useragent import UserAgent
 from .browser_pool import get_browser_pool
+from .response_capture import ResponseCapture, pick
+from .html_extract import extract_cards_from_html
+from .fetch_tiers import get_fetch_tiers, TIER_HTTP, TIER_BROWSER
+from .politeness import get_politeness_policy
+from .debug_artifacts import get_debug_artifacts
+from utils.http_client import get_http_pool
+from utils.job_ids import stable_job_id
 
 logger = logging.getLogger(__name__)
 
+# Runs inside the page: reads every card's fields in a single round trip.
+# Card selectors are tried in order (first with matches wins); each field tries its
+# selectors in order until one yields a non-empty value. ":scope" is the card itself.
+EXTRACT_CARDS_JS = """
+({cardSelectors, fields, limit}) => {
+    let cards = [];
+    for (const selector of cardSelectors) {
+        cards = Array.from(document.querySelectorAll(selector));
+        if (cards.length) break;
+    }
+    if (limit) cards = cards.slice(0, limit);
+
+    const read = (el, attr) => attr ? el.getAttribute(attr) : (el.innerText || el.textContent || "").trim();
+
+    return cards.map(card => {
+        const record = {};
+        for (const [name, spec] of Object.entries(fields)) {
+            let value = spec.many ? [] : null;
+            for (const selector of spec.selectors) {
+                const els = selector === ":scope" ? [card]
+                    : spec.many ? Array.from(card.querySelectorAll(selector))
+                    : [card.querySelector(selector)].filter(Boolean);
+                const values = els.map(el => read(el, spec.attr)).filter(v => v !== null && v !== "");
+                if (values.length) {
+                    value = spec.many ? values : values[0];
+                    break;
+                }
+            }
+            record[name] = value;
+        }
+        return record;
+    });
+}
+"""
+
+# Runs inside the page: resolves true once the DOM has gone `quietMs` without a
+# mutation, or false at `timeoutMs`. Before the first mutation the window is 3x
+# longer, so a page that hasn't started rendering isn't taken for a finished one.
+DOM_QUIET_JS = """
+({quietMs, timeoutMs}) => new Promise(resolve => {
+    let timer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => done(true), quietMs);
+    });
+    const done = (quiet) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(deadline);
+        resolve(quiet);
+    };
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(() => done(true), quietMs * 3);
+    deadline = setTimeout(() => done(false), timeoutMs);
+})
+"""
+
+# Readiness signals returned by BaseScraper._wait_ready, in priority order
+READY_CARDS = "cards"
+READY_RESPONSE = "response"
+READY_QUIET = "quiet"
+READY_TIMEOUT = "timeout"
+
+# Which signal ended each readiness wait, per source (for the metrics endpoint)
+_readiness_stats: Dict[str, Counter] = defaultdict(Counter)
+
+
+def readiness_snapshot() -> Dict[str, Dict[str, int]]:
+    """How each source's readiness waits ended, e.g. {"Naukri": {"response": 12, "cards": 3}}."""
+    return {source: dict(counts) for source, counts in _readiness_stats.items()}
+
+
+def card_field(*selectors: str, attr: str = None, many: bool = False) -> Dict[str, Any]:
+    """
+    Declare a card field for BaseScraper._extract_cards.
+
+    Args:
+        selectors: CSS selectors relative to the card, tried in order (":scope" = the card)
+        attr: Read this attribute instead of the element's text
+        many: Return a list with every match of the first selector that matches
+    """
+    return {"selectors": list(selectors), "attr": attr, "many": many}
+
+
+class ScraperBlockedError(Exception):
+    """
+    Raised when a site serves a bot challenge or login wall instead of results.
+    ScraperManager counts it as a failure for the source's circuit breaker.
+    """
+    pass
+
 class BaseScraper:
+    # Declarative card extraction (see _extract_cards): card selectors in priority
+    # order and a card_field() per output field
+    CARD_SELECTORS: List[str] = []
+    CARD_FIELDS: Dict[str, Dict[str, Any]] = {}
+    # Response interception (see _capture_api_responses): URL substrings of the site's
+    # JSON search endpoint, and output field -> candidate keys (dotted paths) per job item
+    API_RESPONSE_PATTERNS: List[str] = []
+    API_FIELDS: Dict[str, List[str]] = {}
+    API_RESPONSE_TIMEOUT = 8.0
+    # Tiered fetch (see _fetch_cards_http): scrapers whose results are server-rendered
+    # try a plain HTTP GET before leasing a browser page
+    HTTP_FAST_PATH = False
+    # Markers of interstitial challenge pages (Cloudflare, DataDome, PerimeterX, Akamai), matched in
+    # the lowercased head of the page. Not a bare "captcha": ordinary pages load reCAPTCHA for forms
+    BOT_CHALLENGE_MARKERS = ("cf-chl", "challenge-platform", "<title>just a moment", "<title>attention required",
+                             "captcha-delivery.com", "px-captcha", "<title>access denied", "verify you are human")
+    # Readiness (see _wait_ready): deadline in seconds and DOM quiescence window in ms
+    READY_TIMEOUT = 15.0
+    DOM_QUIET_MS = 800
+
     def __init__(self):
         self.ua = UserAgent()
         self._page: Optional[Page] = None
         self._context: Optional[BrowserContext] = None
+        # Pages leased per asyncio task: ScraperManager runs several pages of one
+        # scraper concurrently, so self._page alone would hand back the wrong context
+        self._leases: Dict[Any, Tuple[Page, BrowserContext]] = {}
+
+    @property
+    def source_name(self) -> str:
+        """Source key as used by ScraperManager (e.g. NaukriScraper -> "Naukri")."""
+        return self.__class__.__name__.replace("Scraper", "")
 
     async def _get_page(self) -> Tuple[Page, BrowserContext]:
         """
@@ -22,22 +150,203 @@ class BaseScraper:
             Tuple of (Page, BrowserContext)
         """
         pool = await get_browser_pool()
-        page, context = await pool.get_page()
+        page, context = await pool.get_page(source=self.source_name)
         self._page = page
         self._context = context
+        self._leases[asyncio.current_task()] = (page, context)
         return page, context
 
     async def _safe_close(self):
-        """Safely close page and context."""
+        """
+        Safely hand the current task's page and context back to the pool. Does nothing
+        if this task holds no lease (e.g. `_get_page` failed): self._page may be another
+        task's page.
+        """
+        lease = self._leases.pop(asyncio.current_task(), None)
+        if lease is None:
+            return
+        page, context = lease
         try:
-            if self._page or self._context:
-                pool = await get_browser_pool()
-                await pool.close_page(self._page, self._context)
+            pool = await get_browser_pool()
+            await pool.close_page(page, context)
+            if self._context is context:
                 self._page = None
                 self._context = None
         except Exception as e:
             logger.debug(f"Error closing page/context: {e}")
 
+    async def _extract_cards(self, page: Page, card_selectors: List[str] = None,
+                             fields: Dict[str, Dict[str, Any]] = None, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Extract all job cards with one page.evaluate call instead of a
+        query_selector/inner_text round trip per field.
+
+        Args:
+            page: Page showing the search results
+            card_selectors: Card selectors in priority order (defaults to CARD_SELECTORS)
+            fields: Field name -> card_field() spec (defaults to CARD_FIELDS)
+            limit: Only extract the first N cards
+
+        Returns:
+            One plain dict per card; missing fields are None (or [] for many=True)
+        """
+        records = await page.evaluate(EXTRACT_CARDS_JS, {
+            "cardSelectors": card_selectors or self.CARD_SELECTORS,
+            "fields": fields or self.CARD_FIELDS,
+            "limit": limit,
+        })
+        return records or []
+
+    def _http_headers(self) -> Dict[str, str]:
+        return {
+            "User-Agent": self.ua.chrome,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+
+    def _is_bot_challenge(self, html: str) -> bool:
+        head = html[:5000].lower()
+        return any(marker in head for marker in self.BOT_CHALLENGE_MARKERS)
+
+    async def _fetch_cards_http(self, url: str, limit: int = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fast tier: fetch `url` through the shared httpx pool and extract CARD_FIELDS
+        from the server-rendered HTML, without a browser page.
+
+        Returns:
+            Card records, or None when the caller should escalate to the browser
+            (fast path disabled or remembered as not working, non-200 response,
+            bot challenge, or no cards without JavaScript)
+        """
+        tiers = get_fetch_tiers()
+        if not self.HTTP_FAST_PATH or tiers.preferred(self.source_name) != TIER_HTTP:
+            return None
+        try:
+            # No retries: a challenge or 5xx is answered by escalating, not by hammering
+            await get_politeness_policy().wait(url)
+            response = await get_http_pool().request("GET", url, max_retries=0, headers=self._http_headers())
+            html = response.text
+            if response.status_code != 200:
+                reason = f"HTTP {response.status_code}"
+            elif self._is_bot_challenge(html):
+                reason = "bot challenge"
+            else:
+                cards = extract_cards_from_html(html, self.CARD_SELECTORS, self.CARD_FIELDS, limit)
+                if cards:
+                    tiers.record(self.source_name, TIER_HTTP)
+                    logger.info(f"{self.source_name}: {len(cards)} cards via HTTP fast path")
+                    return cards
+                reason = "no cards in server-rendered HTML"
+        except Exception as e:
+            reason = f"{e.__class__.__name__}: {e}"
+        logger.info(f"{self.source_name}: HTTP fast path failed ({reason}), escalating to browser")
+        tiers.record(self.source_name, TIER_BROWSER, reason)
+        return None
+
+    def _capture_api_responses(self, page: Page) -> Optional[ResponseCapture]:
+        """
+        Start listening for the site's search API responses. Call before page.goto().
+        Returns None for scrapers without API_RESPONSE_PATTERNS.
+        """
+        if not self.API_RESPONSE_PATTERNS:
+            return None
+        title_keys = [path.split(".")[0] for path in self.API_FIELDS.get("title", [])]
+        return ResponseCapture(page, self.API_RESPONSE_PATTERNS, title_keys)
+
+    async def _api_records(self, capture: Optional[ResponseCapture], timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        Wait for a captured search payload and map each job item through API_FIELDS.
+        An empty list means no payload was seen and the caller should fall back to the DOM.
+
+        After `_wait_ready`, `timeout` defaults to what is left of its deadline: the DOM
+        can go quiet before the search XHR lands. If cards already rendered, the DOM
+        fallback is ready, so a payload that isn't in yet isn't waited for.
+        """
+        if capture is None:
+            return []
+        if timeout is None:
+            if capture.ready_deadline is None:
+                timeout = self.API_RESPONSE_TIMEOUT
+            elif capture.ready == READY_CARDS:
+                timeout = 0
+            else:
+                timeout = max(0.0, capture.ready_deadline - asyncio.get_running_loop().time())
+        try:
+            items = await capture.wait(timeout)
+        finally:
+            capture.detach()
+        if items:
+            logger.info(f"{self.source_name}: using {len(items)} jobs from the search API response")
+        return [{name: pick(item, paths) for name, paths in self.API_FIELDS.items()} for item in items]
+
+    async def _navigate(self, page: Page, url: str, **kwargs):
+        """page.goto(url) once the domain's politeness slot is due (see PolitenessPolicy)."""
+        await get_politeness_policy().wait(url)
+        return await page.goto(url, **kwargs)
+
+    async def _wait_ready(self, page: Page, card_selectors: List[str] = None,
+                          capture: Optional[ResponseCapture] = None, timeout: float = None,
+                          quiet_ms: int = None) -> str:
+        """
+        Wait until a results page is usable instead of sleeping a fixed time: returns
+        on the first of a card selector matching, the captured search response
+        arriving, or the DOM going quiet, with READY_TIMEOUT as the deadline.
+
+        Args:
+            page: Page that was just navigated
+            card_selectors: Any of these matching counts as ready (defaults to CARD_SELECTORS;
+                [] waits for DOM quiescence only, e.g. after scrolling)
+            capture: ResponseCapture whose first payload counts as ready
+            timeout: Deadline in seconds (defaults to READY_TIMEOUT)
+            quiet_ms: DOM quiescence window (defaults to DOM_QUIET_MS)
+
+        Returns:
+            The signal that fired: READY_CARDS, READY_RESPONSE, READY_QUIET or READY_TIMEOUT
+        """
+        timeout = timeout or self.READY_TIMEOUT
+        selectors = self.CARD_SELECTORS if card_selectors is None else card_selectors
+        waiters = {}
+        if selectors:
+            waiters[asyncio.ensure_future(page.wait_for_selector(
+                ", ".join(selectors), state="attached", timeout=timeout * 1000))] = READY_CARDS
+        if capture is not None:
+            waiters[asyncio.ensure_future(capture.wait_found())] = READY_RESPONSE
+        waiters[asyncio.ensure_future(page.evaluate(DOM_QUIET_JS, {
+            "quietMs": quiet_ms or self.DOM_QUIET_MS,
+            "timeoutMs": timeout * 1000,
+        }))] = READY_QUIET
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        started = loop.time()
+        signal = READY_TIMEOUT
+        pending = set(waiters)
+        try:
+            while pending and signal == READY_TIMEOUT:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                # A waiter that failed (selector timeout, page closed) or a quiet check
+                # that hit its deadline is not a readiness signal
+                fired = {waiters[t] for t in done if t.exception() is None and t.result() is not False}
+                signal = next((s for s in (READY_CARDS, READY_RESPONSE, READY_QUIET) if s in fired), READY_TIMEOUT)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if capture is not None:
+            capture.ready, capture.ready_deadline = signal, deadline
+        _readiness_stats[self.source_name][signal] += 1
+        logger.debug(f"{self.source_name}: ready on {signal} after {loop.time() - started:.2f}s")
+        return signal
+
+    async def _capture_failure(self, page: Page, reason: str):
+        """Sampled debug snapshot of `page` (see DebugArtifactRecorder); written in the background."""
+        await get_debug_artifacts().capture(self.source_name, page, reason)
+
     async def _random_delay(self, min_seconds=2, max_seconds=5):
         """Add random delay to avoid detection."""
         delay = random.uniform(min_seconds, max_seconds)
@@ -56,7 +365,7 @@ class BaseScraper:
             Normalized job dictionary
         """
         # Generate a unique ID based on link and title
-        job_id = abs(hash(raw_job.get("apply_link", "") + raw_job.get("title", ""))) % (10 ** 8)
+        job_id = stable_job_id((raw_job.get("apply_link") or "") + (raw_job.get("title") or ""))
         
         return {
             "id": job_id,
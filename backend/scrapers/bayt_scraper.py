@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 import urllib.parse
 
 logger = logging.getLogger(__name__)
@@ -10,6 +10,16 @@ class BaytScraper(BaseScraper):
     """
     Scraper for Bayt.com (Middle East).
     """
+    # Selector Update based on Browser Inspection (Jan 2026)
+    CARD_SELECTORS = ["li[data-js-job]"]
+    CARD_FIELDS = {
+        "title": card_field("h2 a[data-js-aid='jobID']"),
+        "link": card_field("h2 a[data-js-aid='jobID']", attr="href"),
+        # Company (b for confidential, a.t-bold for others)
+        "company": card_field("b, .t-bold"),
+        "location": card_field(".t-mute"),
+    }
+
     async def search_jobs(self, query: str, location: str = "Dubai", page: int = 1, country: str = "UAE", **kwargs) -> List[Dict[str, Any]]:
         jobs = []
         try:
@@ -27,7 +37,7 @@ class BaytScraper(BaseScraper):
             
             page_obj, context = await self._get_page()
             
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
             # Wait for list
             # Selector Update based on Browser Inspection (Jan 2026)
@@ -39,21 +49,14 @@ class BaytScraper(BaseScraper):
                 return []
             
             # Select all job cards
-            cards = await page_obj.query_selector_all("li[data-js-job]")
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    # Title
-                    title_el = await card.query_selector("h2 a[data-js-aid='jobID']")
-                    # Company (b for confidential, a.t-bold for others)
-                    company_el = await card.query_selector("b, .t-bold")
-                    # Location
-                    location_el = await card.query_selector(".t-mute")
-                    
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await title_el.get_attribute("href") if title_el else ""
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.bayt.com{link}"
@@ -1,15 +1,139 @@
 import asyncio
 import logging
-from typing import Optional, Tuple
+import os
+import time
+from collections import Counter, deque
+from typing import Optional, Tuple, Dict, Any, Deque, Set
+from urllib.parse import urlsplit
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 from fake_useragent import UserAgent
+from utils.hedging import LatencyTracker
+from .routing_policy import RoutingPolicy, get_routing_policy
 
 logger = logging.getLogger(__name__)
 
+CHROMIUM_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+    '--window-size=1920x1080',
+    '--disable-blink-features=AutomationControlled', # Critical for stealth
+]
+
+# Context profiles: contexts are only reused between sources with the same profile
+CONTEXT_PROFILES: Dict[str, Dict[str, str]] = {
+    "india": {"locale": "en-US", "timezone_id": "Asia/Kolkata", "ua_family": "chrome"},
+    "gulf": {"locale": "en-US", "timezone_id": "Asia/Dubai", "ua_family": "chrome"},
+    "us": {"locale": "en-US", "timezone_id": "America/New_York", "ua_family": "chrome"},
+}
+DEFAULT_PROFILE = "india"
+
+# Source name -> profile (sources not listed use DEFAULT_PROFILE)
+SOURCE_PROFILES: Dict[str, str] = {
+    "NaukriGulf": "gulf",
+    "Bayt": "gulf",
+    "GulfTalent": "gulf",
+    "ZipRecruiter": "us",
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+
+    window.chrome = {
+        runtime: {}
+    };
+"""
+
+
+def chromium_rss_bytes(root_pid: int = None) -> Optional[int]:
+    """
+    Resident memory of the Chromium processes descended from `root_pid` (this
+    process by default), read from /proc. None where /proc isn't available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children: Dict[int, list] = {}
+    processes: Dict[int, Tuple[str, int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces and parentheses: it runs to the last ")"
+        name = stat[stat.find("(") + 1:stat.rfind(")")].lower()
+        fields = stat[stat.rfind(")") + 2:].split()
+        pid, ppid, rss_pages = int(entry), int(fields[1]), int(fields[21])
+        processes[pid] = (name, rss_pages)
+        children.setdefault(ppid, []).append(pid)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = list(children.get(root_pid or os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        name, rss_pages = processes[pid]
+        if "chrom" in name or "headless_shell" in name:
+            total += rss_pages * page_size
+        pending.extend(children.get(pid, []))
+    return total
+
+
+class PooledContext:
+    """
+    A warm browser context (and its page) owned by the pool.
+    `policy` is swapped on every lease so one context can serve several sources.
+    """
+    def __init__(self, profile: str, context: BrowserContext, page: Page, browser: Browser = None):
+        self.profile = profile
+        self.context = context
+        self.page = page
+        self.browser = browser
+        self.uses = 0
+        self.leased_at: Optional[float] = None
+        self.policy: Optional[RoutingPolicy] = None
+        self.origins: Set[str] = set()  # every origin a frame navigated to since the last reset
+        
+    def track_navigation(self, request):
+        if request.is_navigation_request():
+            parts = urlsplit(request.url)
+            if parts.scheme in ("http", "https"):
+                self.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
 class BrowserPool:
     """
     Singleton browser pool for sharing Playwright instances across scrapers.
     Reduces memory usage and eliminates browser startup overhead.
+    
+    Contexts are pooled per profile (locale, timezone, UA family): released contexts
+    are reset (cookies, the storage of every origin their frames visited, a fresh tab)
+    and handed to the next scraper instead of being torn down, and recycled after BROWSER_CONTEXT_MAX_USES leases or once their
+    JS heap grows past BROWSER_CONTEXT_MAX_HEAP_MB.
+    
+    Memory governor: every open context is tracked (not just a counter) and the
+    Chromium processes' RSS is sampled every BROWSER_MEMORY_CHECK_SECONDS. Past
+    BROWSER_MAX_RSS_MB or BROWSER_MAX_CONTEXTS open contexts a fresh browser is
+    launched for new leases while the old one drains: it is closed once its leased
+    contexts come back, or after BROWSER_DRAIN_TIMEOUT_SECONDS.
+    
+    Fixtures (benchmarks/bench_scrapers.py): with `replay` set, requests the routing
+    policy lets through are answered from recorded HAR files instead of the network;
+    with `record_har_dir` set, each new context records its traffic to a HAR file there.
     """
     _instance: Optional['BrowserPool'] = None
     _lock = asyncio.Lock()
@@ -29,8 +153,39 @@ class BrowserPool:
         self.browser: Optional[Browser] = None
         self.ua = UserAgent()
         self._semaphore = asyncio.Semaphore(8)  # Increased from 3 to 8 for higher concurrency
-        self._active_contexts = 0
-        
+        self._contexts: Set[BrowserContext] = set()  # every open context, leased or idle
+        # Request interception stats (aborted by resource type / tracker)
+        self.blocked_requests: Counter = Counter()
+        self.allowed_requests = 0
+        # Warm context pool
+        self.pool_size = int(os.getenv("BROWSER_CONTEXT_POOL_SIZE", "4"))  # idle contexts kept per profile
+        self.max_uses = int(os.getenv("BROWSER_CONTEXT_MAX_USES", "20"))
+        self.max_heap_bytes = float(os.getenv("BROWSER_CONTEXT_MAX_HEAP_MB", "150")) * 1024 * 1024
+        self.prewarm_count = int(os.getenv("BROWSER_CONTEXT_PREWARM", "2"))
+        self._idle: Dict[str, Deque[PooledContext]] = {}
+        self._leased: Dict[BrowserContext, PooledContext] = {}
+        self.pool_stats: Counter = Counter()
+        self.acquire_latency = LatencyTracker(window=200, min_samples=1)
+        self._prewarm_task: Optional[asyncio.Task] = None
+        # Memory governor
+        self.max_rss_bytes = float(os.getenv("BROWSER_MAX_RSS_MB", "1500")) * 1024 * 1024
+        self.max_contexts = int(os.getenv("BROWSER_MAX_CONTEXTS", "32"))
+        self.memory_check_interval = float(os.getenv("BROWSER_MEMORY_CHECK_SECONDS", "15"))
+        self.drain_timeout = float(os.getenv("BROWSER_DRAIN_TIMEOUT_SECONDS", "60"))
+        self.rss_bytes: Optional[int] = None
+        self._rss_sampled_at = 0.0
+        self._launched_at: Optional[float] = None
+        self.relaunches: Counter = Counter()  # reason -> count
+        self._retiring: Dict[Browser, asyncio.Task] = {}  # draining browser -> close task
+        self._returned = asyncio.Event()  # set whenever a lease comes back
+        # Offline fixtures (utils.replay.HarReplay) / HAR recording directory
+        self.replay = None
+        self.record_har_dir: Optional[str] = None
+    
+    @property
+    def _active_contexts(self) -> int:
+        return len(self._contexts)
+    
     async def initialize(self):
         """Initialize the browser pool if not already initialized."""
         async with self._lock:
@@ -39,101 +194,310 @@ class BrowserPool:
                 
             try:
                 self.playwright = await async_playwright().start()
-                self.browser = await self.playwright.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-accelerated-2d-canvas',
-                        '--disable-gpu',
-                        '--window-size=1920x1080',
-                        '--disable-blink-features=AutomationControlled', # Critical for stealth
-                    ]
-                )
+                await self._launch_browser()
                 logger.info("Browser pool initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize browser pool: {e}")
                 raise
+                
+            if self.prewarm_count > 0:
+                self._prewarm_task = asyncio.create_task(self.prewarm(DEFAULT_PROFILE, self.prewarm_count))
+    
+    async def _launch_browser(self):
+        self.browser = await self.playwright.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
+        self._launched_at = time.monotonic()
+        self._rss_sampled_at = 0.0
+    
+    async def prewarm(self, profile: str = DEFAULT_PROFILE, count: int = 2):
+        """Create idle contexts ahead of the first scrape."""
+        for _ in range(count):
+            idle = self._idle.setdefault(profile, deque())
+            if len(idle) >= self.pool_size:
+                return
+            try:
+                idle.append(await self._create_context(profile))
+            except Exception as e:
+                logger.debug(f"Context prewarm failed: {e}")
+                return
+    
+    async def _create_context(self, profile: str) -> PooledContext:
+        settings = CONTEXT_PROFILES.get(profile, CONTEXT_PROFILES[DEFAULT_PROFILE])
+        recording = {}
+        if self.record_har_dir:
+            # Written when the context closes
+            recording = {
+                "record_har_path": os.path.join(self.record_har_dir, f"context-{self.pool_stats['created']}.har"),
+                "record_har_content": "embed",
+            }
+        # Create new context with stealth settings
+        context = await self.browser.new_context(
+            **recording,
+            user_agent=getattr(self.ua, settings["ua_family"], self.ua.random),
+            viewport={'width': 1920, 'height': 1080},
+            locale=settings["locale"],
+            timezone_id=settings["timezone_id"],
+            permissions=['geolocation'],
+            extra_http_headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120"',
+                'Sec-Ch-Ua-Mobile': '?0',
+                'Sec-Ch-Ua-Platform': '"macOS"',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'none',
+                'Sec-Fetch-User': '?1',
+            }
+        )
+        
+        # Add stealth scripts to avoid detection (context-wide, so replacement pages get them too)
+        await context.add_init_script(STEALTH_SCRIPT)
+        
+        # Track the context until it closes, however that happens (pool, scraper or browser exit)
+        self._contexts.add(context)
+        context.on("close", lambda _: self._contexts.discard(context))
+        
+        page = await context.new_page()
+        entry = PooledContext(profile, context, page, browser=self.browser)
+        context.on("request", entry.track_navigation)
+        
+        # Abort resources the scrapers never read, per the current lease's policy
+        await context.route("**/*", lambda route: self._route_request(route, entry.policy))
+        
+        self.pool_stats["created"] += 1
+        return entry
     
-    async def get_page(self) -> Tuple[Page, BrowserContext]:
+    async def get_page(self, source: str = None) -> Tuple[Page, BrowserContext]:
         """
-        Get a new page with a fresh browser context.
-        Uses semaphore to limit concurrent contexts.
+        Get a page with a warm browser context for the source's profile.
+        Uses semaphore to limit concurrent context creation.
+        Requests are filtered through the source's routing policy (images, fonts,
+        stylesheets, media and tracker domains are aborted by default).
         
+        Args:
+            source: Scraper source name, used to pick the profile and routing policy
+            
         Returns:
-            Tuple of (Page, BrowserContext) - caller must close both when done
+            Tuple of (Page, BrowserContext) - caller must hand both back via close_page
         """
         await self.initialize()
+        await self._govern()
         
+        started = time.monotonic()
+        profile = SOURCE_PROFILES.get(source, DEFAULT_PROFILE)
         async with self._semaphore:
             try:
-                # Create new context with stealth settings
-                context = await self.browser.new_context(
-                    user_agent=self.ua.random,
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='en-US',
-                    timezone_id='Asia/Kolkata',
-                    permissions=['geolocation'],
-                    extra_http_headers={
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Upgrade-Insecure-Requests': '1',
-                        'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120"',
-                        'Sec-Ch-Ua-Mobile': '?0',
-                        'Sec-Ch-Ua-Platform': '"macOS"',
-                        'Sec-Fetch-Dest': 'document',
-                        'Sec-Fetch-Mode': 'navigate',
-                        'Sec-Fetch-Site': 'none',
-                        'Sec-Fetch-User': '?1',
-                    }
-                )
-                
-                # Create new page
-                page = await context.new_page()
-                
-                # Add stealth scripts to avoid detection
-                await page.add_init_script("""
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                    
-                    Object.defineProperty(navigator, 'plugins', {
-                        get: () => [1, 2, 3, 4, 5]
-                    });
+                entry = None
+                idle = self._idle.get(profile)
+                while idle and entry is None:
+                    candidate = idle.popleft()
+                    try:
+                        if candidate.page.is_closed():
+                            candidate.page = await candidate.context.new_page()
+                        entry = candidate
+                    except Exception:
+                        # Context died while idle
+                        await self._discard(candidate)
+                        
+                if entry is None:
+                    entry = await self._create_context(profile)
+                else:
+                    self.pool_stats["reused"] += 1
                     
-                    Object.defineProperty(navigator, 'languages', {
-                        get: () => ['en-US', 'en']
-                    });
-                    
-                    window.chrome = {
-                        runtime: {}
-                    };
-                """)
-                
-                self._active_contexts += 1
-                logger.debug(f"Created new page (active contexts: {self._active_contexts})")
+                entry.uses += 1
+                entry.leased_at = time.monotonic()
+                entry.policy = get_routing_policy(source)
+                self._leased[entry.context] = entry
+                self.pool_stats["acquired"] += 1
+                self.acquire_latency.record(time.monotonic() - started)
+                logger.debug(f"Leased {profile} context (use {entry.uses}, active contexts: {self._active_contexts})")
                 
-                return page, context
+                return entry.page, entry.context
                 
             except Exception as e:
                 logger.error(f"Error creating page: {e}")
                 raise
     
+    async def _govern(self):
+        """Relaunch the browser once it holds too many contexts or too much memory."""
+        if self._retiring or self.browser is None:
+            # A relaunch is already draining; its old browser is still counted
+            return
+        reason = None
+        if self._active_contexts >= self.max_contexts:
+            reason = "contexts"
+        elif time.monotonic() - self._rss_sampled_at >= self.memory_check_interval:
+            self._rss_sampled_at = time.monotonic()
+            self.rss_bytes = await asyncio.to_thread(chromium_rss_bytes)
+            if self.rss_bytes is not None and self.rss_bytes > self.max_rss_bytes:
+                reason = "memory"
+        if reason:
+            await self.recycle_browser(reason)
+    
+    async def recycle_browser(self, reason: str = "manual"):
+        """
+        Launch a fresh browser for new leases and drain the current one: idle
+        contexts close now, leased ones when their scrapers hand them back.
+        """
+        async with self._lock:
+            old = self.browser
+            if old is None or old in self._retiring:
+                return
+            logger.warning(
+                f"Recycling browser ({reason}): {self._active_contexts} open contexts, "
+                f"RSS {round(self.rss_bytes / 1024 / 1024) if self.rss_bytes else '?'} MB"
+            )
+            for idle in self._idle.values():
+                while idle:
+                    await self._discard(idle.popleft())
+            await self._launch_browser()
+            self.relaunches[reason] += 1
+            self._retiring[old] = asyncio.create_task(self._drain(old))
+    
+    async def _drain(self, browser: Browser):
+        """Close a retired browser once none of its contexts are leased, or at the drain timeout."""
+        deadline = time.monotonic() + self.drain_timeout
+        while any(entry.browser is browser for entry in self._leased.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.pool_stats["drain_timeouts"] += 1
+                logger.warning("Browser drain timed out, closing it with contexts still leased")
+                break
+            self._returned.clear()
+            try:
+                await asyncio.wait_for(self._returned.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        for context, entry in list(self._leased.items()):
+            if entry.browser is browser:
+                del self._leased[context]
+                self._contexts.discard(context)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing retired browser: {e}")
+        self._retiring.pop(browser, None)
+    
+    async def _route_request(self, route, policy: Optional[RoutingPolicy]):
+        """Abort requests blocked by the policy, let everything else through."""
+        request = route.request
+        try:
+            if policy is not None and policy.should_block(request.resource_type, request.url):
+                self.blocked_requests[request.resource_type] += 1
+                await route.abort()
+            elif self.replay is not None:
+                self.allowed_requests += 1
+                await self.replay.fulfill(route)
+            else:
+                self.allowed_requests += 1
+                await route.continue_()
+        except Exception as e:
+            # Page/context closed while the request was in flight
+            logger.debug(f"Route handling failed for {request.url}: {e}")
+    
+    async def _reset(self, entry: PooledContext) -> bool:
+        """
+        Wipe per-site state from a released context. Returns False if the context
+        should be recycled instead (too many uses, heap growth, or reset failed).
+        
+        Storage (localStorage, IndexedDB, Cache Storage, service workers) is cleared
+        over CDP for every origin the context's frames navigated to, not just the one
+        the page ended on, and the page is replaced by a fresh tab so no
+        sessionStorage or history carries over. This works the same whether or not
+        the scraper already closed the page.
+        """
+        if entry.uses >= self.max_uses:
+            self.pool_stats["recycled_uses"] += 1
+            return False
+        try:
+            for extra in entry.context.pages:
+                if extra is not entry.page:
+                    await extra.close()
+            if not entry.page.is_closed():
+                heap = await entry.page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : 0")
+                if heap and heap > self.max_heap_bytes:
+                    self.pool_stats["recycled_memory"] += 1
+                    return False
+                await entry.page.close()
+                
+            entry.page = await entry.context.new_page()
+            if entry.origins:
+                session = await entry.context.new_cdp_session(entry.page)
+                try:
+                    for origin in sorted(entry.origins):
+                        await session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                finally:
+                    await session.detach()
+                entry.origins.clear()
+            await entry.context.clear_cookies()
+            return True
+        except Exception as e:
+            logger.debug(f"Context reset failed, recycling: {e}")
+            self.pool_stats["recycled_errors"] += 1
+            return False
+    
+    async def _discard(self, entry: PooledContext):
+        try:
+            await entry.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing context: {e}")
+        self._contexts.discard(entry.context)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool and interception counters, for the metrics endpoint."""
+        acquired = self.pool_stats["acquired"]
+        now = time.monotonic()
+        oldest_lease = min((e.leased_at for e in self._leased.values() if e.leased_at), default=None)
+        return {
+            "active_contexts": self._active_contexts,
+            "leased_contexts": len(self._leased),
+            "oldest_lease_seconds": round(now - oldest_lease, 1) if oldest_lease else None,
+            "idle_contexts": {profile: len(idle) for profile, idle in self._idle.items()},
+            "context_pool": dict(self.pool_stats),
+            "reuse_rate": round(self.pool_stats["reused"] / acquired, 3) if acquired else None,
+            "acquire_wait": self.acquire_latency.snapshot(),
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": dict(self.blocked_requests),
+            "memory": {
+                "rss_mb": round(self.rss_bytes / 1024 / 1024, 1) if self.rss_bytes is not None else None,
+                "max_rss_mb": round(self.max_rss_bytes / 1024 / 1024),
+                "max_contexts": self.max_contexts,
+                "browser_age_seconds": round(now - self._launched_at) if self._launched_at else None,
+                "draining_browsers": len(self._retiring),
+                "relaunches": dict(self.relaunches),
+            },
+        }
+    
     async def close_page(self, page: Page, context: BrowserContext):
         """
-        Close a page and its context.
+        Release a page and its context. Pooled contexts are reset and kept warm
+        for the next lease; anything else is closed.
         
         Args:
             page: The page to close
             context: The browser context to close
         """
+        entry = self._leased.pop(context, None) if context is not None else None
+        if entry is not None:
+            entry.policy = None
+            entry.leased_at = None
+            idle = self._idle.setdefault(entry.profile, deque())
+            if entry.browser is self.browser and self.browser is not None and len(idle) < self.pool_size and await self._reset(entry):
+                idle.append(entry)
+                logger.debug(f"Returned {entry.profile} context to pool (idle: {len(idle)})")
+            else:
+                await self._discard(entry)
+                logger.debug(f"Closed {entry.profile} context (active contexts: {self._active_contexts})")
+            self._returned.set()
+            return
+            
         try:
             if page and not page.is_closed():
                 await page.close()
             if context:
                 await context.close()
-            self._active_contexts = max(0, self._active_contexts - 1)
+                self._contexts.discard(context)
             logger.debug(f"Closed page (active contexts: {self._active_contexts})")
         except Exception as e:
             logger.debug(f"Error closing page/context: {e}")
@@ -142,6 +506,19 @@ class BrowserPool:
         """Shutdown the browser pool and cleanup resources."""
         async with self._lock:
             try:
+                for idle in self._idle.values():
+                    while idle:
+                        await self._discard(idle.popleft())
+                self._leased.clear()
+                for task in self._retiring.values():
+                    task.cancel()
+                for browser in list(self._retiring):
+                    try:
+                        await browser.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing retired browser: {e}")
+                self._retiring.clear()
+                self._contexts.clear()
                 if self.browser:
                     await self.browser.close()
                     self.browser = None
@@ -158,8 +535,8 @@ class BrowserPool:
         instance = cls()
         await instance.initialize()
         return instance
-
-
+        
+        
 # Global instance
 _browser_pool: Optional[BrowserPool] = None
 
@@ -169,3 +546,10 @@ async def get_browser_pool() -> BrowserPool:
     if _browser_pool is None:
         _browser_pool = await BrowserPool.get_instance()
     return _browser_pool
+
+
+def browser_pool_snapshot() -> Dict[str, Any]:
+    """Browser pool metrics without launching Chromium if it isn't running yet."""
+    if _browser_pool is None:
+        return {}
+    return _browser_pool.snapshot()
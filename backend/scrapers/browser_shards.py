@@ -0,0 +1,257 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARD_POLICIES = ("affinity", "least_loaded")
+
+
+def _picklable_error(error: BaseException) -> BaseException:
+    """The exception itself if it survives pickling (so callers can catch its type), else a RuntimeError."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+async def _serve(conn):
+    """
+    Worker process main loop: run scraper calls from the parent concurrently on this
+    process's own event loop and browser pool, and send back each result as it completes.
+    """
+    from scrapers.browser_pool import browser_pool_snapshot, get_browser_pool
+
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue = asyncio.Queue()
+    tasks: Dict[int, asyncio.Task] = {}
+    instances: Dict[type, Any] = {}  # one scraper per class, reused across calls
+
+    def on_readable():
+        try:
+            while conn.poll():
+                inbox.put_nowait(conn.recv())
+        except (EOFError, OSError):
+            # Parent went away
+            loop.remove_reader(conn.fileno())
+            inbox.put_nowait(("stop",))
+
+    async def run(call_id: int, scraper_cls: type, args: tuple, kwargs: dict):
+        try:
+            scraper = instances.get(scraper_cls)
+            if scraper is None:
+                scraper = instances[scraper_cls] = scraper_cls()
+            jobs = await scraper.search_jobs(*args, **kwargs)
+            conn.send(("result", call_id, jobs, browser_pool_snapshot()))
+        except asyncio.CancelledError:
+            conn.send(("cancelled", call_id, None, browser_pool_snapshot()))
+        except Exception as e:
+            conn.send(("error", call_id, _picklable_error(e), browser_pool_snapshot()))
+        finally:
+            tasks.pop(call_id, None)
+
+    loop.add_reader(conn.fileno(), on_readable)
+    try:
+        while True:
+            message = await inbox.get()
+            if message[0] == "call":
+                _, call_id, scraper_cls, args, kwargs = message
+                tasks[call_id] = asyncio.create_task(run(call_id, scraper_cls, args, kwargs))
+            elif message[0] == "cancel":
+                task = tasks.get(message[1])
+                if task is not None:
+                    task.cancel()
+            elif message[0] == "stop":
+                break
+    finally:
+        for task in list(tasks.values()):
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        if browser_pool_snapshot():
+            await (await get_browser_pool()).shutdown()
+
+
+def _worker_main(conn):
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(conn))
+    except KeyboardInterrupt:
+        pass
+
+
+class BrowserShard:
+    """One worker process with its own event loop, browser pool and Chromium."""
+    def __init__(self, index: int, mp_context):
+        self.index = index
+        self.mp_context = mp_context
+        self.process = None
+        self.conn = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.calls = 0
+        self.errors = 0
+        self.restarts = 0
+        self.browser: Dict[str, Any] = {}  # last browser pool snapshot reported by the worker
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        if self.process is not None:
+            # Replacing a worker that died (or lost its pipe)
+            self.restarts += 1
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+        parent, child = self.mp_context.Pipe()
+        self.process = self.mp_context.Process(target=_worker_main, args=(child,), daemon=True,
+                                               name=f"browser-shard-{self.index}")
+        self.process.start()
+        child.close()
+        self.conn = parent
+        asyncio.get_running_loop().add_reader(parent.fileno(), self._on_readable)
+        logger.info(f"Browser shard {self.index} started (pid {self.process.pid})")
+
+    def _on_readable(self):
+        try:
+            while self.conn.poll():
+                kind, call_id, payload, browser = self.conn.recv()
+                self.browser = browser
+                future = self.pending.pop(call_id, None)
+                if future is None or future.done():
+                    continue
+                if kind == "result":
+                    future.set_result(payload)
+                elif kind == "error":
+                    self.errors += 1
+                    future.set_exception(payload)
+                else:
+                    future.cancel()
+        except (EOFError, OSError):
+            self._lost()
+
+    def _lost(self):
+        """The worker died: fail its in-flight calls; it is restarted on the next call."""
+        logger.error(f"Browser shard {self.index} exited with {len(self.pending)} calls in flight")
+        try:
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+        except Exception:
+            pass
+        self.conn.close()
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError(f"browser shard {self.index} exited"))
+        self.errors += len(self.pending)
+        self.pending.clear()
+
+    async def call(self, call_id: int, scraper_cls: type, args: tuple, kwargs: dict):
+        if self.conn is None or self.conn.closed or not self.alive:
+            if self.conn is not None and not self.conn.closed:
+                self._lost()
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.pending[call_id] = future
+        self.calls += 1
+        self.conn.send(("call", call_id, scraper_cls, args, kwargs))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Timed out or the search was cancelled: the worker cancels the scrape, closing its page
+            self.pending.pop(call_id, None)
+            if self.conn is not None and not self.conn.closed:
+                self.conn.send(("cancel", call_id))
+            raise
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+            self.conn.send(("stop",))
+        except Exception:
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.process = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "pid": self.process.pid if self.process is not None else None,
+            "alive": self.alive,
+            "in_flight": len(self.pending),
+            "calls": self.calls,
+            "errors": self.errors,
+            "restarts": self.restarts,
+            "active_contexts": self.browser.get("active_contexts"),
+            "memory": self.browser.get("memory"),
+        }
+
+
+class BrowserShards:
+    """
+    Browser scrapes spread over BROWSER_WORKERS worker processes, each with its own
+    event loop, browser pool and Chromium, so page handling and Playwright IPC use
+    more than one core.
+
+    Calls go to a shard by source affinity (the same source always lands on the same
+    worker, which keeps its warm contexts and per-domain politeness in one place) or
+    to the least-loaded shard. Each call's jobs come back as soon as that scrape
+    finishes, so the manager keeps streaming batches in completion order; cancelling
+    a call cancels the scrape in its worker.
+    """
+    def __init__(self, workers: int = None, policy: str = None):
+        self.workers = workers or int(os.getenv("BROWSER_WORKERS", "0"))
+        self.policy = policy or os.getenv("BROWSER_SHARD_POLICY", "affinity")
+        if self.policy not in SHARD_POLICIES:
+            logger.warning(f"Unknown BROWSER_SHARD_POLICY '{self.policy}', using affinity")
+            self.policy = "affinity"
+        # spawn: workers must not inherit the parent's event loop, threads or browser
+        mp_context = multiprocessing.get_context("spawn")
+        self.shards: List[BrowserShard] = [BrowserShard(i, mp_context) for i in range(self.workers)]
+        self._ids = itertools.count()
+
+    def pick(self, source: str) -> BrowserShard:
+        if self.policy == "least_loaded":
+            return min(self.shards, key=lambda shard: (len(shard.pending), shard.calls))
+        return self.shards[zlib.crc32(source.encode()) % len(self.shards)]
+
+    async def run(self, source: str, scraper_cls: type, args: Tuple = (), kwargs: Dict[str, Any] = None):
+        """Run `scraper_cls().search_jobs(*args, **kwargs)` in the source's shard and return its jobs."""
+        return await self.pick(source).call(next(self._ids), scraper_cls, tuple(args), kwargs or {})
+
+    def shutdown(self):
+        for shard in self.shards:
+            shard.stop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "policy": self.policy,
+            "shards": [shard.snapshot() for shard in self.shards],
+        }
+
+
+# Global instance
+_browser_shards: Optional[BrowserShards] = None
+
+def get_browser_shards() -> Optional[BrowserShards]:
+    """The global browser shards, or None when scrapes run in-process (BROWSER_WORKERS=0)."""
+    global _browser_shards
+    if _browser_shards is None and int(os.getenv("BROWSER_WORKERS", "0")) > 0:
+        _browser_shards = BrowserShards()
+    return _browser_shards
+
+
+def browser_shards_snapshot() -> Dict[str, Any]:
+    """Shard metrics without starting worker processes."""
+    if _browser_shards is None:
+        return {}
+    return _browser_shards.snapshot()
@@ -1,12 +1,31 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, READY_CARDS
+from .response_capture import as_text
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class CutshortScraper(BaseScraper):
+    # Cutshort often uses generic classes or dynamic selectors.
+    # Fallback: any element with a title (h3)
+    CARD_SELECTORS = ["div[class*='JobCard'], .job-card", "div:has(h3)"]
+    CARD_FIELDS = {
+        "title": card_field("h3"),
+        "company": card_field("div[class*='company-info'], .company-name"),
+        "link": card_field("a[href*='/jobs/']", attr="href"),
+    }
+    # The search SPA loads its results from Cutshort's public API
+    API_RESPONSE_PATTERNS = ["cutshort.io/api/"]
+    API_FIELDS = {
+        "title": ["headline", "title"],
+        "company": ["companyDetails.name", "company.name", "companyName"],
+        "location": ["locations", "location"],
+        "link": ["publicUrl", "url", "slug"],
+        "skills": ["skills", "allSkills"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on Cutshort.io.
@@ -23,30 +42,30 @@ class CutshortScraper(BaseScraper):
             logger.info(f"Scraping Cutshort: {url}")
             
             page_obj, context = await self._get_page()
-            await page_obj.goto(url, wait_until="networkidle", timeout=30000)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=30000)
             
-            # Wait for content to load
-            await asyncio.sleep(2) # Extra buffer for heavy SPA
+            ready = await self._wait_ready(page_obj, capture=capture)
             
-            # Cutshort often uses generic classes or dynamic selectors
-            # Based on discovery, we look for h3 (title) and company info
-            cards = await page_obj.query_selector_all("div[class*='JobCard'], .job-card")
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "Cutshort") for r in records if r["title"]]
+            
+            # Wait for content to load (heavy SPA)
+            if ready != READY_CARDS:
+                await self._wait_ready(page_obj, card_selectors=self.CARD_SELECTORS[:1], timeout=30)
             
-            if not cards:
-                # Fallback to looking for elements with 'Apply' button
-                cards = await page_obj.query_selector_all("div:has(h3)")
+            # Based on discovery, we look for h3 (title) and company info
+            cards = await self._extract_cards(page_obj)
 
             for card in cards:
                 try:
-                    title_el = await card.query_selector("h3")
-                    company_el = await card.query_selector("div[class*='company-info'], .company-name")
-                    link_el = await card.query_selector("a[href*='/jobs/']")
-                    
-                    if not title_el: continue
+                    if not card["title"]: continue
                     
-                    title = await title_el.inner_text()
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    title = card["title"]
+                    company = card["company"] or "Unknown Company"
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://cutshort.io{link}"
@@ -69,3 +88,18 @@ class CutshortScraper(BaseScraper):
             await self._safe_close()
             
         return jobs
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a search API item to our raw job format."""
+        link = as_text(record["link"]) or ""
+        if link and not link.startswith("http"):
+            link = f"https://cutshort.io{link}" if link.startswith("/") else f"https://cutshort.io/job/{link}"
+        
+        return {
+            "title": as_text(record["title"]),
+            "company": as_text(record["company"]) or "Unknown Company",
+            "location": as_text(record["location"]) or location,
+            "apply_link": link,
+            "skills": [as_text(s) for s in record["skills"] or [] if as_text(s)],
+            "description": f"View details on Cutshort: {link}"
+        }
@@ -0,0 +1,170 @@
+import asyncio
+import gzip
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "debug_dumps")
+# Only the recorder's own files are subject to retention; anything else in the directory is left alone
+ARTIFACT_SUFFIXES = (".html.gz", ".jpg")
+# How long a capture may wait for the page content and the screenshot (seconds)
+SNAPSHOT_TIMEOUT = 2
+
+
+class DebugArtifactRecorder:
+    """
+    Page snapshots (compressed HTML plus a viewport screenshot) for scraper failures
+    such as selector timeouts.
+
+    Keeps debugging cheap when a site blocks us for hours:
+    - sampling: at most one capture per source every DEBUG_ARTIFACTS_MIN_INTERVAL_SECONDS,
+      and then only DEBUG_ARTIFACTS_SAMPLE_RATE of the failures;
+    - the scrape only waits for the page content and screenshot bytes (with a short
+      timeout); gzip and disk writes happen in a background writer fed by a bounded
+      queue, and snapshots are dropped when it is full;
+    - retention: snapshot files (.html.gz, .jpg) older than DEBUG_ARTIFACTS_MAX_AGE_HOURS
+      are removed, then the oldest ones until they take up less than DEBUG_ARTIFACTS_MAX_MB.
+    """
+    def __init__(self, directory: str = None, enabled: bool = None, sample_rate: float = None,
+                 min_interval: float = None, queue_size: int = None, max_bytes: int = None,
+                 max_age: float = None, screenshots: bool = None, rng: random.Random = None):
+        self.directory = directory or os.getenv("DEBUG_ARTIFACTS_DIR", DEFAULT_DIR)
+        if enabled is None:
+            enabled = os.getenv("DEBUG_ARTIFACTS", "true").lower() == "true"
+        self.enabled = enabled
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("DEBUG_ARTIFACTS_SAMPLE_RATE", "0.2"))
+        self.min_interval = min_interval if min_interval is not None else float(os.getenv("DEBUG_ARTIFACTS_MIN_INTERVAL_SECONDS", "300"))
+        self.queue_size = queue_size or int(os.getenv("DEBUG_ARTIFACTS_QUEUE_SIZE", "8"))
+        self.max_bytes = max_bytes or float(os.getenv("DEBUG_ARTIFACTS_MAX_MB", "100")) * 1024 * 1024
+        self.max_age = max_age or float(os.getenv("DEBUG_ARTIFACTS_MAX_AGE_HOURS", "72")) * 3600
+        if screenshots is None:
+            screenshots = os.getenv("DEBUG_ARTIFACTS_SCREENSHOTS", "true").lower() == "true"
+        self.screenshots = screenshots
+        self.rng = rng or random.Random()
+        self._last_capture: Dict[str, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.stats: Counter = Counter()
+
+    def _sampled(self, source: str) -> bool:
+        now = time.monotonic()
+        last = self._last_capture.get(source)
+        if last is not None and (now - last < self.min_interval or self.rng.random() >= self.sample_rate):
+            return False
+        self._last_capture[source] = now
+        return True
+
+    async def capture(self, source: str, page: Page, reason: str):
+        """
+        Snapshot `page` for a failed `source` scrape, if sampled. Never raises: a
+        failed capture must not turn into a failed scrape.
+        """
+        self.stats["failures"] += 1
+        if not self.enabled or not self._sampled(source):
+            self.stats["skipped"] += 1
+            return
+        try:
+            async with asyncio.timeout(SNAPSHOT_TIMEOUT):
+                html = await page.content()
+            screenshot = None
+            if self.screenshots:
+                try:
+                    screenshot = await page.screenshot(type="jpeg", quality=60, full_page=False,
+                                                       timeout=SNAPSHOT_TIMEOUT * 1000)
+                except Exception as e:
+                    logger.debug(f"Debug screenshot for {source} failed: {e}")
+            url = page.url
+        except Exception as e:
+            logger.debug(f"Debug snapshot for {source} failed: {e}")
+            self.stats["errors"] += 1
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.queue_size)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+        try:
+            self._queue.put_nowait((source, reason, url, html, screenshot, datetime.now()))
+            self.stats["queued"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+
+    async def _write_loop(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                await asyncio.to_thread(self._write, *item)
+                self.stats["written"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Could not write debug snapshot: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, source: str, reason: str, url: str, html: str, screenshot: Optional[bytes], when: datetime):
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^a-z0-9]+", "_", f"{source}_{reason}".lower()).strip("_")
+        base = os.path.join(self.directory, f"{slug}_{when.strftime('%Y%m%d_%H%M%S_%f')}")
+        with gzip.open(f"{base}.html.gz", "wt", encoding="utf-8") as f:
+            f.write(f"<!-- {url} -->\n{html}")
+        if screenshot:
+            with open(f"{base}.jpg", "wb") as f:
+                f.write(screenshot)
+        logger.info(f"{source}: debug snapshot saved to {base}.html.gz")
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        now = time.time()
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(ARTIFACT_SUFFIXES):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if os.path.isfile(path):
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files):
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["evicted"] += 1
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+    async def flush(self):
+        """Wait until queued snapshots are on disk."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            **dict(self.stats),
+        }
+
+
+# Global instance
+_debug_artifacts: Optional[DebugArtifactRecorder] = None
+
+def get_debug_artifacts() -> DebugArtifactRecorder:
+    """Get or create the global debug artifact recorder."""
+    global _debug_artifacts
+    if _debug_artifacts is None:
+        _debug_artifacts = DebugArtifactRecorder()
+    return _debug_artifacts
@@ -0,0 +1,66 @@
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from utils.state_store import state_path, load_json_state, save_json_state
+
+logger = logging.getLogger(__name__)
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+
+class FetchTierMemory:
+    """
+    Remembers which fetch tier last worked for each source, persisted across restarts.
+
+    Sources start on the HTTP tier. Once a source needs the browser (bot challenge,
+    JS-rendered results) it stays there, but the HTTP tier is retried after
+    `retry_after` seconds in case the site went back to server-side rendering.
+    """
+    def __init__(self, state_file: str = None, retry_after: float = None):
+        self.state_file = state_file or state_path("fetch_tiers.json")
+        self.retry_after = retry_after if retry_after is not None else \
+            float(os.getenv("SCRAPER_FAST_PATH_RETRY_SECONDS", "3600"))
+        self.tiers: Dict[str, Dict[str, Any]] = load_json_state(self.state_file, default={})
+        self.stats = Counter()
+
+    def preferred(self, source: str) -> str:
+        """Tier to try first for `source`."""
+        entry = self.tiers.get(source)
+        if not entry or entry.get("tier") != TIER_BROWSER:
+            return TIER_HTTP
+        if time.time() - entry.get("since", 0) >= self.retry_after:
+            return TIER_HTTP
+        return TIER_BROWSER
+
+    def record(self, source: str, tier: str, reason: Optional[str] = None):
+        """Remember the tier that served `source`; persists only when the tier changes."""
+        self.stats[tier] += 1
+        entry = self.tiers.get(source)
+        if entry and entry.get("tier") == tier and tier == TIER_HTTP:
+            return
+        if entry and entry.get("tier") != tier:
+            logger.info(f"{source}: fetch tier {entry.get('tier')} -> {tier}" + (f" ({reason})" if reason else ""))
+        # Browser entries are re-stamped so the HTTP retry window restarts after each escalation
+        self.tiers[source] = {"tier": tier, "since": time.time(), "reason": reason}
+        save_json_state(self.state_file, self.tiers)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current tier per source and how often each tier served a scrape, for metrics."""
+        return {
+            "sources": {name: entry.get("tier") for name, entry in self.tiers.items()},
+            "served": dict(self.stats),
+        }
+
+
+# Global instance
+_fetch_tiers: Optional[FetchTierMemory] = None
+
+def get_fetch_tiers() -> FetchTierMemory:
+    """Get or create the global fetch tier memory."""
+    global _fetch_tiers
+    if _fetch_tiers is None:
+        _fetch_tiers = FetchTierMemory()
+    return _fetch_tiers
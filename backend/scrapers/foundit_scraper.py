@@ -1,14 +1,36 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
+from .response_capture import as_text, as_int
 import urllib.parse
 import re
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class FounditScraper(BaseScraper):
+    CARD_SELECTORS = ['div[class*="job-card"], div[class*="jobcard"], div.shadow-job-card']
+    CARD_FIELDS = {
+        "title": card_field("h2 a, h3 a, a[aria-label]"),
+        "link": card_field("h2 a, h3 a, a[aria-label]", attr="href"),
+        "company": card_field("a[class*='company'], div[class*='company']"),
+        # Location, experience and ctc labels
+        "labels": card_field("label, span[class*='location'], div[class*='location'], div[class*='details']", many=True),
+        "text": card_field(":scope"),
+    }
+    # Search results come from the middleware job search endpoint
+    API_RESPONSE_PATTERNS = ["/middleware/jobsearch", "/api/jobsearch"]
+    API_FIELDS = {
+        "title": ["title", "jobTitle"],
+        "company": ["companyName", "company.name"],
+        "link": ["seoJdUrl", "jdUrl", "redirectUrl"],
+        "location": ["locations", "location"],
+        "exp_min": ["minimumExperience.years", "minExperience"],
+        "exp_max": ["maximumExperience.years", "maxExperience"],
+        "description": ["description", "jobDescription"],
+        "skills": ["skills", "itSkills"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on foundit.in.
@@ -29,43 +51,43 @@ class FounditScraper(BaseScraper):
             logger.info(f"Scraping Foundit: {url}")
             
             page_obj, context = await self._get_page()
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await self._random_delay(3, 5)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=30000)
+            
+            await self._wait_ready(page_obj, capture=capture)
+            
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "Foundit") for r in records if r["title"]]
             
             # Wait for job cards - Foundit uses card-based layout
             try:
                 await page_obj.wait_for_selector('div[class*="card"]', timeout=10000)
             except:
-                logger.warning(f"FounditScraper: Job cards not found. Saving debug snapshot.")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                await page_obj.screenshot(path=f"debug_dumps/foundit_fail_{timestamp}.png")
-                content = await page_obj.content()
-                with open(f"debug_dumps/foundit_fail_{timestamp}.html", "w") as f:
-                    f.write(content)
-                logger.info(f"FounditScraper: Snapshot saved to debug_dumps/foundit_fail_{timestamp}.png")
+                logger.warning("FounditScraper: Job cards not found.")
+                await self._capture_failure(page_obj, "no_cards")
                 return []
 
             # Get job card containers
-            cards = await page_obj.query_selector_all('div[class*="job-card"], div[class*="jobcard"], div.shadow-job-card')
+            cards = await self._extract_cards(page_obj)
             
             logger.info(f"Found {len(cards)} job cards on Foundit")
             
             for card in cards:
                 try:
                     # Get title link
-                    title_el = await card.query_selector("h2 a, h3 a, a[aria-label]")
-                    if not title_el:
+                    title = card["title"]
+                    if not title:
                         continue
                     
-                    title = await title_el.inner_text()
-                    link = await title_el.get_attribute("href")
+                    link = card["link"]
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.foundit.in{link}"
                     
                     # Get company
-                    company_el = await card.query_selector("a[class*='company'], div[class*='company']")
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
+                    company = card["company"] or "Unknown Company"
                     
                     # Get location, experience, and ctc from labels
                     loc = location
@@ -73,16 +95,12 @@ class FounditScraper(BaseScraper):
                     exp_max = 0
                     ctc_str = ""
                     
-                    labels = await card.query_selector_all("label, span[class*='location'], div[class*='location'], div[class*='details']")
-                    for label in labels:
-                        text = await label.inner_text()
+                    for text in card["labels"]:
                         text_lower = text.lower()
                         
                         # Extract Experience
                         if "year" in text_lower or "yrs" in text_lower:
                             # Parse "5-10 years" or "5-10 yrs"
-                            # Regex basic
-                            import re
                             # Check for range "5-10"
                             matches = re.findall(r'(\d+)\s*-\s*(\d+)', text)
                             if matches:
@@ -113,7 +131,7 @@ class FounditScraper(BaseScraper):
                                 loc = text.strip()
 
                     # Construct description from all text in card if possible
-                    full_text = await card.inner_text()
+                    full_text = card["text"]
                     
                     raw_job = {
                         "title": title.strip(),
@@ -137,3 +155,24 @@ class FounditScraper(BaseScraper):
             await self._safe_close()
             
         return jobs
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a job search API item to our raw job format."""
+        link = record["link"] or ""
+        if link and not link.startswith("http"):
+            link = f"https://www.foundit.in{link}"
+        
+        skills = record["skills"] or []
+        if isinstance(skills, str):
+            skills = [s.strip() for s in skills.split(",") if s.strip()]
+        
+        return {
+            "title": as_text(record["title"]),
+            "company": as_text(record["company"]) or "Unknown Company",
+            "location": as_text(record["location"]) or location,
+            "apply_link": link,
+            "description": as_text(record["description"]) or f"View details on Foundit: {link}",
+            "experience_min": as_int(record["exp_min"]),
+            "experience_max": as_int(record["exp_max"]),
+            "skills": [as_text(s) for s in skills if as_text(s)],
+        }
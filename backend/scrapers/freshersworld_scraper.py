@@ -1,44 +1,52 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class FreshersworldScraper(BaseScraper):
+    HTTP_FAST_PATH = True
+    CARD_SELECTORS = [".job-container"]
+    CARD_FIELDS = {
+        "title": card_field("span.wrap-title.seo_title"),
+        "link": card_field("a", attr="href"),
+        "text": card_field(":scope"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on Freshersworld.
         URL Pattern: https://www.freshersworld.com/jobs/jobsearch/{query}-jobs
         """
         jobs = []
+        page_obj = None
         try:
             query_slug = query.lower().replace(" ", "-")
             url = f"https://www.freshersworld.com/jobs/jobsearch/{query_slug}-jobs"
             
             logger.info(f"Scraping Freshersworld: {url}")
             
-            page_obj, context = await self._get_page()
-            await page_obj.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Wait for containers
-            await page_obj.wait_for_selector(".job-container", timeout=10000)
-            
-            cards = await page_obj.query_selector_all(".job-container")
+            cards = await self._fetch_cards_http(url)
+            if cards is None:
+                page_obj, context = await self._get_page()
+                await self._navigate(page_obj, url, wait_until="networkidle", timeout=30000)
+                
+                # Wait for containers
+                await page_obj.wait_for_selector(".job-container", timeout=10000)
+                
+                cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector("span.wrap-title.seo_title")
-                    company_el = await card.query_selector(".bold_font") # Often location or company
-                    
-                    if not title_el: continue
+                    if not card["title"]: continue
                     
-                    title = await title_el.inner_text()
+                    title = card["title"]
                     
                     # Freshersworld structure: company is often a text node or sibling
                     # Let's try to extract from the card innerText if direct selector fails
-                    card_text = await card.inner_text()
+                    card_text = card["text"] or ""
                     lines = [line.strip() for line in card_text.split("\n") if line.strip()]
                     
                     company = "Unknown Company"
@@ -53,8 +61,7 @@ class FreshersworldScraper(BaseScraper):
                                 loc = line.replace("Location:", "").strip()
                                 break
 
-                    link_el = await card.query_selector("a")
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.freshersworld.com{link}"
@@ -74,6 +81,7 @@ class FreshersworldScraper(BaseScraper):
         except Exception as e:
             logger.error(f"Freshersworld scraping error: {e}")
         finally:
-            await self._safe_close()
+            if page_obj is not None:
+                await self._safe_close()
             
         return jobs
@@ -1,13 +1,22 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, ScraperBlockedError
 import urllib.parse
 import re
 
 logger = logging.getLogger(__name__)
 
 class GlassdoorScraper(BaseScraper):
+    # data-test="jobListing" is standard
+    CARD_SELECTORS = ['li[data-test="jobListing"]']
+    CARD_FIELDS = {
+        "title": card_field('[data-test="job-title"]'),
+        "company": card_field('[data-test="employer-name"]'),
+        "location": card_field('[data-test="location"]'),
+        "link": card_field('[data-test="job-link"]', attr="href"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on Glassdoor.co.in.
@@ -31,14 +40,15 @@ class GlassdoorScraper(BaseScraper):
             page_obj, context = await self._get_page()
             
             # Glassdoor requires strong stealth and potentially many retries
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
-            await asyncio.sleep(3) # Extra wait for Cloudflare
+            # Wait for cards, or for the page to settle (Cloudflare interstitial)
+            await self._wait_ready(page_obj)
             
             content = await page_obj.content()
             if "hcaptcha" in content.lower() or "cloudflare" in content.lower() or "Access Denied" in content:
                 logger.warning("Glassdoor bot detection triggered. Skipping.")
-                return []
+                raise ScraperBlockedError("Glassdoor bot challenge")
 
             # Wait for job cards (data-test="jobListing" is standard)
             try:
@@ -47,22 +57,17 @@ class GlassdoorScraper(BaseScraper):
                 logger.warning(f"No job cards found on Glassdoor for '{query}' in India")
                 return []
 
-            cards = await page_obj.query_selector_all('li[data-test="jobListing"]')
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector('[data-test="job-title"]')
-                    company_el = await card.query_selector('[data-test="employer-name"]')
-                    location_el = await card.query_selector('[data-test="location"]')
-                    link_el = await card.query_selector('[data-test="job-link"]')
-
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
                     # Company name on Glassdoor often contains rating (e.g. "Google 4.5")
                     company = re.sub(r'\s\d\.\d$', '', company.strip())
                     
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.glassdoor.co.in{link}"
@@ -80,6 +85,8 @@ class GlassdoorScraper(BaseScraper):
                     logger.debug(f"Error parsing Glassdoor job card: {e}")
                     continue
                     
+        except ScraperBlockedError:
+            raise
         except Exception as e:
             logger.error(f"Glassdoor scraping error: {e}")
         finally:
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 import urllib.parse
 
 logger = logging.getLogger(__name__)
@@ -10,8 +10,20 @@ class GulfTalentScraper(BaseScraper):
     """
     Scraper for GulfTalent (UAE/Middle East).
     """
+    # GulfTalent often uses a table row structure or list items
+    # Selectors might need adjustment based on live site changes.
+    HTTP_FAST_PATH = True
+    CARD_SELECTORS = ["tr.clickable-row, .job-list-item"]
+    CARD_FIELDS = {
+        "title": card_field(".job-title a, a[href*='/jobs/']"),
+        "link": card_field(".job-title a, a[href*='/jobs/']", attr="href"), # Usually the title <a> has the link
+        "company": card_field(".company-name"),
+        "location": card_field(".job-location"),
+    }
+
     async def search_jobs(self, query: str, location: str = "UAE", page: int = 1, **kwargs) -> List[Dict[str, Any]]:
         jobs = []
+        page_obj = None
         try:
             # GulfTalent Search URL
             # https://www.gulftalent.com/uae/jobs/search?keywords=python
@@ -24,33 +36,28 @@ class GulfTalentScraper(BaseScraper):
             
             logger.info(f"Scraping GulfTalent: {url}")
             
-            page_obj, context = await self._get_page()
-            
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
-            
-            # Wait for list (GulfTalent uses table or list)
-            try:
-                await page_obj.wait_for_selector(".job-results-list, tr.job-item, .job-list-item", timeout=15000)
-            except:
-                logger.warning("No GulfTalent jobs found or timeout.")
-                return []
-            
-            # GulfTalent often uses a table row structure or list items
-            # Selectors might need adjustment based on live site changes.
-            # Common structure: class="job-item"
-            cards = await page_obj.query_selector_all("tr.clickable-row, .job-list-item")
+            cards = await self._fetch_cards_http(url)
+            if cards is None:
+                page_obj, context = await self._get_page()
+                
+                await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
+                
+                # Wait for list (GulfTalent uses table or list)
+                try:
+                    await page_obj.wait_for_selector(".job-results-list, tr.job-item, .job-list-item", timeout=15000)
+                except:
+                    logger.warning("No GulfTalent jobs found or timeout.")
+                    return []
+                
+                # Common structure: class="job-item"
+                cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector(".job-title a, a[href*='/jobs/']")
-                    company_el = await card.query_selector(".company-name")
-                    location_el = await card.query_selector(".job-location")
-                    link_el = title_el # Usually the title <a> has the link
-                    
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.gulftalent.com{link}"
@@ -74,6 +81,7 @@ class GulfTalentScraper(BaseScraper):
         except Exception as e:
             logger.error(f"GulfTalent scraping error: {e}")
         finally:
-            await self._safe_close()
+            if page_obj is not None:
+                await self._safe_close()
             
         return jobs
@@ -1,12 +1,33 @@
 import logging
 import asyncio
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, READY_CARDS
+from .response_capture import as_text
 import urllib.parse
+import re
 
 logger = logging.getLogger(__name__)
 
 class HerKeyScraper(BaseScraper):
+    # HerKey uses various selectors; fall back to job links
+    CARD_SELECTORS = [
+        "div.job-card, div[class*='job-listing'], article, div[class*='card']",
+        "a[href*='/job/'], a[href*='/jobs/']",
+    ]
+    CARD_FIELDS = {
+        "text": card_field(":scope"),
+        "link": card_field(":scope", "a", attr="href"),
+    }
+    # Search results are fetched from HerKey's jobs API
+    API_RESPONSE_PATTERNS = ["api.herkey.com", "herkey.com/api/"]
+    API_FIELDS = {
+        "title": ["title", "jobTitle"],
+        "company": ["companyName", "company.name"],
+        "location": ["locations", "location"],
+        "link": ["jobUrl", "url", "slug"],
+        "description": ["description", "jobDescription"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from HerKey.
@@ -23,21 +44,26 @@ class HerKeyScraper(BaseScraper):
             logger.info(f"Scraping HerKey: {url}")
             
             page_obj, context = await self._get_page()
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3, 5)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=60000)
+            
+            ready = await self._wait_ready(page_obj, capture=capture)
             
-            # HerKey uses various selectors
-            cards = await page_obj.query_selector_all("div.job-card, div[class*='job-listing'], article, div[class*='card']")
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "HerKey") for r in records if r["title"]]
             
-            # Fallback
-            if not cards or len(cards) == 0:
-                cards = await page_obj.query_selector_all("a[href*='/job/'], a[href*='/jobs/']")
+            if ready != READY_CARDS:
+                await self._wait_ready(page_obj)
+            
+            cards = await self._extract_cards(page_obj)
             
             logger.info(f"Found {len(cards)} job cards on HerKey")
             
             for card in cards:
                 try:
-                    text = await card.inner_text()
+                    text = card["text"] or ""
                     lines = [line.strip() for line in text.split("\n") if line.strip()]
                     
                     if not lines or len(lines) < 1:
@@ -54,12 +80,8 @@ class HerKeyScraper(BaseScraper):
                             loc_text = line
                             break
                     
-                    # Get link
-                    if card.tag_name == "a":
-                        link = await card.get_attribute("href")
-                    else:
-                        link_el = await card.query_selector("a")
-                        link = await link_el.get_attribute("href") if link_el else ""
+                    # Get link (the card itself or the first link inside it)
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = "https://www.herkey.com" + link
@@ -84,3 +106,17 @@ class HerKeyScraper(BaseScraper):
             await self._safe_close()
             
         return jobs
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a jobs API item to our raw job format."""
+        link = as_text(record["link"]) or ""
+        if link and not link.startswith("http"):
+            link = "https://www.herkey.com" + (link if link.startswith("/") else f"/jobs/{link}")
+        
+        return {
+            "title": as_text(record["title"]),
+            "company": as_text(record["company"]) or "Various",
+            "location": as_text(record["location"]) or location,
+            "apply_link": link,
+            "description": re.sub(r"<[^>]+>", " ", as_text(record["description"]) or "")[:500]
+        }
@@ -1,14 +1,20 @@
 import logging
 import asyncio
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 from playwright.async_api import Page
 import urllib.parse
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class HiristScraper(BaseScraper):
+    # Hirist uses MUI card components
+    CARD_SELECTORS = ["div.joblist-card-v2, div.MuiCard-root"]
+    CARD_FIELDS = {
+        "link": card_field("a", attr="href"),
+        "text": card_field(":scope"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from Hirist.tech.
@@ -20,48 +26,33 @@ class HiristScraper(BaseScraper):
         
         logger.info(f"HiristScraper: Navigating to {url}")
         
-        # Debug trace
-        try:
-            with open("debug_dumps/hirist_start.txt", "a") as f:
-                f.write(f"Started Hirist scrape for {url} at {datetime.now()}\n")
-        except: pass
-        
         page_obj, context = await self._get_page()
         jobs = []
         
         try:
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3, 5)
-            
-            # Hirist uses MUI card components
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=60000)
             try:
-                await page_obj.wait_for_selector("div.joblist-card-v2, div.MuiCard-root", timeout=15000)
+                await page_obj.wait_for_selector(self.CARD_SELECTORS[0], timeout=15000)
             except:
-                logger.warning("HiristScraper: Job cards not found immediately. Saving debug snapshot.")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                await page_obj.screenshot(path=f"debug_dumps/hirist_fail_{timestamp}.png")
-                content = await page_obj.content()
-                with open(f"debug_dumps/hirist_fail_{timestamp}.html", "w") as f:
-                    f.write(content)
-                logger.info(f"HiristScraper: Snapshot saved to debug_dumps/hirist_fail_{timestamp}.png")
+                logger.warning("HiristScraper: Job cards not found immediately.")
+                await self._capture_failure(page_obj, "no_cards")
 
-            cards = await page_obj.query_selector_all("div.joblist-card-v2, div.MuiCard-root")
+            cards = await self._extract_cards(page_obj)
             
             logger.info(f"Found {len(cards)} job cards on Hirist")
             
             for card in cards:
                 try:
                     # Get the main link
-                    link_el = await card.query_selector("a")
-                    if not link_el:
+                    link = card["link"]
+                    if not link:
                         continue
                     
-                    link = await link_el.get_attribute("href")
                     if link and not link.startswith("http"):
                         link = "https://www.hirist.tech" + link
                     
                     # Get full text content
-                    text = await card.inner_text()
+                    text = card["text"] or ""
                     lines = [line.strip() for line in text.split("\n") if line.strip()]
                     
                     if not lines:
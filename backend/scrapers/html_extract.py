@@ -0,0 +1,101 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml is in requirements.txt
+    HTML_PARSER = "html.parser"
+
+
+# Elements that start a new line in innerText; inline markup (<b>, <i>, <span>, <a>) doesn't
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tbody", "td", "th", "thead", "tr", "ul",
+})
+SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+
+def inner_text(el) -> str:
+    """
+    Approximation of the browser's innerText, which EXTRACT_CARDS_JS reads: line breaks
+    only around block elements and <br>, whitespace collapsed within a line. Scrapers
+    split card text into lines (title first), so "<h3><b>Senior</b> Data Scientist</h3>"
+    has to stay one line.
+    """
+    parts: List[str] = []
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name in SKIPPED_TAGS:
+                    continue
+                if child.name == "br":
+                    parts.append("\n")
+                elif child.name in BLOCK_TAGS:
+                    parts.append("\n")
+                    walk(child)
+                    parts.append("\n")
+                else:
+                    walk(child)
+            elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                # Source newlines are just whitespace, as in the browser
+                parts.append(re.sub(r"\s+", " ", str(child)))
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _read(el, attr: Optional[str]) -> Optional[str]:
+    if attr:
+        value = el.get(attr)
+        return " ".join(value) if isinstance(value, list) else value
+    return inner_text(el)
+
+
+def extract_cards_from_html(html: str, card_selectors: List[str], fields: Dict[str, Dict[str, Any]],
+                            limit: int = None) -> List[Dict[str, Any]]:
+    """
+    Server-side twin of EXTRACT_CARDS_JS: same card selectors and card_field() specs,
+    applied to static HTML. Card selectors are tried in order (first with matches wins);
+    each field tries its selectors until one yields a non-empty value.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = []
+    for selector in card_selectors:
+        try:
+            cards = soup.select(selector)
+        except Exception as e:
+            logger.debug(f"Unsupported card selector {selector!r}: {e}")
+            cards = []
+        if cards:
+            break
+    if limit:
+        cards = cards[:limit]
+
+    records = []
+    for card in cards:
+        record = {}
+        for name, spec in fields.items():
+            value = [] if spec["many"] else None
+            for selector in spec["selectors"]:
+                if selector == ":scope":
+                    els = [card]
+                elif spec["many"]:
+                    els = card.select(selector)
+                else:
+                    els = [el for el in [card.select_one(selector)] if el is not None]
+                values = [v for v in (_read(el, spec["attr"]) for el in els) if v not in (None, "")]
+                if values:
+                    value = values if spec["many"] else values[0]
+                    break
+            record[name] = value
+        records.append(record)
+    return records
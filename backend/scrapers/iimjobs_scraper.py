@@ -1,12 +1,21 @@
 import logging
 import asyncio
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
 class IimjobsScraper(BaseScraper):
+    # Results are server-rendered: plain HTTP is enough unless we get challenged
+    HTTP_FAST_PATH = True
+    # iimjobs uses anchor tags with /j/ in href, but sometimes div containers
+    CARD_SELECTORS = ["a[href*='/j/'], div.job-label"]
+    CARD_FIELDS = {
+        "link": card_field(":scope", attr="href"),
+        "text": card_field(":scope"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from iimjobs.com.
@@ -18,28 +27,30 @@ class IimjobsScraper(BaseScraper):
         
         logger.info(f"IimjobsScraper: Navigating to {url}")
         
-        page_obj, context = await self._get_page()
+        page_obj = None
         jobs = []
         
         try:
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3, 5)
-            
-            # iimjobs uses anchor tags with /j/ in href, but sometimes div containers
-            # Try getting all large anchor tags or cards
-            cards = await page_obj.query_selector_all("a[href*='/j/'], div.job-label")
+            cards = await self._fetch_cards_http(url)
+            if cards is None:
+                page_obj, context = await self._get_page()
+                await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=60000)
+                await self._wait_ready(page_obj)
+                
+                # Try getting all large anchor tags or cards
+                cards = await self._extract_cards(page_obj)
             
             logger.info(f"Found {len(cards)} job cards on Iimjobs")
             
             for card in cards:
                 try:
                     # Get link
-                    link = await card.get_attribute("href")
+                    link = card["link"]
                     if link and not link.startswith("http"):
                         link = "https://www.iimjobs.com" + link
                     
                     # Get text content
-                    text = await card.inner_text()
+                    text = card["text"] or ""
                     lines = [line.strip() for line in text.split("\n") if line.strip() and len(line.strip()) > 2]
                     
                     if not lines or len(lines) < 1:
@@ -99,6 +110,7 @@ class IimjobsScraper(BaseScraper):
         except Exception as e:
             logger.error(f"IimjobsScraper failed: {e}")
         finally:
-            await self._safe_close()
+            if page_obj is not None:
+                await self._safe_close()
             
         return jobs
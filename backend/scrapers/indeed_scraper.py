@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, ScraperBlockedError
 import urllib.parse
 
 logger = logging.getLogger(__name__)
@@ -11,6 +11,14 @@ class IndeedScraper(BaseScraper):
     Experimental Indeed Scraper.
     Note: Indeed has strong bot detection. This implementation uses best-effort stealth.
     """
+    CARD_SELECTORS = [".job_seen_beacon"]
+    CARD_FIELDS = {
+        "title": card_field("h2.jobTitle span[title], h2.jobTitle a"),
+        "company": card_field(".companyName, [data-testid='company-name']"),
+        "location": card_field(".companyLocation, [data-testid='text-location']"),
+        "link": card_field("h2.jobTitle a", attr="href"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1, country: str = "India") -> List[Dict[str, Any]]:
         jobs = []
         try:
@@ -32,13 +40,13 @@ class IndeedScraper(BaseScraper):
             
             # Indeed specific stealth: randomized user agent and viewport handled in BaseScraper
             # But we might need more specific headers or behavior
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
             # Check for Cloudflare/Bot block
             content = await page_obj.content()
             if "hcaptcha" in content.lower() or "cloudflare" in content.lower():
                 logger.warning("Indeed bot detection triggered. Skipping.")
-                return []
+                raise ScraperBlockedError("Indeed bot challenge (hCaptcha/Cloudflare)")
 
             # Wait for job cards (CSS varies, common ones are .job_seen_beacon)
             try:
@@ -47,19 +55,14 @@ class IndeedScraper(BaseScraper):
                 logger.warning("No Indeed job cards found or timed out.")
                 return []
 
-            cards = await page_obj.query_selector_all(".job_seen_beacon")
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector("h2.jobTitle span[title], h2.jobTitle a")
-                    company_el = await card.query_selector(".companyName, [data-testid='company-name']")
-                    location_el = await card.query_selector(".companyLocation, [data-testid='text-location']")
-                    link_el = await card.query_selector("h2.jobTitle a")
-                    
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://in.indeed.com{link}"
@@ -76,6 +79,8 @@ class IndeedScraper(BaseScraper):
                 except Exception:
                     continue
                     
+        except ScraperBlockedError:
+            raise
         except Exception as e:
             logger.error(f"Indeed scraping error: {e}")
         finally:
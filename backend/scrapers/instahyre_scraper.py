@@ -1,13 +1,30 @@
 import logging
 import asyncio
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, READY_CARDS
+from .response_capture import as_text
 from playwright.async_api import Page
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class InstahyreScraper(BaseScraper):
+    # Instahyre uses opportunity divs
+    CARD_SELECTORS = ["div[class*='opportunity']"]
+    CARD_FIELDS = {
+        "link": card_field("a[href*='/opportunity/']", attr="href"),
+        "text": card_field(":scope"),
+    }
+    # Listing pages fetch opportunities from the job search API
+    API_RESPONSE_PATTERNS = ["/api/v1/job_search", "/api/v1/opportunity"]
+    API_FIELDS = {
+        "title": ["candidate_title", "title"],
+        "company": ["employer.company_name", "company_name"],
+        "location": ["locations", "location"],
+        "link": ["public_url", "url"],
+        "skills": ["keywords", "skills"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from Instahyre.
@@ -23,27 +40,35 @@ class InstahyreScraper(BaseScraper):
         jobs = []
         
         try:
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await self._random_delay(3, 5)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=60000)
+            
+            ready = await self._wait_ready(page_obj, capture=capture)
+            
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "Instahyre") for r in records if r["title"]]
             
-            # Instahyre uses opportunity divs
-            cards = await page_obj.query_selector_all("div[class*='opportunity']")
+            if ready != READY_CARDS:
+                await self._wait_ready(page_obj)
+            
+            cards = await self._extract_cards(page_obj)
             
             logger.info(f"Found {len(cards)} job cards on Instahyre")
             
             for card in cards:
                 try:
                     # Get the link first
-                    link_el = await card.query_selector("a[href*='/opportunity/']")
-                    if not link_el:
+                    link = card["link"]
+                    if not link:
                         continue
                     
-                    link = await link_el.get_attribute("href")
                     if link and not link.startswith("http"):
                         link = "https://www.instahyre.com" + link
                     
                     # Get text content
-                    text = await card.inner_text()
+                    text = card["text"] or ""
                     lines = [line.strip() for line in text.split("\n") if line.strip() and len(line.strip()) > 2]
                     
                     if not lines or len(lines) < 2:
@@ -89,3 +114,19 @@ class InstahyreScraper(BaseScraper):
             await self._safe_close()
             
         return jobs
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a job search API item to our raw job format."""
+        link = as_text(record["link"]) or ""
+        if link and not link.startswith("http"):
+            link = "https://www.instahyre.com" + link
+        
+        skills = [as_text(s) for s in record["skills"] or [] if as_text(s)]
+        return {
+            "title": as_text(record["title"]),
+            "company": as_text(record["company"]) or "Unknown Company",
+            "location": as_text(record["location"]) or location,
+            "apply_link": link,
+            "skills": skills,
+            "description": " ".join(skills)
+        }
@@ -1,13 +1,22 @@
 import logging
 import asyncio
 from typing import List, Dict, Any
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, ScraperBlockedError, card_field
 from datetime import datetime
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class LinkedInScraper(BaseScraper):
+    # Browser inspection showed '.base-search-card'; guest view also uses .base-card
+    CARD_SELECTORS = [".base-search-card", ".base-card"]
+    CARD_FIELDS = {
+        "title": card_field(".base-search-card__title", "h3"),
+        "company": card_field(".base-search-card__subtitle", "h4"),
+        "apply_link": card_field("a.base-card__full-link", "a", attr="href"),
+        "location": card_field(".job-search-card__location", ".base-search-card__metadata"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from LinkedIn India (Guest mode) using Playwright.
@@ -24,15 +33,18 @@ class LinkedInScraper(BaseScraper):
             url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}&location={encoded_loc}&f_TPR=r604800" # Past week
             
             logger.info(f"LinkedInScraper: Navigating to {url}")
-            await page_obj.goto(url, wait_until="networkidle", timeout=60000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=60000)
+            await self._wait_ready(page_obj)
             
-            # LinkedIn often triggers a login wall if scaping too fast
-            await self._random_delay(2, 4)
+            # Guest search redirects to the auth wall when LinkedIn blocks us
+            if "authwall" in page_obj.url or "/login" in page_obj.url:
+                raise ScraperBlockedError("LinkedIn login wall")
             
-            # Scroll to load more
+            # Scroll to load more; wait for each lazy-loaded batch to settle
+            # (request spacing against the login wall comes from the politeness policy)
             for _ in range(2):
                 await page_obj.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await self._random_delay(1, 2)
+                await self._wait_ready(page_obj, card_selectors=[], timeout=3)
 
             # Selectors for LinkedIn Guest Jobs
             # Browser inspection showed '.base-search-card'
@@ -46,29 +58,16 @@ class LinkedInScraper(BaseScraper):
                 except:
                     return []
 
-            job_cards = await page_obj.query_selector_all(".base-search-card")
-            if not job_cards:
-                job_cards = await page_obj.query_selector_all(".base-card")
+            job_cards = await self._extract_cards(page_obj, limit=20)
             
             logger.info(f"LinkedInScraper: Found {len(job_cards)} job cards")
 
-            for card in job_cards[:20]:
+            for card in job_cards:
                 try:
-                    title_el = await card.query_selector(".base-search-card__title")
-                    if not title_el: title_el = await card.query_selector("h3")
-                    title = (await title_el.inner_text()).strip() if title_el else "Unknown Role"
-                    
-                    company_el = await card.query_selector(".base-search-card__subtitle")
-                    if not company_el: company_el = await card.query_selector("h4")
-                    company = (await company_el.inner_text()).strip() if company_el else "Unknown Company"
-                    
-                    link_el = await card.query_selector("a.base-card__full-link")
-                    if not link_el: link_el = await card.query_selector("a")
-                    apply_link = await link_el.get_attribute("href") if link_el else ""
-                    
-                    loc_el = await card.query_selector(".job-search-card__location")
-                    if not loc_el: loc_el = await card.query_selector(".base-search-card__metadata")
-                    location_text = (await loc_el.inner_text()).strip() if loc_el else location
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    apply_link = card["apply_link"] or ""
+                    location_text = card["location"] or location
                     
                     # LinkedIn guest view doesn't easily show description or exp on search page
                     # It would require clicking each job, which increases detection risk.
@@ -89,10 +88,13 @@ class LinkedInScraper(BaseScraper):
                     logger.error(f"Error parsing LinkedIn job card: {e}")
                     continue
 
+        except ScraperBlockedError:
+            raise
         except Exception as e:
             logger.error(f"LinkedInScraper error: {e}")
         finally:
-            if page_obj:
-                await page_obj.close()
+            # Return the context with the page so the pool can reuse or close it
+            if page_obj is not None:
+                await self._safe_close()
         
         return jobs_list
@@ -1,12 +1,44 @@
 import logging
 import asyncio
+import re
 from typing import List, Dict, Any
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, card_field, READY_CARDS
+from scrapers.response_capture import as_text
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 class NaukriScraper(BaseScraper):
+    CARD_SELECTORS = [
+        ".cust-job-tuple",           # New Layout 2024
+        ".srp-jobtuple-wrapper",     # Alternative Layout
+        "article.jobTuple",          # Classics Layout
+        "div[class*='tuple']",       # Generic fallback
+        "div[class*='job-card']"     # Another fallback
+    ]
+    CARD_FIELDS = {
+        "title": card_field("a.title"),
+        "company": card_field(".comp-name"),
+        "apply_link": card_field("a.title", attr="href"),
+        # Naukri structure often uses spans within a div for meta info
+        "experience": card_field(".expwdth"),
+        "location": card_field(".loc-wrap"),
+        "description": card_field(".job-description"),
+        # Skills often in '.tag-container' or specific classes
+        "skills": card_field(".dot-gt-tag", "li.dot-gt-tag", many=True),
+    }
+    # The results list is rendered from the jobapi search endpoint
+    API_RESPONSE_PATTERNS = ["/jobapi/v3/search", "/jobapi/v4/search"]
+    API_FIELDS = {
+        "title": ["title"],
+        "company": ["companyName"],
+        "apply_link": ["jdURL", "staticUrl"],
+        "placeholders": ["placeholders"],  # [{"type": "experience"|"salary"|"location", "label": ...}]
+        "description": ["jobDescription"],
+        "skills": ["tagsAndSkills"],
+        "logo_url": ["logoPathV3", "logoPath"],
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Scrape jobs from Naukri.com using Playwright.
@@ -28,55 +60,32 @@ class NaukriScraper(BaseScraper):
             url = f"https://www.naukri.com/{search_query}-jobs-in-{search_loc}?k={query}&l={location}"
             
             logger.info(f"NaukriScraper: Navigating to mobile URL {url}")
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
-            
-            # Allow some time for Akamai/JS
-            await asyncio.sleep(5)
+            capture = self._capture_api_responses(page_obj)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
-            # Scroll down to trigger lazy loading if any
-            await page_obj.evaluate("window.scrollTo(0, document.body.scrollHeight/2)")
-            await self._random_delay(1, 2)
-
-            # Wait for job cards to appear
-            # Wait for job cards to appear
-            selectors = [
-                ".cust-job-tuple",           # New Layout 2024
-                ".srp-jobtuple-wrapper",     # Alternative Layout
-                "article.jobTuple",          # Classics Layout
-                "div[class*='tuple']",       # Generic fallback
-                "div[class*='job-card']"     # Another fallback
-            ]
+            # Ready on the search payload, the first rendered card or a settled DOM (Akamai/JS)
+            ready = await self._wait_ready(page_obj, capture=capture)
             
-            found_selector = None
-            for selector in selectors:
-                try:
-                    await page_obj.wait_for_selector(selector, timeout=5000)
-                    found_selector = selector
-                    break
-                except:
-                    continue
+            # Prefer the structured search payload; fall back to the rendered cards
+            records = await self._api_records(capture)
+            if records:
+                return [self.normalize_job_data(self._api_job(r, location), "Naukri.com") for r in records[:20]]
             
-            if not found_selector:
+            if ready != READY_CARDS:
+                # Scroll down to trigger lazy loading if any
+                await page_obj.evaluate("window.scrollTo(0, document.body.scrollHeight/2)")
+                await self._wait_ready(page_obj, timeout=5)
+
+            job_cards = await self._extract_cards(page_obj, limit=20) # Fetch more if possible
+            if not job_cards:
                 logger.warning(f"NaukriScraper: No known job card selectors found. Page title: {await page_obj.title()}")
                 return []
-
-            job_cards = await page_obj.query_selector_all(found_selector)
             
             logger.info(f"NaukriScraper: Found {len(job_cards)} job cards")
 
-            for card in job_cards[:20]: # Fetch more if possible
+            for card in job_cards:
                 try:
-                    title_el = await card.query_selector("a.title")
-                    title = (await title_el.inner_text()).strip() if title_el else "Unknown Role"
-                    
-                    company_el = await card.query_selector(".comp-name")
-                    company = (await company_el.inner_text()).strip() if company_el else "Unknown Company"
-                    
-                    apply_link = await title_el.get_attribute("href") if title_el else ""
-                    
-                    # Naukri structure often uses spans within a div for meta info
-                    exp_el = await card.query_selector(".expwdth")
-                    exp_text = (await exp_el.inner_text()).strip() if exp_el else "0-0 Yrs"
+                    exp_text = card["experience"] or "0-0 Yrs"
                     
                     # Simple parsing of "0-5 Yrs"
                     exp_min = 0
@@ -88,28 +97,16 @@ class NaukriScraper(BaseScraper):
                             exp_max = int(''.join(filter(str.isdigit, parts[1])))
                         except:
                             pass
-                    
-                    loc_el = await card.query_selector(".loc-wrap")
-                    location_text = (await loc_el.inner_text()).strip() if loc_el else location
-                    
-                    desc_el = await card.query_selector(".job-description")
-                    description = (await desc_el.inner_text()).strip() if desc_el else ""
-                    
-                    # Skills often in '.tag-container' or specific classes
-                    skills_els = await card.query_selector_all(".dot-gt-tag")
-                    if not skills_els:
-                        skills_els = await card.query_selector_all("li.dot-gt-tag")
-                    skills = [(await s.inner_text()).strip() for s in skills_els]
 
                     raw_job = {
-                        "title": title,
-                        "company": company,
-                        "location": location_text,
+                        "title": card["title"] or "Unknown Role",
+                        "company": card["company"] or "Unknown Company",
+                        "location": card["location"] or location,
                         "experience_min": exp_min,
                         "experience_max": exp_max,
-                        "apply_link": apply_link,
-                        "description": description,
-                        "skills": skills,
+                        "apply_link": card["apply_link"] or "",
+                        "description": card["description"] or "",
+                        "skills": card["skills"],
                         "posted_at": datetime.now() # Naukri dates are often relative like "3 days ago"
                     }
                     
@@ -122,9 +119,41 @@ class NaukriScraper(BaseScraper):
         except Exception as e:
             logger.error(f"NaukriScraper error: {e}")
         finally:
-            if page_obj:
-                await page_obj.close()
-            # We don't close browser here to reuse it for other sources if needed, 
-            # though usually we call _safe_close at the end of the batch.
+            # Return the context with the page so the pool can reuse or close it
+            if page_obj is not None:
+                await self._safe_close()
         
         return jobs_list
+
+    def _api_job(self, record: Dict[str, Any], location: str) -> Dict[str, Any]:
+        """Map a jobapi search item to our raw job format."""
+        placeholders = {p.get("type"): p.get("label") for p in record["placeholders"] or [] if isinstance(p, dict)}
+        
+        exp_min = 0
+        exp_max = 0
+        matches = re.findall(r'(\d+)\s*-\s*(\d+)', placeholders.get("experience") or "")
+        if matches:
+            exp_min = int(matches[0][0])
+            exp_max = int(matches[0][1])
+        
+        link = record["apply_link"] or ""
+        if link and not link.startswith("http"):
+            link = f"https://www.naukri.com{link}"
+        
+        skills = record["skills"] or []
+        if isinstance(skills, str):
+            skills = [s.strip() for s in skills.split(",") if s.strip()]
+        
+        return {
+            "title": as_text(record["title"]) or "Unknown Role",
+            "company": as_text(record["company"]) or "Unknown Company",
+            "location": as_text(placeholders.get("location")) or location,
+            "experience_min": exp_min,
+            "experience_max": exp_max,
+            "apply_link": link,
+            # jobDescription is an HTML snippet
+            "description": re.sub(r"<[^>]+>", " ", record["description"] or "").strip(),
+            "skills": skills,
+            "logo_url": record["logo_url"],
+            "posted_at": datetime.now()
+        }
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field
 import urllib.parse
 
 logger = logging.getLogger(__name__)
@@ -10,6 +10,14 @@ class NaukriGulfScraper(BaseScraper):
     """
     Scraper for NaukriGulf (UAE/Middle East).
     """
+    CARD_SELECTORS = [".srp-tuple-layout, .job-tuple"]
+    CARD_FIELDS = {
+        "title": card_field(".designation-title, .job-title"),
+        "company": card_field(".org-name, .company-name"),
+        "location": card_field(".loc-name, .location-name"),
+        "link": card_field("a.designation-title, a.job-title", attr="href"),
+    }
+
     async def search_jobs(self, query: str, location: str = "Dubai", page: int = 1, country: str = "UAE", **kwargs) -> List[Dict[str, Any]]:
         jobs = []
         try:
@@ -27,7 +35,7 @@ class NaukriGulfScraper(BaseScraper):
             page_obj, context = await self._get_page()
             
             # NaukriGulf might have bot protection, but usually less strict than Naukri India
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
             # Wait for list logic
             try:
@@ -37,19 +45,14 @@ class NaukriGulfScraper(BaseScraper):
                 return []
                 
             # Select cards
-            cards = await page_obj.query_selector_all(".srp-tuple-layout, .job-tuple")
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    title_el = await card.query_selector(".designation-title, .job-title")
-                    company_el = await card.query_selector(".org-name, .company-name")
-                    location_el = await card.query_selector(".loc-name, .location-name")
-                    link_el = await card.query_selector("a.designation-title, a.job-title")
-                    
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.naukrigulf.com{link}"
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two navigations to the same domain: (min, max) jitter window.
+# Sites with aggressive bot detection get a wider spacing.
+DEFAULT_DELAY: Tuple[float, float] = (1.0, 3.0)
+DOMAIN_DELAYS: Dict[str, Tuple[float, float]] = {
+    "glassdoor.co.in": (3.0, 6.0),
+    "indeed.com": (3.0, 6.0),
+    "linkedin.com": (2.0, 4.0),
+    "naukri.com": (1.0, 2.0),
+}
+
+
+def domain_of(url: str) -> str:
+    """Host of `url` without a leading "www." (and with any country subdomain kept)."""
+    host = urlsplit(url).hostname or url
+    return host[4:] if host.startswith("www.") else host
+
+
+def _parse_delays(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "naukri.com=1-2,glassdoor.co.in=3-6" into per-domain delay windows."""
+    delays = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        domain, window = item.split("=", 1)
+        try:
+            low, _, high = window.partition("-")
+            delays[domain.strip()] = (float(low), float(high or low))
+        except ValueError:
+            logger.warning(f"Ignoring invalid SCRAPER_POLITENESS_DELAYS entry: {item!r}")
+    return delays
+
+
+class PolitenessPolicy:
+    """
+    Per-domain request spacing with random jitter.
+
+    Each navigation reserves the next slot for its domain: the first request to a
+    domain goes out immediately, later ones wait until a jittered interval after
+    the previous one. Requests to different domains never wait on each other, so
+    anti-bot spacing no longer sits on every scrape's critical path.
+    """
+    def __init__(self, enabled: bool = None, scale: float = None,
+                 delays: Dict[str, Tuple[float, float]] = None):
+        if enabled is None:
+            enabled = os.getenv("SCRAPER_POLITENESS", "true").lower() == "true"
+        self.enabled = enabled
+        self.scale = scale if scale is not None else float(os.getenv("SCRAPER_POLITENESS_SCALE", "1.0"))
+        self.delays = dict(DOMAIN_DELAYS)
+        self.delays.update(delays if delays is not None else _parse_delays(os.getenv("SCRAPER_POLITENESS_DELAYS", "")))
+        self._next_slot: Dict[str, float] = {}
+
+    def delay_window(self, domain: str) -> Tuple[float, float]:
+        for suffix, window in self.delays.items():
+            if domain == suffix or domain.endswith("." + suffix):
+                return window
+        return DEFAULT_DELAY
+
+    def reserve(self, url: str) -> float:
+        """Reserve the next slot for `url`'s domain and return how long to wait for it."""
+        if not self.enabled:
+            return 0.0
+        domain = domain_of(url)
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(domain, 0.0))
+        low, high = self.delay_window(domain)
+        self._next_slot[domain] = slot + random.uniform(low, high) * self.scale
+        return slot - now
+
+    async def wait(self, url: str):
+        """Wait for this domain's next politeness slot."""
+        delay = self.reserve(url)
+        if delay > 0:
+            logger.debug(f"Politeness: waiting {delay:.1f}s before {domain_of(url)}")
+            await asyncio.sleep(delay)
+
+
+# Global instance
+_politeness: Optional[PolitenessPolicy] = None
+
+def get_politeness_policy() -> PolitenessPolicy:
+    """Get or create the global politeness policy."""
+    global _politeness
+    if _politeness is None:
+        _politeness = PolitenessPolicy()
+    return _politeness
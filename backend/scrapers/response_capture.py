@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import re
+from typing import Any, Iterable, List, Optional, Set
+from playwright.async_api import Page, Response
+
+logger = logging.getLogger(__name__)
+
+
+def find_job_list(payload: Any, title_keys: Iterable[str], depth: int = 6) -> List[dict]:
+    """
+    Find the job list inside a search API payload: the first list of dicts where
+    an item carries one of `title_keys`. Searches breadth-first, `depth` levels deep.
+    """
+    keys = set(title_keys)
+    level = [payload]
+    for _ in range(depth):
+        next_level = []
+        for node in level:
+            if isinstance(node, list):
+                items = [item for item in node if isinstance(item, dict)]
+                if items and any(keys & item.keys() for item in items):
+                    return items
+                next_level.extend(node)
+            elif isinstance(node, dict):
+                next_level.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        level = next_level
+        if not level:
+            break
+    return []
+
+
+def pick(item: dict, paths: Iterable[str]) -> Any:
+    """First non-empty value among dotted `paths` (e.g. "company.name") in `item`."""
+    for path in paths:
+        value: Any = item
+        for key in path.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                break
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def as_text(value: Any) -> Optional[str]:
+    """Flatten API values (strings, numbers, lists of names/labels) to display text."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        parts = [as_text(v) for v in value]
+        return ", ".join(p for p in parts if p) or None
+    if isinstance(value, dict):
+        return as_text(value.get("name") or value.get("label") or value.get("title"))
+    return str(value).strip() or None
+
+
+def as_int(value: Any, default: int = 0) -> int:
+    """Leading integer of an API value ("5", 5, "5 years"), or `default`."""
+    match = re.match(r"\s*(\d+)", str(value)) if value is not None else None
+    return int(match.group(1)) if match else default
+
+
+class ResponseCapture:
+    """
+    Collects job lists from a page's XHR/fetch JSON responses whose URL contains one of
+    `patterns`. Attach before page.goto() so the search request isn't missed.
+    """
+    def __init__(self, page: Page, patterns: List[str], title_keys: List[str]):
+        self.page = page
+        self.patterns = patterns
+        self.title_keys = title_keys
+        self.jobs: List[dict] = []
+        # Set by BaseScraper._wait_ready: the signal it returned on and its deadline (loop time)
+        self.ready: Optional[str] = None
+        self.ready_deadline: Optional[float] = None
+        self._found = asyncio.Event()
+        self._pending: Set[asyncio.Task] = set()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if not any(pattern in response.url for pattern in self.patterns):
+            return
+        task = asyncio.create_task(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response: Response):
+        try:
+            if response.status != 200:
+                return
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Could not read JSON from {response.url}: {e}")
+            return
+        jobs = find_job_list(payload, self.title_keys)
+        if jobs:
+            logger.debug(f"Captured {len(jobs)} jobs from {response.url}")
+            self.jobs.extend(jobs)
+            self._found.set()
+
+    @property
+    def found(self) -> bool:
+        return self._found.is_set()
+
+    async def wait_found(self):
+        """Block until the first job list has been captured."""
+        await self._found.wait()
+
+    async def wait(self, timeout: float) -> List[dict]:
+        """Wait until a job list arrives (or `timeout` passes) and return what was captured."""
+        if not self._found.is_set():
+            try:
+                await asyncio.wait_for(self._found.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return list(self.jobs)
+
+    def detach(self):
+        try:
+            self.page.remove_listener("response", self._on_response)
+        except Exception as e:
+            logger.debug(f"Error removing response listener: {e}")
+        for task in self._pending:
+            task.cancel()
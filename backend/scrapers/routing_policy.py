@@ -0,0 +1,111 @@
+import logging
+import os
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Scrapers only read text and hrefs from the DOM, so these never need to load
+DEFAULT_BLOCKED_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Analytics, ad and session-recording hosts (matched on the host and its subdomains)
+TRACKER_DOMAINS = {
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "js-agent.newrelic.com",
+    "nr-data.net",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "amazon-adsystem.com",
+    "moengage.com",
+    "webengage.com",
+    "clevertap-prod.com",
+    "branch.io",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "onesignal.com",
+    "intercom.io",
+    "cdn.mxpnl.com",
+}
+
+
+class RoutingPolicy:
+    """
+    Decides which requests a scraper page may make. Blocked requests are aborted
+    by the BrowserPool route handler before they hit the network.
+    """
+    def __init__(self, blocked_types: Iterable[str] = None, blocked_domains: Iterable[str] = None,
+                 allowed_types: Iterable[str] = None):
+        self.blocked_types: Set[str] = set(blocked_types if blocked_types is not None else DEFAULT_BLOCKED_TYPES)
+        self.blocked_types -= set(allowed_types or [])
+        self.blocked_domains: Set[str] = set(blocked_domains if blocked_domains is not None else TRACKER_DOMAINS)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.blocked_types or self.blocked_domains)
+
+    def _is_tracker(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        while host:
+            if host in self.blocked_domains:
+                return True
+            if "." not in host:
+                return False
+            host = host.split(".", 1)[1]
+        return False
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        # Never block the document itself, whatever the config says
+        if resource_type == "document":
+            return False
+        return resource_type in self.blocked_types or self._is_tracker(url)
+
+
+# Per-source overrides, keyed by ScraperManager source name.
+# Sites that need a resource type to render their result list opt back in here.
+SOURCE_OVERRIDES: Dict[str, Dict[str, Iterable[str]]] = {
+    # Cloudflare-fronted sites: keep stylesheets so the page load looks like a normal browser's
+    "Glassdoor": {"allowed_types": ["stylesheet"]},
+    "Indeed": {"allowed_types": ["stylesheet"]},
+    "ZipRecruiter": {"allowed_types": ["stylesheet"]},
+}
+
+
+def _env_types(name: str) -> Optional[Set[str]]:
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return {t.strip() for t in value.split(",") if t.strip()}
+
+
+def get_routing_policy(source: str = None) -> RoutingPolicy:
+    """
+    Build the routing policy for a source. BROWSER_BLOCK_RESOURCES overrides the
+    default blocked types globally ("" disables type blocking); BROWSER_BLOCK_TRACKERS=false
+    disables the tracker blocklist.
+    """
+    blocked_types = _env_types("BROWSER_BLOCK_RESOURCES")
+    blocked_domains = TRACKER_DOMAINS if os.getenv("BROWSER_BLOCK_TRACKERS", "true").lower() == "true" else set()
+    override = SOURCE_OVERRIDES.get(source, {}) if source else {}
+    return RoutingPolicy(
+        blocked_types=override.get("blocked_types", blocked_types),
+        blocked_domains=blocked_domains,
+        allowed_types=override.get("allowed_types"),
+    )
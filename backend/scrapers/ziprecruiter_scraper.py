@@ -1,12 +1,23 @@
 import asyncio
 import logging
 from typing import List, Dict, Any
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, card_field, ScraperBlockedError
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
 class ZipRecruiterScraper(BaseScraper):
+    # Modern ZipRecruiter uses [data-testid="job-card"]
+    CARD_SELECTORS = ['[data-testid="job-card"], .job_content']
+    CARD_FIELDS = {
+        # Title is usually an h2 or has a specific data-testid
+        "title": card_field('h2, [data-testid="job-card-title"]'),
+        "company": card_field('[data-testid="job-card-company"], .company_name'),
+        "location": card_field('[data-testid="job-card-location"], .location'),
+        # Link is often either a link inside the card, or the card itself if it's an 'a' tag
+        "link": card_field('a[href*="/jobs/"]', ":scope", attr="href"),
+    }
+
     async def search_jobs(self, query: str, location: str = "India", page: int = 1) -> List[Dict[str, Any]]:
         """
         Search for jobs on ZipRecruiter.
@@ -26,16 +37,16 @@ class ZipRecruiterScraper(BaseScraper):
             page_obj, context = await self._get_page()
             
             # ZipRecruiter has Cloudflare/Bot protection
-            await page_obj.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await self._navigate(page_obj, url, wait_until="domcontentloaded", timeout=45000)
             
-            # Brief wait for animations/content
-            await asyncio.sleep(2)
+            # Wait for cards, or for the page to settle on a challenge
+            await self._wait_ready(page_obj)
             
             # Check for Cloudflare/Access Denied
             content = await page_obj.content()
             if "Access Denied" in content or "hcaptcha" in content.lower():
                 logger.warning("ZipRecruiter bot detection triggered. Skipping.")
-                return []
+                raise ScraperBlockedError("ZipRecruiter bot challenge")
 
             # Wait for job cards
             # Modern ZipRecruiter uses [data-testid="job-card"]
@@ -45,24 +56,14 @@ class ZipRecruiterScraper(BaseScraper):
                 logger.warning(f"No job cards found on ZipRecruiter for '{query}' in '{location}'")
                 return []
 
-            cards = await page_obj.query_selector_all('[data-testid="job-card"], .job_content')
+            cards = await self._extract_cards(page_obj)
             
             for card in cards:
                 try:
-                    # Title is usually an h2 or has a specific data-testid
-                    title_el = await card.query_selector('h2, [data-testid="job-card-title"]')
-                    company_el = await card.query_selector('[data-testid="job-card-company"], .company_name')
-                    location_el = await card.query_selector('[data-testid="job-card-location"], .location')
-                    
-                    # Link is often either the card itself if it's an 'a' tag, or a link inside
-                    link_el = await card.query_selector('a[href*="/jobs/"]')
-                    if not link_el and card.tag_name() == 'a':
-                        link_el = card
-
-                    title = await title_el.inner_text() if title_el else "Unknown Role"
-                    company = await company_el.inner_text() if company_el else "Unknown Company"
-                    loc = await location_el.inner_text() if location_el else location
-                    link = await link_el.get_attribute("href") if link_el else ""
+                    title = card["title"] or "Unknown Role"
+                    company = card["company"] or "Unknown Company"
+                    loc = card["location"] or location
+                    link = card["link"] or ""
                     
                     if link and not link.startswith("http"):
                         link = f"https://www.ziprecruiter.com{link}"
@@ -80,6 +81,8 @@ class ZipRecruiterScraper(BaseScraper):
                     logger.debug(f"Error parsing ZipRecruiter job card: {e}")
                     continue
                     
+        except ScraperBlockedError:
+            raise
         except Exception as e:
             logger.error(f"ZipRecruiter scraping error: {e}")
         finally:
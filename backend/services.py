@@ -2,8 +2,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 from models import Job, SearchQuery, UserInteraction
 from managers.scraper_manager import ScraperManager
+from managers.budget_manager import PRIORITY_INTERACTIVE, PRIORITY_PREWARM
 from managers.filter_engine import FilterEngine
 from managers.matching_engine import MatchingEngine
+from managers.ingest_pipeline import IngestPipeline
+from utils.query_canonical import canonical_location, canonicalize_query, location_spellings
 from database import AsyncSessionLocal
 from hashlib import md5
 import json
@@ -14,74 +17,41 @@ import asyncio
 logger = logging.getLogger(__name__)
 
 class JobService:
-    def __init__(self, db: AsyncSession, vector_manager=None, profiler=None):
+    def __init__(self, db: AsyncSession, vector_manager=None, profiler=None, enricher=None):
         self.db = db
         self.scraper_manager = ScraperManager()
         self.filter_engine = FilterEngine()
         self.matching_engine = MatchingEngine()
         self.vector_manager = vector_manager
         self.profiler = profiler
+        # Fetches detail pages for top-ranked jobs with placeholder descriptions (optional)
+        self.enricher = enricher
 
     def _generate_query_hash(self, params: dict) -> str:
         """Create a deterministic hash from search parameters."""
         query_string = json.dumps(params, sort_keys=True)
         return md5(query_string.encode()).hexdigest()
 
-    async def _scrape_and_save_background(self, query: str, location: str, page: int, query_hash: str, cache_params: dict, country: str = "India"):
-        """Background task to scrape and update DB/Vector index."""
+    async def _scrape_and_save_background(self, query: str, location: str, page: int, query_hash: str, cache_params: dict, country: str = "India",
+                                          priority: str = PRIORITY_INTERACTIVE):
+        """
+        Background task to scrape and update DB/Vector index.
+        Sources stream into the staged ingest pipeline, so fast sources are saved and
+        indexed while slow scrapers are still running. `priority` is prewarm for
+        refreshes of searches that already have enough results.
+        """
         logger.info(f"Background Scrape Triggered: {query} in {country}")
         try:
-             # Use a fresh DB session for background task
-             async with AsyncSessionLocal() as session:
-                 # Re-instantiate manager with new session if needed, or just use it
-                 # ScraperManager doesn't hold DB state, it returns data
-                 jobs_data = await self.scraper_manager.execute_search(query, location, page, country=country)
-                 
-                 if jobs_data:
-                     # DEDUPLICATION: Remove duplicates before saving
-                     seen_links = set()
-                     seen_jobs = set()  # (title, company) tuples
-                     unique_jobs = []
-                     
-                     for job_dict in jobs_data:
-                         # Primary dedup: by apply_link
-                         apply_link = job_dict.get("apply_link", "")
-                         if apply_link and apply_link in seen_links:
-                             logger.debug(f"Skipping duplicate job (same link): {job_dict.get('title')} at {job_dict.get('company')}")
-                             continue
-                         
-                         # Secondary dedup: by title + company (for jobs without links or different links to same job)
-                         job_signature = (
-                             job_dict.get("title", "").lower().strip(),
-                             job_dict.get("company", "").lower().strip()
-                         )
-                         if job_signature in seen_jobs:
-                             logger.debug(f"Skipping duplicate job (same title+company): {job_dict.get('title')} at {job_dict.get('company')}")
-                             continue
-                         
-                         # Mark as seen
-                         if apply_link:
-                             seen_links.add(apply_link)
-                         seen_jobs.add(job_signature)
-                         unique_jobs.append(job_dict)
-                     
-                     logger.info(f"Deduplication: {len(jobs_data)} → {len(unique_jobs)} unique jobs ({len(jobs_data) - len(unique_jobs)} duplicates removed)")
-                     
-                     # Upsert Logic
-                     valid_jobs = []
-                     for job_dict in unique_jobs:
-                         try:
-                             # Add extra metadata
-                             job_dict["query_hash"] = query_hash
-                             job_dict["country"] = country # Tag with country
-                             job = Job(**job_dict)
-                             await session.merge(job)
-                             valid_jobs.append(job_dict)
-                         except Exception as e:
-                             continue
-                     
-                     # Update Cache Entry
-                     # Need to fetch or create SearchQuery in this session
+             # ScraperManager doesn't hold DB state, it streams data
+             pipeline = IngestPipeline(AsyncSessionLocal, vector_manager=self.vector_manager)
+             total_saved = await pipeline.run(
+                 self.scraper_manager.stream_search(query, location, page, country=country, priority=priority),
+                 query_hash, country
+             )
+             
+             if total_saved:
+                 # Update Cache Entry
+                 async with AsyncSessionLocal() as session:
                      stmt = select(SearchQuery).where(SearchQuery.query_hash == query_hash)
                      res = await session.execute(stmt)
                      cached = res.scalar_one_or_none()
@@ -92,14 +62,9 @@ class JobService:
                      cached.last_fetched = datetime.utcnow()
                      
                      await session.commit()
-                     
-                     # Index to Vector DB (real-time update)
-                     if self.vector_manager:
-                         self.vector_manager.upsert_jobs(jobs_data)
-                     
-                     logger.info(f"Background Scrape Complete: {len(valid_jobs)} jobs added.")
-                 else:
-                     logger.info("Background Scrape: No jobs found.")
+                 logger.info(f"Background Scrape Complete: {total_saved} jobs added.")
+             else:
+                 logger.info("Background Scrape: No jobs found.")
                      
         except Exception as e:
             logger.error(f"Background task failed: {e}")
@@ -116,9 +81,15 @@ class JobService:
         context_id: str = None,
         country: str = "India"
     ):
-        search_term = query.strip() or "Job"
+        # Canonical query/location: "Python Devs in Bengaluru" and "python developer" +
+        # location "Bangalore" share one cache entry and one set of scrapes
+        canonical = canonicalize_query(query, locations[0] if locations else None)
+        search_term = canonical.query or "Job"
+        if not locations and canonical.location:
+            # Location typed into the query acts like the location filter
+            locations = [canonical.location]
         # Use first location for scraping search term
-        primary_location = locations[0] if locations and len(locations) > 0 else None
+        primary_location = canonical.location
         if primary_location: 
             full_term = f"{search_term} in {primary_location}"
         else: 
@@ -128,7 +99,7 @@ class JobService:
         cache_params = {
             "q": full_term, 
             "page": page,
-            "orig_q": query,
+            "orig_q": search_term,
             "skills": skills,
             "portals": jobPortals,
             "exp": experience,
@@ -224,13 +195,13 @@ class JobService:
             if locations and len(locations) > 0:
                 location_conditions = []
                 for loc in locations:
-                    if loc == "Delhi NCR":
-                        # Expand Delhi NCR to all component cities
-                        ncr_cities = ["Delhi", "Gurgaon", "Noida", "Faridabad", "Greater Noida", "Manesar", "Ghaziabad"]
-                        for city in ncr_cities:
-                            location_conditions.append(Job.location.ilike(f"%{city}%"))
-                    else:
-                        location_conditions.append(Job.location.ilike(f"%{loc}%"))
+                    # All spellings: "Bangalore" also matches Naukri's "Bengaluru"
+                    spellings = location_spellings(loc)
+                    if canonical_location(loc) == "Delhi NCR":
+                        # "Delhi", "New Delhi", "NCR"...: expand to all component cities
+                        spellings += ["Delhi", "Gurgaon", "Gurugram", "Noida", "Faridabad", "Manesar", "Ghaziabad"]
+                    for spelling in dict.fromkeys(spellings):
+                        location_conditions.append(Job.location.ilike(f"%{spelling}%"))
                 stmt = stmt.where(or_(*location_conditions))
             
         # 3. Apply Filters (using Engine)
@@ -251,10 +222,13 @@ class JobService:
         # 4. Trigger Background Scrape if needed (or if DB has few results)
         # Increased threshold from 5 to 50 to ensure we always have fresh, comprehensive results
         if should_scrape or len(jobs) < 50:
-            logger.info(f"🔄 Triggering background scrape: should_scrape={should_scrape}, current_jobs={len(jobs)}")
+            # A stale cache with a full page of results is refreshed as prewarm work: it yields
+            # scheduler slots to searches still short of results and leaves the API reserve alone
+            priority = PRIORITY_PREWARM if len(jobs) >= 50 else PRIORITY_INTERACTIVE
+            logger.info(f"🔄 Triggering background scrape: should_scrape={should_scrape}, current_jobs={len(jobs)}, priority={priority}")
             # Fire and forget
             asyncio.create_task(self._scrape_and_save_background(
-                search_term, primary_location, page, query_hash, cache_params, country
+                search_term, primary_location, page, query_hash, cache_params, country, priority=priority
             ))
         else:
             logger.info(f"✅ Using cached results: {len(jobs)} jobs found")
@@ -382,6 +356,16 @@ class JobService:
         
         if len(scored_jobs) != len(unique_results):
             logger.info(f"Removed {len(scored_jobs) - len(unique_results)} duplicate jobs from results")
+
+        # Top results with placeholder descriptions get their detail pages fetched in the
+        # background, so the next ranking (embedding, skills, rerank) sees the real text
+        if self.enricher:
+            try:
+                queued = self.enricher.submit(unique_results[:self.enricher.top_n])
+                if queued:
+                    logger.info(f"Queued {queued} top jobs for detail enrichment")
+            except Exception as e:
+                logger.error(f"Enrichment queueing failed: {e}")
             
         # --- AUTOMATIC CSV TRACKING ---
         try:
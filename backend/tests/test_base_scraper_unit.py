@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers.base_scraper import BaseScraper, EXTRACT_CARDS_JS, card_field
+from scrapers.naukri_scraper import NaukriScraper
+from scrapers.foundit_scraper import FounditScraper
+
+
+def make_page(records):
+    """Mock page whose extraction call returns `records`; other evaluate calls return None."""
+    page = MagicMock()
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.title = AsyncMock(return_value="Jobs")
+    page.close = AsyncMock()
+    page.evaluate = AsyncMock(side_effect=lambda script, arg=None: records if script == EXTRACT_CARDS_JS else None)
+    return page
+
+
+class TestCardExtraction:
+    """Unit tests for declarative single-roundtrip card extraction"""
+
+    def test_card_field_spec(self):
+        assert card_field("a.title", "h3", attr="href") == {"selectors": ["a.title", "h3"], "attr": "href", "many": False}
+        assert card_field(".tag", many=True)["many"] is True
+
+    @pytest.mark.asyncio
+    async def test_extract_cards_uses_declared_selectors(self):
+        page = make_page([{"title": "Data Scientist"}])
+
+        records = await NaukriScraper()._extract_cards(page, limit=20)
+
+        assert records == [{"title": "Data Scientist"}]
+        page.evaluate.assert_awaited_once()
+        script, arg = page.evaluate.await_args.args
+        assert script == EXTRACT_CARDS_JS
+        assert arg["cardSelectors"] == NaukriScraper.CARD_SELECTORS
+        assert arg["fields"]["skills"] == card_field(".dot-gt-tag", "li.dot-gt-tag", many=True)
+        assert arg["limit"] == 20
+
+    @pytest.mark.asyncio
+    async def test_extract_cards_handles_empty_result(self):
+        page = make_page(None)
+        assert await BaseScraper()._extract_cards(page, card_selectors=[".card"], fields={"t": card_field("h2")}) == []
+
+    @pytest.mark.asyncio
+    async def test_naukri_post_processes_plain_records(self):
+        records = [{
+            "title": "Data Scientist",
+            "company": "Fractal Analytics",
+            "apply_link": "https://www.naukri.com/job-listings-1",
+            "experience": "3-8 Yrs",
+            "location": None,
+            "description": "Build ML models",
+            "skills": ["python", "sql"],
+        }]
+        page = make_page(records)
+        scraper = NaukriScraper()
+        scraper.API_RESPONSE_TIMEOUT = 0.01  # no search payload: DOM fallback
+
+        with patch.object(scraper, "_get_page", AsyncMock(return_value=(page, MagicMock()))), \
+             patch("scrapers.naukri_scraper.asyncio.sleep", AsyncMock()), \
+             patch.object(scraper, "_random_delay", AsyncMock()):
+            jobs = await scraper.search_jobs("data scientist", "Bangalore")
+
+        assert len(jobs) == 1
+        job = jobs[0]
+        assert (job["experience_min"], job["experience_max"]) == (3, 8)
+        assert job["location"] == "Bangalore"
+        assert job["skills"] == ["python", "sql"]
+        assert job["source"] == "Naukri.com"
+        extraction_calls = [c for c in page.evaluate.await_args_list if c.args[0] == EXTRACT_CARDS_JS]
+        assert len(extraction_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_naukri_returns_context_to_pool(self):
+        page = make_page([])
+        scraper = NaukriScraper()
+        scraper.API_RESPONSE_TIMEOUT = 0.01
+
+        with patch.object(scraper, "_get_page", AsyncMock(return_value=(page, MagicMock()))), \
+             patch.object(scraper, "_safe_close", AsyncMock()) as safe_close, \
+             patch("scrapers.naukri_scraper.asyncio.sleep", AsyncMock()), \
+             patch.object(scraper, "_random_delay", AsyncMock()):
+            await scraper.search_jobs("data scientist", "Bangalore")
+
+        safe_close.assert_awaited_once()
+        page.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_foundit_parses_labels(self):
+        records = [{
+            "title": "ML Engineer",
+            "link": "/job/ml-engineer-123",
+            "company": "Acme",
+            "labels": ["5-10 Years", "12-18 LPA", "Bangalore"],
+            "text": "ML Engineer Acme 5-10 Years",
+        }]
+        page = make_page(records)
+        scraper = FounditScraper()
+        scraper.API_RESPONSE_TIMEOUT = 0.01
+
+        with patch.object(scraper, "_get_page", AsyncMock(return_value=(page, MagicMock()))), \
+             patch.object(scraper, "_random_delay", AsyncMock()), \
+             patch.object(scraper, "_safe_close", AsyncMock()):
+            jobs = await scraper.search_jobs("ml engineer", "India")
+
+        assert jobs[0]["apply_link"] == "https://www.foundit.in/job/ml-engineer-123"
+        assert (jobs[0]["experience_min"], jobs[0]["experience_max"]) == (5, 10)
+        assert jobs[0]["location"] == "Bangalore"
+
+
+class TestPageLeases:
+    """Unit tests for per-task page leases"""
+
+    @pytest.mark.asyncio
+    async def test_close_without_lease_leaves_other_pages_alone(self):
+        scraper = NaukriScraper()
+        pool = MagicMock(get_page=AsyncMock(return_value=("page", "context")), close_page=AsyncMock())
+        with patch("scrapers.base_scraper.get_browser_pool", AsyncMock(return_value=pool)):
+            await scraper._get_page()  # another task's lease, also left in self._page
+
+            async def failed_scrape():
+                await scraper._safe_close()  # e.g. after _get_page raised
+
+            await asyncio.create_task(failed_scrape())
+            pool.close_page.assert_not_awaited()
+            assert scraper._page == "page"
+
+            await scraper._safe_close()
+            pool.close_page.assert_awaited_once_with("page", "context")
+            assert scraper._page is None
@@ -0,0 +1,312 @@
+import asyncio
+import os
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from scrapers.browser_pool import BrowserPool, chromium_rss_bytes
+from scrapers.routing_policy import RoutingPolicy, get_routing_policy
+
+
+def make_route(resource_type, url):
+    route = MagicMock()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    route.abort = AsyncMock()
+    route.continue_ = AsyncMock()
+    return route
+
+
+class TestRoutingPolicy:
+    """Unit tests for browser request routing policies"""
+
+    def test_blocks_default_resource_types(self):
+        policy = RoutingPolicy()
+        assert policy.should_block("image", "https://www.naukri.com/logo.png")
+        assert policy.should_block("font", "https://static.naukimg.com/font.woff2")
+        assert not policy.should_block("script", "https://www.naukri.com/app.js")
+        assert not policy.should_block("xhr", "https://www.naukri.com/jobapi/v3/search")
+
+    def test_blocks_tracker_subdomains(self):
+        policy = RoutingPolicy()
+        assert policy.should_block("script", "https://www.googletagmanager.com/gtm.js?id=GTM-1")
+        assert policy.should_block("xhr", "https://in1.clevertap-prod.com/a?t=96")
+        assert not policy.should_block("script", "https://notgoogletagmanager.com/x.js")
+
+    def test_never_blocks_document(self):
+        policy = RoutingPolicy(blocked_types={"document"})
+        assert not policy.should_block("document", "https://www.doubleclick.net/")
+
+    def test_source_override_allows_stylesheets(self):
+        assert get_routing_policy("Glassdoor").should_block("stylesheet", "https://www.glassdoor.co.in/a.css") is False
+        assert get_routing_policy("Naukri").should_block("stylesheet", "https://www.naukri.com/a.css") is True
+
+    def test_env_disables_blocking(self, monkeypatch):
+        monkeypatch.setenv("BROWSER_BLOCK_RESOURCES", "")
+        monkeypatch.setenv("BROWSER_BLOCK_TRACKERS", "false")
+        assert not get_routing_policy("Naukri").enabled
+
+
+class TestBrowserPoolRouting:
+    """Unit tests for the BrowserPool route handler (no browser launched)"""
+
+    @pytest.fixture
+    def pool(self):
+        BrowserPool._instance = None
+        pool = BrowserPool()
+        yield pool
+        BrowserPool._instance = None
+
+    @pytest.mark.asyncio
+    async def test_route_request_aborts_and_counts(self, pool):
+        policy = RoutingPolicy()
+        image = make_route("image", "https://www.naukri.com/logo.png")
+        tracker = make_route("script", "https://www.google-analytics.com/analytics.js")
+        document = make_route("document", "https://www.naukri.com/python-jobs")
+
+        for route in (image, tracker, document):
+            await pool._route_request(route, policy)
+
+        image.abort.assert_awaited_once()
+        tracker.abort.assert_awaited_once()
+        document.continue_.assert_awaited_once()
+        assert pool.snapshot()["blocked_requests"] == {"image": 1, "script": 1}
+        assert pool.snapshot()["allowed_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_route_request_swallows_closed_page_errors(self, pool):
+        route = make_route("image", "https://www.naukri.com/logo.png")
+        route.abort.side_effect = Exception("Target page, context or browser has been closed")
+
+        await pool._route_request(route, RoutingPolicy())
+
+
+def make_browser():
+    """Mock Chromium whose contexts/pages record what the pool does with them."""
+    def new_context(**kwargs):
+        context = MagicMock()
+        context.options = kwargs
+        context.pages = []
+
+        def new_page():
+            page = MagicMock()
+            page.is_closed.return_value = False
+            page.evaluate = AsyncMock(return_value=0)
+            page.goto = AsyncMock()
+
+            def close():
+                page.is_closed.return_value = True
+                context.pages.remove(page)
+            page.close = AsyncMock(side_effect=close)
+            context.pages.append(page)
+            return page
+
+        context.new_page = AsyncMock(side_effect=new_page)
+        context.cdp = MagicMock(send=AsyncMock(), detach=AsyncMock())
+        context.new_cdp_session = AsyncMock(return_value=context.cdp)
+        context.route = AsyncMock()
+        context.add_init_script = AsyncMock()
+        context.clear_cookies = AsyncMock()
+        context.close = AsyncMock()
+        return context
+
+    browser = MagicMock()
+    browser.new_context = AsyncMock(side_effect=new_context)
+    browser.close = AsyncMock()
+    return browser
+
+
+def handler_for(context, event):
+    """The callback the pool registered with context.on(event, ...)."""
+    return next(c.args[1] for c in context.on.call_args_list if c.args[0] == event)
+
+
+class TestBrowserPoolContexts:
+    """Unit tests for warm context reuse (mocked browser)"""
+
+    @pytest.fixture
+    def pool(self):
+        BrowserPool._instance = None
+        pool = BrowserPool()
+        pool.browser = make_browser()
+        pool.pool_size = 2
+        pool.max_uses = 3
+        yield pool
+        BrowserPool._instance = None
+
+    @pytest.mark.asyncio
+    async def test_released_context_is_reset_and_reused(self, pool):
+        page, context = await pool.get_page(source="Naukri")
+        await pool.close_page(page, context)
+
+        context.clear_cookies.assert_awaited_once()
+        page.close.assert_awaited_once()
+        context.close.assert_not_awaited()
+
+        page2, context2 = await pool.get_page(source="Iimjobs")
+        assert context2 is context
+        assert page2 is not page and not page2.is_closed()
+        assert pool.browser.new_context.await_count == 1
+        assert pool.snapshot()["reuse_rate"] == 0.5
+        assert pool.snapshot()["acquire_wait"]["samples"] == 2
+
+    @pytest.mark.asyncio
+    async def test_storage_of_every_visited_origin_is_cleared(self, pool):
+        page, context = await pool.get_page(source="Naukri")
+        on_request = handler_for(context, "request")
+        for url, navigation in (
+            ("https://www.naukri.com/python-jobs", True),
+            ("https://login.naukri.com/sso?next=/", True),   # iframe
+            ("https://static.naukri.com/app.js", False),
+            ("about:blank", True),
+        ):
+            on_request(MagicMock(url=url, is_navigation_request=Mock(return_value=navigation)))
+        await page.close()  # the scraper closed its page before handing it back
+        await pool.close_page(page, context)
+
+        cleared = [c.args for c in context.cdp.send.await_args_list]
+        assert cleared == [
+            ("Storage.clearDataForOrigin", {"origin": "https://login.naukri.com", "storageTypes": "all"}),
+            ("Storage.clearDataForOrigin", {"origin": "https://www.naukri.com", "storageTypes": "all"}),
+        ]
+        context.cdp.detach.assert_awaited_once()
+        context.clear_cookies.assert_awaited_once()
+
+        page2, context2 = await pool.get_page(source="Naukri")
+        assert context2 is context and not page2.is_closed()
+        await pool.close_page(page2, context2)
+        assert context.cdp.send.await_count == 2  # nothing visited during the second lease
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_when_storage_cannot_be_cleared(self, pool):
+        page, context = await pool.get_page(source="Naukri")
+        handler_for(context, "request")(
+            MagicMock(url="https://www.naukri.com/", is_navigation_request=Mock(return_value=True)))
+        context.cdp.send.side_effect = Exception("Target closed")
+        await pool.close_page(page, context)
+
+        context.close.assert_awaited_once()
+        assert pool.snapshot()["context_pool"]["recycled_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_profiles_do_not_share_contexts(self, pool):
+        page, context = await pool.get_page(source="Naukri")
+        await pool.close_page(page, context)
+
+        _, gulf_context = await pool.get_page(source="NaukriGulf")
+        assert gulf_context is not context
+        assert gulf_context.options["timezone_id"] == "Asia/Dubai"
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_after_max_uses(self, pool):
+        for _ in range(3):
+            page, context = await pool.get_page(source="Naukri")
+            await pool.close_page(page, context)
+
+        context.close.assert_awaited_once()
+        assert pool.snapshot()["context_pool"]["recycled_uses"] == 1
+        assert pool.snapshot()["idle_contexts"]["india"] == 0
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_on_heap_growth(self, pool):
+        page, context = await pool.get_page(source="Naukri")
+        page.evaluate.return_value = pool.max_heap_bytes + 1
+        await pool.close_page(page, context)
+
+        context.close.assert_awaited_once()
+        assert pool.snapshot()["context_pool"]["recycled_memory"] == 1
+
+    @pytest.mark.asyncio
+    async def test_route_uses_current_lease_policy(self, pool):
+        page, context = await pool.get_page(source="Glassdoor")
+        handler = context.route.await_args.args[1]
+        stylesheet = make_route("stylesheet", "https://www.glassdoor.co.in/a.css")
+        await handler(stylesheet)
+        stylesheet.continue_.assert_awaited_once()
+
+        await pool.close_page(page, context)
+        await pool.get_page(source="Naukri")
+        stylesheet = make_route("stylesheet", "https://www.naukri.com/a.css")
+        await handler(stylesheet)
+        stylesheet.abort.assert_awaited_once()
+
+
+class TestBrowserMemoryGovernor:
+    """Unit tests for context tracking and browser recycling (mocked Playwright)"""
+
+    @pytest.fixture
+    def pool(self):
+        BrowserPool._instance = None
+        pool = BrowserPool()
+        pool.playwright = MagicMock()
+        pool.playwright.chromium.launch = AsyncMock(side_effect=lambda **kwargs: make_browser())
+        pool.memory_check_interval = 3600
+        pool._rss_sampled_at = float("inf")
+        yield pool
+        BrowserPool._instance = None
+
+    @pytest.mark.asyncio
+    async def test_contexts_are_tracked_until_closed(self, pool):
+        await pool._launch_browser()
+        page, context = await pool.get_page(source="Naukri")
+        assert pool.snapshot()["active_contexts"] == 1
+
+        # Closed behind the pool's back (e.g. by the browser): the close event untracks it
+        on_close = handler_for(context, "close")
+        on_close(context)
+        assert pool.snapshot()["active_contexts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_recycles_past_context_limit_and_drains_old_browser(self, pool):
+        await pool._launch_browser()
+        pool.max_contexts = 2
+        old_browser = pool.browser
+        leases = [await pool.get_page(source="Naukri") for _ in range(2)]
+
+        page, context = await pool.get_page(source="Naukri")
+        assert pool.browser is not old_browser
+        assert pool.snapshot()["memory"]["relaunches"] == {"contexts": 1}
+        assert pool.snapshot()["memory"]["draining_browsers"] == 1
+        old_browser.close.assert_not_awaited()
+
+        # Leases on the retired browser are closed on release, not pooled
+        for old_page, old_context in leases:
+            await pool.close_page(old_page, old_context)
+            old_context.close.assert_awaited_once()
+        await asyncio.sleep(0)
+        old_browser.close.assert_awaited_once()
+        assert pool.snapshot()["memory"]["draining_browsers"] == 0
+        assert pool.snapshot()["active_contexts"] == 1
+
+        await pool.close_page(page, context)
+        assert pool.snapshot()["idle_contexts"]["india"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recycles_on_memory_growth(self, pool, monkeypatch):
+        await pool._launch_browser()
+        monkeypatch.setattr("scrapers.browser_pool.chromium_rss_bytes", lambda: int(pool.max_rss_bytes) + 1)
+        pool._rss_sampled_at = 0.0
+        old_browser = pool.browser
+
+        await pool.get_page(source="Naukri")
+
+        assert pool.browser is not old_browser
+        assert pool.snapshot()["memory"]["relaunches"] == {"memory": 1}
+        assert pool.snapshot()["memory"]["rss_mb"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_drain_timeout_closes_leaked_contexts(self, pool):
+        await pool._launch_browser()
+        pool.drain_timeout = 0.01
+        old_browser = pool.browser
+        await pool.get_page(source="Naukri")  # never released
+
+        await pool.recycle_browser("manual")
+        await asyncio.gather(*pool._retiring.values())
+
+        old_browser.close.assert_awaited_once()
+        assert pool.snapshot()["leased_contexts"] == 0
+        assert pool.snapshot()["active_contexts"] == 0
+        assert pool.snapshot()["context_pool"]["drain_timeouts"] == 1
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+    def test_rss_sampling_without_chromium(self):
+        assert chromium_rss_bytes() == 0
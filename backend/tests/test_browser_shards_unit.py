@@ -0,0 +1,107 @@
+import asyncio
+import os
+import pytest
+import pytest_asyncio
+from scrapers.base_scraper import BaseScraper, ScraperBlockedError
+from scrapers.browser_shards import BrowserShards
+
+
+# Scrapers run inside the worker processes, so they must be importable top-level classes
+
+class EchoScraper:
+    async def search_jobs(self, query, location, page=1, **kwargs):
+        return [{"title": query, "location": location, "page": page, "pid": os.getpid(), **kwargs}]
+
+
+class SlowScraper:
+    async def search_jobs(self, query, location, page=1):
+        await asyncio.sleep(30)
+        return []
+
+
+class NormalizingScraper(BaseScraper):
+    async def search_jobs(self, query, location, page=1):
+        return [self.normalize_job_data({"title": query, "apply_link": "https://www.naukri.com/job-1"}, "Naukri.com")]
+
+
+class BlockedScraper:
+    async def search_jobs(self, query, location, page=1):
+        raise ScraperBlockedError("captcha")
+
+
+class TestBrowserShards:
+    """Unit tests for browser worker processes (no browser launched)"""
+
+    @pytest_asyncio.fixture
+    async def shards(self):
+        shards = BrowserShards(workers=2)
+        yield shards
+        shards.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_scraper_in_worker_process(self, shards):
+        jobs = await shards.run("Naukri", EchoScraper, ("python", "Pune", 2), {"country": "India"})
+
+        assert jobs[0]["title"] == "python"
+        assert jobs[0]["page"] == 2
+        assert jobs[0]["country"] == "India"
+        assert jobs[0]["pid"] != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_job_ids_match_across_processes(self, shards):
+        local = await NormalizingScraper().search_jobs("python", "Pune")
+        remote = await shards.run("Naukri", NormalizingScraper, ("python", "Pune"))
+
+        assert remote[0]["id"] == local[0]["id"]
+
+    @pytest.mark.asyncio
+    async def test_affinity_keeps_source_on_one_shard(self, shards):
+        runs = [shards.run("Naukri", EchoScraper, ("python", "Pune", p)) for p in range(1, 4)]
+        results = await asyncio.gather(*runs)
+
+        assert len({jobs[0]["pid"] for jobs in results}) == 1
+        assert sum(shard.calls for shard in shards.shards) == 3
+        assert shards.pick("Naukri").calls == 3
+
+    @pytest.mark.asyncio
+    async def test_least_loaded_spreads_concurrent_calls(self):
+        shards = BrowserShards(workers=2, policy="least_loaded")
+        try:
+            results = await asyncio.gather(*[shards.run("Naukri", EchoScraper, ("python", "Pune", p))
+                                             for p in range(1, 5)])
+        finally:
+            shards.shutdown()
+
+        assert len({jobs[0]["pid"] for jobs in results}) == 2
+        assert [shard.calls for shard in shards.shards] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_worker_errors_keep_their_type(self, shards):
+        with pytest.raises(ScraperBlockedError):
+            await shards.run("Naukri", BlockedScraper, ("python", "Pune"))
+        assert shards.pick("Naukri").snapshot()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_scrape_in_worker(self, shards):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(shards.run("Naukri", SlowScraper, ("python", "Pune")), 2)
+
+        shard = shards.pick("Naukri")
+        assert shard.snapshot()["in_flight"] == 0
+        # The worker is still serving calls
+        jobs = await shards.run("Naukri", EchoScraper, ("java", "Pune"))
+        assert jobs[0]["title"] == "java"
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_fails_calls_and_restarts(self, shards):
+        shard = shards.pick("Naukri")
+        call = asyncio.create_task(shards.run("Naukri", SlowScraper, ("python", "Pune")))
+        while not shard.alive or not shard.pending:
+            await asyncio.sleep(0.05)
+        shard.process.kill()
+
+        with pytest.raises(RuntimeError, match="exited"):
+            await asyncio.wait_for(call, 10)
+        jobs = await shards.run("Naukri", EchoScraper, ("python", "Pune"))
+        assert jobs[0]["title"] == "python"
+        assert shard.snapshot()["restarts"] == 1
@@ -0,0 +1,91 @@
+import pytest
+from managers.budget_manager import ApiBudgetManager, PRIORITY_INTERACTIVE, PRIORITY_PREWARM
+
+
+class TestApiBudgetManager:
+    """Unit tests for the quota-aware API budget manager"""
+
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        return str(tmp_path / "api_budget.json")
+
+    @pytest.fixture
+    def budget(self, state_file):
+        budget = ApiBudgetManager(state_file=state_file, reserve_fraction=0.2, max_wait=0.5)
+        jsearch = budget.providers["jsearch"]
+        jsearch.monthly_quota = 10
+        jsearch.rate_per_sec = 100
+        jsearch.capacity = jsearch.tokens = 100
+        return budget
+
+    @pytest.mark.asyncio
+    async def test_acquire_consumes_budget(self, budget):
+        """Each granted call is counted against the monthly quota"""
+        assert await budget.acquire("jsearch")
+        assert await budget.acquire("jsearch", cost=2)
+
+        assert budget.snapshot()["jsearch"]["used"] == 3
+        assert budget.snapshot()["jsearch"]["remaining"] == 7
+
+    @pytest.mark.asyncio
+    async def test_prewarm_respects_reserve(self, budget):
+        """Prewarm stops at the reserve; interactive can use it"""
+        budget.providers["jsearch"].used = 8  # 2 left, reserve is 2
+
+        assert not await budget.acquire("jsearch", priority=PRIORITY_PREWARM)
+        assert await budget.acquire("jsearch", priority=PRIORITY_INTERACTIVE)
+        assert await budget.acquire("jsearch", priority=PRIORITY_INTERACTIVE)
+        assert not await budget.acquire("jsearch", priority=PRIORITY_INTERACTIVE)
+        assert budget.snapshot()["jsearch"]["denied"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_skips_prewarm_and_waits_for_interactive(self, budget):
+        """Empty bucket: prewarm is skipped, interactive waits if within max_wait"""
+        jsearch = budget.providers["jsearch"]
+        jsearch.rate_per_sec = 10
+        jsearch.capacity = jsearch.tokens = 1
+        assert await budget.acquire("jsearch")
+
+        assert not await budget.acquire("jsearch", priority=PRIORITY_PREWARM)
+        assert await budget.acquire("jsearch", priority=PRIORITY_INTERACTIVE)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_wait_too_long(self, budget):
+        """Interactive calls are skipped when the token wait exceeds max_wait"""
+        jsearch = budget.providers["jsearch"]
+        jsearch.rate_per_sec = 0.1
+        jsearch.capacity = jsearch.tokens = 1
+        assert await budget.acquire("jsearch")
+
+        assert not await budget.acquire("jsearch")
+
+    @pytest.mark.asyncio
+    async def test_usage_persisted_across_restarts(self, budget, state_file):
+        """Monthly usage is reloaded from disk"""
+        await budget.acquire("adzuna")
+        await budget.acquire("adzuna")
+
+        restarted = ApiBudgetManager(state_file=state_file)
+        assert restarted.providers["adzuna"].used == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_month_is_reset(self, budget, state_file):
+        """Usage recorded in a previous month does not carry over"""
+        await budget.acquire("adzuna")
+        budget.providers["adzuna"].month = "2000-01"
+        budget._save()
+
+        restarted = ApiBudgetManager(state_file=state_file)
+        assert restarted.providers["adzuna"].used == 0
+
+    def test_sync_remaining_from_provider_header(self, budget):
+        """Provider-reported remaining quota only ever increases local usage"""
+        budget.sync_remaining("jsearch", 4)
+        assert budget.providers["jsearch"].used == 6
+
+        budget.sync_remaining("jsearch", 9)
+        assert budget.providers["jsearch"].used == 6
+
+    @pytest.mark.asyncio
+    async def test_unknown_provider_is_unmetered(self, budget):
+        assert await budget.acquire("remotive")
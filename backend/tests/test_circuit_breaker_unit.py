@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import patch
+from managers.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker:
+    """Unit tests for the per-source circuit breaker"""
+
+    @pytest.fixture
+    def breaker(self):
+        return CircuitBreaker("Indeed", failure_threshold=3, empty_threshold=4, base_cooldown=60, max_cooldown=240)
+
+    def test_trips_after_consecutive_failures(self, breaker):
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        assert breaker.state == CLOSED
+
+        breaker.record_failure("blocked")
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_success_resets_failures(self, breaker):
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        breaker.record_success(1.0, 10)
+        breaker.record_failure("timeout")
+        assert breaker.state == CLOSED
+
+    def test_empty_runs_trip_breaker(self, breaker):
+        for _ in range(4):
+            breaker.record_success(1.0, 0)
+        assert breaker.state == OPEN
+
+    def test_half_open_allows_single_probe(self, breaker):
+        for _ in range(3):
+            breaker.record_failure("blocked")
+
+        with patch("managers.circuit_breaker.time.time", return_value=breaker.opened_at + 61):
+            assert breaker.allow()
+            assert breaker.state == HALF_OPEN
+            assert not breaker.allow()
+
+        breaker.record_success(2.0, 5)
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_doubles_cooldown(self, breaker):
+        for _ in range(3):
+            breaker.record_failure("blocked")
+
+        with patch("managers.circuit_breaker.time.time", return_value=breaker.opened_at + 61):
+            assert breaker.allow()
+        breaker.record_failure("blocked")
+
+        assert breaker.state == OPEN
+        assert breaker.cooldown == 120
+
+    def test_cancelled_probe_frees_probe_slot(self, breaker):
+        for _ in range(3):
+            breaker.record_failure("blocked")
+
+        with patch("managers.circuit_breaker.time.time", return_value=breaker.opened_at + 61):
+            assert breaker.allow()
+            breaker.record_cancelled()
+            assert breaker.state == HALF_OPEN
+            assert breaker.allow()
+
+
+class TestCircuitBreakerRegistry:
+    """Unit tests for adaptive timeouts and persistence"""
+
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        return str(tmp_path / "circuit_breakers.json")
+
+    def test_default_timeout_without_history(self, state_file):
+        registry = CircuitBreakerRegistry(state_file=state_file)
+        assert registry.timeout_for("Naukri", 45) == 45
+
+    def test_timeout_adapts_to_latency(self, state_file):
+        registry = CircuitBreakerRegistry(state_file=state_file, min_timeout=5, max_timeout=60)
+        for latency in [4.0, 5.0, 6.0, 7.0, 8.0]:
+            registry.record_success("Naukri", latency, 10)
+        assert registry.timeout_for("Naukri", 45) == pytest.approx(12.0)
+
+        for _ in range(5):
+            registry.record_success("Hirist", 0.5, 10)
+        assert registry.timeout_for("Hirist", 45) == 5
+
+    def test_state_persisted_across_restarts(self, state_file):
+        registry = CircuitBreakerRegistry(state_file=state_file)
+        for _ in range(3):
+            registry.record_failure("LinkedIn", "blocked")
+        for latency in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            registry.record_success("Naukri", latency, 3)
+        registry.save()
+
+        restarted = CircuitBreakerRegistry(state_file=state_file)
+        assert restarted.get("LinkedIn").state == OPEN
+        assert not restarted.allow("LinkedIn")
+        assert restarted.get("Naukri").latency.p95 == 5.0
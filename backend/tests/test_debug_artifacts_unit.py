@@ -0,0 +1,119 @@
+import asyncio
+import gzip
+import os
+import random
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from scrapers.debug_artifacts import DebugArtifactRecorder
+
+
+def make_page(html="<html><body>blocked</body></html>"):
+    page = MagicMock()
+    page.url = "https://www.foundit.in/search/python-jobs-in-pune"
+    page.content = AsyncMock(return_value=html)
+    page.screenshot = AsyncMock(return_value=b"\xff\xd8jpeg")
+    return page
+
+
+class TestDebugArtifactRecorder:
+    """Unit tests for sampled, queued debug snapshots"""
+
+    @pytest.fixture
+    def recorder(self, tmp_path):
+        return DebugArtifactRecorder(directory=str(tmp_path), enabled=True, sample_rate=0.0, min_interval=300,
+                                     queue_size=2, max_bytes=10 * 1024 * 1024, max_age=3600, screenshots=True,
+                                     rng=random.Random(1))
+
+    @pytest.mark.asyncio
+    async def test_writes_compressed_html_and_screenshot(self, recorder, tmp_path):
+        page = make_page()
+        await recorder.capture("Foundit", page, "no_cards")
+        await recorder.flush()
+
+        files = sorted(os.listdir(tmp_path))
+        assert len(files) == 2
+        assert files[0].startswith("foundit_no_cards_") and files[0].endswith(".html.gz")
+        assert files[1] == files[0].replace(".html.gz", ".jpg")
+        with gzip.open(tmp_path / files[0], "rt", encoding="utf-8") as f:
+            assert f.read() == f"<!-- {page.url} -->\n<html><body>blocked</body></html>"
+        page.screenshot.assert_awaited_once()
+        assert page.screenshot.await_args.kwargs["full_page"] is False
+        assert recorder.snapshot()["written"] == 1
+
+    @pytest.mark.asyncio
+    async def test_repeat_failures_are_sampled_per_source(self, recorder, tmp_path):
+        for _ in range(5):
+            await recorder.capture("Hirist", make_page(), "no_cards")
+        await recorder.capture("Foundit", make_page(), "no_cards")
+        await recorder.flush()
+
+        snapshot = recorder.snapshot()
+        assert (snapshot["failures"], snapshot["skipped"], snapshot["written"]) == (6, 4, 2)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_instead_of_blocking(self, recorder):
+        recorder.min_interval = 0
+        recorder.sample_rate = 1.0
+        for i in range(5):
+            await recorder.capture(f"Source{i}", make_page(), "no_cards")
+
+        # Nothing was written yet: the writer only runs once the scrape yields
+        assert recorder.snapshot()["queued"] == 2
+        assert recorder.snapshot()["dropped"] == 3
+        await recorder.flush()
+        assert recorder.snapshot()["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_capture_errors_never_fail_the_scrape(self, recorder):
+        page = make_page()
+        page.content.side_effect = Exception("Target page, context or browser has been closed")
+
+        await recorder.capture("Foundit", page, "no_cards")
+        assert recorder.snapshot()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_recorder_does_nothing(self, tmp_path):
+        recorder = DebugArtifactRecorder(directory=str(tmp_path), enabled=False)
+        page = make_page()
+        await recorder.capture("Foundit", page, "no_cards")
+        page.content.assert_not_awaited()
+
+    def test_retention_drops_expired_then_oldest(self, recorder, tmp_path):
+        now = time.time()
+        for name, age, size in (("expired.html.gz", 7200, 10), ("old.jpg", 600, 600), ("new.jpg", 60, 600)):
+            path = tmp_path / name
+            path.write_bytes(b"x" * size)
+            os.utime(path, (now - age, now - age))
+        recorder.max_bytes = 1000
+
+        recorder._enforce_retention()
+
+        assert os.listdir(tmp_path) == ["new.jpg"]
+        assert recorder.snapshot()["evicted"] == 2
+
+    def test_retention_leaves_other_files_alone(self, recorder, tmp_path):
+        old = time.time() - 7200
+        for name in ("expired.html.gz", "README.txt", "notes.html"):
+            path = tmp_path / name
+            path.write_bytes(b"x" * 10)
+            os.utime(path, (old, old))
+        (tmp_path / "archive").mkdir()
+
+        recorder._enforce_retention()
+
+        assert sorted(os.listdir(tmp_path)) == ["README.txt", "archive", "notes.html"]
+
+    @pytest.mark.asyncio
+    async def test_hung_page_content_times_out(self, recorder, monkeypatch):
+        monkeypatch.setattr("scrapers.debug_artifacts.SNAPSHOT_TIMEOUT", 0.1)
+        page = make_page()
+
+        async def hang():
+            await asyncio.sleep(60)
+        page.content = hang
+
+        started = time.monotonic()
+        await recorder.capture("Foundit", page, "no_cards")
+        assert time.monotonic() - started < 5
+        assert recorder.snapshot()["errors"] == 1
@@ -0,0 +1,174 @@
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers.base_scraper import card_field
+from scrapers.html_extract import extract_cards_from_html
+from scrapers.fetch_tiers import FetchTierMemory, TIER_HTTP, TIER_BROWSER
+from scrapers.freshersworld_scraper import FreshersworldScraper
+from scrapers.gulftalent_scraper import GulfTalentScraper
+from scrapers.politeness import PolitenessPolicy
+from utils.http_client import HttpClientPool
+
+
+# Hand-written to FreshersworldScraper's selectors: no Iimjobs, Freshersworld or
+# GulfTalent page has been recorded yet
+FRESHERSWORLD_HTML = """
+<html><body>
+  <div class="job-container">
+    <a href="/jobs/python-developer-101"><span class="wrap-title seo_title">Python Developer</span></a>
+    <div>Infosys</div>
+    <div>Location: Pune, Maharashtra</div>
+  </div>
+  <div class="job-container">
+    <a href="https://www.freshersworld.com/jobs/data-analyst-102"><span class="wrap-title seo_title">Data Analyst</span></a>
+    <div>TCS</div>
+  </div>
+  <div class="job-container"><p>Sponsored</p></div>
+</body></html>
+"""
+
+CHALLENGE_HTML = "<html><head><title>Just a moment...</title></head><body>cf-chl</body></html>"
+
+
+def make_http_pool(handler):
+    return HttpClientPool(http2=False, max_retries=2, backoff_base=0, transport=httpx.MockTransport(handler))
+
+
+class TestHtmlExtraction:
+    """Unit tests for server-side card extraction"""
+
+    def test_mirrors_card_field_semantics(self):
+        fields = {
+            "title": card_field("h2.missing", "h2"),
+            "link": card_field("a", attr="href"),
+            "tags": card_field(".tag", many=True),
+            "text": card_field(":scope"),
+        }
+        html = """
+        <ul><li class="card"><h2>ML Engineer</h2><a href="/j/1">Apply</a>
+            <span class="tag">python</span><span class="tag"> </span><span class="tag">sql</span></li>
+            <li class="card"><a>No link</a></li></ul>
+        """
+        records = extract_cards_from_html(html, [".job", "li.card"], fields)
+
+        assert records[0] == {"title": "ML Engineer", "link": "/j/1", "tags": ["python", "sql"],
+                              "text": "ML Engineer\nApply python sql"}
+        assert records[1]["title"] is None and records[1]["link"] is None and records[1]["tags"] == []
+
+    def test_inline_markup_stays_on_one_line(self):
+        html = "<div class='card'><h3><b>Senior</b> Data Scientist</h3><div>Acme <i>Corp</i></div>Pune<br>3-5 yrs" \
+               "<script>var x = 1;</script></div>"
+        records = extract_cards_from_html(html, [".card"], {"text": card_field(":scope")})
+        assert records[0]["text"].split("\n") == ["Senior Data Scientist", "Acme Corp", "Pune", "3-5 yrs"]
+
+    def test_limit_and_no_match(self):
+        html = "<div class='c'>a</div><div class='c'>b</div>"
+        fields = {"text": card_field(":scope")}
+        assert extract_cards_from_html(html, [".c"], fields, limit=1) == [{"text": "a"}]
+        assert extract_cards_from_html(html, [".none"], fields) == []
+
+
+class TestFetchTierMemory:
+    """Unit tests for per-source tier memory"""
+
+    def test_escalation_is_remembered_and_persisted(self, tmp_path):
+        path = str(tmp_path / "tiers.json")
+        tiers = FetchTierMemory(state_file=path, retry_after=3600)
+        assert tiers.preferred("Iimjobs") == TIER_HTTP
+
+        tiers.record("Iimjobs", TIER_BROWSER, "bot challenge")
+
+        assert tiers.preferred("Iimjobs") == TIER_BROWSER
+        assert FetchTierMemory(state_file=path, retry_after=3600).preferred("Iimjobs") == TIER_BROWSER
+
+    def test_http_retried_after_window(self, tmp_path):
+        tiers = FetchTierMemory(state_file=str(tmp_path / "tiers.json"), retry_after=60)
+        tiers.record("GulfTalent", TIER_BROWSER)
+        tiers.tiers["GulfTalent"]["since"] = time.time() - 61
+
+        assert tiers.preferred("GulfTalent") == TIER_HTTP
+        tiers.record("GulfTalent", TIER_HTTP)
+        assert tiers.snapshot() == {"sources": {"GulfTalent": TIER_HTTP}, "served": {TIER_BROWSER: 1, TIER_HTTP: 1}}
+
+
+class TestScraperFastPath:
+    """Unit tests for the HTTP-first, browser-fallback fetch"""
+
+    @pytest.fixture
+    def tiers(self, tmp_path):
+        tiers = FetchTierMemory(state_file=str(tmp_path / "tiers.json"), retry_after=3600)
+        with patch("scrapers.base_scraper.get_fetch_tiers", return_value=tiers), \
+             patch("scrapers.base_scraper.get_politeness_policy", return_value=PolitenessPolicy(enabled=False)):
+            yield tiers
+
+    @pytest.mark.synthetic
+    @pytest.mark.asyncio
+    async def test_freshersworld_served_without_browser(self, tiers):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text=FRESHERSWORLD_HTML)
+
+        scraper = FreshersworldScraper()
+        get_page = AsyncMock()
+        with patch("scrapers.base_scraper.get_http_pool", return_value=make_http_pool(handler)), \
+             patch.object(scraper, "_get_page", get_page):
+            jobs = await scraper.search_jobs("python developer")
+
+        get_page.assert_not_awaited()
+        assert str(requests[0].url) == "https://www.freshersworld.com/jobs/jobsearch/python-developer-jobs"
+        assert "text/html" in requests[0].headers["Accept"]
+        assert [j["title"] for j in jobs] == ["Python Developer", "Data Analyst"]
+        assert jobs[0]["apply_link"] == "https://www.freshersworld.com/jobs/python-developer-101"
+        assert jobs[0]["location"] == "Pune, Maharashtra"
+        assert jobs[1]["company"] == "TCS"
+        assert tiers.preferred("Freshersworld") == TIER_HTTP
+
+    @pytest.mark.asyncio
+    async def test_challenge_escalates_to_browser_once(self, tiers):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, text=CHALLENGE_HTML)
+
+        page = MagicMock()
+        page.goto = AsyncMock()
+        page.wait_for_selector = AsyncMock()
+        page.evaluate = AsyncMock(return_value=[{"title": "Backend Engineer", "company": "Careem",
+                                                 "location": "Dubai", "link": "/jobs/backend-1"}])
+        scraper = GulfTalentScraper()
+
+        with patch("scrapers.base_scraper.get_http_pool", return_value=make_http_pool(handler)), \
+             patch.object(scraper, "_get_page", AsyncMock(return_value=(page, MagicMock()))), \
+             patch.object(scraper, "_safe_close", AsyncMock()) as safe_close:
+            jobs = await scraper.search_jobs("backend engineer")
+            # Tier remembered: the next search skips the HTTP probe
+            await scraper.search_jobs("backend engineer")
+
+        assert len(calls) == 1  # no retries on a challenge
+        assert jobs[0]["apply_link"] == "https://www.gulftalent.com/jobs/backend-1"
+        assert tiers.preferred("GulfTalent") == TIER_BROWSER
+        assert tiers.tiers["GulfTalent"]["reason"] == "HTTP 503"
+        assert safe_close.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_js_rendered_page_escalates(self, tiers):
+        pool = make_http_pool(lambda request: httpx.Response(200, text="<div id='root'></div>"))
+        scraper = FreshersworldScraper()
+
+        with patch("scrapers.base_scraper.get_http_pool", return_value=pool):
+            assert await scraper._fetch_cards_http("https://www.freshersworld.com/jobs") is None
+
+        assert tiers.tiers["Freshersworld"]["reason"] == "no cards in server-rendered HTML"
+
+    def test_bot_challenge_markers(self):
+        scraper = FreshersworldScraper()
+        assert scraper._is_bot_challenge(CHALLENGE_HTML)
+        assert scraper._is_bot_challenge("<html><head><title>Access Denied</title></head></html>")
+        # A results page that loads reCAPTCHA for its login form is not a challenge
+        recaptcha = "<html><head><script src='https://www.google.com/recaptcha/api.js'></script></head>" \
+                    "<body><div class='g-recaptcha'></div>" + FRESHERSWORLD_HTML + "</body></html>"
+        assert not scraper._is_bot_challenge(recaptcha)
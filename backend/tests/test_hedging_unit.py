@@ -0,0 +1,221 @@
+import pytest
+import asyncio
+from utils.hedging import LatencyTracker, hedged_call, fetch_pages
+
+
+class TestLatencyTracker:
+    """Unit tests for the rolling latency window"""
+
+    def test_p95_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for v in [0.1, 0.2, 0.3, 0.4]:
+            tracker.record(v)
+        assert tracker.p95 is None
+
+        tracker.record(0.5)
+        assert tracker.p95 == 0.5
+
+    def test_window_drops_old_samples(self):
+        tracker = LatencyTracker(window=3, min_samples=1)
+        for v in [10.0, 0.1, 0.1, 0.1]:
+            tracker.record(v)
+        assert tracker.p95 == 0.1
+
+
+class TestHedgedCall:
+    """Unit tests for hedged requests"""
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_fast(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "ok"
+
+        assert await hedged_call(call, hedge_after=0.5) == "ok"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_loser_cancelled(self):
+        """A slow primary is hedged; the fast duplicate wins and the primary is cancelled"""
+        attempts = {"n": 0}
+        cancelled = []
+
+        async def call():
+            attempts["n"] += 1
+            if attempts["n"] == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                return "slow"
+            return "fast"
+
+        result = await hedged_call(call, hedge_after=0.01)
+        await asyncio.sleep(0)
+
+        assert result == "fast"
+        assert attempts["n"] == 2
+        assert cancelled == [True]
+
+    @pytest.mark.asyncio
+    async def test_hedge_vetoed(self):
+        """can_hedge=False (e.g. no API budget) keeps waiting on the primary"""
+        attempts = {"n": 0}
+
+        async def call():
+            attempts["n"] += 1
+            await asyncio.sleep(0.05)
+            return "primary"
+
+        assert await hedged_call(call, hedge_after=0.01, can_hedge=lambda: False) == "primary"
+        assert attempts["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back_to_hedge(self):
+        attempts = {"n": 0}
+
+        async def call():
+            attempts["n"] += 1
+            if attempts["n"] == 1:
+                await asyncio.sleep(0.05)
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.1)
+            return "hedge"
+
+        assert await hedged_call(call, hedge_after=0.01) == "hedge"
+
+    @pytest.mark.asyncio
+    async def test_records_latency(self):
+        tracker = LatencyTracker(min_samples=1)
+
+        async def call():
+            return 1
+
+        await hedged_call(call, tracker=tracker)
+        assert len(tracker.samples) == 1
+
+    @pytest.mark.asyncio
+    async def test_records_latency_of_cancelled_attempts(self):
+        """Hedge losers and attempts cut off by the caller still count: they took at least that long"""
+        tracker = LatencyTracker(min_samples=1)
+        attempts = {"n": 0}
+
+        async def call():
+            attempts["n"] += 1
+            await asyncio.sleep(5 if attempts["n"] == 1 else 0.01)
+            return attempts["n"]
+
+        await hedged_call(call, hedge_after=0.05, tracker=tracker)
+        await asyncio.sleep(0)
+        assert len(tracker.samples) == 2 and max(tracker.samples) >= 0.05
+
+        tracker.samples.clear()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hedged_call(lambda: asyncio.sleep(5), tracker=tracker), 0.05)
+        assert len(tracker.samples) == 1 and tracker.samples[0] >= 0.04
+
+
+class TestFetchPages:
+    """Unit tests for parallel page fetching"""
+
+    @pytest.mark.asyncio
+    async def test_pages_run_in_parallel_with_bounded_concurrency(self):
+        in_flight = {"now": 0, "peak": 0}
+
+        async def fetch(page):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.02)
+            in_flight["now"] -= 1
+            return [page]
+
+        results = await fetch_pages(fetch, range(1, 6), concurrency=2)
+
+        assert results == [[1], [2], [3], [4], [5]]
+        assert in_flight["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_results_on_deadline(self):
+        """Slow pages are cancelled at the deadline; finished pages are kept"""
+        async def fetch(page):
+            if page == 2:
+                await asyncio.sleep(5)
+            return [page]
+
+        results = await fetch_pages(fetch, [1, 2, 3], concurrency=3, deadline=0.1)
+
+        assert results == [[1], [3]]
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_skipped(self):
+        async def fetch(page):
+            if page == 1:
+                raise RuntimeError("HTTP 500")
+            return [page]
+
+        assert await fetch_pages(fetch, [1, 2], concurrency=2) == [[2]]
+
+
+class TestJSearchParallelPages:
+    """JSearch fetches all pages in one request, or one request per page when split"""
+
+    @pytest.mark.asyncio
+    async def test_pages_in_one_request_by_default(self, tmp_path, monkeypatch):
+        import httpx
+        from unittest.mock import patch
+        from jsearch import JSearchClient
+        from utils.http_client import HttpClientPool
+        from managers.budget_manager import ApiBudgetManager
+
+        requests = []
+
+        def handler(request):
+            requests.append(dict(request.url.params))
+            return httpx.Response(200, json={"data": [{"job_title": f"Job {i}", "job_apply_link": f"https://x/{i}"}
+                                                      for i in range(30)]})
+
+        monkeypatch.setenv("RAPIDAPI_KEY", "test")
+        monkeypatch.delenv("JSEARCH_SPLIT_PAGES", raising=False)
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=0, http2=False)
+        budget = ApiBudgetManager(state_file=str(tmp_path / "budget.json"))
+        client = JSearchClient()
+        with patch("jsearch.get_http_pool", return_value=pool), \
+             patch("jsearch.get_budget_manager", return_value=budget):
+            jobs = await client.search_jobs("python", page=2, num_pages=3)
+        await pool.close()
+
+        assert len(jobs) == 30
+        assert [(r["page"], r["num_pages"]) for r in requests] == [("2", "3")]
+        # A multi-page request is billed as two
+        assert budget.providers["jsearch"].used == 2
+        assert client.requests_for(3) == 2 and client.requests_for(1) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_page_does_not_drop_batch(self, tmp_path, monkeypatch):
+        import httpx
+        from unittest.mock import patch
+        from jsearch import JSearchClient
+        from utils.http_client import HttpClientPool
+        from managers.budget_manager import ApiBudgetManager
+
+        async def handler(request):
+            page = int(request.url.params["page"])
+            assert request.url.params["num_pages"] == "1"
+            if page == 2:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"data": [{"job_title": f"Job {page}", "job_apply_link": f"https://x/{page}"}]})
+
+        monkeypatch.setenv("RAPIDAPI_KEY", "test")
+        monkeypatch.setenv("JSEARCH_SPLIT_PAGES", "true")
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=0, http2=False)
+        budget = ApiBudgetManager(state_file=str(tmp_path / "budget.json"))
+        with patch("jsearch.get_http_pool", return_value=pool), \
+             patch("jsearch.get_budget_manager", return_value=budget):
+            jobs = await JSearchClient().search_jobs("python", page=1, num_pages=3, deadline=0.3)
+        await pool.close()
+
+        assert [j["title"] for j in jobs] == ["Job 1", "Job 3"]
+        assert budget.providers["jsearch"].used == 3
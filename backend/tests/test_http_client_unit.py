@@ -0,0 +1,137 @@
+import pytest
+import asyncio
+import threading
+import time
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.http_client import HttpClientPool
+
+# Simulated per-connection setup cost (stands in for DNS + TCP + TLS handshakes)
+CONNECT_COST = 0.05
+
+
+class _MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(CONNECT_COST)
+
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpClientPool:
+    """Unit tests for the shared pooled HTTP client"""
+
+    @pytest.fixture
+    def mock_server(self):
+        """Local mock API server that counts new TCP connections"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _MockApiHandler)
+        server.connections = 0
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.mark.asyncio
+    async def test_pooled_client_reuses_connections(self, mock_server):
+        """Pooled client should reuse one keep-alive connection and be faster per request"""
+        url = f"http://127.0.0.1:{mock_server.server_address[1]}/search"
+        n_requests = 8
+
+        # Baseline: fresh client per call (old behaviour)
+        t0 = time.perf_counter()
+        for _ in range(n_requests):
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url)
+                assert response.status_code == 200
+        fresh_elapsed = time.perf_counter() - t0
+        fresh_connections = mock_server.connections
+
+        # Pooled client
+        mock_server.connections = 0
+        pool = HttpClientPool(http2=False)
+        t0 = time.perf_counter()
+        for _ in range(n_requests):
+            response = await pool.get(url)
+            assert response.status_code == 200
+        pooled_elapsed = time.perf_counter() - t0
+        await pool.close()
+
+        assert fresh_connections == n_requests
+        assert mock_server.connections == 1
+        assert pooled_elapsed / n_requests < fresh_elapsed / n_requests
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_status(self):
+        """503 responses are retried with backoff until success"""
+        calls = {"count": 0}
+
+        def handler(request):
+            calls["count"] += 1
+            if calls["count"] < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=3, backoff_base=0, http2=False)
+        response = await pool.get("https://api.example.com/jobs")
+        await pool.close()
+
+        assert response.status_code == 200
+        assert calls["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Last response is returned once retries are exhausted"""
+        calls = {"count": 0}
+
+        def handler(request):
+            calls["count"] += 1
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=2, backoff_base=0, http2=False)
+        response = await pool.get("https://api.example.com/jobs")
+        await pool.close()
+
+        assert response.status_code == 429
+        assert calls["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_transport_error_raises_after_retries(self):
+        """Connection errors propagate after retries so callers can log them"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=1, backoff_base=0, http2=False)
+        with pytest.raises(httpx.ConnectError):
+            await pool.get("https://api.example.com/jobs")
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """No more than max_per_host requests are in flight for one host"""
+        in_flight = {"now": 0, "peak": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200)
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_per_host=2, http2=False)
+        await asyncio.gather(*[pool.get("https://api.example.com/jobs") for _ in range(6)])
+        await pool.close()
+
+        assert in_flight["peak"] == 2
@@ -0,0 +1,193 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import Job
+from managers.scraper_manager import SourceBatch
+from managers.ingest_pipeline import IngestPipeline, normalize_job, ingest_snapshot
+
+
+def job(i, **overrides):
+    data = {'id': i, 'title': f'Engineer {i}', 'company': 'Acme', 'location': 'Bangalore',
+            'apply_link': f'https://example.com/job/{i}', 'source': 'Naukri', 'skills': ['Python']}
+    data.update(overrides)
+    return data
+
+
+async def stream(*batches):
+    for source, jobs in batches:
+        yield SourceBatch(source, jobs)
+
+
+class FakeVectorManager:
+    """Records embedding/index batches; embedding can be held back with a gate"""
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.embedded = []
+        self.indexed = []
+
+    def embed_jobs(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.embedded.append([r['id'] for r in rows])
+        return {"ids": [str(r['id']) for r in rows]}
+
+    def index_embedded(self, embedded):
+        self.indexed.extend(embedded["ids"])
+
+
+class TestIngestPipeline:
+    """Unit tests for the staged ingest pipeline"""
+
+    @pytest_asyncio.fixture
+    async def session_factory(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await engine.dispose()
+
+    async def all_jobs(self, session_factory):
+        async with session_factory() as session:
+            return (await session.execute(select(Job).order_by(Job.id))).scalars().all()
+
+    def test_normalize_job(self):
+        row = normalize_job(job(1, title='  Data   Engineer ', posted_at='2024-05-01', skills=None, extra='x'),
+                            'hash', 'India')
+        assert row['title'] == 'Data Engineer'
+        assert row['posted_at'] == datetime(2024, 5, 1)
+        assert row['skills'] == [] and 'extra' not in row
+        assert row['query_hash'] == 'hash' and row['country'] == 'India'
+        assert normalize_job(job(2, posted_at='3 days ago'), 'hash', 'India')['posted_at'] is None
+        assert normalize_job(job(None), 'hash', 'India') is None
+
+    @pytest.mark.asyncio
+    async def test_dedups_bulk_writes_and_indexes(self, session_factory):
+        vectors = FakeVectorManager()
+        pipeline = IngestPipeline(session_factory, vector_manager=vectors, db_batch_size=10, embed_batch_size=10)
+        batches = stream(
+            ("JSearch", [job(1), job(2)]),
+            # Same link as job 1, and same title + company as job 2
+            ("Naukri", [job(3, apply_link='https://example.com/job/1'), job(4, title='Engineer 2'), job(5)]),
+        )
+
+        written = await pipeline.run(batches, 'hash', 'India')
+
+        assert written == 3
+        rows = await self.all_jobs(session_factory)
+        assert [r.id for r in rows] == [1, 2, 5]
+        assert rows[0].query_hash == 'hash' and rows[0].skills == ['Python']
+        assert sorted(vectors.indexed) == ['1', '2', '5']
+
+    @pytest.mark.asyncio
+    async def test_upsert_updates_existing_rows(self, session_factory):
+        pipeline = IngestPipeline(session_factory)
+        await pipeline.run(stream(("Naukri", [job(1)])), 'old', 'India')
+        await pipeline.run(stream(("Naukri", [job(1, title='Senior Engineer 1')])), 'new', 'India')
+
+        rows = await self.all_jobs(session_factory)
+        assert len(rows) == 1
+        assert rows[0].title == 'Senior Engineer 1' and rows[0].query_hash == 'new'
+
+    @pytest.mark.asyncio
+    async def test_rescrape_keeps_enriched_description_and_skills(self, session_factory):
+        placeholder = 'View details on Indeed: https://www.indeed.com/viewjob?jk=1'
+        pipeline = IngestPipeline(session_factory)
+        await pipeline.run(stream(("Indeed", [job(1, source='Indeed', description=placeholder, skills=[])])), 'a', 'India')
+        # Detail enrichment writes the full page text
+        async with session_factory() as session:
+            await session.execute(update(Job).where(Job.id == 1).values(description='Full description ' * 20,
+                                                                         skills=['python']))
+            await session.commit()
+
+        embedded = []
+        vectors = FakeVectorManager()
+        vectors.embed_jobs = lambda rows: embedded.extend(rows) or {"ids": [str(r['id']) for r in rows]}
+        pipeline = IngestPipeline(session_factory, vector_manager=vectors)
+        await pipeline.run(stream(("Indeed", [job(1, source='Indeed', title='Engineer 1 (updated)',
+                                                  description=placeholder, skills=[])])), 'b', 'India')
+
+        row = (await self.all_jobs(session_factory))[0]
+        assert row.title == 'Engineer 1 (updated)' and row.query_hash == 'b'
+        assert row.description == 'Full description ' * 20
+        assert row.skills == ['python']
+        # The vector index gets the enriched text, not the card placeholder
+        assert embedded[0]['description'] == 'Full description ' * 20 and embedded[0]['skills'] == ['python']
+
+        # A longer scraped description still replaces a shorter stored one
+        await pipeline.run(stream(("Indeed", [job(1, description='Full description ' * 30, skills=['sql'])])), 'c', 'India')
+        row = (await self.all_jobs(session_factory))[0]
+        assert (row.description, row.skills) == ('Full description ' * 30, ['sql'])
+
+    @pytest.mark.asyncio
+    async def test_jobs_are_written_while_sources_are_still_streaming(self, session_factory):
+        pipeline = IngestPipeline(session_factory, db_batch_size=50)
+        release = asyncio.Event()
+        seen_mid_stream = []
+
+        async def sources():
+            yield SourceBatch("JSearch", [job(1)])
+            # Give the pipeline a moment, as a slow scraper would
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if pipeline.written:
+                    break
+            seen_mid_stream.append(len(await self.all_jobs(session_factory)))
+            yield SourceBatch("Naukri", [job(2)])
+
+        assert await pipeline.run(sources(), 'hash', 'India') == 2
+        assert seen_mid_stream == [1]
+
+    @pytest.mark.asyncio
+    async def test_slow_embedding_applies_backpressure(self, session_factory):
+        import threading
+        gate = threading.Event()
+        vectors = FakeVectorManager(gate)
+        pipeline = IngestPipeline(session_factory, vector_manager=vectors, queue_size=2,
+                                  db_batch_size=1, embed_batch_size=1)
+        produced = []
+
+        async def sources():
+            for i in range(1, 21):
+                produced.append(i)
+                yield SourceBatch("Naukri", [job(i)])
+
+        run = asyncio.create_task(pipeline.run(sources(), 'hash', 'India'))
+        await asyncio.sleep(0.3)
+        # Embedding is stuck: bounded queues stop the scrape stage well short of all 20 jobs
+        assert len(produced) < 20
+        stages = ingest_snapshot()["stages"]
+        assert stages["embed"]["queue_depth"] <= 2
+
+        gate.set()
+        assert await run == 20
+        assert len(vectors.indexed) == 20
+        assert ingest_snapshot()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_drop_its_batch(self, session_factory):
+        vectors = FakeVectorManager()
+        before = ingest_snapshot()["stages"]["db_write"]["errors"]
+        pipeline = IngestPipeline(session_factory, vector_manager=vectors)
+        # Not JSON-serializable: fails the whole multi-row INSERT
+        jobs = [job(1), job(2, skills=[object()]), job(3)]
+
+        assert await pipeline.run(stream(("Naukri", jobs)), 'hash', 'India') == 2
+        assert [row.id for row in await self.all_jobs(session_factory)] == [1, 3]
+        assert sorted(vectors.indexed) == ['1', '3']
+        assert ingest_snapshot()["stages"]["db_write"]["errors"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_stage_errors_are_counted_and_do_not_stall(self, session_factory):
+        vectors = Mock()
+        vectors.embed_jobs.side_effect = RuntimeError("model crashed")
+        before = ingest_snapshot()["stages"]["embed"]["errors"]
+        pipeline = IngestPipeline(session_factory, vector_manager=vectors)
+
+        assert await pipeline.run(stream(("Naukri", [job(1), job(2)])), 'hash', 'India') == 2
+        assert ingest_snapshot()["stages"]["embed"]["errors"] > before
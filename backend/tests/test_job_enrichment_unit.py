@@ -0,0 +1,187 @@
+import asyncio
+import json
+import httpx
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import Job
+from managers.job_enrichment import JobEnricher, extract_job_details, needs_enrichment
+from managers.scrape_scheduler import ScrapeScheduler
+from scrapers.politeness import PolitenessPolicy
+from utils.http_client import use_http_transport
+
+LONG_TEXT = "Build data pipelines in Python and Spark for our analytics platform. " * 5
+
+
+def posting_page(description: str, skills=None, graph: bool = False) -> str:
+    posting = {"@type": "JobPosting", "title": "Data Engineer", "description": description}
+    if skills is not None:
+        posting["skills"] = skills
+    data = {"@context": "https://schema.org", "@graph": [{"@type": "Organization"}, posting]} if graph else posting
+    return f'<html><head><script type="application/ld+json">{json.dumps(data)}</script></head><body></body></html>'
+
+
+class FakeVectorManager:
+    def __init__(self):
+        self.embedded = []
+        self.indexed = []
+
+    def embed_jobs(self, rows):
+        self.embedded.append({r['id']: r for r in rows})
+        return {"ids": [str(r['id']) for r in rows]}
+
+    def index_embedded(self, embedded):
+        self.indexed.extend(embedded["ids"])
+
+
+class TestDetailExtraction:
+    """Unit tests for detail page parsing"""
+
+    def test_json_ld_job_posting(self):
+        html = posting_page(f"<p>{LONG_TEXT}</p><ul><li>Airflow</li></ul>", skills="Python, Spark; SQL", graph=True)
+        description, skills = extract_job_details(html, "https://www.indeed.com/viewjob?jk=1")
+        assert description.startswith("Build data pipelines") and description.endswith("Airflow")
+        assert "<p>" not in description
+        assert skills == ["Python", "Spark", "SQL"]
+
+    def test_description_container_fallback(self):
+        html = f'<div class="show-more-less-html__markup">{LONG_TEXT}</div><div class="description">short</div>'
+        description, skills = extract_job_details(html, "https://in.linkedin.com/jobs/view/123")
+        assert (description, skills) == (LONG_TEXT.strip(), [])
+
+    def test_nothing_found(self):
+        assert extract_job_details("<html><body>Sign in</body></html>", "https://x.com/job/1") == (None, [])
+
+    def test_needs_enrichment(self):
+        assert needs_enrichment("View full description on LinkedIn: https://linkedin.com/jobs/view/1", 50)
+        assert needs_enrichment("View details on Apna: https://apna.co/job/1", 10)
+        assert needs_enrichment(None, 200) and needs_enrichment("  ", 200)
+        assert needs_enrichment("Python developer", 200)
+        assert not needs_enrichment(LONG_TEXT, 200)
+
+
+class TestJobEnricher:
+    """Unit tests for background detail enrichment"""
+
+    @pytest_asyncio.fixture
+    async def session_factory(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            session.add_all([
+                Job(id=1, title="Data Engineer", company="Acme", source="Indeed", skills=["Python"],
+                    apply_link="https://www.indeed.com/viewjob?jk=1", description="View details on Indeed: x"),
+                Job(id=2, title="Analyst", company="Beta", source="LinkedIn", skills=[],
+                    apply_link="https://in.linkedin.com/jobs/view/2",
+                    description="View full description on LinkedIn: x"),
+                Job(id=3, title="ML Engineer", company="Gamma", source="Naukri.com", skills=[],
+                    apply_link="https://www.naukri.com/job-3", description=LONG_TEXT),
+            ])
+            await session.commit()
+        yield factory
+        await engine.dispose()
+
+    @pytest_asyncio.fixture
+    async def http(self):
+        requests = []
+
+        def handle(request):
+            requests.append(str(request.url))
+            if "indeed" in request.url.host:
+                return httpx.Response(200, text=posting_page(LONG_TEXT, skills=["python", "Spark"]))
+            return httpx.Response(403, text="Access denied")
+
+        await use_http_transport(httpx.MockTransport(handle))
+        with patch("managers.job_enrichment.get_politeness_policy", return_value=PolitenessPolicy(enabled=False)):
+            yield requests
+        await use_http_transport(None)
+
+    def enricher(self, session_factory, **kwargs):
+        scheduler = ScrapeScheduler(max_concurrency=4, max_in_flight=2, rate_per_sec=100, limits={})
+        return JobEnricher(session_factory, vector_manager=FakeVectorManager(), linger=0.01, scheduler=scheduler,
+                           **kwargs)
+
+    async def jobs(self, session_factory):
+        async with session_factory() as session:
+            return {job.id: job for job in (await session.execute(select(Job))).scalars().all()}
+
+    @pytest.mark.asyncio
+    async def test_enriches_placeholder_jobs_and_reembeds_changed_rows(self, session_factory, http):
+        enricher = self.enricher(session_factory)
+        try:
+            assert enricher.submit((await self.jobs(session_factory)).values()) == 2
+            await enricher.drain()
+        finally:
+            await enricher.close()
+
+        jobs = await self.jobs(session_factory)
+        assert jobs[1].description == LONG_TEXT.strip()
+        assert jobs[1].skills == ["Python", "Spark"]
+        assert jobs[2].description.startswith("View full description")  # blocked: left as is
+        assert sorted(http) == ["https://in.linkedin.com/jobs/view/2", "https://www.indeed.com/viewjob?jk=1"]
+        # Only the changed row is re-embedded, with its new text
+        assert enricher.vector_manager.indexed == ["1"]
+        assert enricher.vector_manager.embedded[0][1]["description"] == LONG_TEXT.strip()
+        assert enricher.snapshot()["enriched"] == 1
+        assert enricher.snapshot()["blocked"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_are_fetched_once_per_window(self, session_factory, http):
+        enricher = self.enricher(session_factory)
+        try:
+            jobs = list((await self.jobs(session_factory)).values())
+            enricher.submit(jobs)
+            await enricher.drain()
+            assert enricher.submit(jobs) == 0
+            assert len(http) == 2
+        finally:
+            await enricher.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_extra_jobs(self, session_factory):
+        enricher = self.enricher(session_factory, queue_size=1, workers=1)
+        try:
+            async def held(*args, **kwargs):
+                await asyncio.sleep(10)
+
+            # Hold the worker so queued jobs stay queued
+            with patch.object(enricher.scheduler, "submit", held):
+                jobs = [SimpleNamespace(id=i, source="Indeed", apply_link=f"https://www.indeed.com/viewjob?jk={i}",
+                                        description="") for i in range(4)]
+                queued = enricher.submit(jobs[:1])
+                await asyncio.sleep(0)  # worker takes the first job
+                queued += enricher.submit(jobs[1:])
+            assert queued == 2
+            assert enricher.snapshot()["dropped"] == 1
+        finally:
+            await enricher.close()
+
+    @pytest.mark.asyncio
+    async def test_slot_wait_timeout_lets_the_job_queue_again(self, session_factory):
+        enricher = self.enricher(session_factory)
+        try:
+            async def no_slot(*args, **kwargs):
+                raise asyncio.TimeoutError()
+
+            jobs = list((await self.jobs(session_factory)).values())
+            with patch.object(enricher.scheduler, "submit", no_slot):
+                assert enricher.submit(jobs) == 2
+                await enricher.drain()
+            assert enricher.snapshot()["expired"] == 2
+            assert "errors" not in enricher.snapshot()
+            assert enricher.submit(jobs) == 2
+        finally:
+            await enricher.close()
+
+    def test_disabled(self, session_factory, monkeypatch):
+        monkeypatch.setenv("ENRICH_ENABLED", "false")
+        enricher = self.enricher(session_factory)
+        job = SimpleNamespace(id=1, source="Indeed", apply_link="https://www.indeed.com/viewjob?jk=1", description="")
+        assert enricher.submit([job]) == 0
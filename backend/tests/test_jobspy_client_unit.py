@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, Mock
+from jobspy_client import JobSpyClient, JobSpyPool, frame_to_jobs, _scrape
+
+
+class TestFrameToJobs:
+    """Unit tests for JobSpy DataFrame normalization"""
+
+    def test_normalizes_columns(self):
+        frame = pd.DataFrame({
+            "site": ["linkedin", "indeed"],
+            "job_url": ["https://in.linkedin.com/jobs/view/1", None],
+            "title": ["Python Developer", np.nan],
+            "company": [np.nan, "Acme"],
+            "location": ["Pune, MH, India", ""],
+            "min_amount": [600000.0, np.nan],
+            "max_amount": ["900000", None],
+            "date_posted": [date(2024, 5, 1), None],
+            "description": ["x" * 5000, None],
+            "company_url": ["https://acme.example", None],
+            "emails": [None, None],
+        })
+
+        first, second = frame_to_jobs(frame)
+
+        assert first == {
+            "id": first["id"],
+            "title": "Python Developer",
+            "company": "Unknown Company",
+            "location": "Pune, MH, India",
+            "experience_min": 0,
+            "experience_max": 0,
+            "ctc_min": 600000.0,
+            "ctc_max": 900000.0,
+            "skills": [],
+            "posted_at": datetime(2024, 5, 1),
+            "apply_link": "https://in.linkedin.com/jobs/view/1",
+            "source": "Linkedin",
+            "logo_url": "https://acme.example",
+            "description": "x" * 3000,
+        }
+        assert (second["company"], second["location"], second["source"]) == ("Acme", "Remote", "Indeed")
+        assert (second["ctc_min"], second["ctc_max"], second["posted_at"], second["logo_url"]) == (None, None, None, None)
+        assert first["skills"] is not second["skills"]
+
+    def test_ids_are_stable_across_processes(self):
+        frame = pd.DataFrame({"job_url": ["https://www.indeed.com/viewjob?jk=1"], "title": ["Data Engineer"]})
+        # Known value: hash() would differ per worker process
+        assert frame_to_jobs(frame)[0]["id"] == 64361753
+
+    def test_empty_results(self):
+        assert frame_to_jobs(None) == []
+        assert frame_to_jobs(pd.DataFrame()) == []
+
+
+class TestJobSpyPool:
+    """Unit tests for the JobSpy worker processes"""
+
+    @pytest.mark.asyncio
+    async def test_runs_calls_in_a_worker_process(self):
+        pool = JobSpyPool(workers=1, timeout=30)
+        try:
+            assert await pool.run(os.getpid) != os.getpid()
+            assert pool.snapshot()["calls"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_the_running_scrape(self):
+        pool = JobSpyPool(workers=1, timeout=30)
+        try:
+            worker = await pool.run(os.getpid)
+            started = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(time.sleep, 60, timeout=0.5)
+            assert time.monotonic() - started < 10
+
+            assert await pool.run(os.getpid) != worker
+            assert pool.snapshot()["timeouts"] == pool.snapshot()["restarts"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_the_running_scrape(self):
+        pool = JobSpyPool(workers=1, timeout=30)
+        try:
+            worker = await pool.run(os.getpid)
+            task = asyncio.create_task(pool.run(time.sleep, 60))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert pool.snapshot()["restarts"] == 1
+            assert pool.snapshot()["in_flight"] == 0
+            assert await pool.run(os.getpid) != worker
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_spares_the_other_workers(self):
+        pool = JobSpyPool(workers=2, timeout=30)
+        try:
+            other = asyncio.create_task(pool.run(time.sleep, 4))
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(time.sleep, 60, timeout=2)
+
+            assert await other is None
+            assert pool.snapshot()["restarts"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_calls_wait_for_a_free_worker(self):
+        pool = JobSpyPool(workers=1, timeout=30)
+        try:
+            first = asyncio.create_task(pool.run(time.sleep, 1))
+            await asyncio.sleep(0)
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(os.getpid, timeout=0.2)  # still queued: withdrawn, nothing killed
+            await first
+            assert "restarts" not in pool.snapshot()
+        finally:
+            pool.shutdown()
+
+
+class TestJobSpyClient:
+    """Unit tests for JobSpyClient"""
+
+    @pytest.mark.asyncio
+    async def test_scrape_runs_in_pool_with_page_offset(self):
+        pool = Mock(run=AsyncMock(return_value=[{"id": 1}]), timeout=90)
+        client = JobSpyClient(pool=pool)
+
+        assert await client.search_jobs("python", "Pune", page=3, country="India") == [{"id": 1}]
+        pool.run.assert_awaited_once_with(_scrape, ["linkedin", "indeed", "glassdoor"], "python", "Pune", 10,
+                                          "India", 20)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [asyncio.TimeoutError(), RuntimeError("No module named 'jobspy'")])
+    async def test_errors_propagate(self, error):
+        client = JobSpyClient(pool=Mock(run=AsyncMock(side_effect=error), timeout=90))
+        with pytest.raises(type(error)):
+            await client.search_jobs("python")
@@ -0,0 +1,45 @@
+import pytest
+from utils.query_canonical import canonicalize_query, canonical_location, location_spellings, stem
+
+
+class TestQueryCanonicalization:
+    """Unit tests for canonical search queries"""
+
+    @pytest.mark.parametrize("raw", ["Python Developer", "python developer ", "python developers", "PYTHON  Devs"])
+    def test_variants_share_canonical_form(self, raw):
+        assert canonicalize_query(raw) == ("python developer", None)
+
+    def test_location_extracted_from_query(self):
+        assert canonicalize_query("Python Dev in Bangalore") == ("python developer", "Bangalore")
+        assert canonicalize_query("ML Engineers @ hyd") == ("machine learning engineer", "Hyderabad")
+        assert canonicalize_query("digital  head in Delhi NCR") == ("digital head", "Delhi NCR")
+        # A query that is only a place name is still a query
+        assert canonicalize_query("Bangalore") == ("bangalore", None)
+
+    def test_location_filter_wins(self):
+        assert canonicalize_query("sde in pune", "Bengaluru") == ("software engineer", "Bangalore")
+        assert canonicalize_query("sde", "Lucknow ") == ("software engineer", "Lucknow")
+
+    def test_stemming_keeps_non_plurals(self):
+        assert [stem(w) for w in ["companies", "analytics", "sales", "business", "devops", "matches", "aws"]] == \
+            ["company", "analytics", "sales", "business", "devops", "match", "aws"]
+        assert canonicalize_query("C++ developers") == ("c++ developer", None)
+
+    def test_tool_names_and_ampersands_survive(self):
+        assert canonicalize_query("Pandas Postgres Jenkins Rails devsecops") == \
+            ("pandas postgres jenkins rails devsecops", None)
+        assert canonicalize_query("R&D engineers at AT&T") == ("r&d engineer at at&t", None)
+        assert canonicalize_query("Sales & Marketing") == ("sales marketing", None)
+
+    def test_canonical_location(self):
+        assert canonical_location("gurugram") == "Gurgaon"
+        assert canonical_location("None") is None
+        assert canonical_location("") is None
+
+    def test_location_spellings(self):
+        assert location_spellings("bengaluru") == ["Bangalore", "bengaluru", "blr"]
+        assert location_spellings("Mumbai") == ["Mumbai", "bombay"]
+        assert location_spellings("Lucknow") == ["Lucknow"]
+        # The given spelling is kept: rows stored as "Delhi" don't contain "Delhi NCR"
+        assert location_spellings("Delhi") == ["Delhi", "ncr"]
+        assert location_spellings("NCR") == ["NCR", "delhi"]
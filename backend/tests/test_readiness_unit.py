@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers.base_scraper import (
+    BaseScraper, DOM_QUIET_JS, READY_CARDS, READY_RESPONSE, READY_QUIET, READY_TIMEOUT, readiness_snapshot,
+)
+from scrapers.politeness import PolitenessPolicy, domain_of, _parse_delays
+from scrapers.response_capture import ResponseCapture
+
+
+class ReadyScraper(BaseScraper):
+    CARD_SELECTORS = [".job-card", ".result"]
+
+
+def make_page(selector_delay=None, quiet=None):
+    """Mock page: the card selector appears after `selector_delay` seconds (never if None),
+    the DOM quiescence check resolves to `quiet` (never if None)."""
+    async def wait_for_selector(selector, **kwargs):
+        if selector_delay is None:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(selector_delay)
+        return MagicMock()
+
+    async def evaluate(script, arg=None):
+        if quiet is None:
+            await asyncio.sleep(3600)
+        return quiet
+
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock(side_effect=wait_for_selector)
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    return page
+
+
+class TestWaitReady:
+    """Unit tests for event-driven readiness waits"""
+
+    @pytest.mark.asyncio
+    async def test_returns_on_card_selector(self):
+        page = make_page(selector_delay=0)
+
+        assert await ReadyScraper()._wait_ready(page, timeout=1) == READY_CARDS
+
+        selector = page.wait_for_selector.await_args.args[0]
+        assert selector == ".job-card, .result"
+        assert page.evaluate.await_args.args[0] == DOM_QUIET_JS
+
+    @pytest.mark.asyncio
+    async def test_returns_on_captured_response(self):
+        page = make_page()
+        capture = ResponseCapture(MagicMock(), ["/api/search"], ["title"])
+
+        async def deliver():
+            await asyncio.sleep(0.01)
+            capture._found.set()
+
+        asyncio.create_task(deliver())
+        assert await ReadyScraper()._wait_ready(page, capture=capture, timeout=1) == READY_RESPONSE
+
+    @pytest.mark.asyncio
+    async def test_quiet_dom_counts_only_when_settled(self):
+        assert await ReadyScraper()._wait_ready(make_page(quiet=True), timeout=1) == READY_QUIET
+        # The in-page check hit its own deadline: not ready, wait on for the selector
+        assert await ReadyScraper()._wait_ready(make_page(selector_delay=0.02, quiet=False), timeout=1) == READY_CARDS
+
+    @pytest.mark.asyncio
+    async def test_deadline_and_failed_waiters(self):
+        page = make_page()
+        page.wait_for_selector.side_effect = Exception("Timeout 50ms exceeded")
+        scraper = ReadyScraper()
+
+        assert await scraper._wait_ready(page, timeout=0.05) == READY_TIMEOUT
+        assert readiness_snapshot()["Ready"][READY_TIMEOUT] >= 1
+
+    @pytest.mark.asyncio
+    async def test_payload_after_quiet_dom_is_still_used(self):
+        """DOM went quiet before the search XHR landed: _api_records waits out the ready budget"""
+        class ApiScraper(ReadyScraper):
+            API_FIELDS = {"title": ["title"]}
+
+        scraper = ApiScraper()
+        capture = ResponseCapture(MagicMock(), ["/api/search"], ["title"])
+        assert await scraper._wait_ready(make_page(quiet=True), capture=capture, timeout=1) == READY_QUIET
+
+        async def deliver():
+            await asyncio.sleep(0.05)
+            capture.jobs.append({"title": "Data Engineer"})
+            capture._found.set()
+
+        asyncio.create_task(deliver())
+        assert await scraper._api_records(capture) == [{"title": "Data Engineer"}]
+
+    @pytest.mark.asyncio
+    async def test_rendered_cards_do_not_wait_for_payload(self):
+        capture = ResponseCapture(MagicMock(), ["/api/search"], ["title"])
+        scraper = ReadyScraper()
+        assert await scraper._wait_ready(make_page(selector_delay=0), capture=capture, timeout=5) == READY_CARDS
+
+        started = asyncio.get_running_loop().time()
+        assert await scraper._api_records(capture) == []
+        assert asyncio.get_running_loop().time() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_empty_selectors_wait_for_quiet_only(self):
+        page = make_page(quiet=True)
+        assert await ReadyScraper()._wait_ready(page, card_selectors=[], timeout=1) == READY_QUIET
+        page.wait_for_selector.assert_not_awaited()
+
+
+class TestPolitenessPolicy:
+    """Unit tests for per-domain request spacing"""
+
+    def test_first_request_per_domain_is_immediate(self):
+        policy = PolitenessPolicy(enabled=True, scale=1.0, delays={})
+
+        assert policy.reserve("https://www.naukri.com/python-jobs") == 0
+        assert policy.reserve("https://www.foundit.in/search/python-jobs") == 0
+        assert 1.0 <= policy.reserve("https://www.naukri.com/java-jobs") <= 2.0
+
+    def test_concurrent_reservations_are_spaced(self):
+        policy = PolitenessPolicy(enabled=True, scale=1.0, delays={"example.com": (1.0, 1.0)})
+        waits = [policy.reserve("https://jobs.example.com/?page=%d" % i) for i in range(3)]
+        assert [round(w, 1) for w in waits] == [0.0, 1.0, 2.0]
+
+    def test_disabled_and_scaled(self):
+        assert PolitenessPolicy(enabled=False).reserve("https://www.naukri.com/") == 0
+        policy = PolitenessPolicy(enabled=True, scale=0, delays={})
+        policy.reserve("https://www.naukri.com/")
+        assert policy.reserve("https://www.naukri.com/") == pytest.approx(0, abs=0.01)
+
+    def test_domain_and_env_parsing(self):
+        assert domain_of("https://www.glassdoor.co.in/Job/x.htm") == "glassdoor.co.in"
+        assert _parse_delays("naukri.com=0.5-1, bad, indeed.com=4") == {"naukri.com": (0.5, 1.0), "indeed.com": (4.0, 4.0)}
+
+    @pytest.mark.asyncio
+    async def test_navigate_waits_for_slot(self):
+        page = MagicMock()
+        page.goto = AsyncMock()
+        policy = MagicMock()
+        policy.wait = AsyncMock()
+
+        with patch("scrapers.base_scraper.get_politeness_policy", return_value=policy):
+            await ReadyScraper()._navigate(page, "https://www.naukri.com/", timeout=1000)
+
+        policy.wait.assert_awaited_once_with("https://www.naukri.com/")
+        page.goto.assert_awaited_once_with("https://www.naukri.com/", timeout=1000)
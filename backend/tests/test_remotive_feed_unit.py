@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import pytest
+import httpx
+from unittest.mock import patch
+import remotive
+from utils.http_client import HttpClientPool
+from remotive import RemotiveFeedCache, RemotiveClient
+from utils.query_canonical import canonicalize_query
+
+FEED = {
+    "jobs": [
+        {"id": 1, "url": "https://remotive.com/1", "title": "Senior Python Developer", "company_name": "Acme",
+         "category": "Software Development", "description": "<p>Django and FastAPI</p>", "tags": ["python"]},
+        {"id": 2, "url": "https://remotive.com/2", "title": "Data Analyst", "company_name": "Globex",
+         "category": "Data", "description": "SQL, Python and dashboards", "tags": []},
+        {"id": 3, "url": "https://remotive.com/3", "title": "Java Engineer", "company_name": "Initech",
+         "category": "Software Development", "description": "Spring Boot", "tags": []},
+    ]
+}
+
+
+class TestRemotiveFeedCache:
+    """Unit tests for the cached, indexed Remotive feed"""
+
+    @pytest.fixture
+    def api(self):
+        """Mock Remotive API that supports ETag conditional requests"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=FEED, headers={"ETag": '"v1"'})
+
+        pool = HttpClientPool(transport=httpx.MockTransport(handler), max_retries=0, http2=False)
+        with patch("remotive.get_http_pool", return_value=pool):
+            yield calls
+
+    @pytest.mark.asyncio
+    async def test_search_uses_token_index(self, api, tmp_path):
+        """Queries match on all tokens across title, company and description"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        await feed.ensure_fresh()
+
+        assert {j["title"] for j in feed.search("python")} == {"Senior Python Developer", "Data Analyst"}
+        assert [j["title"] for j in feed.search("python django")] == ["Senior Python Developer"]
+        assert [j["company"] for j in feed.search("initech")] == ["Initech"]
+        assert feed.search("rust") == []
+        assert len(feed.search("python", category="software-dev")) == 0
+        assert len(feed.search("python", category="Software Development")) == 1
+
+    @pytest.mark.asyncio
+    async def test_canonical_queries_match_plural_feed_text(self, api, tmp_path):
+        """Feed tokens are stemmed like canonicalize_query, so singular and plural meet"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        await feed.ensure_fresh()
+
+        assert [j["title"] for j in feed.search(canonicalize_query("Java Engineers").query)] == ["Java Engineer"]
+        assert [j["title"] for j in feed.search(canonicalize_query("python developers").query)] == \
+            ["Senior Python Developer"]
+        # "dashboards" in the description is indexed as "dashboard"
+        assert [j["title"] for j in feed.search(canonicalize_query("dashboard").query)] == ["Data Analyst"]
+
+    @pytest.mark.asyncio
+    async def test_searches_do_not_hit_network(self, api, tmp_path):
+        """Only the initial fill downloads the feed"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        for _ in range(5):
+            await feed.ensure_fresh()
+            feed.search("python")
+
+        assert len(api) == 1
+
+    @pytest.mark.asyncio
+    async def test_conditional_refresh_not_modified(self, api, tmp_path):
+        """A forced refresh sends If-None-Match and keeps the index on 304"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        await feed.refresh()
+        changed = await feed.refresh(force=True)
+
+        assert changed is False
+        assert api[-1].headers["If-None-Match"] == '"v1"'
+        assert len(feed.search()) == 3
+
+    @pytest.mark.asyncio
+    async def test_persisted_feed_survives_restart(self, api, tmp_path):
+        """A new cache instance loads the feed from disk without a download"""
+        cache_file = str(tmp_path / "feed.json")
+        await RemotiveFeedCache(cache_file=cache_file).ensure_fresh()
+
+        restarted = RemotiveFeedCache(cache_file=cache_file)
+        await restarted.ensure_fresh()
+
+        assert len(api) == 1
+        assert len(restarted.search("java")) == 1
+
+    @pytest.mark.asyncio
+    async def test_not_modified_only_rewrites_meta(self, api, tmp_path):
+        """A 304 updates the small meta file and leaves the feed file alone"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        await feed.refresh()
+        assert sorted(os.listdir(tmp_path)) == ["feed.json", "feed_meta.json"]
+        feed_mtime = os.stat(tmp_path / "feed.json").st_mtime_ns
+        os.utime(tmp_path / "feed_meta.json", ns=(0, 0))
+
+        await feed.refresh(force=True)
+
+        assert os.stat(tmp_path / "feed.json").st_mtime_ns == feed_mtime
+        meta = json.loads((tmp_path / "feed_meta.json").read_text())
+        assert meta["etag"] == '"v1"' and meta["fetched_at"] == feed.fetched_at
+        assert os.stat(tmp_path / "feed_meta.json").st_mtime_ns > 0
+
+    @pytest.mark.asyncio
+    async def test_feed_is_parsed_and_indexed_off_the_loop(self, api, tmp_path):
+        threads = []
+        index_feed = remotive._index_feed
+
+        def recording(raw_jobs):
+            threads.append(threading.get_ident())
+            return index_feed(raw_jobs)
+
+        with patch("remotive._index_feed", recording):
+            await RemotiveFeedCache(cache_file=str(tmp_path / "feed.json")).ensure_fresh()
+            await RemotiveFeedCache(cache_file=str(tmp_path / "feed.json")).ensure_fresh()  # from disk
+
+        assert len(threads) == 2 and threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_loads_single_file_cache(self, api, tmp_path):
+        """Caches written before the meta file existed still load, validators included"""
+        cache_file = tmp_path / "feed.json"
+        cache_file.write_text(json.dumps({"etag": '"v1"', "last_modified": None, "fetched_at": 1.0, **FEED}))
+
+        feed = RemotiveFeedCache(cache_file=str(cache_file))
+        await feed.load()
+        assert len(feed.search("java")) == 1
+        assert await feed.refresh() is False  # stale, revalidated with the stored ETag
+        assert api[-1].headers["If-None-Match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_results_are_copies(self, api, tmp_path):
+        """Mutating a result must not leak into the cached job"""
+        feed = RemotiveFeedCache(cache_file=str(tmp_path / "feed.json"))
+        await feed.ensure_fresh()
+        feed.search("java")[0]["query_hash"] = "abc"
+
+        assert "query_hash" not in feed.search("java")[0]
+
+    @pytest.mark.asyncio
+    async def test_client_skips_uae(self):
+        """UAE searches never touch the feed"""
+        client = RemotiveClient()
+        with patch("remotive.get_remotive_feed") as mock_feed:
+            assert await client.search_jobs("python", country="UAE") == []
+            mock_feed.assert_not_called()
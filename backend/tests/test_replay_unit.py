@@ -0,0 +1,183 @@
+import os
+from collections import Counter
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from benchmarks import bench_resource_blocking, bench_scrapers
+from scrapers.browser_pool import BrowserPool
+from scrapers.html_extract import extract_cards_from_html
+from scrapers.naukri_scraper import NaukriScraper
+from scrapers.routing_policy import RoutingPolicy, get_routing_policy
+from utils.http_client import HttpClientPool
+from utils.replay import HarReplay, RecordingTransport, ReplayTransport, har_entry, request_key, save_har
+
+
+def write_har(path, *entries):
+    save_har(str(path), list(entries))
+    return str(path)
+
+
+class TestHarReplay:
+    """Unit tests for fixture record/replay"""
+
+    def test_request_key_ignores_credentials_and_param_order(self):
+        a = request_key("get", "https://API.adzuna.com/v1/search/1?what=python&app_id=1&app_key=2")
+        b = request_key("GET", "https://api.adzuna.com/v1/search/1/?app_key=x&what=python&app_id=y")
+        assert a == b == "GET https://api.adzuna.com/v1/search/1?what=python"
+
+    def test_repeated_requests_replay_in_order(self, tmp_path):
+        url = "https://www.naukri.com/jobapi/v3/search?k=python"
+        path = write_har(tmp_path / "a.har",
+                         har_entry("GET", url, 200, {"content-type": "application/json"}, b'{"page": 1}'),
+                         har_entry("GET", url, 200, {"content-type": "application/json"}, b'{"page": 2}'))
+        replay = HarReplay(path, str(tmp_path / "missing.har"))
+
+        bodies = [replay.match("GET", url)[2] for _ in range(3)]
+        assert bodies == [b'{"page": 1}', b'{"page": 2}', b'{"page": 2}']
+        replay.rewind()
+        assert replay.match("GET", url)[2] == b'{"page": 1}'
+        assert replay.match("POST", url) is None
+        assert replay.stats.snapshot() == {"round_trips": 4, "bytes": 44, "unmatched": 1}
+
+    def test_binary_bodies_round_trip(self, tmp_path):
+        png = b"\x89PNG\r\n\x1a\n\x00\x01"
+        path = write_har(tmp_path / "a.har", har_entry("GET", "https://x.com/logo.png", 200,
+                                                       {"content-type": "image/png"}, png))
+        status, headers, body = HarReplay(path).match("GET", "https://x.com/logo.png")
+        assert (status, headers["content-type"], body) == (200, "image/png", png)
+
+    @pytest.mark.asyncio
+    async def test_http_pool_replays_and_fails_unrecorded(self, tmp_path):
+        path = write_har(tmp_path / "a.har", har_entry(
+            "GET", "https://jsearch.p.rapidapi.com/search?query=python&page=1", 200,
+            {"content-type": "application/json", "content-encoding": "gzip"}, b'{"data": [1, 2]}'))
+        pool = HttpClientPool(transport=ReplayTransport(HarReplay(path)), max_retries=0)
+
+        response = await pool.get("https://jsearch.p.rapidapi.com/search", params={"page": "1", "query": "python"})
+        assert response.json() == {"data": [1, 2]}
+        with pytest.raises(httpx.ConnectError):
+            await pool.get("https://jsearch.p.rapidapi.com/search", params={"page": "2", "query": "python"})
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_recording_transport_feeds_replay(self, tmp_path):
+        live = httpx.MockTransport(lambda request: httpx.Response(
+            200, json={"results": [request.url.params["what"]]}, headers={"x-served-by": "live"}))
+        recorder = RecordingTransport(live)
+        async with httpx.AsyncClient(transport=recorder) as client:
+            await client.get("https://api.adzuna.com/v1/api/jobs/in/search/1", params={"what": "python", "app_key": "k"})
+        recorder.save(str(tmp_path / "http.har"))
+
+        async with httpx.AsyncClient(transport=ReplayTransport(HarReplay(str(tmp_path / "http.har")))) as client:
+            response = await client.get("https://api.adzuna.com/v1/api/jobs/in/search/1", params={"what": "python"})
+        assert response.json() == {"results": ["python"]}
+        assert response.headers["x-served-by"] == "live"
+
+    @pytest.mark.asyncio
+    async def test_browser_pool_routes_allowed_requests_to_replay(self, tmp_path):
+        path = write_har(tmp_path / "browser.har", har_entry(
+            "GET", "https://www.naukri.com/python-jobs", 200, {"content-type": "text/html"}, b"<html></html>"))
+        BrowserPool._instance = None
+        pool = BrowserPool()
+        pool.replay = HarReplay(path)
+        try:
+            route = MagicMock()
+            route.request.resource_type = "document"
+            route.request.method = "GET"
+            route.request.url = "https://www.naukri.com/python-jobs"
+            route.fulfill = AsyncMock()
+            route.continue_ = AsyncMock()
+            await pool._route_request(route, None)
+
+            route.fulfill.assert_awaited_once_with(status=200, headers={"content-type": "text/html"},
+                                                   body=b"<html></html>")
+            route.continue_.assert_not_awaited()
+        finally:
+            BrowserPool._instance = None
+
+
+# Hand-built: the hand-written Naukri results page plus made-up subresources of each type
+SYNTHETIC_PAGE_HAR = os.path.join(bench_resource_blocking.FIXTURE_DIR, "resource_blocking",
+                                  "synthetic_naukri_search.har")
+
+
+@pytest.mark.synthetic
+class TestResourceBlockingFixture:
+    """A results page and its subresources through the pool's route handler (synthetic fixture, no Chromium)"""
+
+    def test_policy_blocks_assets_and_trackers_only(self):
+        totals = bench_resource_blocking.count_blocked(
+            bench_resource_blocking.load_recording(SYNTHETIC_PAGE_HAR), RoutingPolicy())
+
+        assert totals["blocked"] == Counter({"image": 2, "font": 1, "stylesheet": 1, "script": 1, "xhr": 1})
+        assert totals["requests"] - totals["blocked"] == Counter({"document": 1, "script": 1, "fetch": 1})
+
+    @pytest.mark.asyncio
+    async def test_blocked_requests_abort_and_cards_still_extract(self):
+        BrowserPool._instance = None
+        pool = BrowserPool()
+        pool.replay = HarReplay(SYNTHETIC_PAGE_HAR)
+        routes = []
+        try:
+            for entry in bench_resource_blocking.load_recording(SYNTHETIC_PAGE_HAR):
+                route = MagicMock()
+                route.request.resource_type = entry["_resourceType"]
+                route.request.method = entry["request"]["method"]
+                route.request.url = entry["request"]["url"]
+                route.abort, route.fulfill, route.continue_ = AsyncMock(), AsyncMock(), AsyncMock()
+                await pool._route_request(route, get_routing_policy("Naukri"))
+                routes.append(route)
+        finally:
+            BrowserPool._instance = None
+
+        aborted = [r.request.resource_type for r in routes if r.abort.await_count]
+        fulfilled = [r for r in routes if r.fulfill.await_count]
+        assert sorted(aborted) == ["font", "image", "image", "script", "stylesheet", "xhr"]
+        assert [r.request.resource_type for r in fulfilled] == ["document", "script", "fetch"]
+        assert not any(r.continue_.await_count for r in routes)  # nothing left for the network
+        assert pool.snapshot()["blocked_requests"] == {"stylesheet": 1, "image": 2, "font": 1, "script": 1, "xhr": 1}
+
+        html = fulfilled[0].fulfill.await_args.kwargs["body"].decode("utf-8")
+        cards = extract_cards_from_html(html, NaukriScraper.CARD_SELECTORS, NaukriScraper.CARD_FIELDS)
+        assert len(cards) == bench_scrapers.load_meta("Naukri")["jobs"]
+        assert all(card.get("title") for card in cards)
+
+
+class TestFixtureCorpus:
+    """The recorded API fixtures still parse into the recorded number of jobs (offline)"""
+
+    @pytest.mark.synthetic
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("source", sorted(bench_scrapers.API_SOURCES))
+    async def test_api_fixture_replays(self, source):
+        """Hand-written JSearch/Adzuna responses: checks the clients against the documented format, not the live APIs"""
+        # More runs than the provider's rate-limit burst: replayed calls are never throttled
+        with bench_scrapers.offline_state():
+            result = await bench_scrapers.run_source(source, runs=5)
+
+        assert result["jobs"] == result["expected_jobs"] > 0
+        assert result["round_trips"] == 1
+        assert result["unmatched"] == 0
+
+    @pytest.mark.synthetic
+    @pytest.mark.asyncio
+    async def test_browser_fixture_replays_without_chromium(self):
+        """The Naukri page is hand-written to the scraper's selectors, not recorded"""
+        with bench_scrapers.offline_state():
+            result = await bench_scrapers.run_source("Naukri", runs=1, browser=False)
+
+        assert result["mode"] == "html"
+        assert result["jobs"] == result["expected_jobs"] > 0
+        assert result["round_trips"] == 1
+
+    def test_check_flags_regressions(self):
+        results = {"Naukri": {"jobs": 12, "expected_jobs": 20, "cpu_ms": 40.0},
+                   "JSearch": {"jobs": 10, "expected_jobs": 10, "cpu_ms": 2.0}}
+        failures = bench_scrapers.check(results, {"Naukri": {"cpu_ms": 50.0}, "JSearch": {"cpu_ms": 1.0}}, 1.5)
+        assert failures == ["Naukri: 12 jobs extracted, 20 recorded", "JSearch: 2.0 ms CPU vs 1.0 ms baseline"]
+
+    def test_check_compares_cpu_only_within_a_mode(self):
+        results = {"Naukri": {"mode": "browser", "jobs": 20, "expected_jobs": 20, "cpu_ms": 400.0}}
+        assert bench_scrapers.check(results, {"Naukri": {"mode": "html", "cpu_ms": 80.0}}, 1.5) == []
+        assert bench_scrapers.check(results, {"Naukri": {"mode": "browser", "cpu_ms": 80.0}}, 1.5) == \
+            ["Naukri: 400.0 ms CPU vs 80.0 ms baseline"]
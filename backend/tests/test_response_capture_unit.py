@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from scrapers.response_capture import ResponseCapture, find_job_list, pick, as_text, as_int
+from scrapers.naukri_scraper import NaukriScraper
+from scrapers.base_scraper import EXTRACT_CARDS_JS
+
+
+class FakePage:
+    """Just enough of a Playwright page to drive response listeners."""
+    def __init__(self):
+        self.listeners = []
+
+    def on(self, event, handler):
+        self.listeners.append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove(handler)
+
+    def emit(self, response):
+        for handler in list(self.listeners):
+            handler(response)
+
+
+def make_response(url, payload, resource_type="xhr", status=200):
+    response = MagicMock()
+    response.url = url
+    response.status = status
+    response.request.resource_type = resource_type
+    response.json = AsyncMock(return_value=payload)
+    return response
+
+
+NAUKRI_PAYLOAD = {
+    "noOfJobs": 2,
+    "jobDetails": [
+        {
+            "title": "Data Scientist",
+            "companyName": "Fractal Analytics",
+            "jdURL": "/job-listings-data-scientist-fractal-1",
+            "placeholders": [
+                {"type": "experience", "label": "3-8 Yrs"},
+                {"type": "salary", "label": "Not disclosed"},
+                {"type": "location", "label": "Bengaluru"},
+            ],
+            "tagsAndSkills": "Python,Machine Learning,SQL",
+            "jobDescription": "<p>Build <b>models</b></p>",
+        },
+        {
+            "title": "ML Engineer",
+            "companyName": "Zomato",
+            "jdURL": "https://www.naukri.com/job-listings-ml-engineer-2",
+            "placeholders": [],
+        },
+    ],
+}
+
+
+class TestPayloadHelpers:
+    """Unit tests for search payload parsing helpers"""
+
+    def test_find_job_list_nested(self):
+        payload = {"meta": {"count": 1}, "data": {"jobSearchResponse": {"data": [{"title": "A"}, {"title": "B"}]}}}
+        assert [j["title"] for j in find_job_list(payload, ["title"])] == ["A", "B"]
+
+    def test_find_job_list_ignores_unrelated_lists(self):
+        payload = {"filters": [{"name": "Remote"}], "jobDetails": [{"jobTitle": "A"}]}
+        assert find_job_list(payload, ["title", "jobTitle"]) == [{"jobTitle": "A"}]
+        assert find_job_list({"filters": [{"name": "Remote"}]}, ["title"]) == []
+
+    def test_pick_dotted_paths_with_fallback(self):
+        item = {"company": {"name": ""}, "employer": {"company_name": "Acme"}}
+        assert pick(item, ["company.name", "employer.company_name"]) == "Acme"
+        assert pick(item, ["missing.key"]) is None
+
+    def test_as_text_and_as_int(self):
+        assert as_text([{"name": "Bengaluru"}, "Pune"]) == "Bengaluru, Pune"
+        assert as_text("  ") is None
+        assert as_int("5 years") == 5
+        assert as_int(None, default=3) == 3
+
+
+class TestResponseCapture:
+    """Unit tests for XHR/fetch response interception"""
+
+    @pytest.mark.asyncio
+    async def test_captures_matching_json_response(self):
+        page = FakePage()
+        capture = ResponseCapture(page, ["/jobapi/v3/search"], ["title"])
+
+        page.emit(make_response("https://www.naukri.com/static/app.js", {}, resource_type="script"))
+        page.emit(make_response("https://www.naukri.com/jobapi/v3/search?pageNo=1", NAUKRI_PAYLOAD))
+
+        jobs = await capture.wait(timeout=1)
+        assert len(jobs) == 2
+        capture.detach()
+        assert page.listeners == []
+
+    @pytest.mark.asyncio
+    async def test_times_out_without_payload(self):
+        page = FakePage()
+        capture = ResponseCapture(page, ["/jobapi/v3/search"], ["title"])
+
+        page.emit(make_response("https://www.naukri.com/jobapi/v3/search", {"error": "blocked"}))
+        page.emit(make_response("https://www.naukri.com/jobapi/v3/search", NAUKRI_PAYLOAD, status=403))
+
+        assert await capture.wait(timeout=0.05) == []
+
+    @pytest.mark.asyncio
+    async def test_naukri_returns_api_jobs_without_dom_scrape(self):
+        page = FakePage()
+        page.goto = AsyncMock(side_effect=lambda *a, **kw: page.emit(
+            make_response("https://www.naukri.com/jobapi/v3/search?noOfResults=20", NAUKRI_PAYLOAD)))
+        page.evaluate = AsyncMock()
+        page.wait_for_selector = AsyncMock()
+        page.close = AsyncMock()
+        scraper = NaukriScraper()
+
+        with patch.object(scraper, "_get_page", AsyncMock(return_value=(page, MagicMock()))), \
+             patch.object(scraper, "_random_delay", AsyncMock()) as delay:
+            jobs = await scraper.search_jobs("data scientist", "Bangalore")
+
+        assert [j["title"] for j in jobs] == ["Data Scientist", "ML Engineer"]
+        first, second = jobs
+        assert first["apply_link"] == "https://www.naukri.com/job-listings-data-scientist-fractal-1"
+        assert (first["experience_min"], first["experience_max"]) == (3, 8)
+        assert first["location"] == "Bengaluru"
+        assert first["skills"] == ["Python", "Machine Learning", "SQL"]
+        assert first["description"].split() == ["Build", "models"]
+        assert second["location"] == "Bangalore"
+        # Readiness raced the selector/quiet waits, but no card was extracted from the DOM
+        assert EXTRACT_CARDS_JS not in [c.args[0] for c in page.evaluate.await_args_list]
+        delay.assert_not_awaited()
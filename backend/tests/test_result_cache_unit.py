@@ -0,0 +1,38 @@
+from managers.result_cache import SourceResultCache, _parse_ttls
+
+
+class TestSourceResultCache:
+    """Unit tests for the per-source scrape result cache"""
+
+    def test_hit_on_folded_inputs(self):
+        cache = SourceResultCache(ttls={})
+        cache.put("Naukri", "Python Developer", "Bangalore", 1, "India", [{"id": 1}])
+
+        assert cache.get("Naukri", "  python   developer", "bangalore", 1, "india") == [{"id": 1}]
+        assert cache.get("Naukri", "python developer", "bangalore", 2, "india") is None
+        assert cache.get("Indeed", "python developer", "bangalore", 1, "india") is None
+        assert cache.snapshot()["sources"]["Naukri"] == {"hits": 1, "misses": 1, "hit_rate": 0.5, "ttl": 3600}
+
+    def test_per_source_ttl(self):
+        cache = SourceResultCache(default_ttl=100, ttls={"Naukri": 10})
+        cache.put("Naukri", "python", "Pune", 1, "India", [{"id": 1}])
+        cache.put("Hirist", "python", "Pune", 1, "India", [{"id": 2}])
+        for key, (stored, jobs) in list(cache._entries.items()):
+            cache._entries[key] = (stored - 50, jobs)
+
+        assert cache.get("Naukri", "python", "Pune", 1, "India") is None
+        assert cache.get("Hirist", "python", "Pune", 1, "India") == [{"id": 2}]
+        assert cache.snapshot()["entries"] == 1
+
+    def test_lru_bound_and_empty_results(self):
+        cache = SourceResultCache(max_entries=2, ttls={})
+        cache.put("A", "q", "", 1, "India", [])
+        assert cache.get("A", "q", "", 1, "India") is None
+
+        for i in range(3):
+            cache.put("A", f"q{i}", "", 1, "India", [{"id": i}])
+        assert cache.get("A", "q0", "", 1, "India") is None
+        assert cache.get("A", "q2", "", 1, "India") == [{"id": 2}]
+
+    def test_parse_ttls(self):
+        assert _parse_ttls("Naukri=1800, bad, JSearch=x") == {"Naukri": 1800}
@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+from managers.scrape_scheduler import ScrapeScheduler, _parse_limits
+
+
+def make_job(log, name, gate=None):
+    """Zero-arg factory for a scrape that logs its start and optionally blocks on `gate`."""
+    async def run():
+        log.append(name)
+        if gate is not None:
+            await gate.wait()
+        return name
+    return run
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestScrapeScheduler:
+    """Unit tests for the per-domain/global scrape governor"""
+
+    @pytest.mark.asyncio
+    async def test_domain_max_in_flight(self):
+        scheduler = ScrapeScheduler(max_concurrency=8, max_in_flight=2, rate_per_sec=100, limits={})
+        gate = asyncio.Event()
+        started = []
+        tasks = [asyncio.create_task(scheduler.submit("Naukri", make_job(started, i, gate))) for i in range(4)]
+        await settle()
+
+        assert started == [0, 1]
+        assert scheduler.snapshot()["domains"]["Naukri"]["queued"]["interactive"] == 2
+
+        gate.set()
+        assert await asyncio.gather(*tasks) == [0, 1, 2, 3]
+        naukri = scheduler.snapshot()["domains"]["Naukri"]
+        assert naukri["completed"] == 4 and naukri["in_flight"] == 0
+        assert naukri["queue_wait"]["samples"] == 4
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_domains(self):
+        scheduler = ScrapeScheduler(max_concurrency=1, max_in_flight=4, rate_per_sec=100, limits={})
+        gate = asyncio.Event()
+        started = []
+        # Hold the only global slot while both domains queue up
+        blocker = asyncio.create_task(scheduler.submit("Bayt", make_job(started, "bayt", gate)))
+        await settle()
+        tasks = [asyncio.create_task(scheduler.submit("Naukri", make_job(started, f"naukri-{i}"))) for i in range(3)]
+        tasks += [asyncio.create_task(scheduler.submit("Indeed", make_job(started, f"indeed-{i}"))) for i in range(2)]
+        await settle()
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert started == ["bayt", "naukri-0", "indeed-0", "naukri-1", "indeed-1", "naukri-2"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_before_prewarm_and_prewarm_share(self):
+        scheduler = ScrapeScheduler(max_concurrency=2, max_in_flight=4, rate_per_sec=100, prewarm_share=0.5, limits={})
+        gate = asyncio.Event()
+        started = []
+        prewarm = [asyncio.create_task(scheduler.submit("Naukri", make_job(started, f"prewarm-{i}", gate), "prewarm"))
+                   for i in range(2)]
+        await settle()
+        # Prewarm may only take half of the global slots
+        assert started == ["prewarm-0"]
+
+        interactive = asyncio.create_task(scheduler.submit("Indeed", make_job(started, "interactive", gate)))
+        await settle()
+        assert started == ["prewarm-0", "interactive"]
+
+        gate.set()
+        await asyncio.gather(*prewarm, interactive)
+        assert scheduler.snapshot()["in_flight"] == {"interactive": 0, "prewarm": 0}
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_spaces_starts(self):
+        scheduler = ScrapeScheduler(max_concurrency=8, limits={"Glassdoor": (4, 20.0)})
+        loop = asyncio.get_running_loop()
+        started_at = []
+
+        async def run():
+            started_at.append(loop.time())
+
+        first = loop.time()
+        # Burst of 4 tokens, then one start per 50ms
+        await asyncio.gather(*[scheduler.submit("Glassdoor", run) for _ in range(6)])
+
+        assert started_at[3] - first < 0.03
+        assert started_at[5] - first >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_nothing_and_failures_release(self):
+        scheduler = ScrapeScheduler(max_concurrency=1, max_in_flight=1, rate_per_sec=100, limits={})
+        gate = asyncio.Event()
+        started = []
+        running = asyncio.create_task(scheduler.submit("Naukri", make_job(started, "a", gate)))
+        queued = asyncio.create_task(scheduler.submit("Naukri", make_job(started, "b")))
+        await settle()
+        queued.cancel()
+        gate.set()
+        await running
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        async def boom():
+            raise RuntimeError("page crashed")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("Naukri", boom)
+        assert started == ["a"]
+        assert scheduler.total_in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_prewarm_gives_up_after_max_wait(self):
+        scheduler = ScrapeScheduler(max_concurrency=1, max_in_flight=1, rate_per_sec=100, limits={},
+                                    prewarm_max_wait=0.05)
+        gate = asyncio.Event()
+        started = []
+        running = asyncio.create_task(scheduler.submit("Naukri", make_job(started, "interactive", gate)))
+        await settle()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.submit("Naukri", make_job(started, "prewarm"), "prewarm")
+        # Interactive work has no default limit; an explicit one applies to any priority
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.submit("Naukri", make_job(started, "late"), max_wait=0.05)
+        waiting = asyncio.create_task(scheduler.submit("Naukri", make_job(started, "next")))
+        gate.set()
+        await asyncio.gather(running, waiting)
+
+        assert started == ["interactive", "next"]
+        naukri = scheduler.snapshot()["domains"]["Naukri"]
+        assert naukri["expired"] == 2 and naukri["in_flight"] == 0
+        assert scheduler.total_in_flight == 0
+
+    def test_parse_limits(self):
+        assert _parse_limits("Glassdoor=1:0.1, Indeed=2, junk, Bad=x") == {"Glassdoor": (1, 0.1), "Indeed": (2, None)}
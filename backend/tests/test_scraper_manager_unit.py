@@ -1,15 +1,32 @@
+import asyncio
 import pytest
 import pytest_asyncio
 from unittest.mock import Mock, AsyncMock, patch
-from managers.scraper_manager import ScraperManager
+from managers.scraper_manager import ScraperManager, flush_scrape_state
+from managers.budget_manager import ApiBudgetManager
+from managers.circuit_breaker import HALF_OPEN, OPEN, CircuitBreakerRegistry
+from managers.scrape_scheduler import ScrapeScheduler
+from managers.result_cache import SourceResultCache
+from managers.watermarks import WatermarkStore
+from managers.source_yield import SourceYieldStats
 
 class TestScraperManager:
     """Unit tests for ScraperManager"""
     
     @pytest.fixture
-    def manager(self):
+    def manager(self, tmp_path):
         """Create ScraperManager with mocked scrapers"""
-        with patch('managers.scraper_manager.JSearchClient'), \
+        budget = ApiBudgetManager(state_file=str(tmp_path / "api_budget.json"))
+        breakers = CircuitBreakerRegistry(state_file=str(tmp_path / "circuit_breakers.json"))
+        with patch('managers.scraper_manager.get_budget_manager', return_value=budget), \
+             patch('managers.scraper_manager.get_circuit_breakers', return_value=breakers), \
+             patch('managers.scraper_manager.get_scrape_scheduler', return_value=ScrapeScheduler(limits={})), \
+             patch('managers.scraper_manager.get_result_cache', return_value=SourceResultCache(ttls={})), \
+             patch('managers.scraper_manager.get_watermarks',
+                   return_value=WatermarkStore(state_file=str(tmp_path / "watermarks.json"), max_pages=2, deepen_ratio=0.5)), \
+             patch('managers.scraper_manager.get_source_yield',
+                   return_value=SourceYieldStats(state_file=str(tmp_path / "source_yield.json"))), \
+             patch('managers.scraper_manager.JSearchClient'), \
              patch('managers.scraper_manager.AdzunaClient'), \
              patch('managers.scraper_manager.RemotiveClient'), \
              patch('managers.scraper_manager.NaukriScraper'), \
@@ -17,6 +34,7 @@ class TestScraperManager:
              patch('managers.scraper_manager.InstahyreScraper'):
             
             manager = ScraperManager()
+            manager.jsearch_client.requests_for = lambda num_pages: num_pages
             return manager
     
     @pytest.mark.asyncio
@@ -114,3 +132,497 @@ class TestScraperManager:
         results = await manager.execute_search("Python", "Bangalore", 1, "India")
         
         assert len(results) >= 3  # At least 3 from API clients
+    
+    @pytest.mark.asyncio
+    async def test_execute_search_skips_exhausted_api(self, manager):
+        """Prewarm searches do not spend the reserved paid-API budget"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        jsearch = manager.budget.providers["jsearch"]
+        jsearch.used = jsearch.monthly_quota - 1
+        
+        await manager.execute_search("Python", "Bangalore", 1, "India", priority="prewarm")
+        
+        manager.jsearch_client.search_jobs.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_skipped_api_call_is_not_an_empty_run(self, manager):
+        """A call skipped for budget neither counts as an empty run nor holds the probe slot"""
+        manager.budget.providers["jsearch"].used = manager.budget.providers["jsearch"].monthly_quota
+        breaker = manager.breakers.get("JSearch")
+        breaker.state, breaker.opened_at = "open", 0.0
+        
+        launched = manager._launch("JSearch", "JSearch", 15,
+                                   lambda: manager._budgeted("jsearch", "prewarm", AsyncMock(return_value=[])))
+        assert await launched == []
+        
+        assert breaker.empty_runs == 0
+        assert breaker.state == "half_open" and manager.breakers.allow("JSearch")
+    
+    @pytest.mark.asyncio
+    async def test_remotive_not_run_for_uae(self, manager):
+        """Remotive has nothing for UAE, so UAE searches don't count against it"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        for _ in range(6):
+            await manager.execute_search(f"Python {_}", "Dubai", 1, "UAE")
+        
+        manager.remotive_client.search_jobs.assert_not_called()
+        assert manager.breakers.allow("Remotive")
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_source(self, manager):
+        """Sources with an open circuit are not launched at all"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        for _ in range(3):
+            manager.breakers.record_failure("Indeed", "blocked")
+        
+        await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        manager.scrapers["Indeed"].search_jobs.assert_not_called()
+        manager.scrapers["Hirist"].search_jobs.assert_called()
+    
+    @pytest.mark.asyncio
+    async def test_run_wrapper_records_blocked_source(self, manager):
+        """A bot block counts as a failure for the source's breaker"""
+        from scrapers.base_scraper import ScraperBlockedError
+        
+        async def blocked_scraper():
+            raise ScraperBlockedError("hCaptcha")
+        
+        result = await manager._run_wrapper(blocked_scraper(), "Indeed-Page1", 10, source="Indeed")
+        
+        assert result == []
+        assert manager.breakers.get("Indeed").failures == 1
+    
+    @pytest.mark.asyncio
+    async def test_scrapes_submitted_through_scheduler(self, manager):
+        """Browser scrapes queue in the scheduler with the search priority; APIs don't"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[{'title': 'Job'}])
+        
+        submitted = []
+        real_submit = manager.scheduler.submit
+        
+        async def submit(domain, call, priority):
+            submitted.append((domain, priority))
+            return await real_submit(domain, call, priority=priority)
+        
+        with patch.object(manager.scheduler, "submit", side_effect=submit):
+            results = await manager.execute_search("Python", "Bangalore", 1, "India", priority="prewarm")
+        
+        # Page 1 is all new, so page 2 is fetched; page 2 repeats it, so pagination stops
+        domains = {d for d, _ in submitted}
+        assert "Naukri" in domains and "JSearch" not in domains
+        assert {p for _, p in submitted} == {"prewarm"}
+        assert ("Hirist", "prewarm") in submitted and submitted.count(("Hirist", "prewarm")) == 2
+        assert len(results) == len(submitted)
+        assert manager.scheduler.snapshot()["domains"]["Hirist"]["completed"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_queue_timeout_is_not_a_failure(self, manager):
+        """Scrapes that never got a scheduler slot return nothing and don't count against the source"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[{'title': 'Job'}])
+        
+        manager.breakers.get("Naukri").state = HALF_OPEN
+        
+        async def submit(domain, call, priority):
+            raise asyncio.TimeoutError()
+        
+        with patch.object(manager.scheduler, "submit", side_effect=submit):
+            results = await manager.execute_search("Python", "Bangalore", 1, "India", priority="prewarm")
+        
+        assert [job['title'] for job in results] == ['Job 1']
+        for name in manager.scrapers:
+            assert manager.breakers.get(name).failures == 0
+            manager.scrapers[name].search_jobs.assert_not_called()
+        # The half-open breaker's probe slot is free for the next search
+        assert manager.breakers.get("Naukri").probe_in_flight is False
+    
+    @pytest.mark.asyncio
+    async def test_prewarm_search_gives_up_on_a_busy_domain(self, manager):
+        """A prewarm refresh stuck behind an interactive scrape drops that source after the bounded wait"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.scheduler = ScrapeScheduler(limits={"Naukri": (1, 100.0)}, rate_per_sec=100, prewarm_max_wait=0.2)
+        
+        gate = asyncio.Event()
+        interactive = asyncio.create_task(manager.scheduler.submit("Naukri", gate.wait))
+        await asyncio.sleep(0)
+        
+        results = await asyncio.wait_for(
+            manager.execute_search("Python", "Bangalore", 1, "India", priority="prewarm"), timeout=5)
+        
+        assert [job['title'] for job in results] == ['Job 1']
+        manager.scrapers["Naukri"].search_jobs.assert_not_called()
+        assert manager.scheduler.snapshot()["domains"]["Naukri"]["expired"] == 1
+        assert manager.breakers.get("Naukri").failures == 0
+        gate.set()
+        await interactive
+    
+    @pytest.mark.asyncio
+    async def test_jobspy_timeouts_open_its_breaker(self, manager):
+        """A hung or killed JobSpy worker is a failure, not an empty run"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.jobspy_enabled = True
+        manager.jobspy_client.pool = Mock(run=AsyncMock(side_effect=asyncio.TimeoutError()), timeout=55)
+        
+        for _ in range(manager.breakers.failure_threshold):
+            await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        breaker = manager.breakers.get("JobSpy")
+        assert breaker.state == OPEN
+    
+    @pytest.mark.asyncio
+    async def test_result_cache_serves_repeat_search(self, manager):
+        """A repeat search with the same scraper inputs only launches cold sources"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.scrapers["Naukri"].search_jobs = AsyncMock(
+            side_effect=lambda q, loc, p: [{'id': 2, 'title': 'Job 2'}] if p == 1 else [])
+        
+        first = await manager.execute_search("Python", "Bangalore", 1, "India")
+        second = await manager.execute_search("python ", "Bangalore", 1, "India")
+        
+        assert sorted(j['id'] for j in second) == sorted(j['id'] for j in first) == [1, 2]
+        manager.jsearch_client.search_jobs.assert_called_once()
+        # Pages 1 and 2 on the first search; the repeat gets page 1 from cache and stops there
+        assert manager.scrapers["Naukri"].search_jobs.call_count == 2
+        # Empty results are not cached: those sources are scraped again (an empty page ends pagination)
+        assert manager.scrapers["Hirist"].search_jobs.call_count == 2
+        # Cached dicts are copies: tagging results doesn't leak into the cache
+        second[0]['query_hash'] = 'abc'
+        assert 'query_hash' not in manager.results.get("JSearch", "Python", "Bangalore", 1, "India")[0]
+
+    @pytest.mark.asyncio
+    async def test_pagination_follows_new_job_ratio(self, manager):
+        """Scrapers go a page deeper only while pages are mostly unseen jobs"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.scrapers["Hirist"].search_jobs = AsyncMock(
+            side_effect=lambda q, loc, p: [{'title': f'Job {p}-{i}', 'company': 'Acme'} for i in range(4)])
+        
+        first = await manager.execute_search("Python", "Bangalore", 1, "India")
+        assert [c.args[2] for c in manager.scrapers["Hirist"].search_jobs.call_args_list] == [1, 2]
+        assert len(first) == 8
+        
+        # Same jobs again once the result cache has expired: page 1 is all known, stop there
+        manager.results = SourceResultCache(ttls={})
+        again = await manager.execute_search("Python", "Bangalore", 1, "India")
+        assert manager.scrapers["Hirist"].search_jobs.call_count == 3
+        assert len(again) == 4
+        assert manager.watermarks.snapshot()["sources"]["Hirist"]["early_stops"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_api_depth_shrinks_when_results_are_known(self, manager):
+        """Paid APIs fetch fewer pages next time when a run returned mostly known jobs"""
+        jobs = [{'title': f'Job {i}', 'company': 'Acme'} for i in range(10)]
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=jobs)
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        for _ in range(3):
+            manager.results = SourceResultCache(ttls={})
+            await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        pages = [c.kwargs['num_pages'] for c in manager.jsearch_client.search_jobs.call_args_list]
+        assert pages == [5, 5, 4]
+
+    @pytest.mark.asyncio
+    async def test_stream_search_yields_sources_as_they_finish(self, manager):
+        """Fast sources are yielded while slow scrapers are still running"""
+        gate = asyncio.Event()
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        async def slow(q, loc, p):
+            await gate.wait()
+            return [{'id': 2, 'title': 'Job 2'}] if p == 1 else []
+        manager.scrapers["Naukri"].search_jobs = AsyncMock(side_effect=slow)
+        
+        stream = manager.stream_search("Python", "Bangalore", 1, "India")
+        first = await stream.__anext__()
+        assert first.source == "JSearch" and not gate.is_set()
+        
+        gate.set()
+        rest = [batch async for batch in stream]
+        assert [b.source for b in rest] == ["Naukri"]
+    
+    @pytest.mark.asyncio
+    async def test_search_state_is_flushed_later_not_per_search(self, manager, tmp_path):
+        """Searches only mark breaker/watermark/yield state dirty; flush_scrape_state writes it"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+
+        await manager.execute_search("Python", "Bangalore", 1, "India")
+        files = ["circuit_breakers.json", "watermarks.json", "source_yield.json"]
+        assert not any((tmp_path / name).exists() for name in files)
+        assert manager.breakers.dirty and manager.watermarks.dirty and manager.yields.dirty
+
+        with patch('managers.scraper_manager.get_circuit_breakers', return_value=manager.breakers), \
+             patch('managers.scraper_manager.get_watermarks', return_value=manager.watermarks), \
+             patch('managers.scraper_manager.get_source_yield', return_value=manager.yields):
+            await flush_scrape_state()
+        assert all((tmp_path / name).exists() for name in files)
+        assert not (manager.breakers.dirty or manager.watermarks.dirty or manager.yields.dirty)
+    
+    @pytest.mark.asyncio
+    async def test_slow_consumer_holds_back_fast_sources(self, manager):
+        """A fast source can only run a bounded number of batches ahead of the consumer"""
+        from managers.scraper_manager import SourceBatch
+        produced = []
+
+        async def fast():
+            for i in range(50):
+                produced.append(i)
+                yield SourceBatch("Fast", [{'id': i}])
+
+        async def idle():
+            await asyncio.sleep(30)
+            yield SourceBatch("Idle", [])
+
+        merged = manager._merge([fast(), idle()])
+        consumed = 0
+        for _ in range(5):
+            await merged.__anext__()
+            consumed += 1
+            await asyncio.sleep(0.01)  # slow consumer: the producer gets plenty of turns
+        # Queue holds 2 * len(streams) batches, plus the one the producer is waiting to put
+        assert len(produced) <= consumed + 4 + 1
+        await merged.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_running_sources(self, manager):
+        """Stopping consumption early cancels the sources still running"""
+        started, cancelled = asyncio.Event(), asyncio.Event()
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        async def hang(q, loc, p):
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        manager.scrapers["Naukri"].search_jobs = AsyncMock(side_effect=hang)
+        
+        stream = manager.stream_search("Python", "Bangalore", 1, "India")
+        await stream.__anext__()
+        await started.wait()
+        await stream.aclose()
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_target_new_jobs_cancels_remaining_sources(self, manager):
+        """Once enough new jobs are in, slow scrapers are cancelled (closing their pages)"""
+        started, cancelled = asyncio.Event(), asyncio.Event()
+        manager.jsearch_client.search_jobs = AsyncMock(
+            return_value=[{'title': f'Job {i}', 'company': 'Acme'} for i in range(30)])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        async def hang(q, loc, p):
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        manager.scrapers["Naukri"].search_jobs = AsyncMock(side_effect=hang)
+        
+        results = await asyncio.wait_for(
+            manager.execute_search("Python", "Bangalore", 1, "India", target_new=20), timeout=5)
+        
+        assert len(results) == 30
+        assert started.is_set() and cancelled.is_set()
+        # A cancelled scrape is neither a success nor a failure for its breaker
+        assert manager.breakers.get("Naukri").failures == 0
+    
+    @pytest.mark.asyncio
+    async def test_time_budget_ends_search(self, manager):
+        """Sources still running when the wall-clock budget runs out are cancelled"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[{'id': 1, 'title': 'Job 1'}])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        async def hang(q, loc, p):
+            await asyncio.sleep(30)
+        manager.scrapers["Hirist"].search_jobs = AsyncMock(side_effect=hang)
+        
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await manager.execute_search("Python", "Bangalore", 1, "India", budget=0.3)
+        
+        assert loop.time() - start < 2
+        assert [j['id'] for j in results] == [1]
+    
+    @pytest.mark.asyncio
+    async def test_sources_start_cheapest_first(self, manager):
+        """Scrapes are submitted in order of historical cost per new job"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        
+        bucket = manager.yields.bucket("Python", "India")
+        manager.yields.record_time("Glassdoor", 60.0, bucket)
+        manager.yields.record_time("Cutshort", 1.0, bucket)
+        manager.yields.record_new("Cutshort", 50, bucket)
+        
+        submitted = []
+        real_submit = manager.scheduler.submit
+        
+        async def submit(domain, call, priority):
+            submitted.append(domain)
+            return await real_submit(domain, call, priority=priority)
+        
+        with patch.object(manager.scheduler, "submit", side_effect=submit):
+            await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        assert submitted[0] == "Cutshort" and submitted[-1] == "Glassdoor"
+        assert manager.yields.snapshot()[bucket]["Glassdoor"]["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unproductive_scrapers_are_skipped_for_query_category(self, manager):
+        """Sources that find nothing new for this kind of query stop being launched"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.yields.explore = 0
+        
+        senior = manager.yields.bucket("senior data engineer", "India")
+        for _ in range(5):
+            manager.yields.record_time("Freshersworld", 20.0, senior)
+        
+        await manager.execute_search("senior data engineer", "Bangalore", 1, "India")
+        manager.scrapers["Freshersworld"].search_jobs.assert_not_called()
+        
+        # Other query categories keep their own stats
+        await manager.execute_search("data engineer fresher", "Bangalore", 1, "India")
+        manager.scrapers["Freshersworld"].search_jobs.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_does_not_deselect_sources(self, manager):
+        """A popular query repeated within the watermark TTL finds nothing new, but that isn't held against sources"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.scrapers["Hirist"].search_jobs = AsyncMock(side_effect=lambda query, location, page: [
+            {'title': f'Python Developer {i}', 'company': 'Acme'} for i in range(5)] if page == 1 else [])
+        manager.results.ttls["Hirist"] = -1  # result cache entries expire long before watermarks
+        manager.yields.explore = 0
+        
+        for _ in range(12):
+            await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        # Page 1 every time (page 2 only on the first, novel run)
+        assert manager.scrapers["Hirist"].search_jobs.await_count == 13
+        assert "Hirist" in manager.yields.select(["Hirist"], manager.yields.bucket("Python", "India"), 2)
+
+    @pytest.mark.asyncio
+    async def test_scrapes_run_in_browser_shards(self, manager):
+        """With worker processes configured, browser scrapes are sent to them by source and class"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.shards = Mock()
+        manager.shards.run = AsyncMock(
+            side_effect=lambda source, cls, args, kwargs: [{'title': f'{source} job'}] if args[2] == 1 else [])
+        
+        results = await manager.execute_search("Python", "Bangalore", 1, "India")
+        
+        runs = {}
+        for call in manager.shards.run.await_args_list:
+            runs.setdefault(call.args[0], call.args)
+        assert runs["Hirist"][1:] == (type(manager.scrapers["Hirist"]), ("Python", "Bangalore", 1), {})
+        assert runs["Indeed"][3] == {"country": "India"}
+        assert {'title': 'Naukri job'} in results
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_jobspy_runs_as_a_source_when_enabled(self, manager):
+        """JobSpy is off by default; enabled, it is one cached, breaker-guarded source"""
+        manager.jsearch_client.search_jobs = AsyncMock(return_value=[])
+        manager.adzuna_client.search_jobs = AsyncMock(return_value=[])
+        manager.remotive_client.search_jobs = AsyncMock(return_value=[])
+        for scraper in manager.scrapers.values():
+            scraper.search_jobs = AsyncMock(return_value=[])
+        manager.jobspy_client.search_jobs = AsyncMock(return_value=[{'id': 7, 'title': 'JobSpy job'}])
+        
+        assert await manager.execute_search("Python", "Bangalore", 1, "India") == []
+        manager.jobspy_client.search_jobs.assert_not_called()
+        
+        manager.jobspy_enabled = True
+        results = await manager.execute_search("Python", "Bangalore", 1, "UAE")
+        
+        assert results == [{'id': 7, 'title': 'JobSpy job'}]
+        manager.jobspy_client.search_jobs.assert_awaited_once_with("Python", "Bangalore", 1, country="UAE")
+        assert manager.breakers.snapshot()["JobSpy"]["state"] == "closed"
@@ -20,6 +20,8 @@ class TestJobServiceComprehensive:
         """Create JobService with all dependencies mocked"""
         service = JobService(mock_db)
         service.scraper_manager = AsyncMock()
+        # Background scrapes stream batches; by default the stream is empty
+        service.scraper_manager.stream_search = MagicMock()
         service.filter_engine = Mock()
         service.matching_engine = Mock()
         service.vector_manager = Mock()
@@ -36,24 +38,30 @@ class TestJobServiceComprehensive:
     @pytest.mark.asyncio
     async def test_background_scrape_task(self, full_service, mock_db):
         """Test background scraping task execution"""
-        # Mock scraper results
-        full_service.scraper_manager.execute_search.return_value = [
-            {
-                'id': 1,
-                'title': 'Python Developer',
-                'company': 'Tech Corp',
-                'location': 'Bangalore',
-                'experience_min': 5,
-                'experience_max': 8,
-                'apply_link': 'https://example.com/job/1',
-                'source': 'Naukri',
-                'description': 'Python job'
-            }
-        ]
+        # Mock scraper results, streamed per source
+        from managers.scraper_manager import SourceBatch
+        
+        async def stream(*args, **kwargs):
+            yield SourceBatch("Naukri", [
+                {
+                    'id': 1,
+                    'title': 'Python Developer',
+                    'company': 'Tech Corp',
+                    'location': 'Bangalore',
+                    'experience_min': 5,
+                    'experience_max': 8,
+                    'apply_link': 'https://example.com/job/1',
+                    'source': 'Naukri',
+                    'description': 'Python job'
+                }
+            ])
+        
+        full_service.scraper_manager.stream_search = Mock(side_effect=stream)
         
         # Mock database session for background task
         with patch('services.AsyncSessionLocal') as mock_session_local:
             mock_session = AsyncMock()
+            mock_session.get_bind = Mock()
             mock_session_local.return_value.__aenter__.return_value = mock_session
             
             # Mock database operations
@@ -67,8 +75,76 @@ class TestJobServiceComprehensive:
             )
             
             # Verify scraper was called
-            full_service.scraper_manager.execute_search.assert_called_once()
+            full_service.scraper_manager.stream_search.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_background_scrape_feeds_ingest_pipeline(self, full_service, mock_db):
+        """The source stream goes through the ingest pipeline; the cache entry is stamped afterwards"""
+        stream = object()
+        full_service.scraper_manager.stream_search = Mock(return_value=stream)
+        
+        with patch('services.AsyncSessionLocal') as mock_session_local, \
+             patch('services.IngestPipeline') as mock_pipeline:
+            mock_session = AsyncMock()
+            mock_session.add = Mock()
+            mock_session_local.return_value.__aenter__.return_value = mock_session
+            mock_result = Mock()
+            mock_result.scalar_one_or_none.return_value = None
+            mock_session.execute.return_value = mock_result
+            mock_pipeline.return_value.run = AsyncMock(return_value=3)
+            
+            await full_service._scrape_and_save_background("Python", "Bangalore", 1, "test_hash", {}, "India",
+                                                           priority="prewarm")
+        
+        full_service.scraper_manager.stream_search.assert_called_once_with(
+            "Python", "Bangalore", 1, country="India", priority="prewarm")
+        mock_pipeline.assert_called_once_with(mock_session_local, vector_manager=full_service.vector_manager)
+        mock_pipeline.return_value.run.assert_awaited_once_with(stream, "test_hash", "India")
+        cached = mock_session.add.call_args.args[0]
+        assert isinstance(cached, SearchQuery) and cached.query_hash == "test_hash"
+        mock_session.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_background_scrape_writes_through_real_pipeline(self, full_service, tmp_path):
+        """End to end on a real SQLite session: streamed jobs are stored, indexed and the cache entry stamped"""
+        from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+        from sqlalchemy.orm import sessionmaker
+        from database import Base
+        from managers.scraper_manager import SourceBatch
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", echo=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def stream(*args, **kwargs):
+            yield SourceBatch("Naukri", [{'id': 1, 'title': 'Python Developer', 'company': 'Tech Corp',
+                                          'apply_link': 'https://example.com/job/1', 'source': 'Naukri'}])
+            yield SourceBatch("Indeed", [{'id': 2, 'title': 'Data Engineer', 'company': 'Beta',
+                                          'apply_link': 'https://example.com/job/2', 'source': 'Indeed'},
+                                         {'id': 3, 'title': 'Python Developer', 'company': 'Tech Corp',
+                                          'apply_link': 'https://example.com/job/3', 'source': 'Indeed'}])
+
+        full_service.scraper_manager.stream_search = Mock(side_effect=stream)
+        full_service.vector_manager.embed_jobs = Mock(side_effect=lambda rows: [r['id'] for r in rows])
+        try:
+            with patch('services.AsyncSessionLocal', session_factory):
+                await full_service._scrape_and_save_background("Python", "Bangalore", 1, "test_hash",
+                                                               {"q": "python"}, "India")
+
+            async with session_factory() as session:
+                jobs = (await session.execute(select(Job).order_by(Job.id))).scalars().all()
+                cached = (await session.execute(select(SearchQuery))).scalar_one()
+        finally:
+            await engine.dispose()
+
+        # Job 3 is a duplicate (same title + company) of job 1
+        assert [(job.id, job.query_hash, job.country) for job in jobs] == [(1, "test_hash", "India"),
+                                                                           (2, "test_hash", "India")]
+        assert sorted(i for call in full_service.vector_manager.index_embedded.call_args_list
+                      for i in call.args[0]) == [1, 2]
+        assert cached.query_hash == "test_hash" and cached.params == {"q": "python"}
+
     @pytest.mark.asyncio
     async def test_get_jobs_with_profiler(self, full_service, mock_db):
         """Test get_jobs with profiler enabled"""
@@ -251,6 +327,87 @@ class TestJobServiceComprehensive:
         # Verify reranking was called
         full_service.vector_manager.rerank.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_get_jobs_queues_top_results_for_enrichment(self, full_service, mock_db):
+        """The top-ranked jobs are handed to the detail enricher"""
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_jobs = [
+            Job(id=i, title=f"Python Developer {i}", company=f"Corp {i}", location="Bangalore",
+                description=f"View details on Indeed: https://example.com/{i}", apply_link=f"https://example.com/{i}",
+                source="Indeed")
+            for i in range(8)
+        ]
+        mock_jobs_result = Mock()
+        mock_jobs_result.scalars.return_value.all.return_value = mock_jobs
+        
+        async def mock_execute(stmt):
+            if "search_queries" in str(stmt).lower():
+                return mock_result
+            if "user_interactions" in str(stmt).lower():
+                mock_interaction_result = Mock()
+                mock_interaction_result.scalars.return_value.all.return_value = []
+                return mock_interaction_result
+            return mock_jobs_result
+        
+        mock_db.execute.side_effect = mock_execute
+        full_service.vector_manager.search.return_value = []
+        full_service.vector_manager.rerank.return_value = [i / 10 for i in range(8)]
+        full_service.matching_engine.calculate_score.return_value = (50.0, {})
+        full_service.enricher = Mock(top_n=3)
+        
+        jobs, _ = await full_service.get_jobs("Python", "Bangalore")
+        
+        full_service.enricher.submit.assert_called_once_with(jobs[:3])
+        assert [job.id for job in jobs[:3]] == [7, 6, 5]
+    
+    @pytest.mark.asyncio
+    async def test_get_jobs_location_matches_every_spelling(self, full_service, mock_db):
+        """A location typed into the query filters on all its spellings, not just the canonical one"""
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_jobs_result = Mock()
+        mock_jobs_result.scalars.return_value.all.return_value = []
+
+        async def mock_execute(stmt):
+            if "search_queries" in str(stmt).lower():
+                return mock_result
+            return mock_jobs_result
+
+        mock_db.execute.side_effect = mock_execute
+        full_service.vector_manager.search.return_value = []
+
+        await full_service.get_jobs("Python Developers in Bengaluru")
+
+        stmt = full_service.filter_engine.apply_filters.call_args[0][0]
+        sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+        assert "'%Bangalore%'" in sql and "'%bengaluru%'" in sql
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("location", ["Delhi", "NCR", "New Delhi"])
+    async def test_get_jobs_delhi_filter_keeps_delhi_rows_and_expands_ncr(self, full_service, mock_db, location):
+        """Any Delhi NCR spelling still matches rows stored as "Delhi" and covers the NCR cities"""
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_jobs_result = Mock()
+        mock_jobs_result.scalars.return_value.all.return_value = []
+
+        async def mock_execute(stmt):
+            if "search_queries" in str(stmt).lower():
+                return mock_result
+            return mock_jobs_result
+
+        mock_db.execute.side_effect = mock_execute
+        full_service.vector_manager.search.return_value = []
+
+        await full_service.get_jobs("Python", [location])
+
+        stmt = full_service.filter_engine.apply_filters.call_args[0][0]
+        sql = str(stmt.compile(compile_kwargs={"literal_binds": True})).lower()
+        assert "'%delhi%'" in sql
+        assert "'%gurgaon%'" in sql and "'%noida%'" in sql
+        assert "'%delhi ncr%'" not in sql  # narrower than '%delhi%'
+
     @pytest.mark.asyncio
     async def test_get_jobs_vector_search_failure(self, full_service, mock_db):
         """Test handling of vector search failures"""
@@ -398,3 +555,33 @@ class TestJobServiceComprehensive:
         
         # Should trigger scrape due to low results
         assert len(jobs) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("found,priority", [(3, "interactive"), (60, "prewarm")])
+    async def test_get_jobs_refresh_of_full_results_runs_as_prewarm(self, full_service, mock_db, found, priority):
+        """A stale search that already has a full page of results is refreshed at prewarm priority"""
+        cached_query = SearchQuery(query_hash="test_hash", last_fetched=datetime.utcnow() - timedelta(hours=3), params={})
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = cached_query
+        mock_jobs_result = Mock()
+        mock_jobs_result.scalars.return_value.all.return_value = [
+            Job(id=i, title=f"Python Developer {i}", company="Corp", location="Pune", experience_min=1,
+                experience_max=3, description="Desc", apply_link=f"https://example.com/{i}", source="Test")
+            for i in range(found)
+        ]
+
+        async def mock_execute(stmt):
+            if "search_queries" in str(stmt).lower():
+                return mock_result
+            return mock_jobs_result
+
+        mock_db.execute.side_effect = mock_execute
+        full_service.vector_manager.search.return_value = []
+        full_service.matching_engine.calculate_score.return_value = (85.0, {})
+        full_service._scrape_and_save_background = AsyncMock()
+
+        with patch('services.asyncio.create_task') as create_task:
+            await full_service.get_jobs("Python", "Pune")
+            create_task.call_args.args[0].close()
+
+        assert full_service._scrape_and_save_background.call_args.kwargs["priority"] == priority
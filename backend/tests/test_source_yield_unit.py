@@ -0,0 +1,98 @@
+import random
+import pytest
+from managers.source_yield import SourceYieldStats, query_category, PRIOR_SECONDS, PRIOR_NEW_JOBS
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return SourceYieldStats(state_file=str(tmp_path / "source_yield.json"), min_trials=3, min_new_jobs=2,
+                            explore=0.0)
+
+
+def record_calls(stats, source, bucket, calls, new_per_call, seconds=5.0, failed=False):
+    for _ in range(calls):
+        stats.record_time(source, seconds, bucket, failed=failed)
+        stats.record_new(source, new_per_call, bucket)
+
+
+class TestSourceYieldStats:
+    """Unit tests for per-source yield stats and source selection"""
+
+    def test_query_category(self):
+        assert query_category("senior software engineer") == "senior"
+        assert query_category("analytics lead") == "senior"
+        assert query_category("software engineer intern") == "entry"
+        assert query_category("delivery driver") == "blue_collar"
+        assert query_category("data analyst") == "general"
+        assert SourceYieldStats.bucket("Data Analyst", "India") == "general|india"
+
+    def test_unknown_source_uses_prior(self, stats):
+        assert stats.cost_per_new_job("Naukri") == PRIOR_SECONDS / PRIOR_NEW_JOBS
+
+    def test_cost_tracks_seconds_per_new_job(self, stats):
+        stats.record_time("JSearch", 2.0, "general|india")
+        stats.record_new("JSearch", 95, "general|india")
+        stats.record_time("Glassdoor", 40.0, "general|india")
+
+        assert stats.cost_per_new_job("JSearch", "general|india") == pytest.approx(12.0 / 100)
+        assert stats.order(["Glassdoor", "Naukri", "JSearch"], "general|india") == ["JSearch", "Naukri", "Glassdoor"]
+        # Other buckets don't share the history
+        assert stats.order(["Glassdoor", "JSearch"], "senior|india") == ["Glassdoor", "JSearch"]
+
+    def test_history_decays(self, stats):
+        record_calls(stats, "Naukri", "general|india", 1, 100, seconds=10.0)
+        record_calls(stats, "Naukri", "general|india", 30, 0, seconds=10.0)
+        # Recent empty runs outweigh one old good run
+        assert stats.cost_per_new_job("Naukri", "general|india") > PRIOR_SECONDS / PRIOR_NEW_JOBS
+
+    def test_select_skips_unproductive_and_caps_pages(self, stats):
+        bucket = "senior|india"
+        record_calls(stats, "Naukri", bucket, 5, 20)
+        record_calls(stats, "Hirist", bucket, 5, 3)
+        record_calls(stats, "Freshersworld", bucket, 5, 0)
+        record_calls(stats, "Apna", bucket, 2, 0)  # not enough trials yet
+
+        selected = stats.select(["Naukri", "Hirist", "Freshersworld", "Apna", "Cutshort"], bucket, max_pages=2)
+
+        assert selected == {"Naukri": 2, "Hirist": 1, "Apna": 2, "Cutshort": 2}
+
+    def test_repeated_queries_are_not_evidence(self, stats):
+        bucket = "general|india"
+        record_calls(stats, "Naukri", bucket, 3, 10)
+        # The same popular query again and again within the watermark TTL: page 1 is all known
+        for _ in range(20):
+            stats.record_time("Naukri", 5.0, bucket)
+            stats.record_new("Naukri", 0, bucket, known=True)
+
+        assert stats.mean_new_jobs("Naukri", bucket) == pytest.approx(10)
+        assert stats.select(["Naukri"], bucket, max_pages=2) == {"Naukri": 2}
+        # The time still counts towards cost
+        assert stats.buckets[bucket]["Naukri"]["calls"] == 23
+
+    def test_select_explores_skipped_sources(self, stats):
+        stats.explore = 0.5
+        stats.rng = random.Random(7)
+        record_calls(stats, "Freshersworld", "senior|india", 5, 0)
+
+        picks = [stats.select(["Freshersworld"], "senior|india", max_pages=2) for _ in range(200)]
+
+        explored = sum(1 for p in picks if p == {"Freshersworld": 1})
+        assert 60 < explored < 140
+        assert all(p in ({}, {"Freshersworld": 1}) for p in picks)
+
+    def test_snapshot_reports_failure_rate_and_latency(self, stats):
+        record_calls(stats, "Indeed", "general|india", 1, 0, seconds=25.0, failed=True)
+        record_calls(stats, "Indeed", "general|india", 1, 10, seconds=5.0)
+
+        indeed = stats.snapshot()["general|india"]["Indeed"]
+        assert indeed["calls"] == 2
+        assert 0.4 < indeed["failure_rate"] < 0.5
+        assert indeed["new_jobs_per_call"] > 0
+
+    def test_persists(self, stats, tmp_path):
+        record_calls(stats, "Hirist", "general|india", 1, 20)
+        stats.save()
+
+        reloaded = SourceYieldStats(state_file=str(tmp_path / "source_yield.json"))
+        assert reloaded.cost_per_new_job("Hirist", "general|india") == stats.cost_per_new_job("Hirist", "general|india")
+        assert reloaded.snapshot()["general|india"]["Hirist"]["calls"] == 1
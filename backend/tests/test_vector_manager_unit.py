@@ -35,7 +35,9 @@ class TestVectorManager:
              patch('managers.vector_manager.CrossEncoder') as mock_ce:
             
             mock_encoder = Mock()
-            mock_encoder.encode.return_value = np.array([0.1, 0.2, 0.3])
+            # One vector per text; a list of texts gets a matrix, like the real model
+            mock_encoder.encode.side_effect = lambda texts, **kw: (
+                np.array([[0.1, 0.2, 0.3]] * len(texts)) if isinstance(texts, list) else np.array([0.1, 0.2, 0.3]))
             mock_st.return_value = mock_encoder
             
             mock_reranker = Mock()
@@ -107,6 +109,19 @@ class TestVectorManager:
         
         vm.collection.upsert.assert_not_called()
     
+    def test_embed_jobs_batches_model_calls(self, mock_chroma_client, mock_models):
+        """A batch of jobs is embedded in one model call and indexed in one upsert"""
+        vm = VectorManager()
+        jobs = [{'id': i, 'title': f'Job {i}', 'company': 'Acme', 'description': None} for i in range(3)]
+        
+        embedded = vm.embed_jobs(jobs)
+        vm.index_embedded(embedded)
+        
+        mock_models['encoder'].encode.assert_called_once()
+        assert embedded['ids'] == ['0', '1', '2']
+        assert len(embedded['embeddings']) == 3 and embedded['embeddings'][0] == [0.1, 0.2, 0.3]
+        vm.collection.upsert.assert_called_once_with(**embedded)
+    
     def test_search_basic(self, mock_chroma_client, mock_models):
         """Test basic vector search"""
         vm = VectorManager()
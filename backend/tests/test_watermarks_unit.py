@@ -0,0 +1,76 @@
+import os
+import pytest
+from unittest.mock import patch
+from managers.watermarks import WatermarkStore, job_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WatermarkStore(state_file=str(tmp_path / "watermarks.json"), max_keys=5, ttl=3600,
+                          max_pages=3, deepen_ratio=0.5)
+
+
+def jobs(*ids):
+    return [{"title": f"Engineer {i}", "company": "Acme", "apply_link": f"https://www.site.com/job/{i}/"} for i in ids]
+
+
+class TestWatermarkStore:
+    """Unit tests for per-(source, query) job watermarks"""
+
+    def test_job_key_folds_links_and_falls_back_to_title_company(self):
+        assert job_key({"apply_link": "https://www.Site.com/job/1/#apply"}) == job_key({"apply_link": "http://site.com/job/1"})
+        assert job_key({"title": " Data  Analyst", "company": "ACME"}) == "data analyst|acme"
+
+    def test_observe_returns_share_of_new_jobs(self, store):
+        assert store.observe("Naukri", "python", "Bangalore", jobs(1, 2, 3, 4)) == 1.0
+        assert store.observe("Naukri", "python", "Bangalore", jobs(3, 4, 5, 6)) == 0.5
+        assert store.observe("Naukri", "python", "Bangalore", []) == 0.0
+        # Watermarks are per source, query and location
+        assert store.observe("Indeed", "python", "Bangalore", jobs(1)) == 1.0
+        assert store.observe("Naukri", "python", "Pune", jobs(1)) == 1.0
+
+    def test_seen_keys_expire_and_are_bounded(self, store):
+        store.observe("Naukri", "python", None, jobs(1, 2, 3, 4, 5, 6, 7))
+        entry = store.entries[store._key("Naukri", "python", None)]
+        assert len(entry["seen"]) == 5
+        for k in entry["seen"]:
+            entry["seen"][k] -= 7200
+        assert store.observe("Naukri", "python", None, jobs(1, 2)) == 1.0
+
+    def test_should_deepen(self, store):
+        assert store.should_deepen("Naukri", 0.8, 1)
+        assert not store.should_deepen("Naukri", 0.8, 3)
+        assert not store.should_deepen("Naukri", 0.2, 1)
+        store.observe("Naukri", "python", None, jobs(1))
+        assert store.snapshot()["sources"]["Naukri"] == {"pages": 1, "early_stops": 1}
+
+    def test_depth_adapts_and_persists(self, store, tmp_path):
+        assert store.plan_depth("JSearch", "python", None, default=5) == 5
+        store.record_depth("JSearch", "python", None, 5, new_ratio=0.1, max_depth=5)
+        assert store.plan_depth("JSearch", "python", None, default=5) == 4
+        store.record_depth("JSearch", "python", None, 4, new_ratio=0.9, max_depth=5)
+        assert store.plan_depth("JSearch", "python", None, default=5) == 5
+        store.record_depth("JSearch", "python", None, 1, new_ratio=0.0, max_depth=5)
+        store.save()
+
+        reloaded = WatermarkStore(state_file=str(tmp_path / "watermarks.json"))
+        assert reloaded.plan_depth("JSearch", "python", None, default=5) == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_a_copy_off_the_loop_only_when_dirty(self, store, tmp_path):
+        await store.flush()
+        assert not os.path.exists(tmp_path / "watermarks.json")
+
+        store.observe("Naukri", "python", None, jobs(1))
+        store.dirty = True
+        written = {}
+        with patch("managers.watermarks.save_json_state", side_effect=lambda path, data: written.update(data)):
+            await store.flush()
+        # Later observations don't change what the thread was handed
+        store.observe("Naukri", "python", None, jobs(2))
+        assert list(written[store._key("Naukri", "python", None)]["seen"]) == [job_key(jobs(1)[0])]
+        assert not store.dirty
+
+        store.dirty = True
+        await store.flush()
+        assert WatermarkStore(state_file=str(tmp_path / "watermarks.json")).entries == store.entries
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """
+    Rolling window of request latencies for one source, used to pick the hedge delay.
+    """
+    def __init__(self, window: int = 100, min_samples: int = 5):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q in [0, 1]. Returns None until enough samples have been recorded."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[idx]
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self.samples),
+            "p50": self.percentile(0.5),
+            "p95": self.p95,
+        }
+
+
+# Registry of trackers, shared across requests (clients are re-created per request)
+_trackers: Dict[str, LatencyTracker] = {}
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """Get or create the latency tracker for a source."""
+    if name not in _trackers:
+        _trackers[name] = LatencyTracker()
+    return _trackers[name]
+
+def latency_snapshot() -> Dict[str, Any]:
+    """Per-source latency percentiles, for the metrics endpoint."""
+    return {name: tracker.snapshot() for name, tracker in _trackers.items()}
+
+
+async def hedged_call(
+    call: Callable[[], Awaitable[Any]],
+    hedge_after: Optional[float] = None,
+    can_hedge: Optional[Callable[[], bool]] = None,
+    tracker: Optional[LatencyTracker] = None,
+) -> Any:
+    """
+    Run `call()`; if it hasn't finished after `hedge_after` seconds, start a duplicate
+    and return whichever succeeds first. The loser is cancelled.
+    `can_hedge` is consulted right before hedging (e.g. to spend API budget).
+    `tracker` gets the latency of every attempt, including cancelled ones (hedge
+    losers, or a caller's deadline): they took at least that long, and leaving
+    the slow ones out would bias the p95 low.
+    """
+    async def timed():
+        t0 = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            if tracker is not None:
+                tracker.record(time.monotonic() - t0)
+            raise
+        if tracker is not None:
+            tracker.record(time.monotonic() - t0)
+        return result
+
+    primary = asyncio.create_task(timed())
+    tasks = {primary}
+    try:
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and (can_hedge is None or can_hedge()):
+                logger.debug(f"Hedging request after {hedge_after:.2f}s")
+                tasks.add(asyncio.create_task(timed()))
+
+        errors = []
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int], Awaitable[List[Any]]],
+    pages: Iterable[int],
+    concurrency: int = 3,
+    deadline: Optional[float] = None,
+    name: str = "API",
+) -> List[Any]:
+    """
+    Fetch pages in parallel (at most `concurrency` in flight). When `deadline` expires,
+    unfinished pages are cancelled and the pages that did finish are returned, in page
+    order, instead of dropping the whole batch. Failed pages are logged and skipped.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(page: int):
+        async with semaphore:
+            return await fetch_page(page)
+
+    tasks = {asyncio.create_task(run(p)): p for p in pages}
+    if not tasks:
+        return []
+    try:
+        done, pending = await asyncio.wait(tasks.keys(), timeout=deadline)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(f"{name}: deadline {deadline}s hit, returning {len(done)}/{len(tasks)} pages")
+
+    results = []
+    for task in sorted(done, key=lambda t: tasks[t]):
+        if task.exception() is not None:
+            logger.error(f"{name} page {tasks[task]} failed: {task.exception()}")
+            continue
+        results.append(task.result())
+    return results
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Optional, Dict
+from urllib.parse import urlsplit
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying (rate limited / transient upstream failures)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClientPool:
+    """
+    Shared httpx.AsyncClient for the API clients (JSearch, Adzuna, Remotive).
+    Keeps connections alive across calls so repeated pages skip DNS/TCP/TLS setup,
+    caps concurrent connections per host and retries transient failures with backoff.
+    """
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_keepalive: int = None,
+        max_per_host: int = None,
+        keepalive_expiry: float = None,
+        http2: bool = None,
+        max_retries: int = None,
+        backoff_base: float = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.max_connections = max_connections or int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "50"))
+        self.max_keepalive = max_keepalive or int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "20"))
+        self.max_per_host = max_per_host or int(os.getenv("HTTP_POOL_MAX_PER_HOST", "10"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "30"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+
+        if http2 is None:
+            http2 = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+        if http2 and not _http2_available():
+            logger.info("HTTP/2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use (or after close)."""
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                http2=self.http2,
+                transport=self._transport,
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                follow_redirects=True,
+            )
+            logger.debug(f"HTTP client pool created (http2={self.http2}, max_connections={self.max_connections})")
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_semaphores[host]
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Exponential backoff with jitter. Honors Retry-After on 429/503 (capped)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 10.0)
+                except ValueError:
+                    pass
+        return self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
+
+    async def request(self, method: str, url: str, max_retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request through the shared client with per-host limits and retry/backoff.
+        Returns the last response; callers still decide whether to raise_for_status().
+        `max_retries` overrides the pool default (e.g. 0 for probes that have a fallback).
+        """
+        client = self.get_client()
+        max_retries = self.max_retries if max_retries is None else max_retries
+        async with self._host_semaphore(url):
+            attempt = 0
+            while True:
+                try:
+                    response = await client.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    if attempt >= max_retries:
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"HTTP {method} {url} failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                        return response
+                    delay = self._backoff_delay(attempt, response)
+                    logger.warning(f"HTTP {method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                    await response.aclose()
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def close(self):
+        """Close the shared client and release pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("HTTP client pool closed")
+        self._client = None
+        self._host_semaphores = {}
+
+
+# Global instance
+_http_pool: Optional[HttpClientPool] = None
+
+def get_http_pool() -> HttpClientPool:
+    """Get or create the global HTTP client pool."""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HttpClientPool()
+    return _http_pool
+
+async def close_http_pool():
+    """Close the global HTTP client pool (called from the app lifespan)."""
+    global _http_pool
+    if _http_pool is not None:
+        await _http_pool.close()
+        _http_pool = None
+
+async def use_http_transport(transport: Optional[httpx.AsyncBaseTransport]):
+    """
+    Send the global pool's requests through `transport` (fixture record/replay,
+    without retries); None goes back to the network.
+    """
+    global _http_pool
+    await close_http_pool()
+    if transport is not None:
+        _http_pool = HttpClientPool(transport=transport, max_retries=0)
@@ -0,0 +1,10 @@
+import hashlib
+
+
+def stable_job_id(key: str) -> int:
+    """
+    Job id from a job's identifying text (apply link + title). hash() is salted per
+    process, so it gave the same job a different id in every worker process and after
+    every restart; md5 gives the same id wherever the job is normalized.
+    """
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big") % (10 ** 8)
@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Abbreviations and shorthand -> canonical words (applied per token, before stemming)
+SYNONYMS: Dict[str, str] = {
+    "sde": "software engineer",
+    "swe": "software engineer",
+    "sse": "senior software engineer",
+    "dev": "developer",
+    "devs": "developer",
+    "engg": "engineer",
+    "eng": "engineer",
+    "mgr": "manager",
+    "sr": "senior",
+    "jr": "junior",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "pm": "product manager",
+    "js": "javascript",
+    "fe": "frontend",
+    "front-end": "frontend",
+    "back-end": "backend",
+    "full-stack": "fullstack",
+    "sw": "software",
+}
+
+# Canonical location -> spellings users type (lowercase). Canonical names are what
+# the scrapers get, so they follow the spellings the job sites expect.
+LOCATION_ALIASES: Dict[str, List[str]] = {
+    "Bangalore": ["bangalore", "bengaluru", "blr"],
+    "Delhi NCR": ["delhi ncr", "ncr", "delhi", "new delhi"],
+    "Gurgaon": ["gurgaon", "gurugram"],
+    "Noida": ["noida"],
+    "Mumbai": ["mumbai", "bombay", "navi mumbai"],
+    "Hyderabad": ["hyderabad", "hyd"],
+    "Chennai": ["chennai", "madras"],
+    "Pune": ["pune"],
+    "Kolkata": ["kolkata", "calcutta"],
+    "Ahmedabad": ["ahmedabad"],
+    "Remote": ["remote", "work from home", "wfh"],
+    "Dubai": ["dubai"],
+    "Abu Dhabi": ["abu dhabi"],
+}
+
+# Words that end in "s" but aren't plurals (or whose singular means something else)
+_NO_STEM = {
+    "analytics", "sales", "operations", "devops", "mlops", "kubernetes", "windows", "news",
+    "logistics", "statistics", "economics", "graphics", "robotics", "mathematics", "physics",
+    "electronics", "business", "express", "nodejs", "reactjs", "vuejs", "angularjs", "nextjs",
+    # Product and tool names: the singular is a different word to the job sites
+    "pandas", "postgres", "jenkins", "rails", "saas", "paas", "iaas", "hrms", "teams", "sas", "redux",
+}
+
+_ALIAS_TO_LOCATION = {alias: name for name, aliases in LOCATION_ALIASES.items() for alias in aliases}
+# Longest aliases first so "navi mumbai" wins over "mumbai" and "delhi ncr" over "delhi"
+_LOCATION_RE = re.compile(
+    r"(?:^|\s)(?:in|at|near|@)?\s*(" + "|".join(re.escape(a) for a in sorted(_ALIAS_TO_LOCATION, key=len, reverse=True)) + r")\s*$"
+)
+# "&" stays inside a token so "r&d" and "at&t" survive; a bare "&" is dropped
+_TOKEN_RE = re.compile(r"[a-z0-9+#./&-]+")
+
+
+class CanonicalQuery(NamedTuple):
+    query: str
+    location: Optional[str]
+
+
+def stem(token: str) -> str:
+    """Light plural stemming: "developers" -> "developer", "companies" -> "company"."""
+    if len(token) <= 3 or token in _NO_STEM or not token.isalpha() or token.endswith(("ops", "js")):
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("sses", "shes", "ches", "xes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is", "ics", "ous")):
+        return token[:-1]
+    return token
+
+
+def canonical_location(location: Optional[str]) -> Optional[str]:
+    """Canonical spelling of a known location ("bengaluru" -> "Bangalore"); unknown ones are tidied up."""
+    if not location:
+        return None
+    folded = " ".join(location.lower().split())
+    if not folded or folded == "none":
+        return None
+    return _ALIAS_TO_LOCATION.get(folded, " ".join(location.split()))
+
+
+def location_spellings(location: str) -> List[str]:
+    """
+    Every spelling of a location for matching stored jobs: sources keep their own
+    ("Bengaluru" on Naukri, "Bangalore" elsewhere), so the canonical name alone
+    would drop rows. The spelling as given is always included, and spellings that
+    contain another one are left out ("%Delhi%" already matches "New Delhi").
+    Unknown locations are returned as is.
+    """
+    name = canonical_location(location) or location
+    candidates: List[str] = []
+    for spelling in [name, " ".join(location.split())] + LOCATION_ALIASES.get(name, []):
+        if spelling and spelling.lower() not in (c.lower() for c in candidates):
+            candidates.append(spelling)
+    return [spelling for spelling in candidates
+            if not any(other.lower() in spelling.lower() for other in candidates if other is not spelling)]
+
+
+def canonicalize_query(query: str, location: Optional[str] = None) -> CanonicalQuery:
+    """
+    Canonical form of a search, used for cache keys and scraper inputs:
+    case/whitespace folding, a trailing location ("... in Bangalore") split off,
+    abbreviations expanded (SDE -> software engineer) and plurals stemmed.
+
+    `location` (from the location filter) wins over a location typed into the query.
+    """
+    text = " ".join((query or "").lower().split())
+    typed_location = None
+    match = _LOCATION_RE.search(text)
+    if match and match.start(1) > 0:
+        typed_location = _ALIAS_TO_LOCATION[match.group(1)]
+        text = text[:match.start()].strip()
+
+    words = []
+    for token in _TOKEN_RE.findall(text):
+        if not any(c.isalnum() for c in token):
+            continue
+        for word in SYNONYMS.get(token, token).split():
+            words.append(stem(word))
+    return CanonicalQuery(" ".join(words), canonical_location(location) or typed_location)
@@ -0,0 +1,159 @@
+import base64
+import json
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that differ between recording and replay (credentials, cache busters)
+IGNORED_PARAMS = {"app_id", "app_key", "api_key", "apikey", "key", "_", "ts", "t"}
+# Hop-by-hop/encoding headers: bodies are stored decoded
+STRIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+TEXT_MIME_PREFIXES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg")
+
+
+def request_key(method: str, url: str) -> str:
+    """Identity of a request for replay: method, host, path and sorted query minus IGNORED_PARAMS."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in IGNORED_PARAMS)
+    path = parts.path.rstrip("/") or "/"
+    key = f"{method.upper()} {parts.scheme}://{parts.netloc.lower()}{path}"
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+def har_entry(method: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+              mime_type: str = None) -> Dict[str, Any]:
+    """A HAR 1.2 entry for one exchange (text bodies stored as text, others base64)."""
+    mime_type = mime_type or headers.get("content-type", "application/octet-stream")
+    content: Dict[str, Any] = {"size": len(body), "mimeType": mime_type}
+    if mime_type.startswith(TEXT_MIME_PREFIXES):
+        content["text"] = body.decode("utf-8", errors="replace")
+    else:
+        content["text"] = base64.b64encode(body).decode("ascii")
+        content["encoding"] = "base64"
+    return {
+        "request": {"method": method.upper(), "url": url, "headers": []},
+        "response": {
+            "status": status,
+            "headers": [{"name": k, "value": v} for k, v in headers.items() if k.lower() not in STRIPPED_HEADERS],
+            "content": content,
+        },
+    }
+
+
+def load_har(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["log"]["entries"]
+
+
+def save_har(path: str, entries: List[Dict[str, Any]]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"log": {"version": "1.2", "creator": {"name": "job-portal", "version": "1"}, "entries": entries}},
+                  f, indent=1, ensure_ascii=False)
+
+
+class ReplayStats:
+    """Round trips and bytes served from fixtures, plus requests that had no recording."""
+    def __init__(self):
+        self.round_trips = 0
+        self.bytes = 0
+        self.unmatched: Counter = Counter()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"round_trips": self.round_trips, "bytes": self.bytes, "unmatched": sum(self.unmatched.values())}
+
+
+class HarReplay:
+    """
+    Recorded responses from HAR files, looked up by `request_key`. Repeated requests
+    get the recorded responses in order (the last one repeats). Serves both the httpx
+    pool (`ReplayTransport`) and browser pages (BrowserPool routes through `fulfill`).
+    """
+    def __init__(self, *paths: str):
+        self.responses: Dict[str, List[Tuple[int, Dict[str, str], bytes]]] = {}
+        self._served: Counter = Counter()
+        self.stats = ReplayStats()
+        for path in paths:
+            if os.path.exists(path):
+                for entry in load_har(path):
+                    self.add(entry)
+
+    def add(self, entry: Dict[str, Any]):
+        request, response = entry["request"], entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {h["name"]: h["value"] for h in response.get("headers", [])
+                   if h["name"].lower() not in STRIPPED_HEADERS and not h["name"].startswith(":")}
+        if content.get("mimeType") and not any(k.lower() == "content-type" for k in headers):
+            headers["content-type"] = content["mimeType"]
+        key = request_key(request["method"], request["url"])
+        self.responses.setdefault(key, []).append((response["status"], headers, body))
+
+    def rewind(self):
+        """Serve repeated requests from their first recorded response again (next benchmark run)."""
+        self._served.clear()
+
+    def match(self, method: str, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        key = request_key(method, url)
+        recorded = self.responses.get(key)
+        if not recorded:
+            self.stats.unmatched[key] += 1
+            logger.debug(f"No recorded response for {key}")
+            return None
+        response = recorded[min(self._served[key], len(recorded) - 1)]
+        self._served[key] += 1
+        self.stats.round_trips += 1
+        self.stats.bytes += len(response[2])
+        return response
+
+    async def fulfill(self, route):
+        """Answer a Playwright route from the recording; unrecorded requests fail as if offline."""
+        response = self.match(route.request.method, route.request.url)
+        if response is None:
+            await route.abort("internetdisconnected")
+            return
+        status, headers, body = response
+        await route.fulfill(status=status, headers=headers, body=body)
+
+
+class ReplayTransport(httpx.MockTransport):
+    """httpx transport answering from a HarReplay; unrecorded requests raise ConnectError."""
+    def __init__(self, replay: HarReplay):
+        self.replay = replay
+        super().__init__(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        response = self.replay.match(request.method, str(request.url))
+        if response is None:
+            raise httpx.ConnectError(f"No recorded response for {request_key(request.method, str(request.url))}",
+                                     request=request)
+        status, headers, body = response
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that forwards to the network and keeps every exchange as a HAR entry."""
+    def __init__(self, transport: httpx.AsyncBaseTransport = None):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.entries: List[Dict[str, Any]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        recorded = httpx.Response(response.status_code, headers=response.headers, stream=response.stream,
+                                  request=request)
+        body = await recorded.aread()  # decoded body
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in STRIPPED_HEADERS}
+        self.entries.append(har_entry(request.method, str(request.url), response.status_code, headers, body))
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def save(self, path: str):
+        save_har(path, self.entries)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,46 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Directory for small local state files (feed caches, budgets, breaker state...)
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "state"))
+
+
+def state_path(filename: str) -> str:
+    """Return the absolute path of a state file inside STATE_DIR."""
+    return os.path.join(STATE_DIR, filename)
+
+
+def load_json_state(path: str, default: Any = None) -> Any:
+    """
+    Load a JSON state file. Returns `default` if the file is missing or corrupt,
+    so callers can always start from a clean state.
+    """
+    if not os.path.isfile(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load state file {path}: {e}")
+        return default
+
+
+def save_json_state(path: str, data: Any):
+    """
+    Atomically write a JSON state file (write to a temp file, then rename),
+    so a crash mid-write never leaves a half-written file behind.
+    """
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Could not save state file {path}: {e}")